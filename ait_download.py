@@ -15,20 +15,43 @@ Parameters:
     There are two date parameters, formatted YYYY-MM-DD, which define which WARCs to include in the download.
     date_start : required. WARCs stored on this day will be included.
     date_end : required. WARCs stored on this day will NOT be included.
+    --plan : optional. Report the seeds, WARCs, and GB by department and collection, the disk space needed,
+             and the predicted makespan, without downloading anything or making any folders or logs.
+    --batch-gb GB : optional. Download the seeds in batches of at most this many GB, one batch at a time.
+    --batch-disk-gb GB : optional. Like --batch-gb, but the budget is the disk space needed once unzipped.
+    --pause-between-batches : optional. Wait for Enter before starting each batch after the first.
+    --profile : optional. Profile each stage with cProfile and tracemalloc, saving the results next to seeds_log.csv.
+    --profile-seeds N : optional. With --profile, only profile the workers for the first N seeds downloaded,
+                        so a long download is not slowed down as much. Default is every seed.
 
 Returns:
     One folder for each seed, with the WARCs and metadata reports.
     A metadata.csv file needed for the general-aip script to prepare the folders for preservation.
     A seeds_log.csv file with information about each workflow step.
     A completeness_log.csv file with information about the download's completeness.
+    With batches, a batches.csv file with the seeds in each batch and a completeness_check_batch_N.csv file
+    for each batch, which are combined into completeness_check.csv.
+    A download_status.json file with the progress of the download, which is updated while it runs.
+    A download_trace.json file with how long each step took, if trace = True is in the configuration file.
+    Metrics for Prometheus, on a local web page and/or in a file, if metrics_port and/or metrics_textfile
+    are in the configuration file.
+    A row for the run in the run history (run_history.sqlite), which can be compared with run_history.py.
+    With --plan, only a download_plan.csv file with the size of each collection.
+    With --profile, profile_STAGE.prof and profile_STAGE.txt files for each stage and a profile_summary.csv file.
 """
 
-# Usage: python ait_download.py date_start date_end
+# Usage: python ait_download.py date_start date_end [--plan] [--batch-gb GB | --batch-disk-gb GB]
+#        [--pause-between-batches] [--profile] [--profile-seeds N]
 
+import argparse
 import os
 import pandas as pd
 import re
+import shutil
+import signal
+import subprocess
 import sys
+import time
 
 # Configuration is made by the user and could be forgotten.
 try:
@@ -41,12 +64,25 @@ import web_functions as fun
 
 # Tests to validate the two date arguments, which specify the time frame for WARCs to include in the download.
 
-# Tests that both dates are provided. If not, ends the script.
-try:
-    date_start, date_end = sys.argv[1:]
-except ValueError:
-    print("\nExiting script: must provide exactly two arguments, the start and end date of the download.")
-    exit()
+# Tests that both dates are provided. If not, argparse prints the usage and ends the script.
+parser = argparse.ArgumentParser(description="Download WARCs and metadata from Archive-It for preservation.")
+parser.add_argument("date_start", help="first store date to include, formatted YYYY-MM-DD")
+parser.add_argument("date_end", help="first store date to not include, formatted YYYY-MM-DD")
+parser.add_argument("--plan", action="store_true", help="report the size and estimated time, without downloading")
+batch_budget = parser.add_mutually_exclusive_group()
+batch_budget.add_argument("--batch-gb", type=float, metavar="GB", help="split the download into batches of this size")
+batch_budget.add_argument("--batch-disk-gb", type=float, metavar="GB",
+                          help="split the download into batches that need this much disk space once unzipped")
+parser.add_argument("--pause-between-batches", action="store_true", help="wait for Enter before each new batch")
+parser.add_argument("--profile", action="store_true", help="profile each stage with cProfile and tracemalloc")
+parser.add_argument("--profile-seeds", type=int, metavar="N", help="with --profile, only profile the first N seeds")
+args = parser.parse_args()
+if args.profile_seeds is not None and args.profile_seeds < 1:
+    parser.error("--profile-seeds must be at least 1")
+for budget_gb in (args.batch_gb, args.batch_disk_gb):
+    if budget_gb is not None and budget_gb <= 0:
+        parser.error("the batch size must be greater than 0")
+date_start, date_end = args.date_start, args.date_end
 
 # Tests that both dates are formatted correctly (YYYY-MM-DD). If not, ends the script.
 if not re.match(r"\d{4}-\d{2}-\d{2}", date_start):
@@ -62,57 +98,217 @@ if date_start > date_end:
     exit()
 
 # Verifies the configuration file has the correct values, and quits the script if not.
+# The settings for the download are then made from the configuration file.
 fun.check_config()
+fun.setup()
+
+# Profiles each stage, if the script was run with --profile.
+if args.profile:
+    fun.PROFILER.enable(args.profile_seeds)
+    print(f"\nProfiling each stage{f' (workers for {args.profile_seeds} seeds)' if args.profile_seeds else ''}. "
+          f"The results are saved in {c.script_output}.")
+
+# If the script was run with --plan, reports the size of the download by department and collection, the disk space
+# needed, and the predicted makespan, and ends the script. Nothing is downloaded and no folders or logs are made,
+# so it does not change a download that was stopped and needs to be continued.
+workers = getattr(c, "workers", 1)
+if args.plan:
+    with fun.stage("plan_download"):
+        plan_df, tasks, worker_loads = fun.plan_download(date_start, date_end, workers)
+    plan_df.to_csv(os.path.join(c.script_output, "download_plan.csv"), index=False)
+    report_df = plan_df.assign(GB=(plan_df["Bytes"] / 1000000000).round(3),
+                               Unzipped_GB=(plan_df["Unzipped_Bytes"] / 1000000000).round(3))
+    print(f"\nDownload plan for {date_start} to {date_end} (saved to download_plan.csv):")
+    print(report_df.drop(columns=["Bytes", "Unzipped_Bytes"]).to_string(index=False))
+    print("\nBy department:")
+    print(report_df.groupby("Department", dropna=False)[["Seeds", "WARCs", "GB", "Unzipped_GB"]].sum().round(3)
+          .to_string())
+    print(f"\nTotal: {plan_df['Seeds'].sum()} seeds, {plan_df['WARCs'].sum()} WARCs, "
+          f"{plan_df['Bytes'].sum() / 1000000000:.3f} GB "
+          f"({plan_df['Unzipped_Bytes'].sum() / 1000000000:.3f} GB unzipped).")
+    space_needed = fun.disk_space_needed(tasks, fun.DISK.expansion, workers) + fun.DISK.threshold_bytes
+    space_free = shutil.disk_usage(c.script_output).free
+    print(f"Estimated disk space needed: {space_needed / 1000000000:.3f} GB ({space_free / 1000000000:.3f} GB free).")
+    predicted_bytes, predicted_warcs = max(worker_loads, default=(0, 0))
+    predicted_rate, rate_source = fun.transfer_rate()
+    if predicted_rate:
+        predicted_seconds = predicted_bytes / predicted_rate + predicted_warcs * fun.API_REST
+        print(f"Predicted makespan with {workers} worker(s): {predicted_seconds / 3600:.2f} hours "
+              f"at {predicted_rate / 1000000:.1f} MB/s per worker ({rate_source}).")
+    else:
+        print("No predicted makespan: add transfer_mb_per_second to the configuration file or finish a run first.")
+    fun.TRACE.close()
+    sys.exit()
+
+# Starts the metrics for Prometheus, if metrics_port and/or metrics_textfile are in the configuration file.
+fun.METRICS.start()
+
+# Starts timing the run, which is saved in the run history with each stage when the script ends.
+fun.HISTORY.start()
 
 # Path to the folder in the script output directory (defined in the configuration file)
 # where everything related to this download will be saved.
 seeds_directory = os.path.join(c.script_output, "preservation_download")
 
 # The script may be run repeatedly if there are interruptions, such as due to API connections.
-# If it has run, it will use the existing seeds_log.csv for seed_df and skip seeds that were already done.
+# If it has run, it will use the existing seeds_log.csv for seed_log and skip seeds that were already done.
 # Otherwise, it makes seed_df and metadata_csv by getting data from the Archive-It APIs
 # and add the AIP_ID from metadata_csv to be the first column of seed_df.
-if os.path.exists(seeds_directory):
+# The seed data is then kept in a SeedLog, which updates seeds_log.csv and warcs_log.csv as each step is done.
+resumed = os.path.exists(seeds_directory)
+if resumed:
     os.chdir(seeds_directory)
-    seed_df = pd.read_csv(os.path.join(c.script_output, "seeds_log.csv"), dtype="object")
+    seed_log = fun.SeedLog(pd.read_csv(os.path.join(c.script_output, "seeds_log.csv"), dtype="object"))
+    seed_log.read_warc_log()
 else:
     os.makedirs(seeds_directory)
     os.chdir(seeds_directory)
-    seed_df = fun.seed_data(date_start, date_end)
-    aip_id_df = fun.metadata_csv(seed_df['Seed_ID'].values.tolist(), date_end)
+    with fun.stage("seed_data"):
+        seed_df = fun.seed_data(date_start, date_end)
+    with fun.stage("metadata_csv"):
+        aip_id_df = fun.metadata_csv(seed_df['Seed_ID'].values.tolist(), date_end)
     seed_df = pd.merge(seed_df, aip_id_df, how="left")
     seed_df.insert(0, "AIP_ID", seed_df.pop('AIP_ID'))
+    seed_log = fun.SeedLog(seed_df)
+    seed_log.save()
+    seed_log.start_warc_log()
 
-# Starts a counter for tracking script progress.
-# Some processes are slow, so this shows the script is still working and how much work remains.
-current_seed = 0
-total_seeds = len(seed_df[seed_df["Complete"] == "TBD"])
+# Orders the WARCs so the download finishes as soon as possible with the number of workers in the configuration file,
+# and displays the predicted makespan (time until the last worker is done) if there is an estimated transfer rate,
+# either from the configuration file or the median rate of the last finished runs in the run history.
+with fun.stage("schedule_downloads"):
+    warc_sizes = fun.get_warc_sizes(date_start, date_end)
+    tasks, worker_loads = fun.schedule_downloads(seed_log, warc_sizes, workers)
+predicted_bytes, predicted_warcs = max(worker_loads)
+print(f"\nScheduled {len(tasks)} WARCs for {workers} worker(s). "
+      f"The busiest worker is predicted to download {predicted_bytes / 1000000000:.3f} GB ({predicted_warcs} WARCs).")
+predicted_rate, rate_source = fun.transfer_rate()
+if predicted_rate:
+    predicted_seconds = predicted_bytes / predicted_rate + predicted_warcs * fun.API_REST
+    print(f"Predicted makespan: {predicted_seconds / 3600:.2f} hours "
+          f"at {predicted_rate / 1000000:.1f} MB/s per worker ({rate_source}).")
 
-# Iterates through information about each seed, downloading metadata and WARC files from Archive-It.
-# Filtered for "TBD" in the Complete column to skip seeds done earlier if this is a restart.
-for seed in seed_df[seed_df["Complete"] == "TBD"].itertuples():
+# If the script was run with --batch-gb or --batch-disk-gb, splits the seeds into batches that fit in that budget,
+# which are downloaded and checked one at a time. The batches are saved in batches.csv, so if the script is run again
+# to continue the download, it uses the same batches, even without the option.
+batches_path = os.path.join(c.script_output, "batches.csv")
+if os.path.exists(batches_path):
+    batch_df = pd.read_csv(batches_path, dtype=str)
+    batches = [list(batch_df.loc[batch_df["Batch"] == batch, "Seed_ID"]) for batch in batch_df["Batch"].unique()]
+    print(f"Continuing the download in {len(batches)} batches from batches.csv.")
+elif args.batch_gb is not None or args.batch_disk_gb is not None:
+    disk_budget = args.batch_disk_gb is not None
+    budget = (args.batch_disk_gb if disk_budget else args.batch_gb) * 1000000000
+    batches = fun.batch_seeds(seed_log, warc_sizes, budget, fun.DISK.expansion if disk_budget else None, workers)
+    pd.DataFrame([(number, seed_id) for number, batch in enumerate(batches, 1) for seed_id in batch],
+                 columns=["Batch", "Seed_ID"]).to_csv(batches_path, index=False)
+    print(f"Split the download into {len(batches)} batches of at most {budget / 1000000000:.3f} GB "
+          f"{'of disk space' if disk_budget else 'to download'} (saved to batches.csv).")
+else:
+    batches = None
 
-    # Updates the current seed number and displays the script progress.
-    current_seed += 1
-    print(f"\nStarting seed {current_seed} of {total_seeds}.")
+# The WARCs to download for each batch, as (batch number, Seed IDs, tasks), or one group of every WARC if no batches.
+if batches is None:
+    batch_runs = [(None, None, tasks)]
+else:
+    batch_runs = []
+    for number, batch in enumerate(batches, 1):
+        rows = {seed_log.find(seed_id).Index for seed_id in batch}
+        batch_runs.append((number, batch, [task for task in tasks if task[0] in rows]))
+
+# Estimates the disk space needed to download and unzip everything (or the largest batch)
+# and warns if there is not enough free space.
+# The download still starts, since WARCs only download when there is space for them, but will pause until space is freed.
+space_needed = max(fun.disk_space_needed(batch_tasks, fun.DISK.expansion, workers)
+                   for number, batch, batch_tasks in batch_runs) + fun.DISK.threshold_bytes
+space_free = shutil.disk_usage(c.script_output).free
+print(f"Estimated disk space needed{' for the largest batch' if batches else ''}: {space_needed / 1000000000:.3f} GB "
+      f"({space_free / 1000000000:.3f} GB free).")
+if space_needed > space_free:
+    print("WARNING: there is not enough free space for the entire download. "
+          "WARC downloads will pause when space runs low until more space is freed.")
 
-    # Calculates the row index for the seed being processed in the dataframe, to use for adding log information.
-    row_index = seed_df.index[seed_df["Seed_ID"] == seed.Seed_ID].tolist()[0]
+# Downloads the metadata and WARC files for each seed from Archive-It, and updates the Complete column
+# with the error type or that the seed processed successfully once all the seed's WARCs are done.
+# Ctrl+C or SIGTERM stops starting new WARCs and saves the WARCs in progress, so the script can be run again
+# with the same dates to continue where it stopped.
+# With batches, each batch is checked for completeness once it is done, the batch_handoff command in the configuration
+# file is run (for example, to move the seed folders to storage), and, with --pause-between-batches,
+# the script waits for Enter before starting the next batch.
+signal.signal(signal.SIGINT, fun.stop_downloads)
+signal.signal(signal.SIGTERM, fun.stop_downloads)
+batch_paths = []
+for number, batch, batch_tasks in batch_runs:
+    if number is not None:
+        batch_path = os.path.join(c.script_output, f"completeness_check_batch_{number}.csv")
+        batch_paths.append(batch_path)
+        if not batch_tasks and os.path.exists(batch_path):
+            continue
+        print(f"\nStarting batch {number} of {len(batches)}: {len(batch)} seeds, {len(batch_tasks)} WARCs, "
+              f"{sum(size for row_index, warc, size in batch_tasks) / 1000000000:.3f} GB.")
 
-    # If the seed already has a folder from an error in a previous iteration of the script,
-    # deletes the contents and anything in the seeds_log.csv from the previous iteration, so it can be remade.
-    if os.path.exists(str(seed.Seed_ID)):
-        fun.reset_seed(seed.Seed_ID, seed_df)
+    start_time = time.monotonic()
+    with fun.stage("download_seeds", workers=workers, batch=number):
+        worker_bytes = fun.download_seeds(seed_log, batch_tasks, workers)
+    actual_seconds = time.monotonic() - start_time
+    if worker_bytes:
+        print(f"\nActual makespan{f' for batch {number}' if number else ''}: {actual_seconds / 3600:.2f} hours. "
+              f"The busiest worker downloaded {max(worker_bytes) / 1000000000:.3f} GB.")
+    if fun.STOP.is_set() or number is None:
+        break
 
-    # Makes a folder for the seed in the seeds directory,
-    # and downloads the metadata and WARC files to that seed folder.
-    os.mkdir(str(seed.Seed_ID))
-    fun.download_metadata(seed, row_index, seed_df)
-    fun.download_warcs(seed, row_index, seed_df)
+    with fun.stage("check_seeds", batch=number):
+        fun.check_seeds(date_end, date_start, seed_log, seeds_directory, seed_ids=batch, csv_path=batch_path)
+    if hasattr(c, "batch_handoff"):
 
-    # Updates the Complete column with the error type or that the seed processed successfully.
-    fun.add_completeness(row_index, seed_df)
+        # Only the three placeholders are replaced, so the command can have other braces, like find -exec {} or ${VAR}.
+        handoff_command = c.batch_handoff
+        for placeholder, value in (("{batch}", str(number)), ("{seeds}", " ".join(batch)),
+                                   ("{seeds_directory}", seeds_directory)):
+            handoff_command = handoff_command.replace(placeholder, value)
+        handoff = subprocess.run(handoff_command, shell=True)
+        if handoff.returncode != 0:
+            print(f"\nThe batch_handoff command for batch {number} had an error (exit code {handoff.returncode}). "
+                  f"Finish the handoff for batch {number} by hand before continuing.")
+            fun.STOP.set()
+            break
+    if args.pause_between_batches and number < len(batches):
+        try:
+            input(f"\nBatch {number} is done. Press Enter to start batch {number + 1}.")
+        except EOFError:
+            pass
+
+# Displays how many API calls were retried because of temporary errors and how long the retries waited.
+for endpoint, stats in fun.RETRY_STATS.items():
+    if stats["retries"] > 0:
+        print(f"{endpoint}: {stats['retries']} retries for {stats['calls']} calls, "
+              f"waited {stats['retry_seconds']:.0f} seconds.")
+
+# If the script was stopped, the download is not complete, so it is not checked.
+if fun.STOP.is_set():
+    fun.TRACE.close()
+    fun.METRICS.stop()
+    fun.HISTORY.save("stopped", date_start, date_end, workers, resumed, seed_log, tasks)
+    unfinished = len(seed_log.unfinished())
+    print(f"\nStopped with {unfinished} seeds not finished. "
+          f"Run the script again with the same dates to continue the download.")
+    sys.exit()
 
 # Verifies the all expected seed folders are present and contain all the expected metadata files and WARCs.
 # Saves the result as a csv in the folder with the downloaded content.
-fun.check_seeds(date_end, date_start, seed_df, seeds_directory)
+# With batches, each batch was already checked, so the checks for the batches are combined instead.
+if batches is None:
+    with fun.stage("check_seeds"):
+        fun.check_seeds(date_end, date_start, seed_log, seeds_directory)
+else:
+    fun.combine_completeness(batch_paths, os.path.join(c.script_output, "completeness_check.csv"))
+fun.TRACE.close()
+fun.METRICS.stop()
+
+# Saves the run in the run history and displays anything that was slower or had more errors than previous runs.
+fun.HISTORY.save("finished", date_start, date_end, workers, resumed, seed_log, tasks)
+regressions = fun.HISTORY.regressions()
+if regressions:
+    print("\nCompared to previous runs (python run_history.py for details):")
+    for regression in regressions:
+        print(f"   * {regression}")
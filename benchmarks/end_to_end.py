@@ -0,0 +1,295 @@
+"""Measure a complete run of ait_download.py for a synthetic quarterly download, using the mock Archive-It.
+
+A mock Archive-It is made with seeds in collections that share crawl jobs, each seed with a random number of WARCs
+with random sizes. ait_download.py is then run against it in a separate process, with a configuration file made for
+the run, so the measurements are only for the script. The script's stages are timed as it runs:
+    * check_config: checking the configuration file
+    * seed_data: getting the WARC list from WASAPI and making seeds_log.csv
+    * metadata_csv: getting the seed reports from the Partner API and making metadata.csv
+    * schedule: getting the WARC sizes and scheduling the downloads
+    * download: downloading the metadata reports and WARCs for every seed
+    * check_seeds: checking the download is complete
+
+For each stage, the results have the seconds, the API calls made with api_get() (including retries), the peak
+memory (RSS) of the process during the stage, the bytes written to disk, and the bytes written per second.
+The results for the run also have the number of seeds successfully completed, the WARC bytes downloaded per second
+during the download stage, and the requests and bytes sent by the mock Archive-It for each endpoint.
+The results are added as one line of JSON to the results file, with the git commit, so runs can be compared
+across commits. Peak memory and disk bytes use /proc on Linux and are null when that is not available.
+
+The download is saved in a temporary folder, and the configuration file only needs to exist.
+
+Parameters:
+    --seeds : optional. Number of seeds. Default is 20.
+    --collections : optional. Number of collections the seeds are divided among. Default is 4.
+    --warcs : optional. Fewest and most WARCs for a seed. Default is 1 4.
+    --warc-mb : optional. Average size of a WARC in MB. Default is 2.
+    --distribution : optional. How WARC sizes vary: fixed, uniform (half to 1.5 times the average),
+                     or lognormal (mostly small, with a few large). Default is lognormal.
+    --workers : optional. Number of WARCs to download at the same time. Default is 1.
+    --profile : optional. Name of the bad conditions to use, from mock_archive_it.FAULT_PROFILES. Default is clean.
+    --random-seed : optional. Seed for the synthetic data and faults. Default is 0.
+    --results : optional. JSON Lines file to add the results to. Default is end_to_end_results.jsonl
+                in the script output folder.
+
+Returns:
+    The results for each stage, printed to the terminal and added to the results file.
+"""
+
+# Usage: python benchmarks/end_to_end.py [--seeds N] [--collections N] [--warcs MIN MAX] [--warc-mb N]
+#        [--distribution fixed|uniform|lognormal] [--workers N] [--profile NAME] [--random-seed N] [--results PATH]
+
+import argparse
+import csv
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The stages of ait_download.py, which are the functions from web_functions it calls for each stage.
+# The schedule stage is two functions, which are added together.
+STAGES = {"check_config": "check_config", "seed_data": "seed_data", "metadata_csv": "metadata_csv",
+          "get_warc_sizes": "schedule", "schedule_downloads": "schedule", "download_seeds": "download",
+          "check_seeds": "check_seeds"}
+
+# The dates of the quarter the synthetic WARCs are stored in.
+DATE_START = "2023-04-01"
+DATE_END = "2023-07-01"
+
+
+def rss_bytes():
+    """Return the current memory (resident set size) of this process in bytes, or None if it is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def write_bytes():
+    """Return the bytes this process has written to disk, or None if it is not available."""
+    try:
+        with open("/proc/self/io") as io_stats:
+            for line in io_stats:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class StageMeter:
+    """Measure each stage of ait_download.py, in the process that runs it.
+
+    Memory is sampled every 10 milliseconds by a background thread, so the peak for each stage can be found.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.peak = 0
+        threading.Thread(target=self.sample, daemon=True).start()
+
+    def sample(self):
+        """Save the highest memory since the start of the current stage."""
+        while True:
+            self.peak = max(self.peak, rss_bytes() or 0)
+            time.sleep(0.01)
+
+    def wrap(self, function, stage, api_stats):
+        """Return the function with its run added to the measurements for the stage."""
+
+        def measured(*args, **kwargs):
+            self.peak = rss_bytes() or 0
+            calls = sum(stats["calls"] + stats["retries"] for stats in api_stats.values())
+            written = write_bytes()
+            start = time.monotonic()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.monotonic() - start
+                result = self.results.setdefault(stage, {"seconds": 0.0, "api_calls": 0, "peak_rss_bytes": None,
+                                                         "disk_write_bytes": None})
+                result["seconds"] += seconds
+                result["api_calls"] += sum(stats["calls"] + stats["retries"] for stats in api_stats.values()) - calls
+                if rss_bytes() is not None:
+                    result["peak_rss_bytes"] = max(result["peak_rss_bytes"] or 0, self.peak, rss_bytes())
+                if written is not None:
+                    result["disk_write_bytes"] = (result["disk_write_bytes"] or 0) + write_bytes() - written
+                if result["disk_write_bytes"] is not None:
+                    result["write_bytes_per_second"] = result["disk_write_bytes"] / max(result["seconds"], 0.001)
+        return measured
+
+
+def run_script(results_path):
+    """Run ait_download.py with every stage measured, and save the measurements as JSON.
+
+    This runs in the separate process. The configuration file for the run is in the current folder,
+    which is put first on the path so it is used instead of the one in the repo.
+    """
+    sys.path[:0] = [os.getcwd(), REPO]
+    import runpy
+    import web_functions as fun
+
+    fun.API_REST = 0
+    meter = StageMeter()
+    for function_name, stage in STAGES.items():
+        setattr(fun, function_name, meter.wrap(getattr(fun, function_name), stage, fun.RETRY_STATS))
+    sys.argv = ["ait_download.py", DATE_START, DATE_END]
+    try:
+        runpy.run_path(os.path.join(REPO, "ait_download.py"), run_name="__main__")
+    except SystemExit:
+        pass
+    with open(results_path, "w") as results_file:
+        json.dump(meter.results, results_file)
+
+
+def warc_sizes(rng, count, mean_bytes, distribution):
+    """Return a list of random WARC sizes in bytes with the average and distribution."""
+    if distribution == "fixed":
+        return [mean_bytes] * count
+    if distribution == "uniform":
+        return [int(rng.uniform(0.5, 1.5) * mean_bytes) for _ in range(count)]
+    # For a lognormal distribution with sigma of 1, mu is set so the average is mean_bytes.
+    return [max(int(rng.lognormvariate(math.log(mean_bytes) - 0.5, 1)), 2000) for _ in range(count)]
+
+
+def make_server(args):
+    """Make the mock Archive-It with a synthetic quarter of seeds, collections, crawl jobs, and WARCs.
+
+    Every collection has two crawl jobs, and each seed's WARCs are from one or both jobs,
+    so collections and crawl jobs are shared by seeds like in a real quarter.
+    """
+    from mock_archive_it import MockArchiveIt
+    rng = random.Random(args.random_seed)
+    server = MockArchiveIt()
+    collections = [10001 + number for number in range(args.collections)]
+    for collection in collections:
+        server.add_collection(collection)
+    quarter_seconds = (datetime.date.fromisoformat(DATE_END) - datetime.date.fromisoformat(DATE_START)).days * 86400
+    for number in range(args.seeds):
+        seed_id = 2000001 + number
+        collection = collections[number % len(collections)]
+        server.add_seed(seed_id, collection, scope_rule=rng.random() < 0.3, login=rng.random() < 0.2)
+        count = rng.randint(*args.warcs)
+        for size in warc_sizes(rng, count, int(args.warc_mb * 1000000), args.distribution):
+            job_id = collection * 10 + rng.randint(0, 1)
+            stored = datetime.datetime.fromisoformat(DATE_START) + datetime.timedelta(
+                seconds=rng.randrange(quarter_seconds))
+            server.add_warc(seed_id, job_id, stored.strftime("%Y-%m-%dT%H:%M:%SZ"), size)
+    return server
+
+
+def git_commit():
+    """Return the current git commit, and whether there are changes that are not committed."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True, text=True).stdout.strip()
+        changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO,
+                                 capture_output=True, text=True).stdout.strip()
+        return commit or None, bool(changes)
+    except OSError:
+        return None, None
+
+
+if __name__ == "__main__":
+
+    # The separate process that runs ait_download.py, started below with --run-script.
+    if len(sys.argv) == 3 and sys.argv[1] == "--run-script":
+        run_script(sys.argv[2])
+        sys.exit()
+
+    # Configuration is made by the user and could be forgotten.
+    sys.path.insert(0, REPO)
+    try:
+        import configuration
+    except ModuleNotFoundError:
+        print("\nScript cannot run without a configuration file in the local copy of the GitHub repo.")
+        print("Make a file named configuration.py using configuration_template.py and run the script again.")
+        sys.exit()
+    from mock_archive_it import FAULT_PROFILES
+
+    parser = argparse.ArgumentParser(description="Measure a complete run of ait_download.py with the mock Archive-It.")
+    parser.add_argument("--seeds", type=int, default=20, help="number of seeds")
+    parser.add_argument("--collections", type=int, default=4, help="number of collections")
+    parser.add_argument("--warcs", type=int, nargs=2, default=[1, 4], metavar=("MIN", "MAX"),
+                        help="fewest and most WARCs for a seed")
+    parser.add_argument("--warc-mb", type=float, default=2, help="average size of a WARC in MB")
+    parser.add_argument("--distribution", choices=("fixed", "uniform", "lognormal"), default="lognormal",
+                        help="how WARC sizes vary")
+    parser.add_argument("--workers", type=int, default=1, help="number of WARCs to download at the same time")
+    parser.add_argument("--profile", default="clean", choices=FAULT_PROFILES, help="bad conditions to use")
+    parser.add_argument("--random-seed", type=int, default=0, help="seed for the synthetic data and faults")
+    parser.add_argument("--results", default=os.path.join(configuration.script_output, "end_to_end_results.jsonl"),
+                        help="JSON Lines file to add the results to")
+    args = parser.parse_args()
+
+    server = make_server(args)
+    warc_bytes = sum(len(warc["content"]) for warc in server.warcs.values())
+    print(f"\nSynthetic quarter: {args.seeds} seeds in {args.collections} collections, {len(server.warcs)} WARCs, "
+          f"{warc_bytes / 1000000:.1f} MB.")
+
+    # Runs the script in a temporary folder with a configuration file for the mock Archive-It.
+    # Waits and retries are shortened, so the time is the script's work and not waiting.
+    with tempfile.TemporaryDirectory() as temp_dir, server:
+        server.set_faults(args.profile, seed=args.random_seed)
+        script_output = os.path.join(temp_dir, "output")
+        os.mkdir(script_output)
+        variables = dict(server.config_values(), script_output=script_output, script_path=REPO,
+                         workers=args.workers, disk_free_threshold_gb=0,
+                         retry_policies={endpoint: {"base_seconds": 0.05, "max_seconds": 0.5}
+                                         for endpoint in ("check_seeds", "get_report", "get_warc", "get_warc_info",
+                                                          "get_warc_sizes", "metadata_csv", "seed_data")},
+                         circuit_breaker={"failures": 10, "probe_seconds": 1})
+        with open(os.path.join(temp_dir, "configuration.py"), "w") as config_file:
+            for variable, value in variables.items():
+                config_file.write(f"{variable} = {value!r}\n")
+
+        stages_path = os.path.join(temp_dir, "stages.json")
+        start = time.monotonic()
+        with open(os.path.join(temp_dir, "script.log"), "w") as script_log:
+            process = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-script", stages_path],
+                                     cwd=temp_dir, stdout=script_log, stderr=subprocess.STDOUT)
+        seconds = time.monotonic() - start
+        if process.returncode != 0 or not os.path.exists(stages_path):
+            with open(os.path.join(temp_dir, "script.log")) as script_log:
+                print(script_log.read()[-3000:])
+            print("\nExiting benchmark: ait_download.py did not finish.")
+            sys.exit(1)
+        with open(stages_path) as stages_file:
+            stages = json.load(stages_file)
+        with open(os.path.join(script_output, "seeds_log.csv"), newline="") as seeds_log:
+            complete = [row["Complete"] for row in csv.DictReader(seeds_log)].count("Successfully completed")
+
+    commit, changes = git_commit()
+    download_seconds = stages.get("download", {}).get("seconds", 0)
+    results = {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"), "commit": commit,
+               "uncommitted_changes": changes, "python": platform.python_version(), "platform": platform.platform(),
+               "parameters": vars(args), "warcs": len(server.warcs), "warc_bytes": warc_bytes,
+               "seeds_complete": complete,
+               "seconds": round(seconds, 3), "warc_bytes_per_second": warc_bytes / max(download_seconds, 0.001),
+               "server": server.stats, "stages": stages}
+    with open(args.results, "a") as results_file:
+        results_file.write(json.dumps(results) + "\n")
+
+    # Prints the results for each stage.
+    print(f"{'Stage':<14}{'Seconds':>9}{'API calls':>11}{'Peak RSS MB':>13}{'Written MB':>12}{'MB/s':>8}")
+    for stage in dict.fromkeys(STAGES.values()):
+        if stage not in stages:
+            continue
+        result = stages[stage]
+        rss = f"{result['peak_rss_bytes'] / 1000000:.1f}" if result["peak_rss_bytes"] is not None else "n/a"
+        written = result["disk_write_bytes"]
+        written_text = f"{written / 1000000:.1f}" if written is not None else "n/a"
+        rate = f"{result['write_bytes_per_second'] / 1000000:.1f}" if written is not None else "n/a"
+        print(f"{stage:<14}{result['seconds']:>9.2f}{result['api_calls']:>11}{rss:>13}{written_text:>12}{rate:>8}")
+    print(f"Total: {seconds:.2f} seconds, WARCs downloaded at {results['warc_bytes_per_second'] / 1000000:.1f} MB/s, "
+          f"{complete} of {args.seeds} seeds successfully completed.")
+    print(f"Results added to {args.results}")
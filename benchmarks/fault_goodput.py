@@ -0,0 +1,111 @@
+"""Measure how much of the WARC data transferred is kept when Archive-It has problems, using the mock Archive-It.
+
+For each fault profile in mock_archive_it.FAULT_PROFILES, a new mock server is started with synthetic seeds,
+and download_warcs() downloads, verifies, and unzips every WARC, the same as ait_download.py does.
+The metadata reports are not downloaded, since they are small and are not affected by the WARC faults.
+
+    * Goodput is the bytes of the WARCs that were completed, divided by the time to download all the WARCs.
+    * Wasted bytes are the bytes the server sent that are not part of a completed WARC, for example a WARC that
+      failed the fixity check or part of a transfer that was started over.
+
+The retry waits and the circuit breaker are shortened, so the time is mostly transfers and not waiting to retry.
+The downloads are saved in a temporary folder, and the configuration file only needs to exist.
+
+Parameters:
+    --seeds : optional. Number of seeds. Default is 4.
+    --warcs : optional. Number of WARCs per seed. Default is 3.
+    --warc-bytes : optional. Approximate size of each WARC in bytes. Default is 2000000.
+    --profiles : optional. Names of the fault profiles to measure. Default is every profile.
+    --random-seed : optional. Seed for choosing which requests get a fault. Default is 0.
+
+Returns:
+    The WARCs completed, goodput, bytes transferred, wasted bytes, faults, and retries for each profile,
+    printed to the terminal.
+"""
+
+# Usage: python benchmarks/fault_goodput.py [--seeds N] [--warcs N] [--warc-bytes N] [--profiles NAME ...]
+#        [--random-seed N]
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Configuration is made by the user and could be forgotten.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import configuration
+except ModuleNotFoundError:
+    print("\nScript cannot run without a configuration file in the local copy of the GitHub repo.")
+    print("Make a file named configuration.py using configuration_template.py and run the script again.")
+    sys.exit()
+import web_functions as fun
+from mock_archive_it import FAULT_PROFILES, MockArchiveIt
+
+
+def run(profile, args):
+    """Download every WARC from a new mock server with the fault profile and return the measurements."""
+    with tempfile.TemporaryDirectory() as temp_dir, MockArchiveIt.synthetic(args.seeds, args.warcs,
+                                                                            args.warc_bytes) as server:
+        configuration.script_output = temp_dir
+        for variable, value in server.config_values().items():
+            setattr(configuration, variable, value)
+        fun.RETRY_STATS.clear()
+
+        # Makes the seed log and seed folders before adding the faults, since that is not what is measured.
+        seed_df = fun.seed_data("2023-04-25", "2023-04-26").astype(str)
+        seed_df.insert(0, "AIP_ID", "aip-" + seed_df["Seed_ID"])
+        seed_log = fun.SeedLog(seed_df)
+        seed_log.start_warc_log()
+        for seed in seed_log:
+            os.makedirs(os.path.join(temp_dir, "preservation_download", seed.Seed_ID))
+        server.set_faults(profile, seed=args.random_seed)
+
+        # The messages printed for each WARC are hidden, so the results are easy to read.
+        start = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for seed in seed_log:
+                fun.download_warcs(seed, seed.Index, seed_log)
+        elapsed = time.monotonic() - start
+
+        with open(seed_log.warc_path, newline="") as warcs_log:
+            completed = [int(row["Bytes"]) for row in csv.DictReader(warcs_log)
+                         if row["Status"] == "Successfully completed"]
+        stats = server.stats.get("webdatafile", {})
+        faults = sum(sum(endpoint[fault] for fault in ("errors", "drops", "truncated", "corrupted"))
+                     for endpoint in server.stats.values())
+        retries = sum(endpoint["retries"] for endpoint in fun.RETRY_STATS.values())
+        return {"completed": len(completed), "seconds": elapsed, "goodput": sum(completed) / elapsed,
+                "sent": stats.get("bytes", 0), "wasted": stats.get("bytes", 0) - sum(completed),
+                "faults": faults, "retries": retries}
+
+
+parser = argparse.ArgumentParser(description="Measure goodput and wasted bytes with Archive-It problems.")
+parser.add_argument("--seeds", type=int, default=4, help="number of seeds")
+parser.add_argument("--warcs", type=int, default=3, help="number of WARCs per seed")
+parser.add_argument("--warc-bytes", type=int, default=2000000, help="approximate size of each WARC in bytes")
+parser.add_argument("--profiles", nargs="+", default=list(FAULT_PROFILES), choices=FAULT_PROFILES,
+                    help="fault profiles to measure")
+parser.add_argument("--random-seed", type=int, default=0, help="seed for choosing which requests get a fault")
+args = parser.parse_args()
+
+# Shortens the waits, so a profile with many errors does not take minutes. No WARCs are skipped for this.
+fun.API_REST = 0
+configuration.retry_policies = {endpoint: {"base_seconds": 0.05, "max_seconds": 0.5}
+                                for endpoint in ("get_warc", "get_warc_info", "seed_data")}
+configuration.circuit_breaker = {"failures": 10, "probe_seconds": 1}
+
+total = args.seeds * args.warcs
+print(f"\nDownloading {total} WARCs of about {args.warc_bytes / 1000000:.1f} MB for {args.seeds} seeds:")
+print(f"{'Profile':<15}{'Completed':>11}{'Seconds':>9}{'Goodput MB/s':>14}{'Sent MB':>9}{'Wasted MB':>11}"
+      f"{'Wasted %':>10}{'Faults':>8}{'Retries':>9}")
+for profile_name in args.profiles:
+    result = run(profile_name, args)
+    wasted_percent = result["wasted"] / max(result["sent"], 1) * 100
+    print(f"{profile_name:<15}{result['completed']:>6} of {total:<2}{result['seconds']:>9.2f}"
+          f"{result['goodput'] / 1000000:>14.2f}{result['sent'] / 1000000:>9.1f}{result['wasted'] / 1000000:>11.1f}"
+          f"{wasted_percent:>9.1f}%{result['faults']:>8}{result['retries']:>9}")
@@ -0,0 +1,95 @@
+"""Measure the time spent logging each WARC, with the pandas log used before SeedLog and with SeedLog.
+
+Each WARC adds three messages to the log (download, fixity, and unzip), and the log is saved after each message,
+which is what log() does during a download. The log is also updated without saving it, to show how much of the
+time is updating the log in memory and how much is writing seeds_log.csv.
+
+Nothing is downloaded and the Archive-It APIs are not used. The logs are saved in a temporary folder.
+
+Parameters:
+    --seeds : optional. Number of seeds in the log. Default is 200.
+    --warcs : optional. Number of WARCs to log for each seed. Default is 5.
+
+Returns:
+    The milliseconds per WARC for each version of the log, printed to the terminal.
+"""
+
+# Usage: python benchmarks/log_overhead.py [--seeds N] [--warcs N]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+# Configuration is made by the user and could be forgotten.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import configuration
+except ModuleNotFoundError:
+    print("\nScript cannot run without a configuration file in the local copy of the GitHub repo.")
+    print("Make a file named configuration.py using configuration_template.py and run the script again.")
+    sys.exit()
+import web_functions as fun
+
+
+def make_df(seeds, warcs):
+    """Return a seed dataframe like the one from seed_data(), with the AIP_ID and every log column TBD."""
+    rows = []
+    for number in range(seeds):
+        warc_names = "|".join(f"ARCHIVEIT-{number}-{warc}.warc.gz" for warc in range(warcs))
+        rows.append([f"aip-{number}", str(2000000 + number), "12345", "1000000", 0.01 * warcs, warcs, warc_names]
+                    + ["TBD"] * len(fun.LOG_COLUMNS))
+    return pd.DataFrame(rows, columns=fun.SEED_COLUMNS + fun.LOG_COLUMNS)
+
+
+def pandas_log(message, seed_df, row_index, column, log_path):
+    """Add a message the way log() did before SeedLog: a pandas cell update and saving with to_csv()."""
+    if seed_df.loc[row_index, column] == "TBD":
+        seed_df.loc[row_index, column] = message
+    else:
+        seed_df.loc[row_index, column] += "; " + message
+    if log_path:
+        seed_df.to_csv(f"{log_path}.tmp", index=False)
+        os.replace(f"{log_path}.tmp", log_path)
+
+
+def record_log(message, seed_log, row_index, column, log_path):
+    """Add a message the way log() does now: adding it to the seed's record and saving with SeedLog.save()."""
+    seed_log.add(row_index, column, message)
+    if log_path:
+        seed_log.save()
+
+
+def run(log_function, seed_log, seeds, warcs, log_path):
+    """Log three messages for every WARC and return the milliseconds per WARC."""
+    start = time.perf_counter()
+    for row_index in range(seeds):
+        for warc in range(warcs):
+            warc_name = f"ARCHIVEIT-{row_index}-{warc}.warc.gz"
+            log_function(f"Successfully downloaded {warc_name}", seed_log, row_index, "WARC_Download_Errors", log_path)
+            log_function(f"Successfully verified {warc_name} fixity on 2024-01-01 00:00:00.000000", seed_log,
+                         row_index, "WARC_Fixity_Errors", log_path)
+            log_function(f"Successfully unzipped {warc_name}", seed_log, row_index, "WARC_Unzip_Errors", log_path)
+    return (time.perf_counter() - start) * 1000 / (seeds * warcs)
+
+
+parser = argparse.ArgumentParser(description="Measure the time spent logging each WARC.")
+parser.add_argument("--seeds", type=int, default=200, help="number of seeds in the log")
+parser.add_argument("--warcs", type=int, default=5, help="number of WARCs to log for each seed")
+args = parser.parse_args()
+
+print(f"\nLogging {args.seeds * args.warcs} WARCs for {args.seeds} seeds (milliseconds per WARC):")
+with tempfile.TemporaryDirectory() as temp_dir:
+    log_path = os.path.join(temp_dir, "seeds_log.csv")
+    results = {}
+    for save in (False, True):
+        path = log_path if save else None
+        results[("pandas", save)] = run(pandas_log, make_df(args.seeds, args.warcs), args.seeds, args.warcs, path)
+        seed_log = fun.SeedLog(make_df(args.seeds, args.warcs), log_path)
+        results[("SeedLog", save)] = run(record_log, seed_log, args.seeds, args.warcs, path)
+
+for name in ("pandas", "SeedLog"):
+    print(f"    * {name}: {results[(name, False)]:.3f} in memory, {results[(name, True)]:.3f} with saving the log")
+print(f"SeedLog is {results[('pandas', True)] / results[('SeedLog', True)]:.1f} times faster with saving the log.")
@@ -15,3 +15,80 @@ wasapi = 'https://warcs.archive-it.org/wasapi/v1/webdata'
 inst_page = 'https://partner.archive-it.org/INSERT-NUMBER'
 username = 'INSERT-USERNAME'
 password = 'INSERT-PASSWORD'
+
+# Optional: number of WARCs to download at the same time. Default is 1.
+# WARCs are scheduled largest seed first so the workers finish at about the same time.
+workers = 1
+
+# Optional: estimated download rate for one worker, in MB per second, used to predict how long the download will take.
+# The actual rate for each download is displayed when the script finishes.
+# transfer_mb_per_second = 5
+
+# Optional: free space in GB to always leave where the script output is saved. Default is 10.
+# WARC downloads wait when starting one would leave less than this, and start again once space is freed.
+disk_free_threshold_gb = 10
+
+# Optional: how many times larger a WARC is once unzipped, used to estimate disk space. Default is 3.
+unzip_expansion = 3
+
+# Optional: maximum download rate in MB per second for all workers together. Default is no limit.
+# bandwidth_mb_per_second = 10
+
+# Optional: download rate limits by time of day, as (start hour, end hour, MB per second), using a 24-hour clock.
+# The end hour is not included. A limit of None means no limit. Other times use bandwidth_mb_per_second.
+# This example limits the download to 2 MB per second during business hours on any day.
+# bandwidth_schedule = [(8, 18, 2)]
+
+# Optional: how API calls are retried after temporary errors (status 429, 500, 502, 503, 504, timeouts, and
+# dropped connections), by endpoint. Endpoints are check_seeds, get_report, get_warc, get_warc_info, get_warc_sizes,
+# metadata_csv, and seed_data. The default for every endpoint is 5 attempts, with random waits that double
+# from up to 2 seconds to at most 120 seconds. Other errors, like 404, are not retried.
+# retry_policies = {"get_warc": {"attempts": 8, "max_seconds": 600}}
+
+# Optional: seconds to wait for a connection to the API and for the next data from the API before it is an error
+# (which is retried). The default is 30 seconds to connect and 300 seconds for data.
+# request_timeout = (30, 300)
+
+# Optional: a WARC transfer that is slower than stall_bytes_per_second for stall_seconds is stopped and resumed
+# from the last byte received, up to transfer_restarts times. The defaults are 10000 bytes per second,
+# 300 seconds, and 5 restarts. Use stall_bytes_per_second = 0 to never stop a slow transfer.
+# stall_bytes_per_second = 10000
+# stall_seconds = 300
+# transfer_restarts = 5
+
+# Optional: if an Archive-It API has this many failures in a row (server errors, timeouts, or dropped connections),
+# it is treated as down. API calls then wait, and the API is checked every probe_seconds until it is up again.
+# The defaults are 10 failures and 60 seconds.
+# circuit_breaker = {"failures": 10, "probe_seconds": 60}
+
+# Optional: how many seeds the metadata reports are downloaded ahead of the WARCs, so the WARC workers
+# do not wait for the metadata. The default is the number of workers plus one.
+# prefetch_seeds = 2
+
+# Optional: record how long each step takes (for each stage, seed, and WARC) in download_trace.json
+# in the script_output folder, which can be opened in a trace viewer like https://ui.perfetto.dev. Default is False.
+# trace = True
+
+# Optional: how often, in seconds, to print the download progress (GB, WARCs, and seeds done, rate, and time left)
+# and save it to download_status.json in the script_output folder. Default is 60.
+# progress_seconds = 60
+
+# Optional: metrics for monitoring the download with Prometheus (API requests by endpoint and status, bytes
+# downloaded, hashed, and unzipped, retries, WARCs waiting, and how long each step takes). They are on a web page
+# at http://localhost:metrics_port/metrics for Prometheus to scrape, and/or in metrics_textfile for the
+# node_exporter textfile collector, which is updated every metrics_seconds (default 15). Default is no metrics.
+# metrics_port = 9300
+# metrics_textfile = '/var/lib/node_exporter/textfile_collector/ait_download.prom'
+# metrics_seconds = 15
+
+# Optional: the SQLite database where a summary of every run is saved, to compare runs across quarters with
+# run_history.py and to predict how long the next download will take. Default is run_history.sqlite in the
+# folder with the script. Keep it somewhere that is not replaced each quarter.
+# run_history = 'INSERT-PATH/run_history.sqlite'
+
+# Optional: a command to run after each batch is downloaded and checked, when the script is run with --batch-gb or
+# --batch-disk-gb, for example to move the finished seed folders to storage. {batch} is replaced with the batch
+# number, {seeds} with the Seed IDs (the seed folder names) separated by spaces, and {seeds_directory} with the
+# preservation_download folder. Other braces are left as they are, so the command can use, for example, ${VAR}.
+# If the command has an error, the script stops before the next batch.
+# batch_handoff = 'cd {seeds_directory} && mv {seeds} /mnt/storage/preservation_download/'
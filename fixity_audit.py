@@ -0,0 +1,157 @@
+"""Audit the fixity of a preservation download before it is ingested into ARCHive.
+
+The download saves manifests in each seed folder with the checksums calculated while the WARCs were unzipped
+and after the metadata reports were saved. This script calculates the checksums of every file again
+and compares them to the manifests, to confirm nothing changed while the download was stored on the network.
+
+Files are verified concurrently, since a quarter can be hundreds of GB. Use more workers for storage that
+handles many parallel reads well (network storage) and fewer for a single local disk.
+
+Parameters:
+    --workers : optional. Number of files to verify at the same time. Default is 4.
+    --processes : optional. Use processes instead of threads, for fast local storage where hashing is CPU bound.
+    --all-algorithms : optional. Verify every algorithm in the manifests instead of only the strongest.
+    --new : optional. Start a new audit instead of continuing a partial audit.
+
+Returns:
+    A fixity_audit.csv file in the script output folder with the result for every file.
+    A summary of the throughput, mismatches, and other errors, printed to the terminal.
+"""
+
+# Usage: python fixity_audit.py [--workers N] [--processes] [--all-algorithms] [--new]
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import os
+import sys
+import time
+
+# Configuration is made by the user and could be forgotten.
+try:
+    import configuration as c
+except ModuleNotFoundError:
+    print("\nScript cannot run without a configuration file in the local copy of the GitHub repo.")
+    print("Make a file named configuration.py using configuration_template.py and run the script again.")
+    sys.exit()
+import web_functions as fun
+
+
+def main():
+    """Verify every file in the preservation download against the manifests and save the results."""
+    parser = argparse.ArgumentParser(description="Audit the fixity of a preservation download.")
+    parser.add_argument("--workers", type=int, default=4, help="number of files to verify at the same time")
+    parser.add_argument("--processes", action="store_true", help="use processes instead of threads")
+    parser.add_argument("--all-algorithms", action="store_true", help="verify every algorithm in the manifests")
+    parser.add_argument("--new", action="store_true", help="start a new audit instead of continuing one")
+    args = parser.parse_args()
+
+    seeds_directory = os.path.join(c.script_output, "preservation_download")
+    if not os.path.exists(seeds_directory):
+        print(f"\nExiting script: there is no preservation download to audit in {c.script_output}.")
+        sys.exit()
+
+    # The audit results are saved as each file is verified, so an interrupted audit can continue where it stopped.
+    # If there is a log from a previous audit, the files already in it are skipped, unless a new audit was requested.
+    audit_csv_path = os.path.join(c.script_output, "fixity_audit.csv")
+    header = ["Seed", "File", "Size_Bytes", "Algorithm", "Manifest_Checksum", "Audit_Checksum", "Result"]
+    done = set()
+    if os.path.exists(audit_csv_path) and not args.new:
+        with open(audit_csv_path, newline="") as audit_csv:
+            for row in csv.DictReader(audit_csv):
+                done.add((row["Seed"], row["File"]))
+        print(f"\nContinuing the audit in fixity_audit.csv: {len(done)} files were already verified.")
+    else:
+        with open(audit_csv_path, "w", newline="") as audit_csv:
+            csv.writer(audit_csv).writerow(header)
+
+    # Makes a list of the files to verify, and the results for files that can be evaluated without hashing:
+    # files in a manifest that are not in the seed folder and files in the seed folder that are not in a manifest.
+    to_verify = []
+    results = []
+    for seed_id in sorted(os.listdir(seeds_directory)):
+        seed_dir = os.path.join(seeds_directory, seed_id)
+        if not os.path.isdir(seed_dir):
+            continue
+        manifests = fun.read_manifests(seed_dir)
+        for filename, checksums in sorted(manifests.items()):
+            if (seed_id, filename) in done:
+                continue
+            if not os.path.exists(os.path.join(seed_dir, filename)):
+                results.append([seed_id, filename, 0, "", "", "", "Missing"])
+                continue
+
+            # A manifest can have any algorithm in its name, so a file may not have a checksum this script can verify.
+            # Those files are in the results with the algorithms from the manifests instead of stopping the audit.
+            if args.all_algorithms:
+                supported = {algorithm: checksum for algorithm, checksum in checksums.items()
+                             if algorithm in hashlib.algorithms_available}
+            else:
+                strongest = next((algorithm for algorithm in ("sha256", "sha1", "md5") if algorithm in checksums), None)
+                supported = {strongest: checksums[strongest]} if strongest else {}
+            if not supported:
+                results.append([seed_id, filename, os.path.getsize(os.path.join(seed_dir, filename)),
+                                "|".join(sorted(checksums)), "", "", "No supported checksum"])
+                continue
+            to_verify.append((seed_id, filename, supported))
+        for filename in sorted(os.listdir(seed_dir)):
+            if filename not in manifests and "_manifest-" not in filename and (seed_id, filename) not in done:
+                results.append([seed_id, filename, os.path.getsize(os.path.join(seed_dir, filename)),
+                                "", "", "", "Not in manifest"])
+
+    # Verifies the files, largest first so one large WARC does not start last and keep the audit running alone,
+    # and saves each result as soon as it is available.
+    to_verify.sort(key=lambda item: os.path.getsize(os.path.join(seeds_directory, item[0], item[1])), reverse=True)
+    print(f"\nVerifying {len(to_verify)} files with {args.workers} {'processes' if args.processes else 'threads'}.")
+    if args.processes:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.workers)
+
+    start_time = time.monotonic()
+    last_report = start_time
+    files_verified = 0
+    bytes_verified = 0
+    with executor, open(audit_csv_path, "a", newline="") as audit_csv:
+        audit_write = csv.writer(audit_csv)
+        for result in results:
+            audit_write.writerow(result)
+
+        futures = {executor.submit(fun.verify_file, os.path.join(seeds_directory, seed_id, filename), checksums):
+                   (seed_id, filename) for seed_id, filename, checksums in to_verify}
+        for future in concurrent.futures.as_completed(futures):
+            seed_id, filename = futures[future]
+            row = [seed_id, filename] + future.result()
+            audit_write.writerow(row)
+            audit_csv.flush()
+            results.append(row)
+            files_verified += 1
+            bytes_verified += row[2]
+
+            if row[-1] != "Match":
+                print(f"    * {row[-1]}: {seed_id}/{filename}")
+
+            # Displays the progress every minute, since a large audit can take hours.
+            if time.monotonic() - last_report >= 60:
+                last_report = time.monotonic()
+                rate = bytes_verified / (last_report - start_time) / 1000000
+                print(f"Verified {files_verified} of {len(to_verify)} files, {rate:.1f} MB/s.")
+
+    # Prints a summary of the audit.
+    elapsed = time.monotonic() - start_time
+    problems = [row for row in results if row[-1] != "Match"]
+    print(f"\nVerified {bytes_verified / 1000000000:.3f} GB in {elapsed:.1f} seconds "
+          f"({bytes_verified / max(elapsed, 0.001) / 1000000:.1f} MB/s).")
+    if problems:
+        print(f"Found {len(problems)} problems in this audit, which are in fixity_audit.csv:")
+        for result_type in sorted(set(row[-1] for row in problems)):
+            print(f"    * {result_type}: {len([row for row in problems if row[-1] == result_type])}")
+    else:
+        print("No problems found in this audit.")
+
+
+# The verification processes (with --processes) import this script again, so the audit only runs
+# when the script itself is run, and not when a process imports it.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""A local stand-in for the Archive-It APIs, for testing and benchmarking without the network or UGA credentials.
+
+It implements the parts of WASAPI and the Partner API that the download script uses:
+    * WASAPI webdata, with the filename, collection, crawl, store-time-after, and store-time-before filters
+      and pagination (page_size and page), in JSON.
+    * WASAPI webdatafile, which downloads a WARC and supports Range requests to continue a download.
+    * Partner API collection, crawl_definition, crawl_job, scope_rule, and seed reports, with filters by any column,
+      limit and offset, in CSV (format=csv) or JSON. A CSV with no matching rows is empty, like Archive-It.
+    * An institution page, for check_config().
+
+The WARCs are synthetic gzip WARCs, made when they are added, and WASAPI has their correct size, MD5, and SHA1.
+Every API call except the institution page requires the username and password given to the server.
+
+Bad conditions can be added to each endpoint (webdata, webdatafile, and api) with set_faults(), or by name from
+FAULT_PROFILES: latency, a bandwidth limit, error status codes (like 429 and 503), connections dropped partway
+through a response, responses that end early, and corrupted bytes (a response with the wrong checksum).
+Which requests get a fault is random, from a seed, so the same requests get the same faults every time.
+
+To use in a test, start the server and patch the configuration with config_values():
+    with MockArchiveIt.synthetic(seeds=2) as server, mock.patch.multiple(config, **server.config_values()):
+
+To run the download script against it, run this script and copy the values it prints into configuration.py.
+
+Parameters:
+    --port : optional. Port for the server. Default is 8000.
+    --seeds : optional. Number of seeds. Default is 3.
+    --warcs : optional. Number of WARCs per seed. Default is 2.
+    --warc-bytes : optional. Approximate size of each WARC in bytes. Default is 100000.
+    --date : optional. Store date of the WARCs, formatted YYYY-MM-DD. Default is 2023-04-25.
+    --profile : optional. Name of the bad conditions to use, from FAULT_PROFILES. Default is clean (none).
+
+Returns:
+    The configuration values to use the server, printed to the terminal. The server runs until stopped with Ctrl+C.
+"""
+
+# Usage: python mock_archive_it.py [--port N] [--seeds N] [--warcs N] [--warc-bytes N] [--date YYYY-MM-DD]
+#        [--profile NAME]
+
+import argparse
+import base64
+import csv
+import datetime
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import random
+import socket
+import struct
+import threading
+import time
+import urllib.parse
+
+# Columns in the CSV for each Partner API report.
+REPORT_COLUMNS = {
+    "collection": ["id", "name", "account", "publicly_visible", "created_date"],
+    "crawl_definition": ["id", "collection", "type", "recurrence_type", "time_limit", "document_limit"],
+    "crawl_job": ["id", "collection", "crawl_definition", "type", "status", "original_start_date"],
+    "scope_rule": ["id", "collection", "seed", "type", "value", "enabled"],
+    "seed": ["id", "canonical_url", "collection", "crawl_definition", "active", "login_password",
+             "login_username", "url", "publicly_visible"],
+}
+
+# Metadata for the seed report in JSON, which metadata_csv() uses to make the AIP_ID.
+COLLECTOR = "Map and Government Information Library"
+
+# Bad conditions for each endpoint, for set_faults(). The options for an endpoint are:
+#   latency : seconds to wait before responding
+#   bytes_per_second : bandwidth limit for sending the response
+#   error_rate and error_status : share of requests that get an error status code instead (default 503)
+#   drop_rate : share of responses where the connection is reset after half of the content is sent
+#   truncate_rate : share of responses where the connection is closed after half of the content is sent
+#   corrupt_rate : share of responses with one byte changed, so the checksums are wrong
+#   max_faults : optional. Number of faults after which no more are added to this endpoint
+FAULT_PROFILES = {
+    "clean": {},
+    "slow": {"webdata": {"latency": 0.2}, "webdatafile": {"latency": 0.2, "bytes_per_second": 2000000},
+             "api": {"latency": 0.2}},
+    "throttled": {"webdata": {"error_rate": 0.3, "error_status": 429},
+                  "webdatafile": {"error_rate": 0.3, "error_status": 429}},
+    "server_errors": {"webdata": {"error_rate": 0.2}, "webdatafile": {"error_rate": 0.2}, "api": {"error_rate": 0.2}},
+    "drops": {"webdatafile": {"drop_rate": 0.3}},
+    "truncated": {"webdatafile": {"truncate_rate": 0.3}},
+    "corrupt": {"webdatafile": {"corrupt_rate": 0.2}},
+}
+
+
+class MockArchiveIt:
+    """The data for the mock Archive-It APIs and the web server that provides them.
+
+    Parameters:
+        username : optional. Username the API calls must use. Default is mock.
+        password : optional. Password the API calls must use. Default is mock.
+        port : optional. Port for the server. Default is 0, which uses any free port.
+    """
+
+    def __init__(self, username="mock", password="mock", port=0):
+        self.username = username
+        self.password = password
+        self.port = port
+        self.reports = {report_type: [] for report_type in REPORT_COLUMNS}
+        self.warcs = {}
+        self.seed_metadata = {}
+        self.requests = []
+        self.server = None
+        self.faults = {}
+        self.stats = {}
+        self.random = random.Random(0)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def synthetic(cls, seeds=3, warcs=2, warc_bytes=100000, date="2023-04-25", collection=12345, **kwargs):
+        """Make a server with one collection and seeds that each have WARCs from one crawl job.
+
+        The first seed has a seed scope rule and login columns in its seed report, and the rest do not,
+        so both kinds of empty and redacted reports are in the data.
+        """
+        server = cls(**kwargs)
+        server.add_collection(collection)
+        for number in range(seeds):
+            seed_id = 2000001 + number
+            server.add_seed(seed_id, collection, scope_rule=number == 0, login=number == 0)
+            for warc_number in range(warcs):
+                server.add_warc(seed_id, 1000001 + number, f"{date}T{warc_number:02d}:00:00Z", warc_bytes)
+        return server
+
+    def add_collection(self, collection_id, name=None):
+        """Add a collection, which has a collection report and no collection scope rules."""
+        self.reports["collection"].append({"id": collection_id, "name": name or f"Mock collection {collection_id}",
+                                           "account": 1, "publicly_visible": True, "created_date": "2020-01-01"})
+
+    def add_seed(self, seed_id, collection_id, title=None, scope_rule=False, login=False):
+        """Add a seed, which has a seed report and, optionally, a seed scope rule and login information."""
+        self.reports["seed"].append({"id": seed_id, "canonical_url": f"https://www.example.com/{seed_id}",
+                                     "collection": collection_id, "crawl_definition": "", "active": True,
+                                     "login_password": "password" if login else "",
+                                     "login_username": "username" if login else "",
+                                     "url": f"https://www.example.com/{seed_id}", "publicly_visible": True})
+        self.seed_metadata[str(seed_id)] = {"Collector": [{"value": COLLECTOR}],
+                                            "Title": [{"value": title or f"Mock seed {seed_id}"}]}
+        if scope_rule:
+            self.reports["scope_rule"].append({"id": seed_id + 500000, "collection": "", "seed": seed_id,
+                                               "type": "IGNORE_ROBOTS", "value": "", "enabled": True})
+
+    def add_warc(self, seed_id, job_id, store_time, size=100000):
+        """Add a synthetic WARC for a seed, and the crawl job and crawl definition if they are new.
+
+        Parameters:
+            seed_id : Archive-It identifier for the seed, which must already be added
+            job_id : Archive-It identifier for the crawl job
+            store_time : when the WARC was stored, formatted YYYY-MM-DDTHH:MM:SSZ
+            size : optional. Approximate size of the zipped WARC in bytes. Default is 100000.
+
+        Returns:
+            The WARC filename
+        """
+        seed = [seed for seed in self.reports["seed"] if seed["id"] == seed_id][0]
+        collection_id = seed["collection"]
+        if not any(job["id"] == job_id for job in self.reports["crawl_job"]):
+            crawl_def = job_id + 30000000000
+            self.reports["crawl_job"].append({"id": job_id, "collection": collection_id, "crawl_definition": crawl_def,
+                                              "type": "TEST", "status": "FINISHED", "original_start_date": store_time})
+            self.reports["crawl_definition"].append({"id": crawl_def, "collection": collection_id, "type": "TEST",
+                                                     "recurrence_type": "NONE", "time_limit": 86400,
+                                                     "document_limit": 0})
+
+        timestamp = store_time.replace("-", "").replace("T", "").replace(":", "").rstrip("Z") + "000"
+        number = len([warc for warc in self.warcs.values() if warc["info"]["crawl"] == job_id])
+        filename = f"ARCHIVEIT-{collection_id}-TEST-JOB{job_id}-SEED{seed_id}-{timestamp}-{number:05d}-mock.warc.gz"
+        content = synthetic_warc(filename, size)
+        self.warcs[filename] = {"content": content,
+                                "info": {"filename": filename, "filetype": "warc",
+                                         "checksums": {"md5": hashlib.md5(content).hexdigest(),
+                                                       "sha1": hashlib.sha1(content).hexdigest()},
+                                         "account": 1, "size": len(content), "collection": collection_id,
+                                         "crawl": job_id, "crawl-time": store_time, "crawl-start": store_time,
+                                         "store-time": store_time, "locations": []}}
+        return filename
+
+    def set_faults(self, faults, seed=0):
+        """Add bad conditions to the endpoints, replacing any from before, and start the statistics over.
+
+        Parameters:
+            faults : dictionary with the endpoint (webdata, webdatafile, or api) for keys and a dictionary of
+                     options for values (see FAULT_PROFILES), or the name of a profile in FAULT_PROFILES
+            seed : optional. Seed for choosing which requests get a fault. Default is 0.
+        """
+        self.faults = FAULT_PROFILES[faults] if isinstance(faults, str) else faults
+        self.random = random.Random(seed)
+        self.stats = {}
+
+    def fault(self, endpoint):
+        """Choose the fault for one request to an endpoint, which is None if there is no fault, and count it."""
+        options = self.faults.get(endpoint, {})
+        with self.lock:
+            stats = self.stats.setdefault(endpoint, {"requests": 0, "bytes": 0, "errors": 0, "drops": 0,
+                                                     "truncated": 0, "corrupted": 0})
+            stats["requests"] += 1
+            faults_so_far = stats["errors"] + stats["drops"] + stats["truncated"] + stats["corrupted"]
+            if faults_so_far >= options.get("max_faults", float("inf")):
+                return None
+            for fault, count in (("error", "errors"), ("drop", "drops"), ("truncate", "truncated"),
+                                 ("corrupt", "corrupted")):
+                if self.random.random() < options.get(f"{fault}_rate", 0):
+                    stats[count] += 1
+                    return fault
+        return None
+
+    def sent(self, endpoint, size):
+        """Count the bytes sent for an endpoint."""
+        with self.lock:
+            self.stats[endpoint]["bytes"] += size
+
+    @property
+    def url(self):
+        """The URL of the server, once it is started."""
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def config_values(self):
+        """Return the configuration variables for using this server instead of Archive-It."""
+        return {"partner_api": f"{self.url}/api", "wasapi": f"{self.url}/wasapi/v1/webdata",
+                "inst_page": f"{self.url}/1", "username": self.username, "password": self.password}
+
+    def start(self):
+        """Start the server in a background thread and return it."""
+        handler = type("Handler", (MockHandler,), {"archive_it": self})
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def webdata(self, query):
+        """Return the WASAPI response for the query, as a dictionary."""
+        files = []
+        for warc in self.warcs.values():
+            info = dict(warc["info"], locations=[f"{self.url}/webdatafile/{warc['info']['filename']}"])
+            if "filename" in query and info["filename"] != query["filename"]:
+                continue
+            if any(key in query and str(info[key]) != query[key] for key in ("collection", "crawl")):
+                continue
+            if "store-time-after" in query and info["store-time"] < query["store-time-after"]:
+                continue
+            if "store-time-before" in query and info["store-time"] >= query["store-time-before"]:
+                continue
+            files.append(info)
+
+        # Splits the results into pages, with links to the previous and next pages like WASAPI.
+        page_size = int(query.get("page_size", 100))
+        page = int(query.get("page", 1))
+
+        def page_url(number):
+            return f"{self.url}/wasapi/v1/webdata?{urllib.parse.urlencode(dict(query, page=number))}"
+
+        return {"count": len(files), "includes-extra": False,
+                "next": page_url(page + 1) if page * page_size < len(files) else None,
+                "previous": page_url(page - 1) if page > 1 else None,
+                "files": files[(page - 1) * page_size:page * page_size]}
+
+    def report(self, report_type, query):
+        """Return the Partner API rows for the query, as a list of dictionaries."""
+        rows = [row for row in self.reports[report_type]
+                if all(str(row[key]) == value for key, value in query.items() if key in REPORT_COLUMNS[report_type])]
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 100))
+        rows = rows[offset:] if limit == -1 else rows[offset:offset + limit]
+        if report_type == "seed":
+            rows = [dict(row, metadata=self.seed_metadata[str(row["id"])]) for row in rows]
+        return rows
+
+
+class MockHandler(http.server.BaseHTTPRequestHandler):
+    """Answers requests with the data in archive_it, which is set to a MockArchiveIt by MockArchiveIt.start()."""
+    archive_it = None
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        self.archive_it.requests.append(self.path)
+        parts = url.path.strip("/").split("/")
+
+        # The institution page does not need a login and never has faults.
+        self.endpoint = None
+        self.options = {}
+        self.fault = None
+        if len(parts) == 1 and parts[0].isdigit():
+            self.send_content(200, b"<html><body>Mock Archive-It</body></html>", "text/html")
+            return
+
+        # Chooses the fault for this request, if any, and waits for the latency.
+        self.endpoint = {"wasapi": "webdata", "webdatafile": "webdatafile", "api": "api"}.get(parts[0], parts[0])
+        self.options = self.archive_it.faults.get(self.endpoint, {})
+        self.fault = self.archive_it.fault(self.endpoint)
+        time.sleep(self.options.get("latency", 0))
+
+        expected = base64.b64encode(f"{self.archive_it.username}:{self.archive_it.password}".encode()).decode()
+        if self.headers.get("Authorization") != f"Basic {expected}":
+            self.send_content(401, b'{"detail": "Authentication credentials were not provided."}')
+        elif self.fault == "error":
+            self.send_error_status(self.options.get("error_status", 503))
+        elif parts[:3] == ["wasapi", "v1", "webdata"]:
+            self.send_content(200, json.dumps(self.archive_it.webdata(query)).encode())
+        elif parts[0] == "webdatafile" and len(parts) == 2 and parts[1] in self.archive_it.warcs:
+            self.send_warc(self.archive_it.warcs[parts[1]]["content"])
+        elif parts[0] == "api" and len(parts) == 2 and parts[1] in REPORT_COLUMNS:
+            rows = self.archive_it.report(parts[1], query)
+            if query.get("format") == "csv":
+                self.send_content(200, report_csv(parts[1], rows), "text/csv")
+            else:
+                self.send_content(200, json.dumps(rows).encode())
+        else:
+            self.send_content(404, b'{"detail": "Not found."}')
+
+    def send_content(self, status, content, content_type="application/json"):
+        """Send a response with the content."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.send_body(content)
+
+    def send_error_status(self, status):
+        """Send an error status code, with a Retry-After header for 429 (too many requests) like Archive-It."""
+        content = b'{"detail": "Mock fault."}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.send_body(content)
+
+    def send_warc(self, content):
+        """Send a WARC, or the part of it in the Range header."""
+        start, end = 0, len(content) - 1
+        if "Range" in self.headers:
+            first, last = self.headers["Range"].replace("bytes=", "").split("-")
+            start = int(first)
+            end = int(last) if last else end
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.end_headers()
+                return
+        self.send_response(206 if "Range" in self.headers else 200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        if "Range" in self.headers:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        self.send_body(content[start:end + 1])
+
+    def send_body(self, content):
+        """Send the content of a response, with the fault and bandwidth limit for this request if there are any.
+
+        For a drop or a truncated response, half of the content is sent and then the connection is reset (drop)
+        or closed normally (truncated), so the client gets less than the Content-Length either way.
+        """
+        if self.fault == "corrupt" and content:
+            content = bytearray(content)
+            content[len(content) // 2] ^= 0xFF
+        if self.fault in ("drop", "truncate"):
+            content = content[:len(content) // 2]
+
+        # The bytes are counted as each chunk is sent, so they are counted before the client is done reading them.
+        bytes_per_second = self.options.get("bytes_per_second")
+        start_time = time.monotonic()
+        sent = 0
+        try:
+            for position in range(0, len(content), 64 * 1024):
+                chunk = content[position:position + 64 * 1024]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                if self.endpoint:
+                    self.archive_it.sent(self.endpoint, len(chunk))
+                if bytes_per_second:
+                    time.sleep(max(0.0, start_time + sent / bytes_per_second - time.monotonic()))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+        if self.fault in ("drop", "truncate"):
+            self.close_connection = True
+            if self.fault == "drop":
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.connection.close()
+
+    def log_message(self, *args):
+        pass
+
+
+def report_csv(report_type, rows):
+    """Return the rows as a Partner API CSV, which is empty if there are no rows."""
+    if not rows:
+        return b""
+    report = io.StringIO()
+    writer = csv.DictWriter(report, REPORT_COLUMNS[report_type], extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return report.getvalue().encode()
+
+
+def synthetic_warc(filename, size):
+    """Return a gzip WARC of about size bytes, with a warcinfo record and a resource record.
+
+    Each record is a separate gzip member, like Archive-It WARCs. The content of the resource record is random,
+    so it does not compress, but it is the same every time for the same filename.
+    """
+    date = datetime.datetime(2023, 1, 1).strftime("%Y-%m-%dT%H:%M:%SZ")
+    payload = random.Random(filename).randbytes(max(size - 1000, 0))
+    records = []
+    for record_type, block in (("warcinfo", f"software: mock_archive_it\r\nfilename: {filename}\r\n".encode()),
+                               ("resource", payload)):
+        header = (f"WARC/1.0\r\nWARC-Type: {record_type}\r\nWARC-Date: {date}\r\n"
+                  f"WARC-Record-ID: <urn:uuid:{hashlib.md5((filename + record_type).encode()).hexdigest()}>\r\n"
+                  f"Content-Length: {len(block)}\r\n\r\n").encode()
+        records.append(gzip.compress(header + block + b"\r\n\r\n", mtime=0))
+    return b"".join(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Archive-It APIs.")
+    parser.add_argument("--port", type=int, default=8000, help="port for the server")
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds")
+    parser.add_argument("--warcs", type=int, default=2, help="number of WARCs per seed")
+    parser.add_argument("--warc-bytes", type=int, default=100000, help="approximate size of each WARC in bytes")
+    parser.add_argument("--date", default="2023-04-25", help="store date of the WARCs, formatted YYYY-MM-DD")
+    parser.add_argument("--profile", default="clean", choices=FAULT_PROFILES, help="bad conditions to use")
+    args = parser.parse_args()
+
+    mock_server = MockArchiveIt.synthetic(args.seeds, args.warcs, args.warc_bytes, args.date, port=args.port)
+    mock_server.set_faults(args.profile)
+    mock_server.start()
+    next_day = datetime.date.fromisoformat(args.date) + datetime.timedelta(days=1)
+    print(f"\nMock Archive-It is running at {mock_server.url}. Use these values in configuration.py:")
+    for variable, value in mock_server.config_values().items():
+        print(f"{variable} = '{value}'")
+    print(f"\nDownload the WARCs with: python ait_download.py {args.date} {next_day}")
+    print("Press Ctrl+C to stop the server.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock_server.stop()
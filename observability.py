@@ -0,0 +1,734 @@
+"""Classes for observing a download by ait_download.py: its progress, a trace of each step, metrics for Prometheus,
+profiles of each stage, and the history of every run.
+
+They do not use the configuration file. web_functions.py makes one of each from the configuration file in setup(),
+after config_errors() has checked the values they use.
+"""
+
+import collections
+import contextlib
+import cProfile
+import csv
+import datetime
+import http.server
+import json
+import os
+import pandas as pd
+import pstats
+import sqlite3
+import threading
+import time
+import tracemalloc
+
+# Metrics for monitoring the download with Prometheus, as (type, description), counted by Metrics.
+METRIC_TYPES = {
+    "ait_api_requests_total": ("counter", "Archive-It API requests, by endpoint and status code (or error name)."),
+    "ait_api_request_seconds": ("histogram", "Seconds until the Archive-It API responded, by endpoint."),
+    "ait_api_retries_total": ("counter", "Archive-It API requests that were retried, by endpoint."),
+    "ait_api_retry_wait_seconds_total": ("counter", "Seconds spent waiting to retry Archive-It API requests."),
+    "ait_bytes_downloaded_total": ("counter", "Bytes of WARCs downloaded."),
+    "ait_bytes_hashed_total": ("counter", "Bytes added to checksums, by stage (download, unzip, or file)."),
+    "ait_bytes_decompressed_total": ("counter", "Bytes of unzipped WARCs saved."),
+    "ait_warcs_total": ("counter", "WARCs done, by status (Successfully completed, or the step with an error)."),
+    "ait_warcs_queued": ("gauge", "WARCs in the download that have not started."),
+    "ait_warcs_in_progress": ("gauge", "WARCs being downloaded, verified, or unzipped."),
+    "ait_bytes_remaining": ("gauge", "Bytes of WARCs in the download that are not done."),
+    "ait_step_seconds": ("histogram", "Seconds for each step of the download, by step."),
+}
+
+# Upper limits of the histogram buckets in seconds, from an API call that takes milliseconds to a large WARC.
+METRIC_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600, 14400)
+
+# Default path for the run history, in the folder with the scripts, so it is kept when script_output is replaced.
+RUN_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_history.sqlite")
+
+
+class Tracer:
+    """Record how long each step of the download takes, as spans in a Chrome trace-event file.
+
+    The file can be opened in a trace viewer (https://ui.perfetto.dev or chrome://tracing), which shows each thread
+    as a row with a bar for every step, so the steps where the time is spent are easy to see.
+    Each span is written as soon as it ends, so the file has everything up to when the script stopped.
+    If the script runs again, the new spans are added to the same file, and each run is a separate process.
+    When there is no path, spans are not recorded, so tracing costs nothing unless it is turned on.
+
+    Parameters:
+        path : the trace file, or None to not record spans
+        metrics : optional. The Metrics to add the time for each step to. The default is metrics that are not used.
+    """
+
+    def __init__(self, path, metrics=None):
+        self.path = path
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.file = None
+        self.threads = set()
+        self.lock = threading.Lock()
+
+        # The trace times are microseconds since 1970, so the spans from a later run are after the earlier run,
+        # measured with perf_counter() since it is more precise than time().
+        self.offset = time.time() - time.perf_counter()
+
+    def span(self, name, category, **args):
+        """Return a context manager which records a span for the code it runs.
+
+        Parameters:
+            name : the name of the step, usually the function
+            category : the type of step (stage, seed, warc, api, or log), which a trace viewer can filter by
+            **args : information about the step to include in the trace, for example the seed or WARC
+
+        The span's time is also added to the step metric (ait_step_seconds) if the metrics are used,
+        except for API calls, which have their own metrics from api_get().
+        """
+        if self.path is None and not self.metrics.enabled:
+            return contextlib.nullcontext()
+        return self.record(name, category, args)
+
+    @contextlib.contextmanager
+    def record(self, name, category, args):
+        """Record a span for the code run in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if category != "api":
+                self.metrics.observe("ait_step_seconds", end - start, step=name)
+            if self.path is not None:
+                self.write({"name": name, "cat": category, "ph": "X", "ts": round((self.offset + start) * 1000000),
+                            "dur": round((end - start) * 1000000), "args": args})
+
+    def write(self, event):
+        """Add an event to the trace file, starting the file and naming the thread the first time it is used."""
+        thread = threading.current_thread()
+        event.update(pid=os.getpid(), tid=thread.ident)
+        with self.lock:
+            if self.file is None:
+                new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                self.file = open(self.path, "a")
+                if new:
+                    self.file.write("[\n")
+                self.file.write(json.dumps({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                                            "args": {"name": f"ait_download {datetime.datetime.now():%Y-%m-%d %H:%M}"}})
+                                + ",\n")
+            if thread.ident not in self.threads:
+                self.threads.add(thread.ident)
+                self.file.write(json.dumps({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident,
+                                            "args": {"name": thread.name}}) + ",\n")
+
+            # The file is a JSON array that is never closed with "]", which trace viewers allow,
+            # so it is valid no matter when the script stops.
+            self.file.write(json.dumps(event) + ",\n")
+            self.file.flush()
+
+    def close(self):
+        """Close the trace file, if it was started."""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class Progress:
+    """Report how much of the download is done, the download rate, and when it will finish, while it runs.
+
+    Progress is measured in bytes, using the size of each WARC, since seeds can be a few MB or many GB.
+    Every interval, a line is printed with the bytes, WARCs, and seeds done, the rate, and the estimated time left,
+    and the same information is saved to a status file (JSON) for checking on a download that runs unattended.
+    The rate is the average over the last window_seconds, so it follows changes in the network speed.
+    The time left also includes the rest between WARCs (rest_seconds) for the WARCs not yet started.
+
+    Parameters:
+        status_path : the status file, which is replaced each time with the current progress
+        interval : seconds between reports
+        window_seconds : seconds of recent downloading used for the rate
+        metrics : optional. The Metrics for the WARCs waiting and in progress. The default is metrics that are not used.
+        rest_seconds : seconds of rest after each WARC, from API_REST in web_functions.py
+    """
+
+    def __init__(self, status_path, interval=60, window_seconds=300, metrics=None, rest_seconds=0):
+        self.status_path = status_path
+        self.interval = interval
+        self.window_seconds = window_seconds
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rest_seconds = rest_seconds
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+
+        # Bytes received for the whole run, which is not reset by start(), so it can be used for the run history.
+        self.received_bytes = 0
+        self.start([], 0, 1)
+
+    def start(self, tasks, seeds, workers):
+        """Start measuring a download of these WARCs, as (row_index, WARC filename, size in bytes)."""
+        with self.lock:
+            self.bytes_total = sum(size for row_index, warc, size in tasks)
+            self.warcs_total = len(tasks)
+            self.seeds_total = seeds
+            self.workers = workers
+            self.bytes_done = 0
+            self.warcs_done = 0
+            self.seeds_done = 0
+            self.in_flight = {}
+            self.samples = collections.deque()
+            self.started = time.monotonic()
+            self.started_at = datetime.datetime.now()
+            self.set_metrics()
+
+    def run(self):
+        """Report the progress every interval until stop() is called, in a separate thread."""
+        self.finished.clear()
+        thread = threading.Thread(target=self.report_every_interval, daemon=True)
+        thread.start()
+        return thread
+
+    def report_every_interval(self):
+        """Report the progress each time the interval passes, until the download is done."""
+        while not self.finished.wait(self.interval):
+            self.report()
+
+    def stop(self, state):
+        """Stop the reports and save the status one more time with the final state (finished or stopped)."""
+        self.finished.set()
+        self.save(self.status(state))
+
+    def start_warc(self, warc, seed_id, size):
+        """Add a WARC to the transfers in progress."""
+        with self.lock:
+            self.in_flight[warc] = {"seed": str(seed_id), "bytes": 0, "size": size, "started": time.monotonic()}
+            self.set_metrics()
+
+    def received(self, warc, chunk_bytes, position):
+        """Add a chunk of a WARC that was downloaded, with the WARC bytes saved so far (position)."""
+        with self.lock:
+            self.received_bytes += chunk_bytes
+            if warc in self.in_flight:
+                self.in_flight[warc]["bytes"] = position
+
+    def end_warc(self, warc, size):
+        """Count a WARC as done, whether it was downloaded now, in a previous run, or had an error."""
+        with self.lock:
+            self.in_flight.pop(warc, None)
+            self.bytes_done += size
+            self.warcs_done += 1
+            self.set_metrics()
+
+    def set_metrics(self):
+        """Update the gauges in the metrics for the WARCs waiting, in progress, and the bytes not done.
+        Only called while the lock is held, so the three gauges are from the same moment."""
+        self.metrics.set("ait_warcs_queued", self.warcs_total - self.warcs_done - len(self.in_flight))
+        self.metrics.set("ait_warcs_in_progress", len(self.in_flight))
+        self.metrics.set("ait_bytes_remaining", self.bytes_total - self.bytes_done)
+
+    def end_seed(self):
+        """Count a seed as done."""
+        with self.lock:
+            self.seeds_done += 1
+
+    def rate(self, now=None):
+        """Return the bytes per second downloaded over the last window_seconds, or None if there is no data yet."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.samples.append((now, self.received_bytes))
+            while len(self.samples) > 2 and now - self.samples[1][0] >= self.window_seconds:
+                self.samples.popleft()
+            (first_time, first_bytes), (last_time, last_bytes) = self.samples[0], self.samples[-1]
+        if last_time - first_time <= 0:
+            return None
+        return (last_bytes - first_bytes) / (last_time - first_time)
+
+    def status(self, state="running", now=None):
+        """Return a dictionary with the current progress, which is what is saved in the status file."""
+        now = time.monotonic() if now is None else now
+        rate = self.rate(now)
+        with self.lock:
+            in_flight_bytes = sum(transfer["bytes"] for transfer in self.in_flight.values())
+            done = self.bytes_done + in_flight_bytes
+            remaining = max(self.bytes_total - done, 0)
+            waiting_warcs = self.warcs_total - self.warcs_done - len(self.in_flight)
+            eta_seconds = None
+            if rate:
+                eta_seconds = remaining / rate + waiting_warcs * self.rest_seconds / self.workers
+            return {"state": state, "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "started": self.started_at.isoformat(timespec="seconds"),
+                    "elapsed_seconds": round(now - self.started),
+                    "bytes_total": self.bytes_total, "bytes_done": done, "bytes_remaining": remaining,
+                    "percent": round(done / self.bytes_total * 100, 1) if self.bytes_total else 100.0,
+                    "warcs_total": self.warcs_total, "warcs_done": self.warcs_done,
+                    "seeds_total": self.seeds_total, "seeds_done": self.seeds_done,
+                    "bytes_per_second": round(rate) if rate is not None else None,
+                    "eta_seconds": round(eta_seconds) if eta_seconds is not None else None,
+                    "eta": (datetime.datetime.now() + datetime.timedelta(seconds=eta_seconds)).isoformat(
+                        timespec="minutes") if eta_seconds is not None else None,
+                    "in_flight": [{"warc": warc, "seed": transfer["seed"], "bytes": transfer["bytes"],
+                                   "size": transfer["size"], "seconds": round(now - transfer["started"])}
+                                  for warc, transfer in sorted(self.in_flight.items())]}
+
+    def report(self):
+        """Print the progress and save it to the status file."""
+        status = self.status()
+        rate = f"{status['bytes_per_second'] / 1000000:.1f} MB/s" if status["bytes_per_second"] is not None else "-"
+        eta = self.duration(status["eta_seconds"]) if status["eta_seconds"] is not None else "unknown"
+        print(f"Progress: {status['bytes_done'] / 1000000000:.3f} of {status['bytes_total'] / 1000000000:.3f} GB "
+              f"({status['percent']}%), {status['warcs_done']} of {status['warcs_total']} WARCs, "
+              f"{status['seeds_done']} of {status['seeds_total']} seeds, {rate}, {eta} left.")
+        for transfer in status["in_flight"]:
+            percent = transfer["bytes"] / transfer["size"] * 100 if transfer["size"] else 0
+            print(f"    * {transfer['warc']}: {percent:.0f}% of {transfer['size'] / 1000000:.1f} MB "
+                  f"after {self.duration(transfer['seconds'])}")
+        self.save(status)
+
+    def save(self, status):
+        """Replace the status file with the status, writing a new file first so it is never partly written."""
+        if not self.status_path:
+            return
+        with open(f"{self.status_path}.tmp", "w") as status_file:
+            json.dump(status, status_file, indent=2)
+        os.replace(f"{self.status_path}.tmp", self.status_path)
+
+    @staticmethod
+    def duration(seconds):
+        """Return seconds as days, hours, and minutes, for example 1d 4h 05m."""
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        if days:
+            return f"{days}d {hours}h {minutes:02d}m"
+        if hours:
+            return f"{hours}h {minutes:02d}m"
+        return f"{minutes}m {seconds:02d}s"
+
+
+class Metrics:
+    """Count what the download is doing, for monitoring a download that runs for days with Prometheus.
+
+    The metrics are in METRIC_TYPES. They are available in the Prometheus text format from a web page on this
+    machine (http://localhost:port/metrics), for Prometheus to scrape, and/or in a file which is replaced
+    every interval, for the node_exporter textfile collector. When neither is used, nothing is counted.
+
+    Parameters:
+        port : the port for the metrics web page, or None for no web page
+        textfile : the path for the metrics file, which should end with .prom, or None for no file
+        interval : seconds between updates of the metrics file
+    """
+
+    def __init__(self, port=None, textfile=None, interval=15):
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self.enabled = port is not None or textfile is not None
+        self.values = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.server = None
+
+    def inc(self, name, amount=1, **labels):
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Set a gauge to a value."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        """Add a value (seconds) to a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.setdefault(key, {"buckets": [0] * len(METRIC_BUCKETS), "sum": 0, "count": 0})
+            for index, limit in enumerate(METRIC_BUCKETS):
+                if value <= limit:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def render(self):
+        """Return every metric in the Prometheus text format."""
+
+        def label_text(labels):
+            if not labels:
+                return ""
+            escaped = [(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                       for key, value in labels]
+            return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+        lines = []
+        with self.lock:
+            for name, (metric_type, description) in METRIC_TYPES.items():
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+                for (metric, labels), value in sorted(self.values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{label_text(labels)} {value}")
+                for (metric, labels), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    for limit, count in zip(METRIC_BUCKETS, histogram["buckets"]):
+                        lines.append(f"{name}_bucket{label_text(labels + (('le', limit),))} {count}")
+                    lines.append(f"{name}_bucket{label_text(labels + (('le', '+Inf'),))} {histogram['count']}")
+                    lines.append(f"{name}_sum{label_text(labels)} {histogram['sum']}")
+                    lines.append(f"{name}_count{label_text(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Start the metrics web page and the updates of the metrics file, if they are used."""
+        if self.port is not None:
+            metrics = self
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    content = metrics.render().encode()
+                    self.send_response(200 if self.path.split("?")[0] in ("/", "/metrics") else 404)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+
+                def log_message(self, *args):
+                    pass
+
+            self.server = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), MetricsHandler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        if self.textfile is not None:
+            self.finished.clear()
+            threading.Thread(target=self.write_every_interval, daemon=True).start()
+
+    def write_every_interval(self):
+        """Update the metrics file each time the interval passes, until stop() is called."""
+        while not self.finished.wait(self.interval):
+            self.write()
+
+    def write(self):
+        """Replace the metrics file, writing a new file first so the collector never reads part of one."""
+        with open(f"{self.textfile}.tmp", "w") as metrics_file:
+            metrics_file.write(self.render())
+        os.replace(f"{self.textfile}.tmp", self.textfile)
+
+    def stop(self):
+        """Stop the metrics web page and save the metrics file one last time."""
+        self.finished.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.textfile is not None:
+            self.write()
+
+
+class Profiler:
+    """Profile each stage of the download with cProfile (time in each function) and tracemalloc (memory).
+
+    This is off unless enable() is called, which ait_download.py does with --profile, since both slow the script down.
+    For each stage, it saves profile_STAGE.prof, which can be read with pstats or a viewer like snakeviz,
+    and profile_STAGE.txt with the peak memory, the lines with the largest memory increase, and the functions
+    with the most time. It also adds a row for the stage to profile_summary.csv. The files are in the folder
+    with seeds_log.csv.
+
+    cProfile only measures the thread that starts it, so the metadata and WARC workers in download_seeds() are each
+    profiled with call() and added to the stage's profile. To profile a long download with less slowdown,
+    only the workers for a sample of seeds (the first ones started) are profiled.
+    tracemalloc measures every thread, so the memory is for the whole stage.
+
+    Parameters:
+        directory : the folder for the profile files
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.enabled = False
+        self.sample_seeds = None
+        self.stage_name = None
+        self.thread_profiles = []
+        self.seeds = set()
+        self.lock = threading.Lock()
+
+    def enable(self, sample_seeds=None):
+        """Start profiling every stage, with the workers for only the first sample_seeds seeds, or all if None."""
+        self.enabled = True
+        self.sample_seeds = sample_seeds
+
+    def stage(self, name):
+        """Return a context manager which profiles the code it runs as one stage, or does nothing if not enabled."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self.record(name)
+
+    @contextlib.contextmanager
+    def record(self, name):
+        """Profile the stage run in the with block and save the results."""
+        with self.lock:
+            self.stage_name = name
+            self.thread_profiles = []
+            self.seeds = set()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            growth = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            tracemalloc.stop()
+            with self.lock:
+                self.stage_name = None
+                thread_profiles = self.thread_profiles
+                seeds = len(self.seeds)
+            self.save(name, seconds, peak, growth, profile, thread_profiles, seeds)
+
+    def call(self, seed_id, function, *args):
+        """Run a worker's function for a seed, profiling it if a stage is being profiled and the seed is sampled.
+
+        Returns:
+            What the function returns
+        """
+        with self.lock:
+            sampled = self.stage_name is not None and (self.sample_seeds is None or seed_id in self.seeds
+                                                       or len(self.seeds) < self.sample_seeds)
+            if sampled:
+                self.seeds.add(seed_id)
+        if not sampled:
+            return function(*args)
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return function(*args)
+        finally:
+            profile.disable()
+            with self.lock:
+                self.thread_profiles.append(profile)
+
+    def save(self, name, seconds, peak, growth, profile, thread_profiles, seeds):
+        """Save the profile, the text summary, and the row in profile_summary.csv for a stage."""
+        stats = pstats.Stats(profile)
+        for thread_profile in thread_profiles:
+            stats.add(thread_profile)
+        stats.dump_stats(os.path.join(self.directory, f"profile_{name}.prof"))
+
+        with open(os.path.join(self.directory, f"profile_{name}.txt"), "w") as summary:
+            summary.write(f"Stage: {name}\nSeconds: {seconds:.3f}\nPeak memory: {peak / 1000000:.1f} MB\n")
+            if thread_profiles:
+                summary.write(f"Workers profiled: {len(thread_profiles)} tasks for {seeds} seeds\n")
+            summary.write("\nLargest memory increases by line:\n")
+            for statistic in growth[:10]:
+                summary.write(f"    {statistic}\n")
+            summary.write("\n")
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(30)
+
+        summary_path = os.path.join(self.directory, "profile_summary.csv")
+        new = not os.path.exists(summary_path)
+        with open(summary_path, "a", newline="") as summary_csv:
+            summary_writer = csv.writer(summary_csv)
+            if new:
+                summary_writer.writerow(["Stage", "Started", "Seconds", "Peak_MB", "Seeds_Profiled", "Profile"])
+            started = (datetime.datetime.now() - datetime.timedelta(seconds=seconds)).isoformat(" ", "seconds")
+            summary_writer.writerow([name, started, round(seconds, 3), round(peak / 1000000, 1),
+                                     seeds if thread_profiles else "", f"profile_{name}.prof"])
+
+
+class RunHistory:
+    """Save a summary of every run of ait_download.py in a SQLite database, to compare runs across quarters.
+
+    The logs in script_output are replaced each quarter, so the history is kept in its own file, by default in the
+    folder with the script. Each run has a row in the runs table with the totals for the run
+    (bytes, seeds, WARCs, throughput, API errors, retries, and duration) and a row in the stages table for each stage,
+    with the seconds, bytes downloaded, and API calls, errors, and retries during that stage.
+    A run that was stopped and then run again is saved twice, with the second run marked as resumed.
+
+    Parameters:
+        path : the SQLite database file, which is made the first time it is used
+        counters : optional. A function that returns the totals compared before and after each stage,
+                   as a dictionary with the keys in COUNTERS. The default is zero for every total.
+    """
+
+    # Columns in each table, with the SQLite type.
+    RUN_COLUMNS = {"run_id": "INTEGER PRIMARY KEY AUTOINCREMENT", "started": "TEXT", "state": "TEXT",
+                   "resumed": "INTEGER", "date_start": "TEXT", "date_end": "TEXT", "workers": "INTEGER",
+                   "seeds": "INTEGER", "seeds_complete": "INTEGER", "warcs": "INTEGER", "bytes_scheduled": "INTEGER",
+                   "bytes_downloaded": "INTEGER", "bytes_per_second": "REAL", "api_calls": "INTEGER",
+                   "api_errors": "INTEGER", "retries": "INTEGER", "retry_seconds": "REAL", "seconds": "REAL"}
+    STAGE_COLUMNS = {"run_id": "INTEGER", "stage": "TEXT", "seconds": "REAL", "bytes_downloaded": "INTEGER",
+                     "api_calls": "INTEGER", "api_errors": "INTEGER", "retries": "INTEGER", "retry_seconds": "REAL"}
+
+    # Totals that are compared before and after a stage: bytes and API calls, errors, and retries.
+    COUNTERS = ("bytes_downloaded", "api_calls", "api_errors", "retries", "retry_seconds")
+
+    def __init__(self, path, counters=None):
+        self.path = path
+        self.counters = counters if counters is not None else lambda: dict.fromkeys(self.COUNTERS, 0)
+        self.stages = []
+        self.started = None
+        self.started_at = None
+
+    def connect(self):
+        """Return a connection to the database, making the tables if they do not exist yet."""
+        connection = sqlite3.connect(self.path)
+        for table, columns in (("runs", self.RUN_COLUMNS), ("stages", self.STAGE_COLUMNS)):
+            definition = ", ".join(f"{column} {column_type}" for column, column_type in columns.items())
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition})")
+        return connection
+
+    def start(self):
+        """Start timing a run."""
+        self.stages = []
+        self.started = time.monotonic()
+        self.started_at = datetime.datetime.now()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Measure the stage run in the with block, to save with the run."""
+        before = self.counters()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            after = self.counters()
+            stage = {"stage": name, "seconds": round(time.monotonic() - start, 3)}
+            stage.update({counter: after[counter] - before[counter] for counter in before})
+            self.stages.append(stage)
+
+    def save(self, state, date_start, date_end, workers, resumed, seed_log, tasks):
+        """Save the run and its stages in the database.
+
+        Parameters:
+            state : finished or stopped
+            date_start : first store date included in the download, formatted YYYY-MM-DD
+            date_end : first store date not included in the download, formatted YYYY-MM-DD
+            workers : number of WARCs downloaded at the same time
+            resumed : True if the run continued a download that was stopped
+            seed_log : SeedLog with all seed data in the download, including log information
+            tasks : list of (row_index, WARC filename, size in bytes) that were scheduled
+
+        Returns:
+            The run_id of the saved run
+        """
+        totals = {counter: sum(stage[counter] for stage in self.stages) for counter in self.COUNTERS}
+        download_seconds = sum(stage["seconds"] for stage in self.stages if stage["stage"] == "download_seeds")
+        run = {"started": self.started_at.isoformat(" ", "seconds"), "state": state, "resumed": int(resumed),
+               "date_start": date_start, "date_end": date_end, "workers": workers, "seeds": len(seed_log),
+               "seeds_complete": sum(record.value("Complete") == "Successfully completed" for record in seed_log),
+               "warcs": len(tasks), "bytes_scheduled": sum(size for row_index, warc, size in tasks),
+               "bytes_per_second": totals["bytes_downloaded"] / download_seconds if download_seconds else None,
+               "seconds": round(time.monotonic() - self.started, 3)}
+        run.update(totals)
+        with contextlib.closing(self.connect()) as connection, connection:
+            cursor = connection.execute(f"INSERT INTO runs ({', '.join(run)}) VALUES ({', '.join('?' * len(run))})",
+                                        list(run.values()))
+            run_id = cursor.lastrowid
+            for stage in self.stages:
+                stage = dict(stage, run_id=run_id)
+                connection.execute(f"INSERT INTO stages ({', '.join(stage)}) VALUES ({', '.join('?' * len(stage))})",
+                                   list(stage.values()))
+        return run_id
+
+    def runs(self):
+        """Return a dataframe with every run, oldest first."""
+        with contextlib.closing(self.connect()) as connection:
+            return pd.read_sql("SELECT * FROM runs ORDER BY run_id", connection)
+
+    def stage_seconds(self):
+        """Return a dataframe with the seconds for each stage (columns) of each run (rows, by run_id)."""
+        with contextlib.closing(self.connect()) as connection:
+            stages_df = pd.read_sql("SELECT run_id, stage, seconds FROM stages", connection)
+        return stages_df.pivot_table(index="run_id", columns="stage", values="seconds", aggfunc="sum")
+
+    def estimate_rate(self, runs=4):
+        """Return the median download rate for one worker in bytes per second from the last finished runs,
+        or None if there are none, to predict how long the next download will take."""
+        runs_df = self.runs()
+        runs_df = runs_df[(runs_df["state"] == "finished") & runs_df["bytes_per_second"].notna()
+                          & (runs_df["bytes_downloaded"] > 0)].tail(runs)
+        if runs_df.empty:
+            return None
+        return float((runs_df["bytes_per_second"] / runs_df["workers"]).median())
+
+    def regressions(self, threshold=0.25, baseline=4, min_seconds=10):
+        """Compare the last finished run to the median of the finished runs before it and describe what got worse.
+
+        Throughput is compared directly. The API error and retry rates are compared per API call.
+        Stage times are compared per seed, so a quarter with more seeds is not a regression,
+        except download_seeds, which is compared with the throughput. A stage is only a regression if it took
+        at least min_seconds longer, so stages that take a second or less are not flagged for normal variation.
+
+        Parameters:
+            threshold : how much worse (0.25 is 25%) the last run must be to be a regression
+            baseline : how many runs before the last run are used for the median
+            min_seconds : how many seconds longer a stage must take to be a regression
+
+        Returns:
+            A list of messages, one for each regression, which is empty if there are none or not enough runs
+        """
+        runs_df = self.runs()
+        runs_df = runs_df[runs_df["state"] == "finished"].set_index("run_id")
+        if len(runs_df) < 2:
+            return []
+        latest, previous = runs_df.iloc[-1], runs_df.iloc[-baseline - 1:-1]
+        compared = f"the median of the previous {len(previous)} run(s)"
+        messages = []
+
+        def worse(name, value, median, higher_is_worse, unit):
+            if pd.isna(value) or pd.isna(median):
+                return
+            if (higher_is_worse and value > median * (1 + threshold) and value > 0) \
+                    or (not higher_is_worse and value < median * (1 - threshold)):
+                change = (value - median) / median * 100 if median else float("inf")
+                messages.append(f"{name}: {value:.3g}{unit} is {change:+.0f}% compared to {compared} "
+                                f"({median:.3g}{unit}).")
+
+        worse("Throughput", latest["bytes_per_second"] / 1000000, (previous["bytes_per_second"] / 1000000).median(),
+              False, " MB/s")
+        calls = previous["api_calls"].where(previous["api_calls"] > 0)
+        if latest["api_calls"]:
+            worse("API errors per call", latest["api_errors"] / latest["api_calls"],
+                  (previous["api_errors"] / calls).median(), True, "")
+            worse("API retries per call", latest["retries"] / latest["api_calls"],
+                  (previous["retries"] / calls).median(), True, "")
+
+        stages_df = self.stage_seconds().reindex(runs_df.index)
+        for stage in stages_df.columns.drop("download_seeds", errors="ignore"):
+            per_seed = stages_df[stage].div(runs_df["seeds"].where(runs_df["seeds"] > 0))
+            median = per_seed.iloc[-baseline - 1:-1].median()
+            if stages_df[stage].iloc[-1] - median * latest["seeds"] >= min_seconds:
+                worse(f"{stage} seconds per seed", per_seed.iloc[-1], median, True, "")
+        return messages
+
+
+def config_errors(config):
+    """Check the values in the configuration file for the progress, trace, metrics, and run history.
+
+    This is used by check_config() in web_functions.py, which reports every error together.
+
+    Parameters:
+        config : the configuration module
+
+    Returns:
+        A list with a message for each value that is not correct, which is empty if there are none
+    """
+    errors = []
+    for variable in ("progress_seconds", "metrics_seconds"):
+        if not isinstance(getattr(config, variable, 1), (int, float)) or getattr(config, variable, 1) <= 0:
+            errors.append(f"Variable '{variable}' must be a number greater than 0.")
+    if not isinstance(getattr(config, "trace", False), bool):
+        errors.append("Variable 'trace' must be True or False.")
+    metrics_port = getattr(config, "metrics_port", None)
+    if metrics_port is not None and (not isinstance(metrics_port, int) or not 0 < metrics_port < 65536):
+        errors.append("Variable 'metrics_port' must be a port number from 1 to 65535.")
+    metrics_textfile = getattr(config, "metrics_textfile", None)
+    if metrics_textfile is not None and not os.path.isdir(os.path.dirname(os.path.abspath(metrics_textfile))):
+        errors.append(f"Variable 'metrics_textfile' must be in a folder that exists: '{metrics_textfile}'.")
+    run_history = getattr(config, "run_history", None)
+    if run_history is not None and not os.path.isdir(os.path.dirname(os.path.abspath(run_history))):
+        errors.append(f"Variable 'run_history' must be in a folder that exists: '{run_history}'.")
+    return errors
@@ -0,0 +1,75 @@
+"""Compare the runs of ait_download.py saved in the run history, to see if a quarter was slower than before.
+
+Every run of ait_download.py saves a summary in the run history (run_history.sqlite in the folder with the script,
+or the path for run_history in the configuration file). This script displays the most recent runs with their
+size, throughput, API errors, retries, and duration, and the seconds for each stage of each run.
+It then compares the last finished run to the median of the finished runs before it and lists any regressions:
+lower throughput, more API errors or retries per call, or stages that took longer per seed.
+
+Parameters:
+    --runs : optional. Number of recent runs to display. Default is 8.
+    --threshold : optional. How much worse the last run must be to be a regression, as a percent. Default is 25.
+    --baseline : optional. Number of finished runs before the last run used for the median. Default is 4.
+
+Returns:
+    The runs, the stage times, and the regressions, printed to the terminal.
+"""
+
+# Usage: python run_history.py [--runs N] [--threshold PERCENT] [--baseline N]
+
+import argparse
+import os
+import pandas as pd
+import sys
+
+# Configuration is made by the user and could be forgotten.
+try:
+    import configuration as c
+except ModuleNotFoundError:
+    print("\nScript cannot run without a configuration file in the local copy of the GitHub repo.")
+    print("Make a file named configuration.py using configuration_template.py and run the script again.")
+    sys.exit()
+import observability
+
+parser = argparse.ArgumentParser(description="Compare the runs of ait_download.py in the run history.")
+parser.add_argument("--runs", type=int, default=8, help="number of recent runs to display")
+parser.add_argument("--threshold", type=float, default=25, help="percent worse that is a regression")
+parser.add_argument("--baseline", type=int, default=4, help="number of previous runs for the median")
+args = parser.parse_args()
+
+# The run history is the path in the configuration file, if there is one, or else in the folder with the script.
+history = observability.RunHistory(getattr(c, "run_history", observability.RUN_HISTORY_PATH))
+if not os.path.exists(history.path):
+    print(f"\nExiting script: there is no run history in {history.path}. It is made when ait_download.py runs.")
+    sys.exit()
+
+runs_df = history.runs().tail(args.runs)
+if runs_df.empty:
+    print(f"\nExiting script: there are no runs in {history.path}.")
+    sys.exit()
+
+# Displays the runs with the sizes in GB, the rate in MB/s, and the duration in hours, which are easier to compare.
+display_df = pd.DataFrame({"Run": runs_df["run_id"], "Started": runs_df["started"],
+                           "Dates": runs_df["date_start"] + " to " + runs_df["date_end"],
+                           "State": runs_df["state"] + runs_df["resumed"].map({1: " (resumed)", 0: ""}),
+                           "Workers": runs_df["workers"],
+                           "Seeds": runs_df["seeds_complete"].astype(str) + "/" + runs_df["seeds"].astype(str),
+                           "WARCs": runs_df["warcs"], "GB": (runs_df["bytes_downloaded"] / 1000000000).round(3),
+                           "MB/s": (runs_df["bytes_per_second"] / 1000000).round(2),
+                           "API_Calls": runs_df["api_calls"], "API_Errors": runs_df["api_errors"],
+                           "Retries": runs_df["retries"], "Hours": (runs_df["seconds"] / 3600).round(2)})
+print(f"\nRuns in {history.path}:")
+print(display_df.to_string(index=False))
+
+stages_df = history.stage_seconds().reindex(runs_df["run_id"]).dropna(how="all")
+if not stages_df.empty:
+    print("\nSeconds for each stage:")
+    print(stages_df.round(2).to_string())
+
+regressions = history.regressions(args.threshold / 100, args.baseline)
+if regressions:
+    print("\nRegressions in the last finished run:")
+    for regression in regressions:
+        print(f"   * {regression}")
+else:
+    print("\nNo regressions in the last finished run (or not enough finished runs to compare).")
@@ -0,0 +1,28 @@
+"""
+Checks if the Archive-It APIs can be used by the unit tests that download UGA Archive-It data.
+
+Those tests are skipped when there is no network connection or the configuration file does not have
+credentials that Archive-It accepts, instead of waiting for each API call to time out and retry.
+The tests that use the mock Archive-It in mock_archive_it.py do not need this and can run anywhere.
+"""
+import functools
+import requests
+import configuration as config
+
+# Message displayed for each skipped test.
+SKIP_REASON = "needs a network connection and UGA Archive-It credentials in the configuration file"
+
+
+@functools.lru_cache(maxsize=None)
+def archive_it_available():
+    """
+    Tests one WASAPI call with the credentials in the configuration file, waiting at most a few seconds.
+    The result is saved, so this is only checked once each time the tests run.
+    Returns True if WASAPI responded successfully and False if not.
+    """
+    try:
+        response = requests.get(config.wasapi, params={"page_size": 1}, auth=(config.username, config.password),
+                                timeout=5)
+    except (AttributeError, requests.exceptions.RequestException):
+        return False
+    return response.status_code == 200
@@ -1,27 +1,27 @@
 """
 Tests for the add_completeness() function.
-It calculates the value for Complete based on other data in seed_df for a seed.
+It calculates the value for Complete based on other data in seed_log for a seed.
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
 and errors are combined which would not be given the workflow so the combinations can be tested all at once.
 """
 import os
 import pandas as pd
 import unittest
 import configuration as config
-from web_functions import add_completeness
+from web_functions import SeedLog, add_completeness
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
 class TestAddCompleteness(unittest.TestCase):
@@ -44,13 +44,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully verified name.warc.gz fixity on 2023-05-05; "
                "Successfully verified name2.warc.gz fixity on 2023-05-05",
                "Successfully unzipped name.warc.gz; Successfully unzipped name2.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "Successfully completed"
         self.assertEqual(actual, expected, "Problem with test for all correct")
 
@@ -69,13 +69,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Error: fixity for name.warc.gz cannot be extracted from md5deep output;"
                "Error: fixity for name.warc.gz changed and it was deleted",
                "Error unzipping name.warc.gz: file not found", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "Metadata_Report_Errors; WARC_Download_Errors; WARC_Fixity_Errors; WARC_Unzip_Errors"
         self.assertEqual(actual, expected, "Problem with test for all four error types")
 
@@ -91,13 +91,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully verified name.warc.gz fixity on 2023-05-05; "
                "Successfully verified name2.warc.gz fixity on 2023-05-05",
                "Error unzipping name.warc.gz: ERROR; Successfully unzipped name2.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Unzip_Errors"
         self.assertEqual(actual, expected, "Problem with test for error mixed with correct")
 
@@ -110,13 +110,13 @@ class TestAddCompleteness(unittest.TestCase):
         row = ["aip-id", 1000000, 12345, "1234567", 1.0, 1, "name.warc.gz", "1000000_seed.csv API Error 500",
                "No empty reports", "Successfully redacted", "Successfully downloaded name.warc.gz",
                "Successfully verified name.warc.gz fixity on 2023-05-05", "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "Metadata_Report_Errors"
         self.assertEqual(actual, expected, "Problem with test for Metadata_Report_Errors, API")
 
@@ -130,13 +130,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Error: crawl job was not downloaded so can't get crawl definition id", "No empty reports",
                "Successfully redacted", "Successfully downloaded name.warc.gz",
                "Successfully verified name.warc.gz fixity on 2023-05-05", "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "Metadata_Report_Errors"
         self.assertEqual(actual, expected, "Problem with test for Metadata_Report_Errors, crawl definition id")
 
@@ -150,13 +150,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully downloaded all metadata reports", "No empty reports", "Successfully redacted",
                "API Error 404: can't download name.warc.gz", "Successfully verified name.warc.gz fixity on 2023-05-05",
                "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Download_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Download_Errors, API error from download")
 
@@ -171,13 +171,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Index Error: cannot get the WARC URL or MD5 for name.warc.gz",
                "Successfully verified name.warc.gz fixity on 2023-05-05",
                "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Download_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Download_Errors, index error during get info")
 
@@ -191,13 +191,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully downloaded all metadata reports", "No empty reports", "Successfully redacted",
                "API Error 500: can't get info about name.warc.gz",
                "Successfully verified name.warc.gz fixity on 2023-05-05", "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Download_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Download_Errors, API error during get info")
 
@@ -211,13 +211,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully downloaded all metadata reports", "No empty reports", "Successfully redacted",
                "Successfully downloaded name.warc.gz", "Error: fixity for name.warc.gz changed and it was deleted",
                "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Fixity_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Fixity_Errors, change in fixity")
 
@@ -232,13 +232,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully downloaded name.warc.gz",
                "Error: fixity for name.warc.gz cannot be extracted from md5deep output",
                "Successfully unzipped name.warc.gz", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Fixity_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Fixity_Errors, can't extract from MD5deep")
 
@@ -252,13 +252,13 @@ class TestAddCompleteness(unittest.TestCase):
                "Successfully downloaded all metadata reports", "No empty reports", "Successfully redacted",
                "Successfully downloaded name.warc.gz", "Successfully verified name.warc.gz fixity on 2023-05-05",
                "Error unzipping name.warc.gz: file not found", "TBD"]
-        seed_df = make_df(row)
+        seed_log = make_log(row)
 
         # Runs the function being tested.
-        add_completeness(0, seed_df)
+        add_completeness(0, seed_log)
 
         # Tests that Complete was updated.
-        actual = seed_df.at[0, 'Complete']
+        actual = seed_log.value(0, 'Complete')
         expected = "WARC_Unzip_Errors"
         self.assertEqual(actual, expected, "Problem with test for WARC_Unzip_Errors, error from unzipping tool")
 
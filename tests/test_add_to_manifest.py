@@ -0,0 +1,84 @@
+"""
+Tests for the add_to_manifest() function.
+It adds the checksums for a file to the seed's manifests, with one manifest per algorithm.
+"""
+import os
+import shutil
+import unittest
+from web_functions import add_to_manifest
+
+
+def read_manifest(manifest_path):
+    """
+    Reads a manifest and returns a list with one item per line.
+    """
+    with open(manifest_path) as manifest:
+        return manifest.read().splitlines()
+
+
+class TestAddToManifest(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the seed folder where the manifests are saved.
+        """
+        self.seed_dir = os.path.join(os.getcwd(), "1111111")
+        os.mkdir(self.seed_dir)
+
+    def tearDown(self):
+        """
+        Deletes the seed folder and the manifests in it.
+        """
+        shutil.rmtree(self.seed_dir)
+
+    def test_new_manifests(self):
+        """
+        Tests that the function makes one manifest for each algorithm when there are no manifests yet.
+        """
+        add_to_manifest(self.seed_dir, "aip-1", "ARCHIVEIT-1.warc.gz",
+                        {"md5": "d41d8cd98f00b204e9800998ecf8427e", "sha1": "da39a3ee5e6b4b0d3255bfef95601890afd80709"})
+
+        # Test that the expected manifests were made.
+        actual_files = sorted(os.listdir(self.seed_dir))
+        expected_files = ["aip-1_manifest-md5.txt", "aip-1_manifest-sha1.txt"]
+        self.assertEqual(actual_files, expected_files, "Problem with test for new manifests, files")
+
+        # Test that each manifest has the correct contents.
+        actual_md5 = read_manifest(os.path.join(self.seed_dir, "aip-1_manifest-md5.txt"))
+        expected_md5 = ["d41d8cd98f00b204e9800998ecf8427e  ARCHIVEIT-1.warc.gz"]
+        self.assertEqual(actual_md5, expected_md5, "Problem with test for new manifests, MD5 manifest")
+
+        actual_sha1 = read_manifest(os.path.join(self.seed_dir, "aip-1_manifest-sha1.txt"))
+        expected_sha1 = ["da39a3ee5e6b4b0d3255bfef95601890afd80709  ARCHIVEIT-1.warc.gz"]
+        self.assertEqual(actual_sha1, expected_sha1, "Problem with test for new manifests, SHA1 manifest")
+
+    def test_existing_manifests(self):
+        """
+        Tests that the function adds to the manifests when another file was already added,
+        including making a manifest for an algorithm that was not used before.
+        """
+        add_to_manifest(self.seed_dir, "aip-1", "ARCHIVEIT-1.warc.gz",
+                        {"md5": "d41d8cd98f00b204e9800998ecf8427e", "sha1": "da39a3ee5e6b4b0d3255bfef95601890afd80709"})
+        add_to_manifest(self.seed_dir, "aip-1", "ARCHIVEIT-1.warc",
+                        {"md5": "0cc175b9c0f1b6a831c399e269772661",
+                         "sha256": "ca978112ca1bbdcafac231b39a23dc4da786eff8147c4e72b9807785afee48bb"})
+
+        # Test that the expected manifests were made.
+        actual_files = sorted(os.listdir(self.seed_dir))
+        expected_files = ["aip-1_manifest-md5.txt", "aip-1_manifest-sha1.txt", "aip-1_manifest-sha256.txt"]
+        self.assertEqual(actual_files, expected_files, "Problem with test for existing manifests, files")
+
+        # Test that the MD5 manifest has both files.
+        actual_md5 = read_manifest(os.path.join(self.seed_dir, "aip-1_manifest-md5.txt"))
+        expected_md5 = ["d41d8cd98f00b204e9800998ecf8427e  ARCHIVEIT-1.warc.gz",
+                        "0cc175b9c0f1b6a831c399e269772661  ARCHIVEIT-1.warc"]
+        self.assertEqual(actual_md5, expected_md5, "Problem with test for existing manifests, MD5 manifest")
+
+        # Test that the SHA256 manifest has only the unzipped WARC.
+        actual_sha256 = read_manifest(os.path.join(self.seed_dir, "aip-1_manifest-sha256.txt"))
+        expected_sha256 = ["ca978112ca1bbdcafac231b39a23dc4da786eff8147c4e72b9807785afee48bb  ARCHIVEIT-1.warc"]
+        self.assertEqual(actual_sha256, expected_sha256, "Problem with test for existing manifests, SHA256 manifest")
+
+
+if __name__ == '__main__':
+    unittest.main()
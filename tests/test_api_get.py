@@ -0,0 +1,90 @@
+"""
+Tests for the api_get() function.
+It makes an API call and tries again with exponential backoff if the error is temporary.
+
+The API responses are replaced with values set by each test, so the tests can have errors on purpose
+and do not wait for the real backoff time.
+"""
+import io
+import requests
+import unittest
+from unittest import mock
+import web_functions
+from web_functions import api_get
+
+
+def response(status_code, headers=None):
+    """
+    Makes a response with the provided status code and headers.
+    """
+    result = requests.models.Response()
+    result.status_code = status_code
+    result.headers.update(headers or {})
+    result.raw = io.BytesIO(b"")
+    return result
+
+
+class TestApiGet(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Uses a retry policy without waiting and starts the retry statistics over.
+        """
+        policies = {"test": {"attempts": 3, "base_seconds": 0, "max_seconds": 0}}
+        self.policy_patch = mock.patch.object(web_functions.config, "retry_policies", policies, create=True)
+        self.policy_patch.start()
+        web_functions.RETRY_STATS.clear()
+
+    def tearDown(self):
+        """
+        Restores the retry policy.
+        """
+        self.policy_patch.stop()
+
+    def test_retry_then_success(self):
+        """
+        Tests that temporary errors are retried until the API call works.
+        """
+        with mock.patch("web_functions.requests.get",
+                        side_effect=[response(502), requests.exceptions.ConnectionError(), response(200)]) as get:
+            actual = api_get("https://example.org/api", "test")
+        self.assertEqual(actual.status_code, 200, "Problem with test for retry then success, status")
+        self.assertEqual(get.call_count, 3, "Problem with test for retry then success, calls")
+        self.assertEqual(web_functions.RETRY_STATS["test"]["retries"], 2, "Problem with test for retry, statistics")
+
+    def test_permanent_error(self):
+        """
+        Tests that an error which will not change if it is tried again is returned without retrying.
+        """
+        with mock.patch("web_functions.requests.get", side_effect=[response(404), response(200)]) as get:
+            actual = api_get("https://example.org/api", "test")
+        self.assertEqual(actual.status_code, 404, "Problem with test for permanent error, status")
+        self.assertEqual(get.call_count, 1, "Problem with test for permanent error, calls")
+
+    def test_out_of_attempts(self):
+        """
+        Tests that the last response is returned when every attempt has a temporary error,
+        and a connection error is raised if it happens on the last attempt.
+        """
+        with mock.patch("web_functions.requests.get", side_effect=[response(503)] * 3) as get:
+            actual = api_get("https://example.org/api", "test")
+        self.assertEqual(actual.status_code, 503, "Problem with test for out of attempts, status")
+        self.assertEqual(get.call_count, 3, "Problem with test for out of attempts, calls")
+
+        with mock.patch("web_functions.requests.get", side_effect=requests.exceptions.Timeout()):
+            with self.assertRaises(requests.exceptions.Timeout):
+                api_get("https://example.org/api", "test")
+
+    def test_retry_after(self):
+        """
+        Tests that the wait time from the API is used when the API provides one.
+        """
+        web_functions.config.retry_policies["test"]["max_seconds"] = 30
+        with mock.patch("web_functions.requests.get", side_effect=[response(429, {"Retry-After": "7"}), response(200)]):
+            with mock.patch("web_functions.time.sleep") as sleep:
+                api_get("https://example.org/api", "test")
+        sleep.assert_called_once_with(7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for batch_seeds(), which splits the seeds that still need to be downloaded into batches within a budget,
+and for combine_completeness(), which combines the completeness check for each batch.
+"""
+import os
+import pandas as pd
+import tempfile
+import unittest
+from test_schedule_downloads import make_log
+from web_functions import batch_seeds, combine_completeness
+
+
+class TestBatchSeeds(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a seed log with three seeds of 20 MB, 6 MB, and 3 MB, and the sizes of their WARCs.
+        """
+        self.seed_log = make_log([["aip-1", "1111111", "12345", "1", "0.003", "1", "small.warc.gz",
+                                   "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
+                                  ["aip-2", "2222222", "12345", "2", "0.02", "2", "big-a.warc.gz|big-b.warc.gz",
+                                   "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
+                                  ["aip-3", "3333333", "12345", "3", "0.006", "2", "mid-a.warc.gz|mid-b.warc.gz",
+                                   "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]])
+        self.warc_sizes = {"small.warc.gz": 3000000, "big-a.warc.gz": 5000000, "big-b.warc.gz": 15000000,
+                           "mid-a.warc.gz": 4000000, "mid-b.warc.gz": 2000000}
+
+    def test_bytes(self):
+        """
+        Tests that seeds are added largest first to the first batch with room.
+        """
+        actual = batch_seeds(self.seed_log, self.warc_sizes, 25000000)
+        expected = [["2222222", "1111111"], ["3333333"]]
+        self.assertEqual(actual, expected, "Problem with test for bytes")
+
+    def test_larger_than_budget(self):
+        """
+        Tests that a seed larger than the budget is a batch by itself.
+        """
+        actual = batch_seeds(self.seed_log, self.warc_sizes, 10000000)
+        expected = [["2222222"], ["3333333", "1111111"]]
+        self.assertEqual(actual, expected, "Problem with test for larger than budget")
+
+    def test_disk(self):
+        """
+        Tests that the disk budget includes the unzipped WARCs and the largest zipped WARC for each worker.
+        The big and mid seeds need 26 MB * 3 + 15 MB = 93 MB, and adding the small seed needs 102 MB.
+        """
+        actual = batch_seeds(self.seed_log, self.warc_sizes, 100000000, expansion=3, workers=1)
+        expected = [["2222222", "3333333"], ["1111111"]]
+        self.assertEqual(actual, expected, "Problem with test for disk")
+
+    def test_finished(self):
+        """
+        Tests that seeds that are already complete are not in a batch.
+        """
+        self.seed_log.add(0, "Complete", "Successfully completed")
+        actual = batch_seeds(self.seed_log, self.warc_sizes, 25000000)
+        self.assertEqual(actual, [["2222222"], ["3333333"]], "Problem with test for finished")
+
+
+class TestCombineCompleteness(unittest.TestCase):
+
+    def test_combine(self):
+        """
+        Tests that every batch is in the combined check, with only the last row for a seed in more than one batch.
+        """
+        columns = ["Seed", "AIP", "Seed Folder Made"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f"completeness_check_batch_{number}.csv") for number in (1, 2, 3)]
+            pd.DataFrame([["1111111", "aip-1", "True"], ["extra", "Not expected", "Not expected"]],
+                         columns=columns).to_csv(paths[0], index=False)
+            pd.DataFrame([["2222222", "aip-2", "False"], ["extra", "Not expected", "Not expected"]],
+                         columns=columns).to_csv(paths[1], index=False)
+            csv_path = os.path.join(temp_dir, "completeness_check.csv")
+            combine_completeness(paths, csv_path)
+            actual = pd.read_csv(csv_path, dtype=str).values.tolist()
+        expected = [["1111111", "aip-1", "True"], ["2222222", "aip-2", "False"],
+                    ["extra", "Not expected", "Not expected"]]
+        self.assertEqual(actual, expected, "Problem with test for combine")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,8 @@ import os
 import pandas as pd
 import unittest
 import configuration as config
-from web_functions import check_seeds
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, check_seeds
 
 
 def csv_to_list(csv_path):
@@ -22,18 +23,19 @@ def csv_to_list(csv_path):
     return row_list
 
 
-def make_df(df_rows):
+def make_log(df_rows):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame(df_rows, columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame(df_rows, columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class MyTestCase(unittest.TestCase):
 
     def tearDown(self):
@@ -62,9 +64,9 @@ class MyTestCase(unittest.TestCase):
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191022235750599-00001-h3.warc.gz|"
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191021141836733-00000-h3.warc.gz",
                  "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "Complete"]]
-        seed_df = make_df(rows)
+        seed_log = make_log(rows)
         seeds_directory = os.path.join("check_seeds", "preservation_download_complete")
-        check_seeds("2019-10-30", "2019-10-22", seed_df, seeds_directory)
+        check_seeds("2019-10-30", "2019-10-22", seed_log, seeds_directory)
 
         # Test for the completeness log.
         actual = csv_to_list(os.path.join(config.script_output, "completeness_check.csv"))
@@ -96,9 +98,9 @@ class MyTestCase(unittest.TestCase):
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191022235750599-00001-h3.warc.gz|"
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191021141836733-00000-h3.warc.gz",
                  "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "Complete"]]
-        seed_df = make_df(rows)
+        seed_log = make_log(rows)
         seeds_directory = os.path.join("check_seeds", "preservation_download_extra")
-        check_seeds("2019-10-30", "2019-10-22", seed_df, seeds_directory)
+        check_seeds("2019-10-30", "2019-10-22", seed_log, seeds_directory)
 
         # Test for the completeness log.
         actual = csv_to_list(os.path.join(config.script_output, "completeness_check.csv"))
@@ -136,9 +138,9 @@ class MyTestCase(unittest.TestCase):
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191022235750599-00001-h3.warc.gz|"
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191021141836733-00000-h3.warc.gz",
                  "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "Complete"]]
-        seed_df = make_df(rows)
+        seed_log = make_log(rows)
         seeds_directory = os.path.join("check_seeds", "preservation_download_missing")
-        check_seeds("2019-10-30", "2019-10-22", seed_df, seeds_directory)
+        check_seeds("2019-10-30", "2019-10-22", seed_log, seeds_directory)
 
         # Test for the completeness log.
         actual = csv_to_list(os.path.join(config.script_output, "completeness_check.csv"))
@@ -173,9 +175,9 @@ class MyTestCase(unittest.TestCase):
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191022235750599-00001-h3.warc.gz|"
                  "ARCHIVEIT-12939-TEST-JOB1010672-SEED2090407-20191021141836733-00000-h3.warc.gz",
                  "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "No Errors", "Complete"]]
-        seed_df = make_df(rows)
+        seed_log = make_log(rows)
         seeds_directory = os.path.join("check_seeds", "preservation_download_not_complete")
-        check_seeds("2019-10-30", "2019-10-22", seed_df, seeds_directory)
+        check_seeds("2019-10-30", "2019-10-22", seed_log, seeds_directory)
 
         # Test for the completeness log.
         actual = csv_to_list(os.path.join(config.script_output, "completeness_check.csv"))
@@ -0,0 +1,90 @@
+"""
+Tests for the CircuitBreaker class and for api_get() waiting for the API while the circuit breaker is open.
+
+The API responses are replaced with values set by each test, so the tests do not need the Archive-It API.
+"""
+import requests
+import threading
+import time
+import unittest
+from unittest import mock
+import web_functions
+from web_functions import CircuitBreaker, api_get
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_open(self):
+        """
+        Tests that the breaker opens after the number of failures in a row, and a success starts the count over.
+        """
+        breaker = CircuitBreaker("example.org", "https://example.org/api", failures=3)
+        for success in (False, False, True, False, False):
+            breaker.record(success)
+        self.assertEqual(breaker.open, False, "Problem with test for open, success in between")
+        breaker.record(False)
+        self.assertEqual(breaker.open, True, "Problem with test for open, failures in a row")
+
+    def test_wait(self):
+        """
+        Tests that calls wait while the breaker is open, only one thread checks the API,
+        and every waiting call continues once the API is up.
+        """
+        breaker = CircuitBreaker("example.org", "https://example.org/api", failures=1, probe_seconds=0.05)
+        breaker.record(False)
+        checks = iter([False, False, True])
+        with mock.patch.object(breaker, "check", side_effect=lambda: next(checks)) as check:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(breaker.wait())) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+        self.assertEqual(results, [True, True, True], "Problem with test for wait, results")
+        self.assertEqual(check.call_count, 3, "Problem with test for wait, checks")
+        self.assertEqual(breaker.wait(), False, "Problem with test for wait, closed")
+
+
+class TestApiGetOutage(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Uses a retry policy and circuit breaker without waiting, and starts with no circuit breakers.
+        """
+        self.patches = [
+            mock.patch.object(web_functions.config, "retry_policies",
+                              {"test": {"attempts": 2, "base_seconds": 0, "max_seconds": 0}}, create=True),
+            mock.patch.object(web_functions.config, "circuit_breaker",
+                              {"failures": 2, "probe_seconds": 0.01}, create=True),
+            mock.patch.object(CircuitBreaker, "check", return_value=True),
+        ]
+        for patch in self.patches:
+            patch.start()
+        web_functions.BREAKERS.clear()
+
+    def tearDown(self):
+        """
+        Restores the configuration and removes the circuit breakers made by the test.
+        """
+        for patch in self.patches:
+            patch.stop()
+        web_functions.BREAKERS.clear()
+
+    def test_outage(self):
+        """
+        Tests that a call which would run out of attempts during an outage waits for the API instead of failing.
+        """
+        error = requests.exceptions.ConnectionError()
+        success = requests.models.Response()
+        success.status_code = 200
+        with mock.patch("web_functions.requests.get", side_effect=[error, error, error, success]) as get:
+            start = time.monotonic()
+            actual = api_get("https://example.org/api", "test")
+        self.assertEqual(actual.status_code, 200, "Problem with test for outage, status")
+        self.assertEqual(get.call_count, 4, "Problem with test for outage, calls")
+        self.assertLess(time.monotonic() - start, 5, "Problem with test for outage, time")
+        self.assertEqual(web_functions.BREAKERS["example.org"].open, False, "Problem with test for outage, breaker")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Tests for the config_errors() function in observability.py.
+It checks the configuration values for the progress, trace, metrics, and run history, for check_config().
+"""
+import types
+import unittest
+from observability import config_errors
+
+
+class TestConfigErrors(unittest.TestCase):
+
+    def test_correct(self):
+        """
+        Tests that there are no errors when the values are correct or not in the configuration file.
+        """
+        self.assertEqual(config_errors(types.SimpleNamespace()), [], "Problem with test for correct, not present")
+        config = types.SimpleNamespace(progress_seconds=30, trace=True, metrics_port=9100, metrics_seconds=15,
+                                       metrics_textfile="ait_download.prom", run_history="run_history.sqlite")
+        self.assertEqual(config_errors(config), [], "Problem with test for correct, present")
+
+    def test_errors(self):
+        """
+        Tests that there is an error for each value that is not correct.
+        """
+        config = types.SimpleNamespace(progress_seconds="60", trace="yes", metrics_port=70000, metrics_seconds=0,
+                                       metrics_textfile="/no/folder/ait_download.prom",
+                                       run_history="/no/folder/run_history.sqlite")
+        expected = ["Variable 'progress_seconds' must be a number greater than 0.",
+                    "Variable 'metrics_seconds' must be a number greater than 0.",
+                    "Variable 'trace' must be True or False.",
+                    "Variable 'metrics_port' must be a port number from 1 to 65535.",
+                    "Variable 'metrics_textfile' must be in a folder that exists: '/no/folder/ait_download.prom'.",
+                    "Variable 'run_history' must be in a folder that exists: '/no/folder/run_history.sqlite'."]
+        self.assertEqual(config_errors(config), expected, "Problem with test for errors")
+
+
+if __name__ == '__main__':
+    unittest.main()
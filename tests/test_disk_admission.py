@@ -0,0 +1,84 @@
+"""
+Tests for the DiskAdmission class.
+It only lets WARC downloads start when there is enough free disk space to download and unzip them.
+
+The free disk space is replaced with a value set by each test, so the tests do not depend on the real disk.
+"""
+import collections
+import threading
+import time
+import unittest
+from unittest import mock
+from web_functions import DiskAdmission
+
+DiskUsage = collections.namedtuple("DiskUsage", ["total", "used", "free"])
+
+
+class TestDiskAdmission(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Replaces the free disk space with a value the tests can change.
+        """
+        self.free = 10000
+        self.patch = mock.patch("web_functions.shutil.disk_usage",
+                                side_effect=lambda path: DiskUsage(100000, 100000 - self.free, self.free))
+        self.patch.start()
+
+    def tearDown(self):
+        """
+        Restores the real free disk space.
+        """
+        self.patch.stop()
+
+    def test_enough_space(self):
+        """
+        Tests that a download with enough space starts right away and reserves the space until it is done.
+        """
+        disk = DiskAdmission(".", 1000, 2)
+        with disk.admit(1000, "a.warc.gz"):
+            self.assertEqual(disk.reserved_bytes, 3000, "Problem with test for enough space, reserved")
+            self.assertEqual(disk.available(), 6000, "Problem with test for enough space, available")
+        self.assertEqual(disk.reserved_bytes, 0, "Problem with test for enough space, released")
+
+    def test_waits_for_other_download(self):
+        """
+        Tests that a download waits while another download has the space reserved and starts once it is released.
+        """
+        disk = DiskAdmission(".", 1000, 2, poll_seconds=0.05)
+        events = []
+
+        def second_download():
+            with disk.admit(2000, "b.warc.gz"):
+                events.append("second started")
+
+        with disk.admit(2000, "a.warc.gz"):
+            thread = threading.Thread(target=second_download)
+            thread.start()
+            time.sleep(0.2)
+            events.append("first done")
+        thread.join(timeout=5)
+        self.assertEqual(events, ["first done", "second started"], "Problem with test for waits for other download")
+
+    def test_waits_for_space_freed(self):
+        """
+        Tests that a download waits while the disk is too full and starts once space is freed outside the script.
+        """
+        self.free = 2000
+        disk = DiskAdmission(".", 1000, 2, poll_seconds=0.05)
+        started = threading.Event()
+
+        def download():
+            with disk.admit(1000, "a.warc.gz"):
+                started.set()
+
+        thread = threading.Thread(target=download)
+        thread.start()
+        self.assertEqual(started.wait(timeout=0.2), False, "Problem with test for space freed, before")
+        self.free = 10000
+        self.assertEqual(started.wait(timeout=5), True, "Problem with test for space freed, after")
+        thread.join(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for the disk_space_needed() function.
+It estimates the disk space needed to download and unzip every WARC in the schedule.
+"""
+import unittest
+from web_functions import disk_space_needed
+
+
+class TestDiskSpaceNeeded(unittest.TestCase):
+
+    def test_one_worker(self):
+        """
+        Tests the estimate with one worker, which needs space for the largest zipped WARC while it is unzipped.
+        """
+        tasks = [(0, "a.warc.gz", 1000), (0, "b.warc.gz", 3000), (1, "c.warc.gz", 2000)]
+        actual = disk_space_needed(tasks, 2, 1)
+        self.assertEqual(actual, 15000, "Problem with test for one worker")
+
+    def test_three_workers(self):
+        """
+        Tests the estimate with three workers, which each need space for a large zipped WARC while it is unzipped.
+        """
+        tasks = [(0, "a.warc.gz", 1000), (0, "b.warc.gz", 3000), (1, "c.warc.gz", 2000), (1, "d.warc.gz", 500)]
+        actual = disk_space_needed(tasks, 2, 3)
+        self.assertEqual(actual, 19000, "Problem with test for three workers")
+
+    def test_no_tasks(self):
+        """
+        Tests the estimate when every seed was already downloaded.
+        """
+        actual = disk_space_needed([], 2, 1)
+        self.assertEqual(actual, 0, "Problem with test for no tasks")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,8 @@ import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import download_crawl_definition, get_report
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, download_crawl_definition, get_report
 
 
 def csv_to_list(csv_path):
@@ -22,18 +23,19 @@ def csv_to_list(csv_path):
     return row_list
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestDownloadCrawlDefinition(unittest.TestCase):
 
     def tearDown(self):
@@ -57,14 +59,14 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         Causes the error by not running the function which downloads the crawl job report.
         """
         # Makes data needed as function input and runs the function.
-        seed_df = make_df(["harg-0000-web-0001", "2202440", "12181", "1137665", "1", "1", "name.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["harg-0000-web-0001", "2202440", "12181", "1137665", "1", "1", "name.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2202440")
-        download_crawl_definition("1137665", seed, seed_df, 0)
+        download_crawl_definition("1137665", seed, seed_log, 0)
 
         # Test that the log was updated.
-        actual = seed_df.at[0, 'Metadata_Report_Errors']
+        actual = seed_log.value(0, 'Metadata_Report_Errors')
         expected = f"Error: crawl job 1137665 was not downloaded so can't get crawl definition id"
         self.assertEqual(actual, expected, "Problem with test for error/no job")
 
@@ -75,24 +77,24 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         """
         # Makes data needed as function input,
         # including downloading the crawl job reports which are read by this function.
-        seed_df = make_df(["rbrl-0000-web-0001", 2027776, 12264, "1718467|943446", 1.0, 1, "name.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["rbrl-0000-web-0001", 2027776, 12264, "1718467|943446", 1.0, 1, "name.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2027776")
-        get_report(seed, seed_df, 0, "id", "1718467", "crawl_job", f"{seed.AIP_ID}_1718467_crawljob.csv")
-        get_report(seed, seed_df, 0, "id", "943446", "crawl_job", f"{seed.AIP_ID}_943446_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "1718467", "crawl_job", f"{seed.AIP_ID}_1718467_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "943446", "crawl_job", f"{seed.AIP_ID}_943446_crawljob.csv")
 
         # Runs the function for each crawl job. In production, download_metadata() repeats the function call.
-        download_crawl_definition("1718467", seed, seed_df, 0)
-        download_crawl_definition("943446", seed, seed_df, 0)
+        download_crawl_definition("1718467", seed, seed_log, 0)
+        download_crawl_definition("943446", seed, seed_log, 0)
 
         # Test that the crawl definition 31104519042 report has the expected values.
         actual1 = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104519042_crawldef.csv"))
         expected1 = [['account', 'brozzler', 'byte_limit', 'collection', 'crawl_queue', 'crawl_technology',
-                     'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
-                     'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
-                     'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
-                     'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
+                      'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
+                      'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
+                      'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
+                      'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
                      ['1468', 'False', 'blank_cell', '12264', '1', 'HERITRIX', 'blank_cell', 'blank_cell',
                       '31104519042', '2022-12-02T15:34:50.574147Z', '1718467', 'blank_cell', 'blank_cell',
                       'Annual', 'blank_cell', '4', '0', 'blank_cell', 'blank_cell', 'False', 'False',
@@ -102,10 +104,10 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         # Test that the crawl definition 31104250884 report have the expected values.
         actual2 = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104250884_crawldef.csv"))
         expected2 = [['account', 'brozzler', 'byte_limit', 'collection', 'crawl_queue', 'crawl_technology',
-                     'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
-                     'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
-                     'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
-                     'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
+                      'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
+                      'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
+                      'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
+                      'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
                      ['1468', 'False', 'blank_cell', '12264', '1', 'HERITRIX', 'blank_cell', 'blank_cell', 
                       '31104250884', '2019-07-10T13:17:44.208000Z', '943446', 'blank_cell', 'blank_cell', 
                       'Legacy Test with ID 31104250884', 'blank_cell', '0', '0','TEST', 'blank_cell', 'False', 
@@ -119,26 +121,26 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         """
         # Makes data needed as function input,
         # including downloading the crawl job reports which are read by this function.
-        seed_df = make_df(["rbrl-0000-web-0001", 2467332, 12265, "1360420|1365539|1718490", 1.0, 1,
-                           "name.warc.gz", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["rbrl-0000-web-0001", 2467332, 12265, "1360420|1365539|1718490", 1.0, 1,
+                             "name.warc.gz", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2467332")
-        get_report(seed, seed_df, 0, "id", "1360420", "crawl_job", f"{seed.AIP_ID}_1360420_crawljob.csv")
-        get_report(seed, seed_df, 0, "id", "1365539", "crawl_job", f"{seed.AIP_ID}_1365539_crawljob.csv")
-        get_report(seed, seed_df, 0, "id", "1718490", "crawl_job", f"{seed.AIP_ID}_1718490_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "1360420", "crawl_job", f"{seed.AIP_ID}_1360420_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "1365539", "crawl_job", f"{seed.AIP_ID}_1365539_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "1718490", "crawl_job", f"{seed.AIP_ID}_1718490_crawljob.csv")
 
         # Runs the function for each crawl job. In production, download_metadata() repeats the function call.
-        download_crawl_definition("1360420", seed, seed_df, 0)
-        download_crawl_definition("1365539", seed, seed_df, 0)
-        download_crawl_definition("1718490", seed, seed_df, 0)
+        download_crawl_definition("1360420", seed, seed_log, 0)
+        download_crawl_definition("1365539", seed, seed_log, 0)
+        download_crawl_definition("1718490", seed, seed_log, 0)
 
         # Test that the crawl definition 31104392189 report has the expected values.
         actual1 = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104392189_crawldef.csv"))
         expected1 = [['account', 'brozzler', 'byte_limit', 'collection', 'crawl_queue', 'crawl_technology',
-                     'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
-                     'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
-                     'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
-                     'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
+                      'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
+                      'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
+                      'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
+                      'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
                      ['1468', 'False', 'blank_cell', '12265', '1', 'HERITRIX', 'blank_cell', 'blank_cell',
                       '31104392189', '2022-12-02T16:07:48.753667Z', '1718490', 'blank_cell', 'blank_cell',
                       'Monthly', 'blank_cell', '0', '0', 'blank_cell', 'blank_cell', 'False', 'False',
@@ -148,10 +150,10 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         # Test that the crawl definition 31104419857 report has the expected values.
         actual2 = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104419857_crawldef.csv"))
         expected2 = [['account', 'brozzler', 'byte_limit', 'collection', 'crawl_queue', 'crawl_technology',
-                     'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
-                     'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
-                     'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
-                     'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
+                      'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
+                      'machine_count', 'modified_at', 'name', 'next_scheduled_crawl_event', 'num_active_seeds',
+                      'num_inactive_seeds', 'one_time_subtype', 'patch_for_qa_job_id', 'patch_ignore_robots',
+                      'pdfs_only', 'recurrence_type', 'test', 'time_limit', 'visibility'],
                      ['1468', 'False', 'blank_cell', '12265', '1', 'HERITRIX', 'blank_cell', 'blank_cell',
                       '31104419857', '2021-02-16T16:05:31.601697Z', '1365539', 'blank_cell', 'blank_cell',
                       'Legacy Test with ID 31104419857', 'blank_cell', '0', '0', 'TEST', 'blank_cell', 'False',
@@ -165,16 +167,16 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         """
         # Makes data needed as function input,
         # including downloading the crawl job reports which are read by this function.
-        seed_df = make_df(["harg-0000-web-0001", 2016223, 12249, "918473|918474", 1.0, 1, "name.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["harg-0000-web-0001", 2016223, 12249, "918473|918474", 1.0, 1, "name.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2016223")
-        get_report(seed, seed_df, 0, "id", "918473", "crawl_job", f"{seed.AIP_ID}_918473_crawljob.csv")
-        get_report(seed, seed_df, 0, "id", "918474", "crawl_job", f"{seed.AIP_ID}_918474_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "918473", "crawl_job", f"{seed.AIP_ID}_918473_crawljob.csv")
+        get_report(seed, seed_log, 0, "id", "918474", "crawl_job", f"{seed.AIP_ID}_918474_crawljob.csv")
 
         # Runs the function for each crawl job. In production, download_metadata() repeats the function call.
-        download_crawl_definition("918473", seed, seed_df, 0)
-        download_crawl_definition("918474", seed, seed_df, 0)
+        download_crawl_definition("918473", seed, seed_log, 0)
+        download_crawl_definition("918474", seed, seed_log, 0)
 
         # Test that the crawl definition report has the expected values.
         actual = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104242954_crawldef.csv"))
@@ -195,12 +197,12 @@ class TestDownloadCrawlDefinition(unittest.TestCase):
         one crawl job id, which has one crawl definition id.
         """
         # Makes data needed as function input, including downloading the crawl job report, and runs the function.
-        seed_df = make_df(["harg-0000-web-0001", 2202440, 12181, "1137665", 1.0, 1, "name.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["harg-0000-web-0001", 2202440, 12181, "1137665", 1.0, 1, "name.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2202440")
-        get_report(seed, seed_df, 0, "id", "1137665", "crawl_job", f"{seed.AIP_ID}_1137665_crawljob.csv")
-        download_crawl_definition("1137665", seed, seed_df, 0)
+        get_report(seed, seed_log, 0, "id", "1137665", "crawl_job", f"{seed.AIP_ID}_1137665_crawljob.csv")
+        download_crawl_definition("1137665", seed, seed_log, 0)
 
         # Test that the crawl definition report has the expected values.
         actual = csv_to_list(os.path.join(os.getcwd(), str(seed.Seed_ID), f"{seed.AIP_ID}_31104315076_crawldef.csv"))
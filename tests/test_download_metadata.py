@@ -11,21 +11,23 @@ import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import download_metadata
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, download_metadata
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestDownloadMetadata(unittest.TestCase):
 
     def tearDown(self):
@@ -43,11 +45,11 @@ class TestDownloadMetadata(unittest.TestCase):
         for a Hargrett seed with one each of all six of the report types.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["harg-1", 2187482, 12181, "1177700", 3.62, 3, "name0.warc.gz|name1.warc.gz|name2.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["harg-1", 2187482, 12181, "1177700", 3.62, 3, "name0.warc.gz|name1.warc.gz|name2.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2187482")
-        download_metadata(seed, 0, seed_df)
+        download_metadata(seed, 0, seed_log)
 
         # Test that the correct metadata reports were downloaded.
         actual = []
@@ -58,17 +60,19 @@ class TestDownloadMetadata(unittest.TestCase):
                     "harg-1_31104333391_crawldef.csv",
                     "harg-1_coll.csv",
                     "harg-1_collscope.csv",
+                    "harg-1_manifest-md5.txt",
+                    "harg-1_manifest-sha256.txt",
                     "harg-1_seed.csv",
                     "harg-1_seedscope.csv"]
         self.assertEqual(actual, expected, "Problem with test for Hargrett, downloaded files")
 
         # Test that the log has the correct information for metadata errors.
-        actual_errors = seed_df.at[0, 'Metadata_Report_Errors']
+        actual_errors = seed_log.value(0, 'Metadata_Report_Errors')
         expected_errors = "Successfully downloaded all metadata reports"
         self.assertEqual(actual_errors, expected_errors, "Problem with test for Hargrett, log errors")
 
         # Test that the log has the correct information for empty reports.
-        actual_info = seed_df.at[0, 'Metadata_Report_Empty']
+        actual_info = seed_log.value(0, 'Metadata_Report_Empty')
         expected_info = "No empty reports"
         self.assertEqual(actual_info, expected_info, "Problem with test for Hargrett, log info")
 
@@ -78,11 +82,11 @@ class TestDownloadMetadata(unittest.TestCase):
         for a MAGIL seed with one each of the four report types which always have data.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["magil-1", 2529685, 15678, "1594228", 0.36, 1, "name.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["magil-1", 2529685, 15678, "1594228", 0.36, 1, "name.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2529685")
-        download_metadata(seed, 0, seed_df)
+        download_metadata(seed, 0, seed_log)
 
         # Test that the correct metadata reports were downloaded.
         actual = []
@@ -92,16 +96,18 @@ class TestDownloadMetadata(unittest.TestCase):
         expected = ["magil-1_1594228_crawljob.csv",
                     "magil-1_31104546937_crawldef.csv",
                     "magil-1_coll.csv",
+                    "magil-1_manifest-md5.txt",
+                    "magil-1_manifest-sha256.txt",
                     "magil-1_seed.csv"]
         self.assertEqual(actual, expected, "Problem with test for MAGIL, downloaded files")
 
         # Test that the log has the correct information for metadata errors.
-        actual_errors = seed_df.at[0, 'Metadata_Report_Errors']
+        actual_errors = seed_log.value(0, 'Metadata_Report_Errors')
         expected_errors = "Successfully downloaded all metadata reports"
         self.assertEqual(actual_errors, expected_errors, "Problem with test for MAGIL, log errors")
 
         # Test that the log has the correct information for empty reports.
-        actual_info = seed_df.at[0, 'Metadata_Report_Empty']
+        actual_info = seed_log.value(0, 'Metadata_Report_Empty')
         expected_info = "magil-1_seedscope.csv; magil-1_collscope.csv"
         self.assertEqual(actual_info, expected_info, "Problem with test for MAGIL, log info")
 
@@ -111,12 +117,12 @@ class TestDownloadMetadata(unittest.TestCase):
         for a Russell two each of the crawl job and definition reports and one each of the other four report types.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["rbrl-1", 2547528, 12265, "1436714|1718490", 0.72, 3,
-                           "name0.warc.gz|name1.warc.gz|name2.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        seed = [seed for seed in seed_df.itertuples()][0]
+        seed_log = make_log(["rbrl-1", 2547528, 12265, "1436714|1718490", 0.72, 3,
+                             "name0.warc.gz|name1.warc.gz|name2.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed = seed_log.records[0]
         os.mkdir("2547528")
-        download_metadata(seed, 0, seed_df)
+        download_metadata(seed, 0, seed_log)
 
         # Test that the correct metadata reports were downloaded.
         actual = []
@@ -129,17 +135,19 @@ class TestDownloadMetadata(unittest.TestCase):
                     "rbrl-1_31104463393_crawldef.csv",
                     "rbrl-1_coll.csv",
                     "rbrl-1_collscope.csv",
+                    "rbrl-1_manifest-md5.txt",
+                    "rbrl-1_manifest-sha256.txt",
                     "rbrl-1_seed.csv",
                     "rbrl-1_seedscope.csv"]
         self.assertEqual(actual, expected, "Problem with test for RussellL, downloaded files")
 
         # Test that the log has the correct information for metadata errors.
-        actual_errors = seed_df.at[0, 'Metadata_Report_Errors']
+        actual_errors = seed_log.value(0, 'Metadata_Report_Errors')
         expected_errors = "Successfully downloaded all metadata reports"
         self.assertEqual(actual_errors, expected_errors, "Problem with test for Russell, log errors")
 
         # Test that the log has the correct information for empty reports.
-        actual_info = seed_df.at[0, 'Metadata_Report_Empty']
+        actual_info = seed_log.value(0, 'Metadata_Report_Empty')
         expected_info = "No empty reports"
         self.assertEqual(actual_info, expected_info, "Problem with test for Russell, log info")
 
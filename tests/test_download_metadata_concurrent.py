@@ -0,0 +1,102 @@
+"""
+Tests for download_metadata() downloading the reports at the same time and logging them in a consistent order.
+
+The Partner API is replaced with a function that waits before returning each report,
+so the tests can check the timing without the Archive-It API.
+"""
+import io
+import os
+import pandas as pd
+import requests
+import shutil
+import time
+import unittest
+import urllib3
+from unittest import mock
+import configuration as config
+from web_functions import SeedLog, download_metadata
+
+# Content of each report, by report type and id. A report that is missing is an API error.
+REPORTS = {("seed", "1111111"): b"id,login_username,login_password\n1111111,user,password\n",
+           ("scope_rule", "1111111"): b"",
+           ("collection", "12345"): b"id,name\n12345,Collection\n",
+           ("crawl_job", "1"): b"id,crawl_definition\n1,10\n",
+           ("crawl_job", "2"): b"id,crawl_definition\n2,10\n",
+           ("crawl_job", "3"): b"id,crawl_definition\n3,11\n",
+           ("crawl_definition", "10"): b"id,name\n10,Definition\n",
+           ("crawl_definition", "11"): b""}
+
+
+def fake_api_get(url, endpoint, params, stream):
+    """
+    Returns the report from REPORTS after a delay, like a streaming Partner API call.
+    """
+    time.sleep(0.2)
+    report_type = url.split("/")[-1]
+    filter_value = str(params.get("id", params.get("seed", params.get("collection"))))
+    response = requests.models.Response()
+    if "collection" in params:
+        response.status_code = 500
+        content = b""
+    else:
+        response.status_code = 200
+        content = REPORTS[(report_type, filter_value)]
+    response.raw = urllib3.response.HTTPResponse(body=io.BytesIO(content), preload_content=False)
+    return response
+
+
+class TestDownloadMetadataConcurrent(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the seed log and seed folder.
+        """
+        columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+                        "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
+                        "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
+        self.seed_log = SeedLog(pd.DataFrame([["aip-1", "1111111", "12345", "1|2|3", 0.01, 1, "ARCHIVEIT.warc.gz",
+                                               "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]],
+                                             columns=columns_list))
+        os.mkdir("1111111")
+
+    def tearDown(self):
+        """
+        Deletes the seed folder and seeds_log.csv.
+        """
+        shutil.rmtree("1111111")
+        os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+
+    def test_concurrent(self):
+        """
+        Tests that the reports download at the same time, each crawl definition is only downloaded once,
+        and the log is in the same order as when the reports were downloaded one at a time.
+        """
+        seed = self.seed_log.records[0]
+        with mock.patch("web_functions.api_get", side_effect=fake_api_get) as api_get:
+            start = time.monotonic()
+            download_metadata(seed, 0, self.seed_log)
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1, "Problem with test for concurrent, time")
+        self.assertEqual(api_get.call_count, 9, "Problem with test for concurrent, API calls")
+
+        actual_files = sorted(os.listdir("1111111"))
+        expected_files = ["aip-1_10_crawldef.csv", "aip-1_1_crawljob.csv", "aip-1_2_crawljob.csv",
+                          "aip-1_3_crawljob.csv", "aip-1_coll.csv", "aip-1_manifest-md5.txt",
+                          "aip-1_manifest-sha256.txt", "aip-1_seed.csv"]
+        self.assertEqual(actual_files, expected_files, "Problem with test for concurrent, files")
+
+        actual_log = [self.seed_log.value(0, column) for column in ("Metadata_Report_Errors", "Metadata_Report_Empty",
+                                                                    "Seed_Report_Redaction")]
+        expected_log = ["aip-1_collscope.csv API Error 500", "aip-1_seedscope.csv; aip-1_11_crawldef.csv",
+                        "Successfully redacted"]
+        self.assertEqual(actual_log, expected_log, "Problem with test for concurrent, log")
+
+        with open(os.path.join("1111111", "aip-1_seed.csv")) as seed_csv:
+            actual_seed = seed_csv.read()
+        expected_seed = "id,login_username,login_password\n1111111,REDACTED,REDACTED\n"
+        self.assertEqual(actual_seed, expected_seed, "Problem with test for concurrent, seed report redacted")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for the download_seeds() function.
+It starts each seed (folder and metadata) with a separate worker ahead of the WARC downloads.
+
+The metadata and WARC downloads are replaced with functions that record when they run,
+so the tests check the order of the steps without the Archive-It API.
+"""
+import os
+import pandas as pd
+import threading
+import time
+import unittest
+from unittest import mock
+import configuration as config
+from web_functions import SeedLog, download_seeds
+
+
+class TestDownloadSeeds(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the seed log and replaces the downloads with functions that record the order of events.
+        """
+        columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames"]
+        self.seed_log = SeedLog(pd.DataFrame([[f"aip-{number}", str(number) * 7, "12345", "1", 0.01, 1,
+                                               "name.warc.gz"] for number in range(1, 5)], columns=columns_list))
+        self.tasks = [(0, "one.warc.gz", 4), (1, "two.warc.gz", 3), (2, "three.warc.gz", 2), (3, "four.warc.gz", 1)]
+        self.events = []
+        lock = threading.Lock()
+
+        def record(event):
+            with lock:
+                self.events.append(event)
+
+        def metadata(seed, row_index, seed_log):
+            record(f"metadata {seed.Seed_ID}")
+
+        def warc(seed, row_index, seed_log, warc):
+            record(f"start {seed.Seed_ID}")
+            time.sleep(0.1)
+            record(f"end {seed.Seed_ID}")
+
+        self.patches = [mock.patch("web_functions.download_metadata", side_effect=metadata),
+                        mock.patch("web_functions.download_warc", side_effect=warc),
+                        mock.patch("web_functions.add_completeness")]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """
+        Restores the downloads and deletes the seed folders and status file.
+        """
+        for patch in self.patches:
+            patch.stop()
+        for seed_id in [seed.Seed_ID for seed in self.seed_log]:
+            if os.path.exists(seed_id):
+                os.rmdir(seed_id)
+        if os.path.exists(os.path.join(config.script_output, "download_status.json")):
+            os.remove(os.path.join(config.script_output, "download_status.json"))
+
+    def test_prefetch(self):
+        """
+        Tests that the metadata for the next seed is downloaded while the current seed's WARC downloads,
+        but not more than prefetch_seeds ahead, and that every seed's metadata is done before its WARCs.
+        """
+        worker_bytes = download_seeds(self.seed_log, self.tasks, 1, prefetch_seeds=1)
+        self.assertEqual(worker_bytes, [10], "Problem with test for prefetch, bytes")
+
+        position = {event: index for index, event in enumerate(self.events)}
+        for seed_id in [seed.Seed_ID for seed in self.seed_log]:
+            self.assertLess(position[f"metadata {seed_id}"], position[f"start {seed_id}"],
+                            f"Problem with test for prefetch, metadata before WARCs for {seed_id}")
+        self.assertLess(position["metadata 2222222"], position["end 1111111"],
+                        "Problem with test for prefetch, metadata during WARCs")
+        self.assertLess(position["start 2222222"], position["metadata 3333333"],
+                        "Problem with test for prefetch, not too far ahead")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,17 +2,19 @@
 Test for download_warcs() function.
 It downloads every WARC for a seed, verifies its fixity, and unzips it.
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
-and seed_df only has the WARC(s) being tested, not other WARCs for that seed.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
+and seed_log only has the WARC(s) being tested, not other WARCs for that seed.
 """
 import os
 import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import download_warcs
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, download_warcs
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestDownloadWarcs(unittest.TestCase):
 
     def setUp(self):
@@ -33,7 +35,7 @@ class TestDownloadWarcs(unittest.TestCase):
                 "ARCHIVEIT-12265-MONTHLY-JOB1718490-SEED2485678-20221203180441653-00001-h3.warc.gz|"
                 "ARCHIVEIT-12265-MONTHLY-JOB1718490-SEED2485678-20221202160754903-00000-h3.warc.gz",
                 "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]
-        self.seed_df = pd.DataFrame([error, harg, rbrl], columns=columns)
+        self.seed_log = SeedLog(pd.DataFrame([error, harg, rbrl], columns=columns))
 
         self.seeds_dir = os.path.join(config.script_output, "preservation_download")
         os.mkdir(self.seeds_dir)
@@ -41,12 +43,14 @@ class TestDownloadWarcs(unittest.TestCase):
 
     def tearDown(self):
         """
-        Deletes the script output directory and contents, if any, and seeds_log.csv produced by the tests.
+        Deletes the script output directory and contents, if any,
+        and the seeds_log.csv and warcs_log.csv produced by the tests.
         The directory is changed first because seeds_dir can't be deleted while it is the current working directory.
         """
         os.chdir(config.script_output)
         shutil.rmtree(self.seeds_dir)
         os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+        os.remove(os.path.join(config.script_output, "warcs_log.csv"))
 
     def test_error_handling(self):
         """
@@ -55,8 +59,8 @@ class TestDownloadWarcs(unittest.TestCase):
         # Makes the seed folder in the output directory and the seed object from the df and runs the function.
         seed_path = os.path.join(self.seeds_dir, "2018086")
         os.makedirs(seed_path)
-        seed = [seed for seed in self.seed_df.itertuples()][0]
-        download_warcs(seed, 0, self.seed_df)
+        seed = self.seed_log.records[0]
+        download_warcs(seed, 0, self.seed_log)
 
         # Test for the WARC download, error file not made.
         downloaded1 = os.path.exists(os.path.join(seed_path, "error.warc.gz"))
@@ -68,19 +72,19 @@ class TestDownloadWarcs(unittest.TestCase):
         self.assertEqual(downloaded2, True, "Problem with test for error handling, WARC download: correct")
 
         # Test for the log field WARC_Download_Errors.
-        actual_log1 = self.seed_df.at[0, 'WARC_Download_Errors']
+        actual_log1 = self.seed_log.value(0, 'WARC_Download_Errors')
         expected_log1 = f"Index Error: cannot get the WARC URL or MD5 for error.warc.gz; " \
                         f"Successfully downloaded {warc}.gz"
         self.assertEqual(actual_log1, expected_log1, "Problem with test for error handling, log: WARC_Download_Errors")
 
         # Test for the log field WARC_Fixity_Errors.
         # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
-        actual_log2 = self.seed_df.at[0, 'WARC_Fixity_Errors']
+        actual_log2 = self.seed_log.value(0, 'WARC_Fixity_Errors')
         expected_log2 = f"Successfully verified {warc}.gz fixity"
         self.assertIn(expected_log2, actual_log2, "Problem with test for error handling, log: WARC_Fixity_Errors")
 
         # Test for the log field WARC_Unzip_Errors.
-        actual_log3 = self.seed_df.at[0, 'WARC_Unzip_Errors']
+        actual_log3 = self.seed_log.value(0, 'WARC_Unzip_Errors')
         expected_log3 = f"Successfully unzipped {warc}.gz"
         self.assertEqual(actual_log3, expected_log3, "Problem with test for error handling, log: WARC_Unzip_Errors")
 
@@ -92,8 +96,8 @@ class TestDownloadWarcs(unittest.TestCase):
         # Makes the seed folder in the output directory and the seed object from the df and runs the function.
         seed_path = os.path.join(self.seeds_dir, "2173769")
         os.makedirs(seed_path)
-        seed = [seed for seed in self.seed_df.itertuples()][1]
-        download_warcs(seed, 1, self.seed_df)
+        seed = self.seed_log.records[1]
+        download_warcs(seed, 1, self.seed_log)
 
         # Test for the WARC download.
         warc = "ARCHIVEIT-12912-WEEKLY-JOB1415330-SEED2173769-20210519233828683-00001-h3.warc"
@@ -101,20 +105,20 @@ class TestDownloadWarcs(unittest.TestCase):
         self.assertEqual(downloaded, True, "Problem with test for seed with one WARC, WARC download")
 
         # Test for the log field WARC_Download_Errors.
-        actual_log1 = self.seed_df.at[1, 'WARC_Download_Errors']
+        actual_log1 = self.seed_log.value(1, 'WARC_Download_Errors')
         expected_log1 = f"Successfully downloaded {warc}.gz"
         self.assertEqual(actual_log1, expected_log1,
                          "Problem with test for seed with one WARC, log: WARC_Download_Errors")
 
         # Test for the log field WARC_Fixity_Errors.
         # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
-        actual_log2 = self.seed_df.at[1, 'WARC_Fixity_Errors']
+        actual_log2 = self.seed_log.value(1, 'WARC_Fixity_Errors')
         expected_log2 = f"Successfully verified {warc}.gz fixity"
         self.assertIn(expected_log2, actual_log2,
                       "Problem with test for seed with one WARC, log: WARC_Fixity_Errors")
 
         # Test for the log field WARC_Unzip_Errors.
-        actual_log3 = self.seed_df.at[1, 'WARC_Unzip_Errors']
+        actual_log3 = self.seed_log.value(1, 'WARC_Unzip_Errors')
         expected_log3 = f"Successfully unzipped {warc}.gz"
         self.assertEqual(actual_log3, expected_log3,
                          "Problem with test for seed with one WARC, log: WARC_Unzip_Errors")
@@ -127,8 +131,8 @@ class TestDownloadWarcs(unittest.TestCase):
         # Makes the seed folder in the output directory and the seed object from the df and runs the function.
         seed_path = os.path.join(self.seeds_dir, "2485678")
         os.makedirs(seed_path)
-        seed = [seed for seed in self.seed_df.itertuples()][2]
-        download_warcs(seed, 2, self.seed_df)
+        seed = self.seed_log.records[2]
+        download_warcs(seed, 2, self.seed_log)
 
         # Test for the first WARC's download.
         warc1 = "ARCHIVEIT-12265-MONTHLY-JOB1718490-SEED2485678-20221203180441653-00001-h3.warc"
@@ -141,14 +145,14 @@ class TestDownloadWarcs(unittest.TestCase):
         self.assertEqual(downloaded2, True, "Problem with test for seed with two WARCs, WARC download")
 
         # Test for the log field WARC_Download_Errors.
-        actual_log1 = self.seed_df.at[2, 'WARC_Download_Errors']
+        actual_log1 = self.seed_log.value(2, 'WARC_Download_Errors')
         expected_log1 = f"Successfully downloaded {warc1}.gz; Successfully downloaded {warc2}.gz"
         self.assertEqual(actual_log1, expected_log1,
                          "Problem with test for seed with two WARCs, log: WARC_Download_Errors")
 
         # Test for the log field WARC_Fixity_Errors.
         # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
-        actual_log2 = self.seed_df.at[2, 'WARC_Fixity_Errors']
+        actual_log2 = self.seed_log.value(2, 'WARC_Fixity_Errors')
         expected_log2a = f"Successfully verified {warc1}.gz fixity"
         expected_log2b = f"Successfully verified {warc2}.gz fixity"
         self.assertIn(expected_log2a, actual_log2,
@@ -157,7 +161,7 @@ class TestDownloadWarcs(unittest.TestCase):
                       "Problem with test for seed with two WARCs, log: WARC_Fixity_Errors WARC 2")
 
         # Test for the log field WARC_Unzip_Errors.
-        actual_log3 = self.seed_df.at[2, 'WARC_Unzip_Errors']
+        actual_log3 = self.seed_log.value(2, 'WARC_Unzip_Errors')
         expected_log3 = f"Successfully unzipped {warc1}.gz; Successfully unzipped {warc2}.gz"
         self.assertEqual(actual_log3, expected_log3,
                          "Problem with test for seed with two WARCs, log: WARC_Unzip_Errors")
@@ -0,0 +1,175 @@
+"""
+Test for download_warcs() function, using a mock of Archive-It instead of the UGA data.
+It downloads every WARC for a seed, verifies its fixity, and unzips it.
+
+The mock has three seeds (2000001-2000003), each with two WARCs from one crawl job.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests.
+"""
+import os
+import pandas as pd
+import shutil
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from mock_archive_it import MockArchiveIt
+from web_functions import SeedLog, download_warcs
+
+
+class TestDownloadWarcsMock(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts the mock and uses it in place of Archive-It, makes the seed dataframe with WARCs from the mock
+        and the AIP folder that is used for every test, and makes the AIP folder the current working directory
+        so that the unzipped WARC saves to the right place.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=3, warcs=2, warc_bytes=5000).start()
+        self.patches = [mock.patch.multiple(config, **self.server.config_values()),
+                        mock.patch.object(web_functions, "API_REST", 0)]
+        for patch in self.patches:
+            patch.start()
+
+        self.warcs = {seed_id: sorted(warc for warc in self.server.warcs if f"-SEED{seed_id}-" in warc)
+                      for seed_id in ("2000001", "2000002", "2000003")}
+        columns = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+                   "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
+                   "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
+        error = ["magil-1", 2000001, 12345, "1000001", 0.01, 2, f"error.warc.gz|{self.warcs['2000001'][0]}",
+                 "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]
+        one = ["magil-2", 2000002, 12345, "1000002", 0.01, 1, self.warcs["2000002"][0],
+               "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]
+        two = ["magil-3", 2000003, 12345, "1000003", 0.01, 2, "|".join(self.warcs["2000003"]),
+               "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]
+        self.seed_log = SeedLog(pd.DataFrame([error, one, two], columns=columns))
+
+        self.current_directory = os.getcwd()
+        self.seeds_dir = os.path.join(config.script_output, "preservation_download")
+        os.mkdir(self.seeds_dir)
+        os.chdir(self.seeds_dir)
+
+    def tearDown(self):
+        """
+        Restores the configuration, stops the mock, and deletes the script output directory and contents, if any,
+        and the seeds_log.csv and warcs_log.csv produced by the tests.
+        The directory is changed first because seeds_dir can't be deleted while it is the current working directory.
+        """
+        for patch in self.patches:
+            patch.stop()
+        self.server.stop()
+        os.chdir(self.current_directory)
+        shutil.rmtree(self.seeds_dir)
+        for filename in ("seeds_log.csv", "warcs_log.csv"):
+            if os.path.exists(os.path.join(config.script_output, filename)):
+                os.remove(os.path.join(config.script_output, filename))
+
+    def test_error_handling(self):
+        """
+        Tests that the function can continue to download and unzip other WARCs after a WARC has an anticipated error.
+        """
+        # Makes the seed folder in the output directory and runs the function.
+        seed_path = os.path.join(self.seeds_dir, "2000001")
+        os.makedirs(seed_path)
+        download_warcs(self.seed_log.records[0], 0, self.seed_log)
+
+        # Test for the WARC downloads, error file not made and correct WARC unzipped.
+        warc = self.warcs["2000001"][0][:-3]
+        actual_files = [name for name in os.listdir(seed_path) if ".warc" in name]
+        self.assertEqual(actual_files, [warc], "Problem with test for error handling, WARC download")
+
+        # Test for the log fields.
+        # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
+        actual_log1 = self.seed_log.value(0, 'WARC_Download_Errors')
+        expected_log1 = f"Index Error: cannot get the WARC URL or MD5 for error.warc.gz; " \
+                        f"Successfully downloaded {warc}.gz"
+        self.assertEqual(actual_log1, expected_log1, "Problem with test for error handling, log: WARC_Download_Errors")
+        actual_log2 = self.seed_log.value(0, 'WARC_Fixity_Errors')
+        self.assertIn(f"Successfully verified {warc}.gz fixity", actual_log2,
+                      "Problem with test for error handling, log: WARC_Fixity_Errors")
+        actual_log3 = self.seed_log.value(0, 'WARC_Unzip_Errors')
+        self.assertEqual(actual_log3, f"Successfully unzipped {warc}.gz",
+                         "Problem with test for error handling, log: WARC_Unzip_Errors")
+
+    def test_fixity_error(self):
+        """
+        Tests that a WARC that is changed during the download is deleted, and not unzipped,
+        when the mock corrupts every WARC it sends.
+        """
+        # Makes the seed folder in the output directory and runs the function.
+        seed_path = os.path.join(self.seeds_dir, "2000002")
+        os.makedirs(seed_path)
+        self.server.set_faults({"webdatafile": {"corrupt_rate": 1}})
+        download_warcs(self.seed_log.records[1], 1, self.seed_log)
+
+        # Test for the WARC download, no zipped or unzipped WARC left.
+        warc = self.warcs["2000002"][0]
+        actual_files = [name for name in os.listdir(seed_path) if ".warc" in name]
+        self.assertEqual(actual_files, [], "Problem with test for fixity error, WARC download")
+
+        # Test for the log fields.
+        actual_log1 = self.seed_log.value(1, 'WARC_Fixity_Errors')
+        self.assertIn(f"Error: fixity for {warc} changed and it was deleted", actual_log1,
+                      "Problem with test for fixity error, log: WARC_Fixity_Errors")
+        actual_log2 = self.seed_log.value(1, 'WARC_Unzip_Errors')
+        self.assertEqual(actual_log2, "TBD", "Problem with test for fixity error, log: WARC_Unzip_Errors")
+
+    def test_one_warc(self):
+        """
+        Tests that the function downloads and unzips the expected WARC, and correctly updates the log,
+        for a seed with one WARC.
+        """
+        # Makes the seed folder in the output directory and runs the function.
+        seed_path = os.path.join(self.seeds_dir, "2000002")
+        os.makedirs(seed_path)
+        download_warcs(self.seed_log.records[1], 1, self.seed_log)
+
+        # Test for the WARC download.
+        warc = self.warcs["2000002"][0][:-3]
+        actual_files = [name for name in os.listdir(seed_path) if ".warc" in name]
+        self.assertEqual(actual_files, [warc], "Problem with test for seed with one WARC, WARC download")
+
+        # Test for the log fields.
+        # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
+        actual_log1 = self.seed_log.value(1, 'WARC_Download_Errors')
+        self.assertEqual(actual_log1, f"Successfully downloaded {warc}.gz",
+                         "Problem with test for seed with one WARC, log: WARC_Download_Errors")
+        actual_log2 = self.seed_log.value(1, 'WARC_Fixity_Errors')
+        self.assertIn(f"Successfully verified {warc}.gz fixity", actual_log2,
+                      "Problem with test for seed with one WARC, log: WARC_Fixity_Errors")
+        actual_log3 = self.seed_log.value(1, 'WARC_Unzip_Errors')
+        self.assertEqual(actual_log3, f"Successfully unzipped {warc}.gz",
+                         "Problem with test for seed with one WARC, log: WARC_Unzip_Errors")
+
+    def test_two_warcs(self):
+        """
+        Tests that the function downloads and unzips the expected WARCs, and correctly updates the log,
+        for a seed with two WARCs.
+        """
+        # Makes the seed folder in the output directory and runs the function.
+        seed_path = os.path.join(self.seeds_dir, "2000003")
+        os.makedirs(seed_path)
+        download_warcs(self.seed_log.records[2], 2, self.seed_log)
+
+        # Test for the WARC downloads.
+        warc1, warc2 = [warc[:-3] for warc in self.warcs["2000003"]]
+        actual_files = sorted(name for name in os.listdir(seed_path) if ".warc" in name)
+        self.assertEqual(actual_files, [warc1, warc2], "Problem with test for seed with two WARCs, WARC download")
+
+        # Test for the log fields.
+        # WARC_Fixity_Errors includes a time stamp, so the test cannot be for an exact match.
+        actual_log1 = self.seed_log.value(2, 'WARC_Download_Errors')
+        expected_log1 = f"Successfully downloaded {warc1}.gz; Successfully downloaded {warc2}.gz"
+        self.assertEqual(actual_log1, expected_log1,
+                         "Problem with test for seed with two WARCs, log: WARC_Download_Errors")
+        actual_log2 = self.seed_log.value(2, 'WARC_Fixity_Errors')
+        for warc in (warc1, warc2):
+            self.assertIn(f"Successfully verified {warc}.gz fixity", actual_log2,
+                          "Problem with test for seed with two WARCs, log: WARC_Fixity_Errors")
+        actual_log3 = self.seed_log.value(2, 'WARC_Unzip_Errors')
+        expected_log3 = f"Successfully unzipped {warc1}.gz; Successfully unzipped {warc2}.gz"
+        self.assertEqual(actual_log3, expected_log3,
+                         "Problem with test for seed with two WARCs, log: WARC_Unzip_Errors")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Tests for the file_checksums() function.
+It calculates one or more checksums for a file, reading the file only once.
+"""
+import hashlib
+import os
+import unittest
+from web_functions import file_checksums
+
+
+class TestFileChecksums(unittest.TestCase):
+
+    def tearDown(self):
+        """
+        Deletes the file made by the test.
+        """
+        os.remove("checksum_test.warc")
+
+    def test_one_algorithm(self):
+        """
+        Tests that the function returns the correct checksum when one algorithm is requested.
+        """
+        with open("checksum_test.warc", "wb") as file:
+            file.write(b"WARC/1.0 test content")
+        actual = file_checksums("checksum_test.warc", ["sha256"])
+        expected = {"sha256": hashlib.sha256(b"WARC/1.0 test content").hexdigest()}
+        self.assertEqual(actual, expected, "Problem with test for one algorithm")
+
+    def test_three_algorithms(self):
+        """
+        Tests that the function returns the correct checksums when three algorithms are requested
+        and the file is larger than the size read at one time.
+        """
+        content = os.urandom(3 * 1024 * 1024 + 5)
+        with open("checksum_test.warc", "wb") as file:
+            file.write(content)
+        actual = file_checksums("checksum_test.warc", ["md5", "sha1", "sha256"])
+        expected = {"md5": hashlib.md5(content).hexdigest(),
+                    "sha1": hashlib.sha1(content).hexdigest(),
+                    "sha256": hashlib.sha256(content).hexdigest()}
+        self.assertEqual(actual, expected, "Problem with test for three algorithms")
+
+
+if __name__ == '__main__':
+    unittest.main()
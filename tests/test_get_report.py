@@ -7,7 +7,8 @@ import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import get_report
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, get_report
 
 
 def csv_to_list(csv_path):
@@ -24,29 +25,32 @@ def csv_to_list(csv_path):
     return row_list
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestGetReport(unittest.TestCase):
 
     def setUp(self):
         """
-        Makes a dataframe, seed folder, and seed for one Russell and one MAGIL seed.
+        Makes a seed log, seed folder, and seed for one Russell and one MAGIL seed.
         The MAGIL seed is for testing empty reports and the Russell seed is used for the rest.
         """
-        # Makes the dataframe with metadata for both the Russell and MAGIL seeds.
+        # Makes the seed log with metadata for both the Russell and MAGIL seeds.
         columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                         "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-        self.seed_df = pd.DataFrame([["rbrl-1", "2027707", 12265, "943048", 0.01, 1, "AIT-12265-T-JOB-SEED.warc.gz",
-                                      "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
-                                     ["magil-1", "2783596", 15678, "1789232", 0.01, 1, "AIT-15678-T-JOB-SEED.warc.gz",
-                                      "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]],
-                                    columns=columns_list)
+        self.seed_log = SeedLog(pd.DataFrame([["rbrl-1", "2027707", 12265, "943048", 0.01, 1,
+                                               "AIT-12265-T-JOB-SEED.warc.gz", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD",
+                                               "TBD"],
+                                              ["magil-1", "2783596", 15678, "1789232", 0.01, 1,
+                                               "AIT-15678-T-JOB-SEED.warc.gz", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD",
+                                               "TBD"]],
+                                             columns=columns_list))
 
         # Makes the seed and seed folder for the Russell seed.
-        self.seed_rbrl = [seed for seed in self.seed_df.itertuples()][0]
+        self.seed_rbrl = self.seed_log.records[0]
         os.mkdir("2027707")
 
         # Makes the seed and seed folder for the MAGIL seed.
-        self.seed_magil = [seed for seed in self.seed_df.itertuples()][1]
+        self.seed_magil = self.seed_log.records[1]
         os.mkdir("2783596")
 
     def tearDown(self):
@@ -65,8 +69,8 @@ class TestGetReport(unittest.TestCase):
         Tests that the function updates the log if there is an API error.
         The error is caused by giving it improperly formatted collection number.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "collection", "abc-coll", "scope_rule", "rbrl-1_collscope.csv")
-        actual_error = self.seed_df.at[0, 'Metadata_Report_Errors']
+        get_report(self.seed_rbrl, self.seed_log, 0, "collection", "abc-coll", "scope_rule", "rbrl-1_collscope.csv")
+        actual_error = self.seed_log.value(0, 'Metadata_Report_Errors')
         expected_error = "rbrl-1_collscope.csv API Error 500"
         self.assertEqual(actual_error, expected_error, "Problem with test for API error")
 
@@ -75,7 +79,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct collection report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "id", "12265", "collection", "rbrl-1_coll.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "id", "12265", "collection", "rbrl-1_coll.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_coll.csv"))
         expected = [["account", "created_by", "created_date", "custom_user_agent", "deleted", "id", "image",
                      "last_crawl_date", "last_updated_by", "last_updated_date", "metadata.Collector.0.id",
@@ -88,10 +92,10 @@ class TestGetReport(unittest.TestCase):
                      "2022-12-05T21:20:48.348624Z", "ahanson", "2020-07-27T14:24:29.521230Z", 5035337,
                      "Richard B. Russell Library for Political Research and Studies", 5035338, "Captured 2019-",
                      5035357, "This collection contains websites documenting political activity in the state of "
-                              "Georgia including those created by political candidates, elected officials, and "
-                              "political parties.",
+                     "Georgia including those created by political candidates, elected officials, and "
+                     "political parties.",
                      5962149, "https://wayback.archive-it.org/12265/*/https://www.youtube.com/channel/"
-                              "UC-LF69SBOSgT1S1-yy-VgaA/videos?view=0&sort=dd&shelf_id=0",
+                     "UC-LF69SBOSgT1S1-yy-VgaA/videos?view=0&sort=dd&shelf_id=0",
                      5035336, "Georgia Politics", "Georgia Politics", 79, 0, False, True, "ACTIVE", "", 432086921613]]
         self.assertEqual(actual, expected, "Problem with test for collection")
 
@@ -100,7 +104,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct collection scope report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "collection", "12265", "scope_rule", "rbrl-1_collscope.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "collection", "12265", "scope_rule", "rbrl-1_collscope.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_collscope.csv"))
         expected = [["abstract_scope_rule", "account", "collection", "created_by", "created_date", "enabled",
                      "host", "id", "last_updated_by", "last_updated_date", "scope_rule_template", "seed", "type",
@@ -119,14 +123,14 @@ class TestGetReport(unittest.TestCase):
         Tests that the function does not download an empty collection scope report.
         This is one of two reports (the other is seed scope) that does not always have data.
         """
-        get_report(self.seed_magil, self.seed_df, 1, "collection", "15678", "scope_rule", "magil-1_collscope.csv")
+        get_report(self.seed_magil, self.seed_log, 1, "collection", "15678", "scope_rule", "magil-1_collscope.csv")
 
         # Test that the file was not made.
         csv_path_exists = os.path.exists(os.path.join(os.getcwd(), "2783596", "magil-1_collscope.csv"))
         self.assertEqual(csv_path_exists, False, "Problem with test for collection scope is empty, is file made")
 
-        # Test that the log information in seed_df was updated.
-        actual_info = self.seed_df.at[1, 'Metadata_Report_Empty']
+        # Test that the log information in seed_log was updated.
+        actual_info = self.seed_log.value(1, 'Metadata_Report_Empty')
         expected_info = "magil-1_collscope.csv"
         self.assertEqual(actual_info, expected_info, "Problem with test for seed scope is empty, log")
 
@@ -135,7 +139,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct crawl definition report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "id", "31104250630", "crawl_definition", "rbrl-1_31104250630_crawldef.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "id", "31104250630", "crawl_definition", "rbrl-1_31104250630_crawldef.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_31104250630_crawldef.csv"))
         expected = [['account', 'brozzler', 'byte_limit', 'collection', 'crawl_queue', 'crawl_technology',
                      'created_at', 'document_limit', 'id', 'last_crawl_datetime', 'last_crawl_job_id',
@@ -152,7 +156,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct crawl job report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "id", "943048", "crawl_job", "rbrl-1_943048_crawljob.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "id", "943048", "crawl_job", "rbrl-1_943048_crawljob.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_943048_crawljob.csv"))
         expected = [["account", "brozzler", "collection", "crawl_definition", "doc_rate", "downloaded_count",
                      "duplicate_bytes", "duplicate_count", "elapsed_ms", "end_date", "id", "novel_bytes",
@@ -169,7 +173,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct seed report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "id", "2027707", "seed", "rbrl-1_seed.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "id", "2027707", "seed", "rbrl-1_seed.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_seed.csv"))
         expected = [["active", "canonical_url", "collection", "created_by", "created_date", "deleted",
                      "http_response_code", "id", "last_checked_http_response_code", "last_updated_by",
@@ -198,7 +202,7 @@ class TestGetReport(unittest.TestCase):
         Tests that the function downloads the correct seed scope report.
         The result for testing is the contents of the report.
         """
-        get_report(self.seed_rbrl, self.seed_df, 0, "seed", "2027707", "scope_rule", "rbrl-1_seedscope.csv")
+        get_report(self.seed_rbrl, self.seed_log, 0, "seed", "2027707", "scope_rule", "rbrl-1_seedscope.csv")
         actual = csv_to_list(os.path.join(os.getcwd(), "2027707", "rbrl-1_seedscope.csv"))
         expected = [["abstract_scope_rule", "account", "collection", "created_by", "created_date", "enabled",
                      "host", "id", "last_updated_by", "last_updated_date", "scope_rule_template", "seed",
@@ -213,14 +217,14 @@ class TestGetReport(unittest.TestCase):
         Tests that the function does not download an empty seed scope report.
         This is one of two reports (the other is collection scope) that does not always have data.
         """
-        get_report(self.seed_magil, self.seed_df, 1, "seed", "2783596", "scope_rule", "magil-1_seedscope.csv")
+        get_report(self.seed_magil, self.seed_log, 1, "seed", "2783596", "scope_rule", "magil-1_seedscope.csv")
 
         # Test that the file was not made.
         csv_path_exists = os.path.exists(os.path.join(os.getcwd(), "2783596", "2783596_seedscope.csv"))
         self.assertEqual(csv_path_exists, False, "Problem with test for seed scope is empty, is file made")
 
-        # Test that the log information in seed_df was updated.
-        actual_info = self.seed_df.at[1, 'Metadata_Report_Empty']
+        # Test that the log information in seed_log was updated.
+        actual_info = self.seed_log.value(1, 'Metadata_Report_Empty')
         expected_info = "magil-1_seedscope.csv"
         self.assertEqual(actual_info, expected_info, "Problem with test for seed scope is empty, log")
 
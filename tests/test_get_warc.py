@@ -2,29 +2,31 @@
 Tests for get_warc() function.
 It downloads and saves the WARC.
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
-and seed_df only has the WARC being tested, no other WARCs for that seed.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
+and seed_log only has the WARC being tested, no other WARCs for that seed.
 """
 import os
 import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import get_warc
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, get_warc
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestGetWarc(unittest.TestCase):
 
     def tearDown(self):
@@ -42,17 +44,17 @@ class TestGetWarc(unittest.TestCase):
         """
         # Makes the data needed for the function input and runs the function.
         warc = "ARCHIVEIT-15678-TEST-JOB1594318-0-SEED2529656-20220420025307556-00000-k3n6tj0y.warc.gz"
-        seed_df = make_df(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
         os.mkdir("2529656")
-        get_warc(seed_df, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, f"2529656/{warc}")
+        get_warc(seed_log, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, f"2529656/{warc}")
 
         # Test the WARC was downloaded.
         warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2529656", warc))
         self.assertEqual(warc_downloaded, True, "Problem with test for correct, WARC download")
 
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Download_Errors']
+        actual = seed_log.value(0, 'WARC_Download_Errors')
         expected = f"Successfully downloaded {warc}"
         self.assertEqual(actual, expected, "Problem with test for correct, log")
 
@@ -63,19 +65,19 @@ class TestGetWarc(unittest.TestCase):
         """
         # Makes the data needed for the function input and runs the function.
         warc = "ARCHIVEIT-error.warc.gz"
-        seed_df = make_df(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
-                            "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
         os.mkdir("2529656")
 
         with self.assertRaises(ValueError):
-            get_warc(seed_df, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, f"2529656/{warc}")
+            get_warc(seed_log, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, f"2529656/{warc}")
 
         # Test the WARC was not downloaded.
         warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2529656", warc))
         self.assertEqual(warc_downloaded, False, "Problem with test for error, WARC download")
 
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Download_Errors']
+        actual = seed_log.value(0, 'WARC_Download_Errors')
         expected = f"API Error 404: can't download ARCHIVEIT-error.warc.gz"
         self.assertEqual(actual, expected, "Problem with test for error, log")
 
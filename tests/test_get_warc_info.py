@@ -2,28 +2,30 @@
 Tests for get_warc_info() function.
 It gets the WARC URL and MD5 from WASAPI.
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
-and seed_df only has the WARC being tested, not other WARCs for that seed.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
+and seed_log only has the WARC being tested, not other WARCs for that seed.
 """
 import os
 import pandas as pd
 import unittest
 import configuration as config
-from web_functions import get_warc_info
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, get_warc_info
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestGetWarcInfo(unittest.TestCase):
 
     def tearDown(self):
@@ -39,33 +41,33 @@ class TestGetWarcInfo(unittest.TestCase):
         Tests that the function returns the expected values for a BMA WARC.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["harg-1", 2028986, 12470, "1085452", 0.01, 1,
-                           "ARCHIVEIT-12470-TEST-JOB1085452-SEED2028986-20200129213514425-00000-h3.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        warc_url, warc_md5 = get_warc_info(seed_df.at[0, 'WARC_Filenames'], seed_df, 0)
+        seed_log = make_log(["harg-1", 2028986, 12470, "1085452", 0.01, 1,
+                             "ARCHIVEIT-12470-TEST-JOB1085452-SEED2028986-20200129213514425-00000-h3.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        warc_url, warc_checksums, warc_size = get_warc_info(seed_log.value(0, 'WARC_Filenames'), seed_log, 0)
 
         # Test for the URL.
-        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_df.at[0, 'WARC_Filenames']}"
+        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_log.value(0, 'WARC_Filenames')}"
         self.assertEqual(warc_url, expected_url, "Problem with test for BMA, URL")
 
         # Test for the MD5.
         expected_md5 = "60d789913d1f4dfb7e8c0c67a6a57505"
-        self.assertEqual(warc_md5, expected_md5, "Problem with test for BMA, MD5")
+        self.assertEqual(warc_checksums['md5'], expected_md5, "Problem with test for BMA, MD5")
 
     def test_error(self):
         """
         Tests that the function raises an IndexError and updates the log for a WARC that is not in Archive-It
         """
         # Makes the data needed for the function input.
-        seed_df = make_df(["harg-1", 2173769, 12912, "362980", 0.01, 1, "ARCHIVEIT-ERROR-SEED2173769.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["harg-1", 2173769, 12912, "362980", 0.01, 1, "ARCHIVEIT-ERROR-SEED2173769.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
 
         # Test for raising the error.
         with self.assertRaises(IndexError):
-            get_warc_info(seed_df.at[0, 'WARC_Filenames'], seed_df, 0)
+            get_warc_info(seed_log.value(0, 'WARC_Filenames'), seed_log, 0)
 
         # Test for the log.
-        actual = seed_df.at[0, 'WARC_Download_Errors']
+        actual = seed_log.value(0, 'WARC_Download_Errors')
         expected = "Index Error: cannot get the WARC URL or MD5 for ARCHIVEIT-ERROR-SEED2173769.warc.gz"
         self.assertEqual(actual, expected, "Problem with error, log")
 
@@ -74,54 +76,54 @@ class TestGetWarcInfo(unittest.TestCase):
         Tests that the function returns the expected values for a Hargrett WARC.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["harg-1", 2173769, 12912, "362980", 0.01, 1,
-                           "ARCHIVEIT-12912-WEEKLY-JOB1362980-SEED2173769-20210210221704177-00000-h3.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        warc_url, warc_md5 = get_warc_info(seed_df.at[0, 'WARC_Filenames'], seed_df, 0)
+        seed_log = make_log(["harg-1", 2173769, 12912, "362980", 0.01, 1,
+                             "ARCHIVEIT-12912-WEEKLY-JOB1362980-SEED2173769-20210210221704177-00000-h3.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        warc_url, warc_checksums, warc_size = get_warc_info(seed_log.value(0, 'WARC_Filenames'), seed_log, 0)
 
         # Test for the URL.
-        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_df.at[0, 'WARC_Filenames']}"
+        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_log.value(0, 'WARC_Filenames')}"
         self.assertEqual(warc_url, expected_url, "Problem with test for Hargrett, URL")
 
         # Test for the MD5.
         expected_md5 = "2d4646eb04920325ba3d9538d56e93ff"
-        self.assertEqual(warc_md5, expected_md5, "Problem with test for Hargrett, MD5")
+        self.assertEqual(warc_checksums['md5'], expected_md5, "Problem with test for Hargrett, MD5")
 
     def test_magil(self):
         """
         Tests that the function returns the expected values for a MAGIL WARC.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["magil-1", 2529646, 15678, "1585231", 0.01, 1,
-                           "ARCHIVEIT-15678-TEST-JOB1585231-SEED2529646-20220406065532448-00002-h3.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        warc_url, warc_md5 = get_warc_info(seed_df.at[0, 'WARC_Filenames'], seed_df, 0)
+        seed_log = make_log(["magil-1", 2529646, 15678, "1585231", 0.01, 1,
+                             "ARCHIVEIT-15678-TEST-JOB1585231-SEED2529646-20220406065532448-00002-h3.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        warc_url, warc_checksums, warc_size = get_warc_info(seed_log.value(0, 'WARC_Filenames'), seed_log, 0)
 
         # Test for the URL.
-        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_df.at[0, 'WARC_Filenames']}"
+        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_log.value(0, 'WARC_Filenames')}"
         self.assertEqual(warc_url, expected_url, "Problem with test for MAGIL, URL")
 
         # Test for the MD5.
         expected_md5 = "220ca00b247a3110533f3810e458722f"
-        self.assertEqual(warc_md5, expected_md5, "Problem with test for MAGIL, MD5")
+        self.assertEqual(warc_checksums['md5'], expected_md5, "Problem with test for MAGIL, MD5")
 
     def test_russell(self):
         """
         Tests that the function returns the expected values for a Russell WARC.
         """
         # Makes the data needed for the function input and runs the function.
-        seed_df = make_df(["rbrl-1", 2027713, 12264, "943066", 0.01, 1,
-                           "ARCHIVEIT-12264-TEST-JOB943066-SEED2027713-20190709150720209-00000-h3.warc.gz",
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        warc_url, warc_md5 = get_warc_info(seed_df.at[0, 'WARC_Filenames'], seed_df, 0)
+        seed_log = make_log(["rbrl-1", 2027713, 12264, "943066", 0.01, 1,
+                             "ARCHIVEIT-12264-TEST-JOB943066-SEED2027713-20190709150720209-00000-h3.warc.gz",
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        warc_url, warc_checksums, warc_size = get_warc_info(seed_log.value(0, 'WARC_Filenames'), seed_log, 0)
 
         # Test for the URL.
-        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_df.at[0, 'WARC_Filenames']}"
+        expected_url = f"https://warcs.archive-it.org/webdatafile/{seed_log.value(0, 'WARC_Filenames')}"
         self.assertEqual(warc_url, expected_url, "Problem with test for Hargrett, URL")
 
         # Test for the MD5.
         expected_md5 = "941b25ea237edcf3a5dd5aea80e812eb"
-        self.assertEqual(warc_md5, expected_md5, "Problem with test for Hargrett, MD5")
+        self.assertEqual(warc_checksums['md5'], expected_md5, "Problem with test for Hargrett, MD5")
 
 
 if __name__ == '__main__':
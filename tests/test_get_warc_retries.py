@@ -0,0 +1,93 @@
+"""
+Tests for get_warc() retrying a WARC that cannot be downloaded.
+The request for each transfer is retried by api_get(), and only a transfer that was interrupted is restarted,
+so the retries are not repeated for every restart.
+
+The API responses are replaced with values set by each test, so the tests can have errors on purpose
+and do not wait for the real backoff time.
+"""
+import os
+import requests
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from test_get_warc import make_log
+from web_functions import get_warc
+
+
+def interrupted_response(status_code):
+    """
+    Makes a response that sends some bytes of the WARC and then has a dropped connection.
+    """
+    def iter_content(chunk_size):
+        yield b"partial"
+        raise requests.exceptions.ChunkedEncodingError()
+
+    response = mock.Mock(status_code=status_code, headers={})
+    response.iter_content.side_effect = iter_content
+    return response
+
+
+class TestGetWarcRetries(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Uses a retry policy for get_warc without waiting, and makes the seed folder and seed log.
+        """
+        policies = {"get_warc": {"attempts": 3, "base_seconds": 0, "max_seconds": 0}}
+        self.patches = [mock.patch.object(web_functions.config, "retry_policies", policies, create=True),
+                        mock.patch.object(web_functions, "TRANSFER_RESTARTS", 2)]
+        for patch in self.patches:
+            patch.start()
+        os.mkdir("2529656")
+        self.warc = "test.warc.gz"
+        self.warc_path = os.path.join("2529656", self.warc)
+        self.seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, self.warc,
+                                  "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+
+    def tearDown(self):
+        """
+        Restores the retry policy and restarts, and deletes the seed folder and seeds_log.csv.
+        """
+        for patch in self.patches:
+            patch.stop()
+        for filename in os.listdir("2529656"):
+            os.remove(os.path.join("2529656", filename))
+        os.rmdir("2529656")
+        os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+
+    def test_connection_error(self):
+        """
+        Tests that a connection error on every attempt is only retried by api_get(), not restarted by get_warc().
+        """
+        with mock.patch("web_functions.requests.get", side_effect=requests.exceptions.ConnectionError()) as get:
+            with self.assertRaises(ValueError):
+                get_warc(self.seed_log, 0, "https://get-warc-retries.example.org/test.warc.gz", self.warc,
+                         self.warc_path)
+        self.assertEqual(get.call_count, 3, "Problem with test for connection error, requests")
+        self.assertEqual(self.seed_log.value(0, "WARC_Download_Errors"),
+                         f"API Error ConnectionError: can't download {self.warc}",
+                         "Problem with test for connection error, log")
+        self.assertEqual(os.path.exists(self.warc_path), False, "Problem with test for connection error, file")
+
+    def test_interrupted(self):
+        """
+        Tests that a transfer which is interrupted every time is restarted up to TRANSFER_RESTARTS times,
+        with one request for each transfer.
+        """
+        responses = [interrupted_response(200), interrupted_response(206), interrupted_response(206)]
+        with mock.patch("web_functions.requests.get", side_effect=responses) as get:
+            with self.assertRaises(ValueError):
+                get_warc(self.seed_log, 0, "https://get-warc-retries.example.org/test.warc.gz", self.warc,
+                         self.warc_path)
+        actual_ranges = [call.kwargs["headers"].get("Range") for call in get.call_args_list]
+        self.assertEqual(actual_ranges, [None, "bytes=7-", "bytes=14-"], "Problem with test for interrupted, requests")
+        self.assertEqual(self.seed_log.value(0, "WARC_Download_Errors"),
+                         f"Error: download of {self.warc} was interrupted 3 times, last by ChunkedEncodingError",
+                         "Problem with test for interrupted, log")
+        self.assertEqual(os.path.exists(self.warc_path), False, "Problem with test for interrupted, file")
+
+
+if __name__ == '__main__':
+    unittest.main()
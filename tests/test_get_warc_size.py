@@ -0,0 +1,112 @@
+"""
+Tests for get_warc() checking the number of bytes in the transfer against the WARC size from WASAPI.
+
+The WARC is served by a local web server which sends the wrong number of bytes for the first request,
+so the tests do not need the Archive-It API.
+"""
+import hashlib
+import http.server
+import os
+import threading
+import unittest
+import configuration as config
+from test_get_warc import make_log
+from web_functions import get_warc
+
+DATA = os.urandom(200000)
+
+
+class WrongSizeHandler(http.server.BaseHTTPRequestHandler):
+    """Sends the body for the first request from FIRST, without a Content-Length unless LENGTH is set,
+    and after that sends DATA, or the requested range of DATA."""
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("Range"))
+        start = int(self.headers["Range"][6:-1]) if "Range" in self.headers else 0
+        body = self.server.first if len(self.requests) == 1 else DATA[start:]
+        self.send_response(206 if start else 200)
+        if self.server.length or len(self.requests) > 1:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestGetWarcSize(unittest.TestCase):
+
+    def start_server(self, first, length=False, warc_size=len(DATA)):
+        """
+        Starts the local web server with the body for the first request and downloads the WARC,
+        using warc_size as the size from WASAPI.
+        """
+        WrongSizeHandler.requests = []
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), WrongSizeHandler)
+        self.server.first = first
+        self.server.length = length
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        os.mkdir("2529656")
+
+        warc = "test.warc.gz"
+        seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        url = f"http://127.0.0.1:{self.server.server_port}/{warc}"
+        checksums = get_warc(seed_log, 0, url, warc, os.path.join("2529656", warc), warc_size)
+        with open(os.path.join("2529656", warc), "rb") as warc_file:
+            return checksums, warc_file.read(), seed_log.value(0, "WARC_Download_Errors")
+
+    def tearDown(self):
+        """
+        Stops the local web server and deletes the seed folder and seeds_log.csv.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        for filename in os.listdir("2529656"):
+            os.remove(os.path.join("2529656", filename))
+        os.rmdir("2529656")
+        os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+
+    def test_short(self):
+        """
+        Tests that a transfer which ends early is resumed from the last byte received.
+        """
+        checksums, content, log = self.start_server(DATA[:120000])
+        self.assertEqual(WrongSizeHandler.requests, [None, "bytes=120000-"], "Problem with test for short, requests")
+        self.assertEqual(content, DATA, "Problem with test for short, file")
+        self.assertEqual(checksums["md5"], hashlib.md5(DATA).hexdigest(), "Problem with test for short, MD5")
+        self.assertEqual(log, "Successfully downloaded test.warc.gz", "Problem with test for short, log")
+
+    def test_overlong(self):
+        """
+        Tests that a transfer with more bytes than the WASAPI size is stopped and started over.
+        """
+        checksums, content, log = self.start_server(DATA + b"extra")
+        self.assertEqual(WrongSizeHandler.requests, [None, None], "Problem with test for overlong, requests")
+        self.assertEqual(content, DATA, "Problem with test for overlong, file")
+        self.assertEqual(checksums["md5"], hashlib.md5(DATA).hexdigest(), "Problem with test for overlong, MD5")
+
+    def test_content_length(self):
+        """
+        Tests that a transfer with the wrong Content-Length is stopped before any of it is saved.
+        """
+        checksums, content, log = self.start_server(DATA[:1000], length=True)
+        self.assertEqual(WrongSizeHandler.requests, [None, None], "Problem with test for Content-Length, requests")
+        self.assertEqual(content, DATA, "Problem with test for Content-Length, file")
+
+    def test_stale_wasapi_size(self):
+        """
+        Tests that when the API sends the same Content-Length again after a restart, it is used instead of
+        the size from WASAPI, and the difference is logged.
+        """
+        checksums, content, log = self.start_server(DATA, length=True, warc_size=len(DATA) + 1000)
+        self.assertEqual(WrongSizeHandler.requests, [None, None], "Problem with test for stale WASAPI size, requests")
+        self.assertEqual(content, DATA, "Problem with test for stale WASAPI size, file")
+        self.assertEqual(log, f"Archive-It sent {len(DATA)} bytes for test.warc.gz instead of the {len(DATA) + 1000} "
+                              f"bytes in WASAPI; Successfully downloaded test.warc.gz",
+                         "Problem with test for stale WASAPI size, log")
+
+
+if __name__ == '__main__':
+    unittest.main()
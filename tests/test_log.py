@@ -1,12 +1,12 @@
 """
 Tests for the log() function.
-It updates and returns a dataframe with the log message and also saves the data to a spreadsheet.
+It adds the log message to the seed log and also saves the data to a spreadsheet.
 """
 import os
 import pandas as pd
 import unittest
 import configuration as config
-from web_functions import log
+from web_functions import SeedLog, log
 
 
 def csv_to_list(csv_path):
@@ -23,19 +23,19 @@ class TestLog(unittest.TestCase):
 
     def setUp(self):
         """
-        Makes a dataframe and a CSV to use as the starting point for each test.
+        Makes a seed log and a CSV to use as the starting point for each test.
         """
-        row_list = [[1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz",
+        row_list = [["aip-1", 1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz",
                      "Successfully downloaded all metadata reports", "No empty reports",
                      "TBD", "TBD", "TBD", "TBD", "TBD"],
-                    [2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
+                    ["aip-2", 2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
                      "Successfully downloaded all metadata reports", "2222222_seedscope.csv",
                      "TBD", "TBD", "TBD", "TBD", "TBD"]]
-        columns_list = ["Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+        columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                         "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-        self.seed_df = pd.DataFrame(row_list, columns=columns_list)
-        self.seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+        self.seed_log = SeedLog(pd.DataFrame(row_list, columns=columns_list))
+        self.seed_log.save()
 
     def tearDown(self):
         """
@@ -48,30 +48,31 @@ class TestLog(unittest.TestCase):
         Tests that the function returns the correct dataframe and correctly updates the CSV
         when there is not already a message of this type in the dataframe.
         """
-        log("Successfully downloaded ARCHIVEIT.warc.gz", self.seed_df, 0, "WARC_Download_Errors")
+        log("Successfully downloaded ARCHIVEIT.warc.gz", self.seed_log, 0, "WARC_Download_Errors")
         
         # Test that the dataframe has the correct values.
-        actual_df = [self.seed_df.columns.tolist()] + self.seed_df.values.tolist()
-        expected_df = [["Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+        seed_df = self.seed_log.to_df()
+        actual_df = [seed_df.columns.tolist()] + seed_df.values.tolist()
+        expected_df = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                         "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"],
-                       [1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz", 
+                       ["aip-1", 1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz", 
                         "Successfully downloaded all metadata reports", "No empty reports", "TBD",
-                        "Successfully downloaded ARCHIVEIT.warc.gz", "TBD", "TBD", "TBD"],
-                       [2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
+                        "Successfully downloaded 1 of 1 WARCs", "TBD", "TBD", "TBD"],
+                       ["aip-2", 2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
                         "Successfully downloaded all metadata reports", "2222222_seedscope.csv",
                         "TBD", "TBD", "TBD", "TBD", "TBD"]]
         self.assertEqual(actual_df, expected_df, "Problem with test for first message, dataframe values")
 
         # Test that the CSV has the correct values.
         actual_csv = csv_to_list(os.path.join(config.script_output, "seeds_log.csv"))
-        expected_csv = [["Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+        expected_csv = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                          "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                          "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"],
-                        [1111111, 12345, 1100000, 0.52, 1, "ARCHIVEIT.warc.gz",
+                        ["aip-1", 1111111, 12345, 1100000, 0.52, 1, "ARCHIVEIT.warc.gz",
                          "Successfully downloaded all metadata reports", "No empty reports",
-                         "TBD", "Successfully downloaded ARCHIVEIT.warc.gz", "TBD", "TBD", "TBD"],
-                        [2222222, 12345, 2200000, 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
+                         "TBD", "Successfully downloaded 1 of 1 WARCs", "TBD", "TBD", "TBD"],
+                        ["aip-2", 2222222, 12345, 2200000, 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
                          "Successfully downloaded all metadata reports", "2222222_seedscope.csv",
                          "TBD", "TBD", "TBD", "TBD", "TBD"]]
         self.assertEqual(actual_csv, expected_csv, "Problem with test for first message, CSV values")
@@ -81,30 +82,31 @@ class TestLog(unittest.TestCase):
         Tests that the function returns the correct dataframe and correctly updates the CSV
         when there is already a message of this type in the dataframe.
         """
-        log("2222222_collscope.csv", self.seed_df, 1, "Metadata_Report_Empty")
+        log("2222222_collscope.csv", self.seed_log, 1, "Metadata_Report_Empty")
 
         # Test that the dataframe has the correct values.
-        actual_df = [self.seed_df.columns.tolist()] + self.seed_df.values.tolist()
-        expected_df = [["Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+        seed_df = self.seed_log.to_df()
+        actual_df = [seed_df.columns.tolist()] + seed_df.values.tolist()
+        expected_df = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                         "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"],
-                       [1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz",
+                       ["aip-1", 1111111, 12345, "1100000", 0.52, 1, "ARCHIVEIT.warc.gz",
                         "Successfully downloaded all metadata reports", "No empty reports",
                         "TBD", "TBD", "TBD", "TBD", "TBD"],
-                       [2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
+                       ["aip-2", 2222222, 12345, "2200000", 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
                         "Successfully downloaded all metadata reports", "2222222_seedscope.csv; 2222222_collscope.csv",
                         "TBD", "TBD", "TBD", "TBD", "TBD"]]
         self.assertEqual(actual_df, expected_df, "Problem with test for second message, dataframe values")
 
         # Test that the CSV has the correct values.
         actual_csv = csv_to_list(os.path.join(config.script_output, "seeds_log.csv"))
-        expected_csv = [["Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+        expected_csv = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                          "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                          "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"],
-                        [1111111, 12345, 1100000, 0.52, 1, "ARCHIVEIT.warc.gz",
+                        ["aip-1", 1111111, 12345, 1100000, 0.52, 1, "ARCHIVEIT.warc.gz",
                          "Successfully downloaded all metadata reports", "No empty reports",
                          "TBD", "TBD", "TBD", "TBD", "TBD"],
-                        [2222222, 12345, 2200000, 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
+                        ["aip-2", 2222222, 12345, 2200000, 1.52, 2, "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz",
                          "Successfully downloaded all metadata reports",
                          "2222222_seedscope.csv; 2222222_collscope.csv", "TBD", "TBD", "TBD", "TBD", "TBD"]]
         self.assertEqual(actual_csv, expected_csv, "Problem with test for second message, CSV values")
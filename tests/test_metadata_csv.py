@@ -7,9 +7,11 @@ import pandas as pd
 import shutil
 import unittest
 import configuration as config
+from archive_it_available import SKIP_REASON, archive_it_available
 from web_functions import metadata_csv
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestMetadataCSV(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,136 @@
+"""
+Tests for Metrics, which counts what the download is doing for Prometheus, and for the metrics from api_get().
+"""
+import os
+import requests
+import socket
+import tempfile
+import unittest
+from unittest import mock
+import web_functions
+from mock_archive_it import MockArchiveIt
+from observability import Metrics, Tracer
+from web_functions import api_get
+
+
+def free_port():
+    """
+    Returns a port on this machine that is not being used.
+    """
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+def samples(text):
+    """
+    Returns the metric lines (not HELP or TYPE) of the Prometheus text format as a dictionary of name to value.
+    """
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a temporary folder for the metrics file.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.textfile = os.path.join(self.temp_dir.name, "ait_download.prom")
+
+    def tearDown(self):
+        """
+        Deletes the temporary folder.
+        """
+        self.temp_dir.cleanup()
+
+    def test_render(self):
+        """
+        Tests the Prometheus text format for a counter with labels, a gauge, and a histogram.
+        """
+        metrics = Metrics(textfile=self.textfile)
+        metrics.inc("ait_api_requests_total", endpoint="get_warc", status="200")
+        metrics.inc("ait_api_requests_total", endpoint="get_warc", status="200")
+        metrics.set("ait_warcs_queued", 5)
+        metrics.observe("ait_step_seconds", 2, step="get_warc")
+        text = metrics.render()
+
+        self.assertIn("# TYPE ait_api_requests_total counter", text, "Problem with test for render, type")
+        actual = samples(text)
+        expected = {'ait_api_requests_total{endpoint="get_warc",status="200"}': 2, "ait_warcs_queued": 5,
+                    'ait_step_seconds_bucket{step="get_warc",le="1"}': 0,
+                    'ait_step_seconds_bucket{step="get_warc",le="5"}': 1,
+                    'ait_step_seconds_bucket{step="get_warc",le="+Inf"}': 1,
+                    'ait_step_seconds_sum{step="get_warc"}': 2, 'ait_step_seconds_count{step="get_warc"}': 1}
+        self.assertEqual({key: actual[key] for key in expected}, expected, "Problem with test for render, values")
+
+    def test_disabled(self):
+        """
+        Tests that nothing is counted when there is no port or file.
+        """
+        metrics = Metrics()
+        metrics.inc("ait_bytes_downloaded_total", 100)
+        metrics.observe("ait_step_seconds", 1, step="log")
+        self.assertEqual(samples(metrics.render()), {}, "Problem with test for disabled")
+
+    def test_textfile(self):
+        """
+        Tests that stop() saves the metrics file, with no temporary file left.
+        """
+        metrics = Metrics(textfile=self.textfile, interval=60)
+        metrics.start()
+        metrics.inc("ait_bytes_downloaded_total", 100)
+        metrics.stop()
+        with open(self.textfile) as metrics_file:
+            actual = samples(metrics_file.read())["ait_bytes_downloaded_total"]
+        self.assertEqual(actual, 100, "Problem with test for textfile")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["ait_download.prom"], "Problem with test for textfile, tmp")
+
+    def test_web_page(self):
+        """
+        Tests that the metrics can be scraped from the web page while it runs.
+        """
+        metrics = Metrics(port=free_port())
+        metrics.start()
+        try:
+            metrics.inc("ait_warcs_total", status="Successfully completed")
+            response = requests.get(f"http://127.0.0.1:{metrics.port}/metrics")
+        finally:
+            metrics.stop()
+        actual = [response.status_code, samples(response.text)['ait_warcs_total{status="Successfully completed"}']]
+        self.assertEqual(actual, [200, 1], "Problem with test for web page")
+
+    def test_span(self):
+        """
+        Tests that a span adds its time to the step histogram when there is no trace file, except for API calls.
+        """
+        metrics = Metrics(textfile=self.textfile)
+        tracer = Tracer(None, metrics)
+        with tracer.span("unzip_warc", "warc"):
+            pass
+        with tracer.span("api_get get_warc", "api"):
+            pass
+        actual = [key for key in samples(metrics.render()) if key.startswith("ait_step_seconds_count")]
+        self.assertEqual(actual, ['ait_step_seconds_count{step="unzip_warc"}'], "Problem with test for span")
+
+    def test_api_get(self):
+        """
+        Tests that api_get() counts requests by status and the retries, using the mock Archive-It.
+        """
+        metrics = Metrics(textfile=self.textfile)
+        with MockArchiveIt.synthetic(seeds=1, warcs=1, warc_bytes=1000) as server, \
+                mock.patch.object(web_functions, "METRICS", metrics), \
+                mock.patch("web_functions.time.sleep"):
+            server.set_faults({"webdata": {"error_rate": 1, "error_status": 503, "max_faults": 1}})
+            api_get(server.config_values()["wasapi"], "get_warc_info", auth=(server.username, server.password))
+        actual = samples(metrics.render())
+        expected = {'ait_api_requests_total{endpoint="get_warc_info",status="503"}': 1,
+                    'ait_api_requests_total{endpoint="get_warc_info",status="200"}': 1,
+                    'ait_api_retries_total{endpoint="get_warc_info"}': 1,
+                    'ait_api_request_seconds_count{endpoint="get_warc_info"}': 2}
+        self.assertEqual({key: actual.get(key) for key in expected}, expected, "Problem with test for api_get")
+
+
+if __name__ == '__main__':
+    unittest.main()
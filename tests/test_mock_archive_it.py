@@ -0,0 +1,247 @@
+"""
+Tests for the mock Archive-It server in mock_archive_it.py: the WASAPI and Partner API responses,
+and the download functions using it in place of Archive-It, so they can be tested without the network.
+"""
+import gzip
+import hashlib
+import os
+import requests
+import shutil
+import time
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from mock_archive_it import MockArchiveIt
+from web_functions import SeedLog, check_config, download_metadata, download_warc, get_warc, get_warc_sizes, seed_data
+
+
+class TestMockArchiveIt(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a server with two seeds that have two WARCs each.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=2, warcs=2, warc_bytes=5000).start()
+        self.auth = (self.server.username, self.server.password)
+        self.wasapi = self.server.config_values()["wasapi"]
+
+    def tearDown(self):
+        """
+        Stops the server.
+        """
+        self.server.stop()
+
+    def test_login(self):
+        """
+        Tests that the APIs require the username and password.
+        """
+        response = requests.get(self.wasapi)
+        self.assertEqual(response.status_code, 401, "Problem with test for login")
+
+    def test_webdata_filters(self):
+        """
+        Tests that WASAPI filters by store time, with the end date not included, and by filename.
+        """
+        params = {"store-time-after": "2023-04-25", "store-time-before": "2023-04-26"}
+        actual = requests.get(self.wasapi, params=params, auth=self.auth).json()["count"]
+        self.assertEqual(actual, 4, "Problem with test for webdata filters, store time")
+
+        params = {"store-time-after": "2023-04-24", "store-time-before": "2023-04-25"}
+        actual = requests.get(self.wasapi, params=params, auth=self.auth).json()["count"]
+        self.assertEqual(actual, 0, "Problem with test for webdata filters, end date")
+
+        warc = sorted(self.server.warcs)[0]
+        files = requests.get(self.wasapi, params={"filename": warc}, auth=self.auth).json()["files"]
+        self.assertEqual([file["filename"] for file in files], [warc], "Problem with test for webdata filters, name")
+
+    def test_webdata_pages(self):
+        """
+        Tests that WASAPI splits the results into pages with a link to the next page.
+        """
+        first = requests.get(self.wasapi, params={"page_size": 3}, auth=self.auth).json()
+        second = requests.get(first["next"], auth=self.auth).json()
+        actual = [len(first["files"]), len(second["files"]), second["next"]]
+        self.assertEqual(actual, [3, 1, None], "Problem with test for webdata pages")
+
+    def test_warc_file(self):
+        """
+        Tests that the WARC matches the checksums in WASAPI, unzips, and can be downloaded in parts with Range.
+        """
+        warc = sorted(self.server.warcs)[0]
+        info = requests.get(self.wasapi, params={"filename": warc}, auth=self.auth).json()["files"][0]
+        content = requests.get(info["locations"][0], auth=self.auth).content
+        actual = [len(content), hashlib.md5(content).hexdigest(), hashlib.sha1(content).hexdigest()]
+        expected = [info["size"], info["checksums"]["md5"], info["checksums"]["sha1"]]
+        self.assertEqual(actual, expected, "Problem with test for WARC file, checksums")
+        self.assertTrue(gzip.decompress(content).startswith(b"WARC/1.0"), "Problem with test for WARC file, unzip")
+
+        response = requests.get(info["locations"][0], auth=self.auth, headers={"Range": "bytes=100-"})
+        actual_range = [response.status_code, response.content]
+        self.assertEqual(actual_range, [206, content[100:]], "Problem with test for WARC file, Range")
+
+    def test_report_csv(self):
+        """
+        Tests that a Partner API report is a CSV for the filter, and is empty if nothing matches the filter.
+        """
+        partner_api = self.server.config_values()["partner_api"]
+        params = {"id": 2000001, "format": "csv", "limit": -1}
+        report = requests.get(f"{partner_api}/seed", params=params, auth=self.auth).text
+        actual = [line.split(",")[0] for line in report.splitlines()]
+        self.assertEqual(actual, ["id", "2000001"], "Problem with test for report CSV, seed")
+
+        params = {"seed": 2000002, "format": "csv", "limit": -1}
+        report = requests.get(f"{partner_api}/scope_rule", params=params, auth=self.auth).text
+        self.assertEqual(report, "", "Problem with test for report CSV, empty")
+
+
+class TestFaults(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a server with one seed with one WARC.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=1, warcs=1, warc_bytes=200000).start()
+        self.auth = (self.server.username, self.server.password)
+        self.warc = list(self.server.warcs.values())[0]
+        self.warc_url = f"{self.server.url}/webdatafile/{self.warc['info']['filename']}"
+
+    def tearDown(self):
+        """
+        Stops the server.
+        """
+        self.server.stop()
+
+    def test_error_status(self):
+        """
+        Tests that an endpoint with an error rate of 1 gives the error status code, with Retry-After for 429,
+        and that max_faults stops the errors.
+        """
+        self.server.set_faults({"webdata": {"error_rate": 1, "error_status": 429, "max_faults": 1}})
+        wasapi = self.server.config_values()["wasapi"]
+        first = requests.get(wasapi, auth=self.auth)
+        second = requests.get(wasapi, auth=self.auth)
+        actual = [first.status_code, first.headers.get("Retry-After"), second.status_code]
+        self.assertEqual(actual, [429, "1", 200], "Problem with test for error status")
+
+    def test_latency_bandwidth(self):
+        """
+        Tests that the latency and bandwidth limit slow down the response.
+        """
+        self.server.set_faults({"webdatafile": {"latency": 0.2, "bytes_per_second": 1000000}})
+        start = time.monotonic()
+        requests.get(self.warc_url, auth=self.auth)
+        self.assertGreater(time.monotonic() - start, 0.35, "Problem with test for latency and bandwidth")
+
+    def test_drop_truncate(self):
+        """
+        Tests that a dropped or truncated response ends before the Content-Length, which is an error for the client,
+        and that the bytes sent are counted.
+        """
+        for fault in ("drop", "truncate"):
+            self.server.set_faults({"webdatafile": {f"{fault}_rate": 1}})
+            with self.assertRaises(requests.exceptions.RequestException, msg=f"Problem with test for {fault}"):
+                requests.get(self.warc_url, auth=self.auth).content
+            actual = self.server.stats["webdatafile"]["bytes"]
+            self.assertEqual(actual, self.warc["info"]["size"] // 2, f"Problem with test for {fault}, bytes")
+
+    def test_corrupt(self):
+        """
+        Tests that a corrupted response has the right size and the wrong MD5.
+        """
+        self.server.set_faults({"webdatafile": {"corrupt_rate": 1}})
+        content = requests.get(self.warc_url, auth=self.auth).content
+        actual = [len(content), hashlib.md5(content).hexdigest() == self.warc["info"]["checksums"]["md5"]]
+        self.assertEqual(actual, [self.warc["info"]["size"], False], "Problem with test for corrupt")
+
+
+class TestDownloadWithMock(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a server with one seed with two WARCs, uses it in place of Archive-It,
+        and makes the seed folder for the downloads.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=1, warcs=2, warc_bytes=5000).start()
+        self.patches = [mock.patch.multiple(config, **self.server.config_values()),
+                        mock.patch.object(web_functions, "API_REST", 0)]
+        for patch in self.patches:
+            patch.start()
+        self.seed_dir = os.path.join(config.script_output, "preservation_download", "2000001")
+        os.makedirs(self.seed_dir)
+
+    def tearDown(self):
+        """
+        Restores the configuration, stops the server, and deletes the downloads and logs.
+        """
+        for patch in self.patches:
+            patch.stop()
+        self.server.stop()
+        shutil.rmtree(os.path.join(config.script_output, "preservation_download"))
+        for filename in ("seeds_log.csv", "warcs_log.csv"):
+            if os.path.exists(os.path.join(config.script_output, filename)):
+                os.remove(os.path.join(config.script_output, filename))
+
+    def test_download(self):
+        """
+        Tests that the seed data, metadata reports, and WARCs all download from the mock server.
+        """
+        seed_df = seed_data("2023-04-25", "2023-04-26").astype(str)
+        seed_df.insert(0, "AIP_ID", "magil-ggp-2000001-2023-04")
+        seed_log = SeedLog(seed_df)
+        seed_log.start_warc_log()
+
+        current_directory = os.getcwd()
+        os.chdir(os.path.dirname(self.seed_dir))
+        try:
+            download_metadata(seed_log.records[0], 0, seed_log)
+        finally:
+            os.chdir(current_directory)
+        for warc in seed_log.records[0].WARC_Filenames.split("|"):
+            download_warc(seed_log.records[0], 0, seed_log, warc)
+
+        actual = [seed_log.records[0].summary(column) for column in ("Metadata_Report_Errors", "Metadata_Report_Empty",
+                                                                  "Seed_Report_Redaction", "WARC_Download_Errors",
+                                                                  "WARC_Fixity_Errors", "WARC_Unzip_Errors")]
+        expected = ["Successfully downloaded all metadata reports", "magil-ggp-2000001-2023-04_collscope.csv",
+                    "Successfully redacted", "Successfully downloaded 2 of 2 WARCs",
+                    "Successfully verified 2 of 2 WARCs", "Successfully unzipped 2 of 2 WARCs"]
+        self.assertEqual(actual, expected, "Problem with test for download, log")
+
+        actual_files = len([name for name in os.listdir(self.seed_dir) if name.endswith(".warc")])
+        self.assertEqual(actual_files, 2, "Problem with test for download, unzipped WARCs")
+
+    def test_resume_after_drops(self):
+        """
+        Tests that get_warc() resumes a WARC after the connection is dropped and gets the correct checksums.
+        """
+        self.server.set_faults({"webdatafile": {"drop_rate": 1, "max_faults": 2}})
+        seed_log = SeedLog(seed_data("2023-04-25", "2023-04-26").astype(str).assign(AIP_ID="aip-1"))
+        warc = sorted(self.server.warcs)[0]
+        info = self.server.warcs[warc]["info"]
+        checksums = get_warc(seed_log, 0, f"{self.server.url}/webdatafile/{warc}", warc,
+                             os.path.join(self.seed_dir, warc), info["size"])
+        self.assertEqual(checksums, info["checksums"], "Problem with test for resume after drops, checksums")
+        self.assertEqual(self.server.stats["webdatafile"]["requests"], 3, "Problem with test for resume after drops")
+
+    def test_warc_sizes(self):
+        """
+        Tests that get_warc_sizes() uses the sizes from the WASAPI call made by seed_data() instead of calling again.
+        """
+        seed_data("2023-04-25", "2023-04-26")
+        actual = get_warc_sizes("2023-04-25", "2023-04-26")
+        expected = {warc: self.server.warcs[warc]["info"]["size"] for warc in self.server.warcs}
+        self.assertEqual(actual, expected, "Problem with test for WARC sizes")
+        self.assertEqual(self.server.stats["webdata"]["requests"], 1, "Problem with test for WARC sizes, requests")
+
+    def test_check_config(self):
+        """
+        Tests that the configuration check accepts the mock server's URLs and credentials.
+        """
+        with mock.patch("web_functions.sys.exit") as exit_script:
+            check_config()
+        exit_script.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for plan_download(), which gets the size of a download by department and collection and the schedule,
+without saving or downloading anything, using the mock Archive-It in place of Archive-It.
+"""
+import os
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from mock_archive_it import MockArchiveIt
+from web_functions import plan_download
+
+
+class TestPlanDownload(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a server with three seeds with two WARCs each, and uses it in place of Archive-It.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=3, warcs=2, warc_bytes=5000).start()
+        self.patches = [mock.patch.multiple(config, **self.server.config_values()),
+                        mock.patch.object(web_functions.DISK, "expansion", 3)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """
+        Restores the configuration and stops the server.
+        """
+        for patch in self.patches:
+            patch.stop()
+        self.server.stop()
+
+    def test_plan(self):
+        """
+        Tests the seeds, WARCs, and bytes for each collection, and that the schedule has every WARC.
+        """
+        plan_df, tasks, worker_loads = plan_download("2023-04-25", "2023-04-26", 2)
+        total_bytes = sum(warc["info"]["size"] for warc in self.server.warcs.values())
+        actual = [plan_df["Seeds"].sum(), plan_df["WARCs"].sum(), plan_df["Bytes"].sum(),
+                  plan_df["Unzipped_Bytes"].sum(), len(tasks), sum(load[0] for load in worker_loads)]
+        expected = [3, 6, total_bytes, total_bytes * 3, 6, total_bytes]
+        self.assertEqual(actual, expected, "Problem with test for plan, totals")
+        actual_collections = list(zip(plan_df["Department"], plan_df["Collection"]))
+        self.assertEqual(actual_collections, [("magil", "magil-0000")], "Problem with test for plan, collections")
+
+    def test_nothing_saved(self):
+        """
+        Tests that seeds_log.csv, metadata.csv, and the seed folders are not made.
+        """
+        plan_download("2023-04-25", "2023-04-26", 1)
+        actual = [os.path.exists(os.path.join(config.script_output, name))
+                  for name in ("seeds_log.csv", "preservation_download")]
+        self.assertEqual(actual, [False, False], "Problem with test for nothing saved")
+
+
+if __name__ == '__main__':
+    unittest.main()
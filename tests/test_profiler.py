@@ -0,0 +1,89 @@
+"""
+Tests for Profiler, which profiles each stage of the download with cProfile and tracemalloc
+and saves the results next to seeds_log.csv.
+"""
+import csv
+import os
+import pstats
+import tempfile
+import threading
+import unittest
+from observability import Profiler
+
+
+def make_list(size):
+    """
+    Makes a list, so the profile has a function and memory to find.
+    """
+    return [str(number) for number in range(size)]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a temporary folder for the profile files.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.profiler = Profiler(self.temp_dir.name)
+
+    def tearDown(self):
+        """
+        Deletes the temporary folder.
+        """
+        self.temp_dir.cleanup()
+
+    def test_stage(self):
+        """
+        Tests that a stage saves a profile with its functions, a text summary with the peak memory,
+        and a row in profile_summary.csv.
+        """
+        self.profiler.enable()
+        with self.profiler.stage("metadata_csv"):
+            make_list(100000)
+
+        stats = pstats.Stats(os.path.join(self.temp_dir.name, "profile_metadata_csv.prof"))
+        functions = [function for filename, line, function in stats.stats]
+        self.assertIn("make_list", functions, "Problem with test for stage, profile")
+
+        with open(os.path.join(self.temp_dir.name, "profile_metadata_csv.txt")) as summary:
+            text = summary.read()
+        self.assertIn("Peak memory:", text, "Problem with test for stage, summary")
+        self.assertIn("test_profiler.py", text, "Problem with test for stage, memory by line")
+
+        with open(os.path.join(self.temp_dir.name, "profile_summary.csv"), newline="") as summary_csv:
+            rows = list(csv.DictReader(summary_csv))
+        actual = [(row["Stage"], row["Profile"], float(row["Peak_MB"]) > 0) for row in rows]
+        self.assertEqual(actual, [("metadata_csv", "profile_metadata_csv.prof", True)],
+                         "Problem with test for stage, summary csv")
+
+    def test_sample_seeds(self):
+        """
+        Tests that only the workers for the first sample_seeds seeds are profiled, including every task for them,
+        and that their functions are added to the stage profile.
+        """
+        self.profiler.enable(sample_seeds=1)
+        with self.profiler.stage("download_seeds"):
+            for seed_id in ("1", "2", "1"):
+                worker = threading.Thread(target=self.profiler.call, args=(seed_id, make_list, 10))
+                worker.start()
+                worker.join()
+            self.assertEqual(self.profiler.seeds, {"1"}, "Problem with test for sample seeds, seeds")
+            self.assertEqual(len(self.profiler.thread_profiles), 2, "Problem with test for sample seeds, tasks")
+
+        stats = pstats.Stats(os.path.join(self.temp_dir.name, "profile_download_seeds.prof"))
+        calls = [stats.stats[key][1] for key in stats.stats if key[2] == "make_list"]
+        self.assertEqual(calls, [2], "Problem with test for sample seeds, profile")
+
+    def test_off(self):
+        """
+        Tests that nothing is profiled or saved when the profiler is not enabled.
+        """
+        with self.profiler.stage("check_seeds"):
+            result = self.profiler.call("1", make_list, 3)
+        self.assertEqual(result, ["0", "1", "2"], "Problem with test for off, result")
+        self.assertEqual(os.listdir(self.temp_dir.name), [], "Problem with test for off, files")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests for Progress, which reports the bytes, WARCs, and seeds done, the download rate, and the time left,
+and saves them to a status file.
+"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from observability import Progress
+
+# WARCs in the download, as (row_index, WARC filename, size in bytes), like the tasks from schedule_downloads().
+TASKS = [(0, "one.warc.gz", 6000000), (0, "two.warc.gz", 3000000), (1, "three.warc.gz", 1000000)]
+
+
+class TestProgress(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a temporary folder for the status file and starts measuring the download.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.status_path = os.path.join(self.temp_dir.name, "download_status.json")
+        self.progress = Progress(self.status_path, window_seconds=60, rest_seconds=15)
+        self.progress.start(TASKS, 2, 1)
+
+    def tearDown(self):
+        """
+        Deletes the temporary folder.
+        """
+        self.temp_dir.cleanup()
+
+    def test_bytes(self):
+        """
+        Tests that the bytes done include WARCs that are done and the bytes saved so far for WARCs in progress.
+        """
+        self.progress.end_warc("three.warc.gz", 1000000)
+        self.progress.end_seed()
+        self.progress.start_warc("one.warc.gz", "1111111", 6000000)
+        self.progress.received("one.warc.gz", 1500000, 1500000)
+        status = self.progress.status()
+        actual = [status["bytes_done"], status["bytes_remaining"], status["percent"], status["warcs_done"],
+                  status["seeds_done"], [(warc["warc"], warc["bytes"]) for warc in status["in_flight"]]]
+        expected = [2500000, 7500000, 25.0, 1, 1, [("one.warc.gz", 1500000)]]
+        self.assertEqual(actual, expected, "Problem with test for bytes")
+
+    def test_rate_eta(self):
+        """
+        Tests that the rate is the average over the window, and the time left is the remaining bytes at that rate
+        plus the rest after each WARC not started.
+        """
+        self.progress.rate(now=0)
+        self.progress.start_warc("one.warc.gz", "1111111", 6000000)
+        self.progress.received("one.warc.gz", 1000000, 1000000)
+        self.progress.rate(now=10)
+        self.progress.received("one.warc.gz", 1000000, 2000000)
+        status = self.progress.status(now=20)
+        actual = [status["bytes_per_second"], status["eta_seconds"]]
+        expected = [100000, 8000000 / 100000 + 2 * 15]
+        self.assertEqual(actual, expected, "Problem with test for rate and ETA")
+
+        # After the window has passed, only the recent data is used, so the rate is the new (slower) rate.
+        self.progress.rate(now=70)
+        self.progress.received("one.warc.gz", 600000, 2600000)
+        self.assertEqual(self.progress.rate(now=130), 10000, "Problem with test for rate and ETA, window")
+
+    def test_no_rate(self):
+        """
+        Tests that there is no rate or time left before anything is downloaded.
+        """
+        status = self.progress.status()
+        self.assertEqual([status["bytes_per_second"], status["eta"]], [None, None], "Problem with test for no rate")
+
+    def test_report(self):
+        """
+        Tests that the report is printed and saved to the status file, and that stop() saves the final state.
+        """
+        self.progress.start_warc("one.warc.gz", "1111111", 6000000)
+        self.progress.received("one.warc.gz", 3000000, 3000000)
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.progress.report()
+        self.assertIn("0.003 of 0.010 GB (30.0%), 0 of 3 WARCs, 0 of 2 seeds", printed.getvalue(),
+                      "Problem with test for report, printed")
+        self.assertIn("one.warc.gz: 50% of 6.0 MB", printed.getvalue(), "Problem with test for report, in flight")
+
+        self.progress.stop("stopped")
+        with open(self.status_path) as status_file:
+            status = json.load(status_file)
+        actual = [status["state"], status["bytes_done"], status["in_flight"][0]["warc"]]
+        self.assertEqual(actual, ["stopped", 3000000, "one.warc.gz"], "Problem with test for report, status file")
+
+    def test_duration(self):
+        """
+        Tests the format of the time left.
+        """
+        actual = [Progress.duration(65), Progress.duration(3 * 3600 + 300), Progress.duration(2 * 86400 + 3660)]
+        self.assertEqual(actual, ["1m 05s", "3h 05m", "2d 1h 01m"], "Problem with test for duration")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the read_manifests() function.
+It reads every manifest in a seed folder into a dictionary organized by filename.
+"""
+import contextlib
+import io
+import os
+import shutil
+import unittest
+from web_functions import read_manifests
+
+
+class TestReadManifests(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the seed folder for the manifests.
+        """
+        os.mkdir("1111111")
+
+    def tearDown(self):
+        """
+        Deletes the seed folder and its contents.
+        """
+        shutil.rmtree("1111111")
+
+    def test_manifests(self):
+        """
+        Tests that the function combines the checksums from every manifest for each file
+        and ignores other files in the seed folder.
+        """
+        with open(os.path.join("1111111", "aip-1_manifest-md5.txt"), "w") as manifest:
+            manifest.write("aaa  ARCHIVEIT-1.warc.gz\nbbb  ARCHIVEIT-1.warc\nccc  aip-1_seed.csv\n")
+        with open(os.path.join("1111111", "aip-1_manifest-sha256.txt"), "w") as manifest:
+            manifest.write("ddd  ARCHIVEIT-1.warc\neee  aip-1_seed.csv\n")
+        with open(os.path.join("1111111", "aip-1_seed.csv"), "w") as report:
+            report.write("id\n1111111\n")
+
+        actual = read_manifests("1111111")
+        expected = {"ARCHIVEIT-1.warc.gz": {"md5": "aaa"},
+                    "ARCHIVEIT-1.warc": {"md5": "bbb", "sha256": "ddd"},
+                    "aip-1_seed.csv": {"md5": "ccc", "sha256": "eee"}}
+        self.assertEqual(actual, expected, "Problem with test for manifests")
+
+    def test_malformed_lines(self):
+        """
+        Tests that blank lines, lines with only spaces, and lines without a checksum and filename are skipped,
+        that the lines which are malformed are printed, and that the rest of the manifest is still read.
+        """
+        with open(os.path.join("1111111", "aip-1_manifest-md5.txt"), "w") as manifest:
+            manifest.write("aaa  ARCHIVEIT-1.warc\n\n   \n \nnot-a-checksum\nbbb *aip-1_seed.csv\n")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            actual = read_manifests("1111111")
+        expected = {"ARCHIVEIT-1.warc": {"md5": "aaa"}, "aip-1_seed.csv": {"md5": "bbb"}}
+        self.assertEqual(actual, expected, "Problem with test for malformed lines")
+        skipped = [line.split(" of ")[0] for line in output.getvalue().splitlines()]
+        self.assertEqual(skipped, ["Skipping line 5"], "Problem with test for malformed lines, printed")
+
+    def test_no_manifests(self):
+        """
+        Tests that the function returns an empty dictionary when the seed folder has no manifests.
+        """
+        actual = read_manifests("1111111")
+        self.assertEqual(actual, {}, "Problem with test for no manifests")
+
+
+if __name__ == '__main__':
+    unittest.main()
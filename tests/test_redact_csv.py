@@ -0,0 +1,49 @@
+"""
+Tests for the redact_csv() function.
+It copies a seed report one row at a time, redacting the login columns if they are present.
+"""
+import io
+import unittest
+from web_functions import redact_csv
+
+
+class TestRedactCsv(unittest.TestCase):
+
+    def test_redaction(self):
+        """
+        Tests that the login columns are redacted, including blank values,
+        and that values with commas and line breaks are copied correctly.
+        """
+        source = io.StringIO('canonical_url,login_password,login_username,notes\r\n'
+                             'www.one.com,PASS,USER,"two\nlines, one comma"\r\n'
+                             'www.two.com,,,\r\n')
+        destination = io.StringIO()
+        redacted = redact_csv(source, destination)
+        self.assertEqual(redacted, True, "Problem with test for redaction, return")
+        expected = ('canonical_url,login_password,login_username,notes\n'
+                    'www.one.com,REDACTED,REDACTED,"two\nlines, one comma"\n'
+                    'www.two.com,REDACTED,REDACTED,\n')
+        self.assertEqual(destination.getvalue(), expected, "Problem with test for redaction, report")
+
+    def test_password_only(self):
+        """
+        Tests that login_username is added if only login_password is present.
+        """
+        destination = io.StringIO()
+        redact_csv(io.StringIO("canonical_url,login_password\nwww.one.com,PASS\n"), destination)
+        expected = "canonical_url,login_password,login_username\nwww.one.com,REDACTED,REDACTED\n"
+        self.assertEqual(destination.getvalue(), expected, "Problem with test for password only")
+
+    def test_no_redaction(self):
+        """
+        Tests that a report without login columns and an empty report are not redacted.
+        """
+        destination = io.StringIO()
+        self.assertEqual(redact_csv(io.StringIO("canonical_url\nwww.one.com\n"), destination), False,
+                         "Problem with test for no redaction, return")
+        self.assertEqual(destination.getvalue(), "canonical_url\nwww.one.com\n", "Problem with test for no redaction")
+        self.assertEqual(redact_csv(io.StringIO(""), io.StringIO()), False, "Problem with test for empty report")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,13 @@
 """
 Test for the reset_seed() function.
-It deletes a seed folder and the information from that seed from seed_df and seeds_log.csv.
+It deletes a seed folder and the information from that seed from seed_log and seeds_log.csv.
 """
 import os
 import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import reset_seed
+from web_functions import LOG_COLUMNS, SeedLog, add_to_manifest, reset_seed
 
 
 class TestResetSeed(unittest.TestCase):
@@ -23,11 +23,11 @@ class TestResetSeed(unittest.TestCase):
 
     def test_reset_seed(self):
         """
-        Tests that the function correctly deletes the seed folder, updates seeds_df,
+        Tests that the function correctly deletes the seed folder, updates the seed log,
         and updates seeds_log.csv.
         """
         # Makes everything needed for test input:
-        # a folder with placeholders for downloaded files, seed_df, and seeds_log.csv
+        # a folder with placeholders for downloaded files, seed_log, and seeds_log.csv
         os.mkdir("2222222")
         with open(os.path.join(os.getcwd(), "2222222", "metadata.csv"), "w") as file:
             file.write("Metadata Placeholder")
@@ -38,21 +38,23 @@ class TestResetSeed(unittest.TestCase):
         columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames", 
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction", 
                         "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-        seed_df = pd.DataFrame([["aip-1", "1111111", "12345", "1000000", 0.521, 1, "ARCHIVEIT.warc.gz", "Success",
-                                 "No empty reports", "Success", "Success", "Success", "Success", "TBD"],
-                                ["aip-2", "2222222", "12345", "2000000", 0.522, 2,
-                                 "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz", "Success", "seed.csv", "Success", "Success",
-                                 "Success", "Error", "TBD"]], columns=columns_list)
-        seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+        seed_log = SeedLog(pd.DataFrame([["aip-1", "1111111", "12345", "1000000", 0.521, 1, "ARCHIVEIT.warc.gz",
+                                          "Success", "No empty reports", "Success", "Success", "Success", "Success",
+                                          "TBD"],
+                                         ["aip-2", "2222222", "12345", "2000000", 0.522, 2,
+                                          "ARCHIVEIT.warc.gz|ARCHIVEIT-1.warc.gz", "Success", "seed.csv", "Success",
+                                          "Success", "Success", "Error", "TBD"]], columns=columns_list))
+        seed_log.save()
 
         # Runs the function being tested.
-        reset_seed("2222222", seed_df)
+        reset_seed("2222222", seed_log)
 
         # Test that the seed folder was deleted.
         seed_path = os.path.exists(os.path.join(os.getcwd(), "2222222"))
         self.assertEqual(seed_path, False, "Problem with test that the seed folder was deleted")
 
         # Test that the dataframe has the correct values.
+        seed_df = seed_log.to_df()
         actual_df = [seed_df.columns.tolist()] + seed_df.values.tolist()
         expected_df = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                         "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
@@ -75,6 +77,54 @@ class TestResetSeed(unittest.TestCase):
                          "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]]
         self.assertEqual(actual_csv, expected_csv, "Problem with test for CSV values")
 
+    def test_keep_finished(self):
+        """
+        Tests that the function keeps the finished and partly downloaded WARCs, their checksums, and their log,
+        and deletes everything else.
+        """
+        # Makes everything needed for test input: a folder with one finished WARC, one partly downloaded WARC,
+        # one WARC that was downloaded but not unzipped, a metadata report, and manifests.
+        os.mkdir("2222222")
+        for filename in ("aip-2_seed.csv", "ARCHIVEIT-1.warc", "ARCHIVEIT-2.warc.gz.part", "ARCHIVEIT-3.warc.gz"):
+            with open(os.path.join("2222222", filename), "w") as file:
+                file.write("Placeholder")
+        add_to_manifest("2222222", "aip-2", "aip-2_seed.csv", {"md5": "aaa", "sha256": "bbb"})
+        add_to_manifest("2222222", "aip-2", "ARCHIVEIT-1.warc", {"md5": "eee", "sha256": "fff"})
+        columns_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+                        "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
+                        "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
+        seed_log = SeedLog(pd.DataFrame([["aip-2", "2222222", "12345", "2000000", 0.522, 3,
+                                          "ARCHIVEIT-1.warc.gz|ARCHIVEIT-2.warc.gz|ARCHIVEIT-3.warc.gz", "Success",
+                                          "seed.csv", "Success", "Successfully downloaded ARCHIVEIT-1.warc.gz; "
+                                                                 "Successfully downloaded ARCHIVEIT-3.warc.gz",
+                                          "Successfully verified ARCHIVEIT-1.warc.gz fixity on 2024-01-01 00:00:00.000000",
+                                          "Successfully unzipped ARCHIVEIT-1.warc.gz", "TBD"]], columns=columns_list))
+
+        # Runs the function being tested.
+        done = reset_seed("2222222", seed_log)
+
+        # Test that the finished WARC is returned.
+        self.assertEqual(done, {"ARCHIVEIT-1.warc.gz"}, "Problem with test for keep finished, return")
+
+        # Test that the seed folder has the expected files.
+        actual_files = sorted(os.listdir("2222222"))
+        expected_files = ["ARCHIVEIT-1.warc", "ARCHIVEIT-2.warc.gz.part", "aip-2_manifest-md5.txt",
+                          "aip-2_manifest-sha256.txt"]
+        self.assertEqual(actual_files, expected_files, "Problem with test for keep finished, files")
+
+        # Test that the manifest only has the finished WARC.
+        with open(os.path.join("2222222", "aip-2_manifest-md5.txt")) as manifest:
+            actual_manifest = manifest.read()
+        expected_manifest = "eee  ARCHIVEIT-1.warc\n"
+        self.assertEqual(actual_manifest, expected_manifest, "Problem with test for keep finished, manifest")
+
+        # Test that the log only has the finished WARC.
+        actual_log = [seed_log.value(0, column) for column in LOG_COLUMNS]
+        expected_log = ["TBD", "TBD", "TBD", "Successfully downloaded ARCHIVEIT-1.warc.gz",
+                        "Successfully verified ARCHIVEIT-1.warc.gz fixity on 2024-01-01 00:00:00.000000",
+                        "Successfully unzipped ARCHIVEIT-1.warc.gz", "TBD"]
+        self.assertEqual(actual_log, expected_log, "Problem with test for keep finished, log")
+
 
 if __name__ == '__main__':
     unittest.main()
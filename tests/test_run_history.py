@@ -0,0 +1,119 @@
+"""
+Tests for RunHistory, which saves a summary of every run in a SQLite database to compare runs across quarters.
+"""
+import os
+import pandas as pd
+import tempfile
+import unittest
+from unittest import mock
+import web_functions
+from observability import RunHistory
+from web_functions import SeedLog, run_counters
+
+# WARCs scheduled for the run, as (row_index, WARC filename, size in bytes), like the tasks from schedule_downloads().
+TASKS = [(0, "one.warc.gz", 6000000), (1, "two.warc.gz", 4000000)]
+
+
+def make_seed_log():
+    """
+    Makes a seed log with two seeds, one of them complete.
+    """
+    seed_df = pd.DataFrame([["aip-1", "1", "12345", "1", 0.006, 1, "one.warc.gz", "Successfully completed"],
+                            ["aip-2", "2", "12345", "2", 0.004, 1, "two.warc.gz", "WARC_Fixity_Errors"]],
+                           columns=["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs",
+                                    "WARC_Filenames", "Complete"])
+    return SeedLog(seed_df)
+
+
+class TestRunHistory(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a temporary folder for the database and replaces the download totals the history measures,
+        which are from run_counters().
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = RunHistory(os.path.join(self.temp_dir.name, "run_history.sqlite"), run_counters)
+        self.progress = mock.Mock(received_bytes=0)
+        self.retry_stats = {}
+        self.patches = [mock.patch.object(web_functions, "PROGRESS", self.progress),
+                        mock.patch.object(web_functions, "RETRY_STATS", self.retry_stats)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """
+        Restores the download totals and deletes the temporary folder.
+        """
+        for patch in self.patches:
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    def add_run(self, seconds, received_bytes, api_calls=10, api_errors=0, retries=0, seed_data_seconds=10.0):
+        """
+        Saves a finished run with a seed_data stage and a download_seeds stage, and returns the run_id.
+        The stage times are set by replacing the clock.
+        """
+        clock = iter([0, 0, seed_data_seconds, seed_data_seconds, seed_data_seconds + seconds,
+                      seed_data_seconds + seconds])
+        with mock.patch("observability.time.monotonic", lambda: next(clock)):
+            self.history.start()
+            with self.history.stage("seed_data"):
+                self.retry_stats["seed_data"] = {"calls": 0, "errors": 0, "retries": 0, "retry_seconds": 0.0}
+            with self.history.stage("download_seeds"):
+                self.progress.received_bytes += received_bytes
+                stats = self.retry_stats.setdefault("get_warc", {"calls": 0, "errors": 0, "retries": 0,
+                                                                 "retry_seconds": 0.0})
+                stats["calls"] += api_calls
+                stats["errors"] += api_errors
+                stats["retries"] += retries
+            return self.history.save("finished", "2023-04-01", "2023-07-01", 2, False, make_seed_log(), TASKS)
+
+    def test_save(self):
+        """
+        Tests that the run totals and each stage are saved, with the changes during each stage.
+        """
+        run_id = self.add_run(seconds=10, received_bytes=10000000, api_calls=20, api_errors=1, retries=3)
+        run = self.history.runs().set_index("run_id").loc[run_id]
+        actual = [run["state"], run["seeds"], run["seeds_complete"], run["warcs"], run["bytes_scheduled"],
+                  run["bytes_downloaded"], run["bytes_per_second"], run["api_calls"], run["api_errors"],
+                  run["retries"], run["seconds"]]
+        expected = ["finished", 2, 1, 2, 10000000, 10000000, 1000000, 20, 1, 3, 20]
+        self.assertEqual(actual, expected, "Problem with test for save, run")
+
+        stages = self.history.stage_seconds().loc[run_id].to_dict()
+        self.assertEqual(stages, {"download_seeds": 10, "seed_data": 10}, "Problem with test for save, stages")
+
+    def test_estimate_rate(self):
+        """
+        Tests that the estimated rate is the median rate for one worker from the finished runs.
+        """
+        self.assertIsNone(self.history.estimate_rate(), "Problem with test for estimate rate, no runs")
+        for seconds in (10, 20, 40):
+            self.add_run(seconds=seconds, received_bytes=20000000)
+        self.assertEqual(self.history.estimate_rate(), 500000, "Problem with test for estimate rate")
+
+    def test_regressions(self):
+        """
+        Tests that a run with lower throughput, more API errors, and a slower stage is flagged,
+        and a run like the previous runs is not.
+        """
+        for number in range(3):
+            self.add_run(seconds=10, received_bytes=10000000, api_calls=100, api_errors=1)
+        self.assertEqual(self.history.regressions(), [], "Problem with test for regressions, none")
+
+        self.add_run(seconds=20, received_bytes=10000000, api_calls=100, api_errors=5, seed_data_seconds=30.0)
+        actual = [message.split(":")[0] for message in self.history.regressions()]
+        expected = ["Throughput", "API errors per call", "seed_data seconds per seed"]
+        self.assertEqual(actual, expected, "Problem with test for regressions")
+
+    def test_one_run(self):
+        """
+        Tests that there are no regressions when there is only one run.
+        """
+        self.add_run(seconds=10, received_bytes=10000000)
+        self.assertEqual(self.history.regressions(), [], "Problem with test for one run")
+
+
+if __name__ == '__main__':
+    unittest.main()
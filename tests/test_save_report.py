@@ -0,0 +1,107 @@
+"""
+Tests for save_report() with a real HTTP response, which streams a metadata report to a file in the seed folder
+and redacts the seed report while it is streamed, and returns an error when the connection fails.
+The other tests for the metadata reports use Archive-It or replace the response, which does not test the socket.
+"""
+import http.server
+import os
+import shutil
+import threading
+import unittest
+from unittest import mock
+import configuration as config
+from web_functions import save_report
+
+# Seed report with the login columns and enough rows that the response is read in more than one chunk.
+SEED_REPORT = "id,url,login_username,login_password\n" + "".join(f"{number},https://example.org/{number},user,secret\n"
+                                                                 for number in range(2000))
+
+
+class ReportHandler(http.server.BaseHTTPRequestHandler):
+    """Sends the seed report for every request, except the crawl job report, which closes the connection
+    without a response, and the collection report, which closes the connection after part of the report."""
+
+    def do_GET(self):
+        content = SEED_REPORT.encode("utf-8")
+        if self.path.startswith("/api/crawl_job"):
+            return
+        if self.path.startswith("/api/collection"):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content[:1000])
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSaveReport(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a server on this machine for the Partner API and makes the seed folder.
+        """
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ReportHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.patch = mock.patch.multiple(config, create=True, username="mock", password="mock",
+                                         partner_api=f"http://127.0.0.1:{self.server.server_port}/api",
+                                         retry_policies={"get_report": {"attempts": 1}})
+        self.patch.start()
+        os.mkdir("1111111")
+
+    def tearDown(self):
+        """
+        Deletes the seed folder, restores the configuration, and stops the server.
+        """
+        shutil.rmtree("1111111")
+        self.patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_redact(self):
+        """
+        Tests that every row of the seed report is saved with the login columns redacted.
+        """
+        results = save_report("1111111", "id", "1111111", "seed", "aip-1_seed.csv", redact=True)
+        self.assertEqual(results, [("Successfully redacted", "Seed_Report_Redaction")], "Problem with test for redact")
+
+        with open(os.path.join("1111111", "aip-1_seed.csv"), encoding="utf-8") as report:
+            rows = report.read().splitlines()
+        actual = [len(rows), rows[0], rows[-1]]
+        expected = [2001, "id,url,login_username,login_password", "1999,https://example.org/1999,REDACTED,REDACTED"]
+        self.assertEqual(actual, expected, "Problem with test for redact, report")
+
+    def test_connection_error(self):
+        """
+        Tests that a connection that fails is returned as an API error for the report, instead of stopping the download,
+        and no report is saved.
+        """
+        results = save_report("1111111", "id", "1", "crawl_job", "aip-1_1_crawljob.csv")
+        self.assertEqual(results, [("aip-1_1_crawljob.csv API Error ConnectionError", "Metadata_Report_Errors")],
+                         "Problem with test for connection error, results")
+        self.assertEqual(os.listdir("1111111"), [], "Problem with test for connection error, report")
+
+        results = save_report("1111111", "id", "1", "crawl_job", "aip-1_seed.csv", redact=True)
+        expected = [("aip-1_seed.csv API Error ConnectionError", "Metadata_Report_Errors"),
+                    ("No seeds.csv to redact", "Seed_Report_Redaction")]
+        self.assertEqual(results, expected, "Problem with test for connection error, redact")
+
+    def test_partial(self):
+        """
+        Tests that a connection that fails while the report is saved is returned as an API error
+        and the part of the report that was saved is deleted.
+        """
+        results = save_report("1111111", "id", "12345", "collection", "aip-1_coll.csv")
+        self.assertEqual(results, [("aip-1_coll.csv API Error ChunkedEncodingError", "Metadata_Report_Errors")],
+                         "Problem with test for partial, results")
+        self.assertEqual(os.listdir("1111111"), [], "Problem with test for partial, report")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests for the schedule_downloads() function.
+It orders the WARCs for seeds that still need to be downloaded, largest seed first and largest WARC first,
+and predicts how much each worker will download.
+"""
+import pandas as pd
+import unittest
+from web_functions import SeedLog, schedule_downloads
+
+
+def make_log(rows):
+    """
+    Makes a seed log with the provided rows. The column values are the same for all tests.
+    Returns the seed log.
+    """
+    column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+                   "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
+                   "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
+    seed_log = SeedLog(pd.DataFrame(rows, columns=column_list))
+    return seed_log
+
+
+class TestScheduleDownloads(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a seed log with three seeds of different sizes and the sizes of their WARCs.
+        """
+        self.seed_log = make_log([["aip-1", "1111111", "12345", "1", "0.003", "1", "small.warc.gz",
+                                   "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
+                                ["aip-2", "2222222", "12345", "2", "0.02", "2", "big-a.warc.gz|big-b.warc.gz",
+                                 "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
+                                ["aip-3", "3333333", "12345", "3", "0.006", "2", "mid-a.warc.gz|mid-b.warc.gz",
+                                 "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]])
+        self.warc_sizes = {"small.warc.gz": 3000000, "big-a.warc.gz": 5000000, "big-b.warc.gz": 15000000,
+                           "mid-a.warc.gz": 4000000, "mid-b.warc.gz": 2000000}
+
+    def test_one_worker(self):
+        """
+        Tests the order of the WARCs and the predicted load with one worker.
+        """
+        tasks, worker_loads = schedule_downloads(self.seed_log, self.warc_sizes, 1)
+
+        expected_tasks = [(1, "big-b.warc.gz", 15000000), (1, "big-a.warc.gz", 5000000),
+                          (2, "mid-a.warc.gz", 4000000), (2, "mid-b.warc.gz", 2000000),
+                          (0, "small.warc.gz", 3000000)]
+        self.assertEqual(tasks, expected_tasks, "Problem with test for one worker, tasks")
+        self.assertEqual(worker_loads, [(29000000, 5)], "Problem with test for one worker, worker loads")
+
+    def test_two_workers(self):
+        """
+        Tests the predicted load with two workers, where the largest WARC keeps one worker busy
+        while the other worker downloads everything else.
+        """
+        tasks, worker_loads = schedule_downloads(self.seed_log, self.warc_sizes, 2)
+        self.assertEqual(worker_loads, [(15000000, 1), (14000000, 4)], "Problem with test for two workers")
+
+    def test_restart(self):
+        """
+        Tests that seeds which are already complete are not scheduled
+        and the seed's average WARC size is used for WARCs without a size from WASAPI.
+        """
+        self.seed_log.add(1, "Complete", "Successfully completed")
+        tasks, worker_loads = schedule_downloads(self.seed_log, {}, 1)
+
+        expected_tasks = [(2, "mid-b.warc.gz", 3000000), (2, "mid-a.warc.gz", 3000000),
+                          (0, "small.warc.gz", 3000000)]
+        self.assertEqual(tasks, expected_tasks, "Problem with test for restart, tasks")
+        self.assertEqual(worker_loads, [(9000000, 3)], "Problem with test for restart, worker loads")
+
+
+if __name__ == '__main__':
+    unittest.main()
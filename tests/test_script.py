@@ -9,6 +9,7 @@ import shutil
 import subprocess
 import unittest
 import configuration as config
+from archive_it_available import SKIP_REASON, archive_it_available
 
 
 def consistent_seeds_log(csv_path):
@@ -23,10 +24,6 @@ def consistent_seeds_log(csv_path):
     # Replaces blanks with an empty string.
     df.fillna("", inplace=True)
 
-    # Replaces the value of WARC_Fixity_Errors, which includes timestamps,
-    # with the number of WARCs that were successfully verified.
-    df['WARC_Fixity_Errors'] = df['WARC_Fixity_Errors'].str.count("Successfully")
-
     # If Seed_Report_Redaction has no login columns, replaces with the other standard message of success.
     # The same seed sometimes has the login columns and sometimes does not.
     mask = df['Seed_Report_Redaction'] == "No login columns to redact"
@@ -35,6 +32,7 @@ def consistent_seeds_log(csv_path):
     return df
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class MyTestCase(unittest.TestCase):
 
     def tearDown(self):
@@ -44,6 +42,8 @@ class MyTestCase(unittest.TestCase):
         shutil.rmtree(os.path.join(config.script_output, "preservation_download"))
         os.remove(os.path.join(config.script_output, "completeness_check.csv"))
         os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+        os.remove(os.path.join(config.script_output, "warcs_log.csv"))
+        os.remove(os.path.join(config.script_output, "download_status.json"))
 
     def test_multi_warc_seed(self):
         """
@@ -73,13 +73,9 @@ class MyTestCase(unittest.TestCase):
                          "ARCHIVEIT-12912-WEEKLY-JOB1143415-SEED2173769-20200430010118013-00000-h3.warc.gz",
                          "Successfully downloaded all metadata reports", "harg-0000-web-202005-0001_seedscope.csv",
                          "Successfully redacted",
-                         "Successfully downloaded ARCHIVEIT-12912-WEEKLY-JOB1154002-SEED2173769-20200513225747964-00000-h3.warc.gz; "
-                         "Successfully downloaded ARCHIVEIT-12912-WEEKLY-JOB1148757-SEED2173769-20200506223640988-00000-h3.warc.gz; "
-                         "Successfully downloaded ARCHIVEIT-12912-WEEKLY-JOB1143415-SEED2173769-20200430010118013-00000-h3.warc.gz",
-                         3,
-                         "Successfully unzipped ARCHIVEIT-12912-WEEKLY-JOB1154002-SEED2173769-20200513225747964-00000-h3.warc.gz; "
-                         "Successfully unzipped ARCHIVEIT-12912-WEEKLY-JOB1148757-SEED2173769-20200506223640988-00000-h3.warc.gz; "
-                         "Successfully unzipped ARCHIVEIT-12912-WEEKLY-JOB1143415-SEED2173769-20200430010118013-00000-h3.warc.gz",
+                         "Successfully downloaded 3 of 3 WARCs",
+                         "Successfully verified 3 of 3 WARCs",
+                         "Successfully unzipped 3 of 3 WARCs",
                          "Successfully completed"]]
         self.assertEqual(expected_seeds, actual_seeds, "Problem with test for multi WARC seed, seeds_log.csv")
 
@@ -119,17 +115,17 @@ class MyTestCase(unittest.TestCase):
                           ["rbrl-498-web-201907-0001", 2027707, 12265, 943048, 0.007, 1,
                            "ARCHIVEIT-12265-TEST-JOB943048-SEED2027707-20190709144234143-00000-h3.warc.gz",
                            "Successfully downloaded all metadata reports", "No empty reports", "Successfully redacted",
-                           "Successfully downloaded ARCHIVEIT-12265-TEST-JOB943048-SEED2027707-20190709144234143-00000-h3.warc.gz",
-                           1,
-                           "Successfully unzipped ARCHIVEIT-12265-TEST-JOB943048-SEED2027707-20190709144234143-00000-h3.warc.gz",
+                           "Successfully downloaded 1 of 1 WARCs",
+                           "Successfully verified 1 of 1 WARCs",
+                           "Successfully unzipped 1 of 1 WARCs",
                            "Successfully completed"],
                           ["rbrl-377-web-201907-0001", 2027776, 12264, 943446, 0.096, 1,
                            "ARCHIVEIT-12264-TEST-JOB943446-SEED2027776-20190710131748634-00000-h3.warc.gz",
                            "Successfully downloaded all metadata reports", "rbrl-377-web-201907-0001_seedscope.csv",
                            "Successfully redacted",
-                           "Successfully downloaded ARCHIVEIT-12264-TEST-JOB943446-SEED2027776-20190710131748634-00000-h3.warc.gz",
-                           1,
-                           "Successfully unzipped ARCHIVEIT-12264-TEST-JOB943446-SEED2027776-20190710131748634-00000-h3.warc.gz",
+                           "Successfully downloaded 1 of 1 WARCs",
+                           "Successfully verified 1 of 1 WARCs",
+                           "Successfully unzipped 1 of 1 WARCs",
                            "Successfully completed"]]
         self.assertEqual(actual_seeds, expected_seeds, "Problem with test for one WARC seeds, seeds_log.csv")
 
@@ -189,21 +185,9 @@ class MyTestCase(unittest.TestCase):
                            "Successfully downloaded all metadata reports",
                            "magil-ggp-2520379-2023-05_seedscope.csv; magil-ggp-2520379-2023-05_collscope.csv",
                            "Successfully redacted",
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230416150811551-00000-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417184230631-00001-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417185737629-00002-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417193251948-00003-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417201414622-00004-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417223344837-00005-sl63gmud.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230419134031254-00000-dwz98uv7.warc.gz",
-                           7,
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230416150811551-00000-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417184230631-00001-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417185737629-00002-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417193251948-00003-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417201414622-00004-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230417223344837-00005-sl63gmud.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1789230-0-SEED2520379-20230419134031254-00000-dwz98uv7.warc.gz",
+                           "Successfully downloaded 7 of 7 WARCs",
+                           "Successfully verified 7 of 7 WARCs",
+                           "Successfully unzipped 7 of 7 WARCs",
                            "Successfully completed"],
                           ["magil-ggp-2529671-2023-05", 2529671, 15678, 1791478, 0.028, 1,
                            "ARCHIVEIT-15678-TEST-JOB1791478-0-SEED2529671-20230420155417222-00000-mntg8u5v.warc.gz",
@@ -211,27 +195,25 @@ class MyTestCase(unittest.TestCase):
                            "magil-ggp-2529671-2023-05_seedscope.csv; magil-ggp-2529671-2023-05_collscope.csv",
                            "Successfully redacted",
                            "API error 404: can't downloaded ARCHIVEIT-15678-TEST-JOB1791478-0-SEED2529671-20230420155417222-00000-mntg8u5v.warc.gz",
-                           0, "", "WARC_Downloaded_Errors"],
+                           "TBD", "TBD", "WARC_Downloaded_Errors"],
                           ["magil-ggp-2529683-2023-05", 2529683, 15678, 1791489, 0.05, 2,
                            "ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420161205384-00000-qix5zv0f.warc.gz|"
                            "ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420230248436-00000-8bk2lsxt.warc.gz",
                            "Successfully downloaded all metadata reports",
                            "magil-ggp-2529683-2023-05_seedscope.csv; magil-ggp-2529683-2023-05_collscope.csv",
                            "Successfully redacted",
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420161205384-00000-qix5zv0f.warc.gz; "
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420230248436-00000-8bk2lsxt.warc.gz",
-                           2,
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420161205384-00000-qix5zv0f.warc.gz; "
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1791489-0-SEED2529683-20230420230248436-00000-8bk2lsxt.warc.gz",
+                           "Successfully downloaded 2 of 2 WARCs",
+                           "Successfully verified 2 of 2 WARCs",
+                           "Successfully unzipped 2 of 2 WARCs",
                            "Successfully completed"],
                           ["magil-ggp-2529676-2023-05", 2529676, 15678, 1791480, 0.014, 1,
                            "ARCHIVEIT-15678-TEST-JOB1791480-0-SEED2529676-20230420155757131-00000-zrl3k481.warc.gz",
                            "Successfully downloaded all metadata reports",
                            "magil-ggp-2529676-2023-05_seedscope.csv; magil-ggp-2529676-2023-05_collscope.csv",
                            "Successfully redacted",
-                           "Successfully downloaded ARCHIVEIT-15678-TEST-JOB1791480-0-SEED2529676-20230420155757131-00000-zrl3k481.warc.gz",
-                           1,
-                           "Successfully unzipped ARCHIVEIT-15678-TEST-JOB1791480-0-SEED2529676-20230420155757131-00000-zrl3k481.warc.gz",
+                           "Successfully downloaded 1 of 1 WARCs",
+                           "Successfully verified 1 of 1 WARCs",
+                           "Successfully unzipped 1 of 1 WARCs",
                            "Successfully completed"]]
         self.assertEqual(actual_seeds, expected_seeds, "Problem with test for restart, seeds_log.csv")
 
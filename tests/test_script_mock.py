@@ -0,0 +1,159 @@
+"""
+Tests the output of the ait_download.py script, using a mock of Archive-It instead of the UGA data.
+It downloads metadata and WARCs for the seeds saved during the specified date range.
+
+The script is run in a separate Python process with a configuration file in a temporary folder,
+which is imported before the configuration.py in the local copy of the GitHub repo.
+"""
+import contextlib
+import os
+import pandas as pd
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from mock_archive_it import MockArchiveIt
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_script(config_dir, *arguments, **kwargs):
+    """
+    Starts ait_download.py with the configuration file in config_dir and the API_REST pause turned off.
+    Returns the subprocess.Popen for the script, with its output and errors as text.
+    """
+    code = f"import sys; sys.path[:0] = [{config_dir!r}, {REPO!r}]; " \
+           f"import web_functions; web_functions.API_REST = 0; " \
+           f"import runpy; sys.argv = ['ait_download.py'] + {list(arguments)!r}; " \
+           f"runpy.run_path({os.path.join(REPO, 'ait_download.py')!r}, run_name='__main__')"
+    return subprocess.Popen([sys.executable, "-c", code], cwd=config_dir, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True, **kwargs)
+
+
+class TestScriptMock(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts a mock with two seeds that each have two WARCs and makes the configuration file for the script,
+        with the script output and run history in a temporary folder.
+        """
+        self.server = MockArchiveIt.synthetic(seeds=2, warcs=2, warc_bytes=5000, date="2023-05-01").start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "output")
+        os.mkdir(self.output)
+        self.run_history = os.path.join(self.temp_dir.name, "run_history.sqlite")
+        self.make_config()
+
+    def make_config(self, **values):
+        """
+        Makes configuration.py in the temporary folder from the mock's values, the temporary folder paths,
+        two workers, and any other values for the test.
+        """
+        values = dict(self.server.config_values(), script_output=self.output, workers=2,
+                      run_history=self.run_history, **values)
+        with open(os.path.join(self.temp_dir.name, "configuration.py"), "w") as config_file:
+            for name, value in values.items():
+                config_file.write(f"{name} = {value!r}\n")
+
+    def tearDown(self):
+        """
+        Stops the mock and deletes the temporary folder with the configuration file and everything the script made.
+        """
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def test_download(self):
+        """
+        Tests the full script with a date range that has 2 seeds with 2 WARCs each.
+        Results for testing are the contents of the three CSVs made by the script and the run history.
+        """
+        script = run_script(self.temp_dir.name, "2023-04-01", "2023-07-01")
+        stdout, stderr = script.communicate(timeout=300)
+        self.assertEqual(script.returncode, 0, f"Problem with test for download, script errors: {stderr}")
+
+        # Test for metadata.csv
+        metadata_df = pd.read_csv(os.path.join(self.output, "preservation_download", "metadata.csv"))
+        actual_metadata = [metadata_df.columns.tolist()] + metadata_df.values.tolist()
+        expected_metadata = [["Department", "Collection", "Folder", "AIP_ID", "Title", "Version"],
+                             ["magil", "magil-0000", 2000001, "magil-ggp-2000001-2023-07", "Mock seed 2000001", 1],
+                             ["magil", "magil-0000", 2000002, "magil-ggp-2000002-2023-07", "Mock seed 2000002", 1]]
+        self.assertEqual(actual_metadata, expected_metadata, "Problem with test for download, metadata.csv")
+
+        # Test for seeds_log.csv
+        seeds_df = pd.read_csv(os.path.join(self.output, "seeds_log.csv"))
+        actual_seeds = [seeds_df.columns.tolist()] + seeds_df.drop(columns="WARC_Filenames").values.tolist()
+        expected_seeds = [["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
+                           "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
+                           "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"],
+                          ["magil-ggp-2000001-2023-07", 2000001, 12345, 1000001, 0.0, 2,
+                           "Successfully downloaded all metadata reports", "magil-ggp-2000001-2023-07_collscope.csv",
+                           "Successfully redacted", "Successfully downloaded 2 of 2 WARCs",
+                           "Successfully verified 2 of 2 WARCs", "Successfully unzipped 2 of 2 WARCs",
+                           "Successfully completed"],
+                          ["magil-ggp-2000002-2023-07", 2000002, 12345, 1000002, 0.0, 2,
+                           "Successfully downloaded all metadata reports",
+                           "magil-ggp-2000002-2023-07_seedscope.csv; magil-ggp-2000002-2023-07_collscope.csv",
+                           "Successfully redacted", "Successfully downloaded 2 of 2 WARCs",
+                           "Successfully verified 2 of 2 WARCs", "Successfully unzipped 2 of 2 WARCs",
+                           "Successfully completed"]]
+        self.assertEqual(actual_seeds, expected_seeds, "Problem with test for download, seeds_log.csv")
+
+        # Test for completeness_check.csv
+        completeness_df = pd.read_csv(os.path.join(self.output, "completeness_check.csv"))
+        actual_completeness = [completeness_df.columns.tolist()] + completeness_df.values.tolist()
+        expected_completeness = [["Seed", "AIP", "Seed Folder Made", "coll.csv", "collscope.csv", "seed.csv",
+                                  "seedscope.csv", "crawldef.csv count", "crawljob.csv count", "WARC Count Correct",
+                                  "All Expected File Types"],
+                                 [2000001, "magil-ggp-2000001-2023-07", True, True, False, True, True, 1, 1, True,
+                                  True],
+                                 [2000002, "magil-ggp-2000002-2023-07", True, True, False, True, False, 1, 1, True,
+                                  True]]
+        self.assertEqual(actual_completeness, expected_completeness,
+                         "Problem with test for download, completeness_check.csv")
+
+        # Test for the run history.
+        with contextlib.closing(sqlite3.connect(self.run_history)) as connection:
+            actual_run = connection.execute("SELECT state, seeds, seeds_complete, warcs FROM runs").fetchall()
+        self.assertEqual(actual_run, [("finished", 2, 2, 4)], "Problem with test for download, run history")
+
+    def test_stop_twice(self):
+        """
+        Tests that the script saves the logs and run history for a stopped run when it is stopped twice
+        (Ctrl+C two times) while WARCs are downloading, instead of ending with a KeyboardInterrupt traceback.
+        The bandwidth limit makes the download slow enough to stop it partway through.
+        """
+        self.make_config(bandwidth_mb_per_second=0.005)
+        script = run_script(self.temp_dir.name, "2023-04-01", "2023-07-01")
+
+        # Waits for the first WARC to start downloading before sending the two signals.
+        seeds_dir = os.path.join(self.output, "preservation_download")
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline and script.poll() is None:
+            if any(name.endswith(".warc.gz") for folder, subfolders, files in os.walk(seeds_dir) for name in files):
+                break
+            time.sleep(0.05)
+        script.send_signal(signal.SIGINT)
+        time.sleep(0.01)
+        script.send_signal(signal.SIGINT)
+        stdout, stderr = script.communicate(timeout=120)
+
+        # Test for the script ending without an error.
+        self.assertEqual(script.returncode, 0, "Problem with test for stop twice, return code")
+        self.assertNotIn("Traceback", stderr, "Problem with test for stop twice, errors")
+
+        # Test for the seeds log, which is saved with the seeds not complete.
+        seeds_df = pd.read_csv(os.path.join(self.output, "seeds_log.csv"))
+        self.assertEqual(seeds_df["Complete"].tolist(), ["TBD", "TBD"],
+                         "Problem with test for stop twice, seeds_log.csv")
+
+        # Test for the run history.
+        with contextlib.closing(sqlite3.connect(self.run_history)) as connection:
+            actual_run = connection.execute("SELECT state FROM runs").fetchall()
+        self.assertEqual(actual_run, [("stopped",)], "Problem with test for stop twice, run history")
+
+
+if __name__ == '__main__':
+    unittest.main()
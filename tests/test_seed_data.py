@@ -8,9 +8,11 @@ For the CSV, the test only checks that it exists, not its contents, since those
 import os
 import unittest
 import configuration as config
+from archive_it_available import SKIP_REASON, archive_it_available
 from web_functions import seed_data
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestSeedData(unittest.TestCase):
 
     def tearDown(self):
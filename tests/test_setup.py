@@ -0,0 +1,83 @@
+"""
+Tests for the setup() function.
+It makes the settings and objects shared by the steps of the download from the configuration file,
+after the configuration is checked, so importing web_functions does not use the configuration values.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import configuration as config
+import observability
+import web_functions
+from web_functions import setup
+
+# Settings and objects that setup() replaces, which are restored after each test.
+NAMES = ("REQUEST_TIMEOUT", "STALL_BYTES_PER_SECOND", "STALL_SECONDS", "TRANSFER_RESTARTS",
+         "DISK", "BANDWIDTH", "METRICS", "PROGRESS", "TRACE", "PROFILER", "HISTORY")
+
+
+class TestSetup(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Saves the settings and objects, so the tests do not change them for other tests.
+        """
+        self.saved = {name: getattr(web_functions, name) for name in NAMES}
+
+    def tearDown(self):
+        """
+        Restores the settings and objects.
+        """
+        for name, value in self.saved.items():
+            setattr(web_functions, name, value)
+
+    def test_configuration(self):
+        """
+        Tests that the settings and objects use the values in the configuration file.
+        """
+        values = {"disk_free_threshold_gb": 2, "unzip_expansion": 4, "stall_seconds": 5, "request_timeout": (1, 2),
+                  "progress_seconds": 6, "trace": True, "run_history": "history.sqlite"}
+        with mock.patch.multiple(config, create=True, **values):
+            setup()
+        actual = [web_functions.DISK.threshold_bytes, web_functions.DISK.expansion, web_functions.STALL_SECONDS,
+                  web_functions.REQUEST_TIMEOUT, web_functions.PROGRESS.status_path, web_functions.PROGRESS.interval,
+                  web_functions.TRACE.path, web_functions.HISTORY.path]
+        expected = [2000000000, 4, 5, (1, 2), os.path.join(config.script_output, "download_status.json"), 6,
+                    os.path.join(config.script_output, "download_trace.json"), "history.sqlite"]
+        self.assertEqual(actual, expected, "Problem with test for configuration")
+
+        # The trace and progress add to the same metrics, and the run history uses the download totals.
+        actual = [web_functions.TRACE.metrics, web_functions.PROGRESS.metrics, web_functions.HISTORY.counters]
+        expected = [web_functions.METRICS, web_functions.METRICS, web_functions.run_counters]
+        self.assertEqual(actual, expected, "Problem with test for configuration, shared objects")
+
+    def test_defaults(self):
+        """
+        Tests that the settings use the default values when they are not in the configuration file.
+        """
+        setup()
+        actual = [web_functions.STALL_BYTES_PER_SECOND, web_functions.STALL_SECONDS, web_functions.TRANSFER_RESTARTS,
+                  web_functions.TRACE.path, web_functions.HISTORY.path]
+        expected = [10000, 300, 5, None, observability.RUN_HISTORY_PATH]
+        self.assertEqual(actual, expected, "Problem with test for defaults")
+
+    def test_import(self):
+        """
+        Tests that web_functions can be imported when the configuration has a value check_config() would report,
+        since the values are not used until setup().
+        """
+        with tempfile.TemporaryDirectory() as config_dir:
+            with open(os.path.join(config_dir, "configuration.py"), "w") as config_file:
+                config_file.write("script_output = '.'\ndisk_free_threshold_gb = '10'\nstall_seconds = 'x'\n")
+            repo = os.path.dirname(os.path.abspath(web_functions.__file__))
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join([config_dir, repo]))
+            result = subprocess.run([sys.executable, "-c", "import web_functions"], env=environment,
+                                    capture_output=True, text=True)
+        self.assertEqual((result.returncode, result.stderr), (0, ""), "Problem with test for import")
+
+
+if __name__ == '__main__':
+    unittest.main()
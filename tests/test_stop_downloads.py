@@ -0,0 +1,124 @@
+"""
+Tests for stopping the download gracefully: get_warc() saving a partly downloaded WARC when the script is stopping,
+and continuing it from the saved part the next time, and stop_downloads() stopping the WARCs being unzipped
+when the script is stopped a second time.
+
+The WARC is served slowly by a local web server, so the tests do not need the Archive-It API.
+"""
+import gzip
+import hashlib
+import http.server
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from test_get_warc import make_log
+from web_functions import get_warc, stop_downloads, unzip_warc
+
+DATA = os.urandom(500000)
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    """Sends DATA, or the requested range of DATA, in small pieces with a pause between them."""
+    ranges = []
+
+    def do_GET(self):
+        self.ranges.append(self.headers.get("Range"))
+        start = int(self.headers["Range"][6:-1]) if "Range" in self.headers else 0
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(DATA) - start))
+        self.end_headers()
+        try:
+            for position in range(start, len(DATA), 65536):
+                self.wfile.write(DATA[position:position + 65536])
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStopDownloads(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts the local web server, makes the seed folder, and uses a new stop event for each test.
+        """
+        SlowHandler.ranges = []
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/test.warc.gz"
+        self.warc_path = os.path.join("2529656", "test.warc.gz")
+        self.seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, "test.warc.gz",
+                                  "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        os.mkdir("2529656")
+        self.stop_patch = mock.patch.object(web_functions, "STOP", threading.Event())
+        self.stop = self.stop_patch.start()
+        self.stop_now_patch = mock.patch.object(web_functions, "STOP_NOW", threading.Event())
+        self.stop_now = self.stop_now_patch.start()
+
+    def tearDown(self):
+        """
+        Stops the local web server and deletes the seed folder and seeds_log.csv, if made.
+        """
+        self.stop_patch.stop()
+        self.stop_now_patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        for filename in os.listdir("2529656"):
+            os.remove(os.path.join("2529656", filename))
+        os.rmdir("2529656")
+        if os.path.exists(os.path.join(config.script_output, "seeds_log.csv")):
+            os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+
+    def test_stop_and_continue(self):
+        """
+        Tests that stopping saves the part downloaded without logging an error, and the next download continues it.
+        """
+        threading.Timer(0.3, self.stop.set).start()
+        with self.assertRaises(ValueError):
+            get_warc(self.seed_log, 0, self.url, "test.warc.gz", self.warc_path, len(DATA))
+        with open(f"{self.warc_path}.part", "rb") as partial:
+            saved = partial.read()
+        self.assertEqual(DATA.startswith(saved) and 0 < len(saved) < len(DATA), True,
+                         "Problem with test for stop, saved part")
+        self.assertEqual(self.seed_log.value(0, "WARC_Download_Errors"), "TBD", "Problem with test for stop, log")
+
+        self.stop.clear()
+        checksums = get_warc(self.seed_log, 0, self.url, "test.warc.gz", self.warc_path, len(DATA))
+        self.assertEqual(SlowHandler.ranges, [None, f"bytes={len(saved)}-"], "Problem with test for continue, range")
+        self.assertEqual(checksums["md5"], hashlib.md5(DATA).hexdigest(), "Problem with test for continue, MD5")
+        self.assertEqual(os.path.exists(f"{self.warc_path}.part"), False, "Problem with test for continue, part")
+
+    def test_second_signal(self):
+        """
+        Tests that the first signal stops the download gracefully
+        and the second signal also stops the WARCs being unzipped.
+        """
+        stop_downloads(2, None)
+        self.assertEqual((self.stop.is_set(), self.stop_now.is_set()), (True, False),
+                         "Problem with test for second signal, first signal")
+        stop_downloads(2, None)
+        self.assertEqual(self.stop_now.is_set(), True, "Problem with test for second signal, second signal")
+
+    def test_stop_unzip(self):
+        """
+        Tests that unzipping stops when the script is stopped a second time, deleting the partly unzipped WARC
+        without logging an error, so the WARC is downloaded again the next time.
+        """
+        with gzip.open(self.warc_path, "wb") as zipped:
+            zipped.write(DATA)
+        self.stop_now.set()
+        checksums = unzip_warc(self.seed_log, 0, self.warc_path, "test.warc.gz")
+        result = [checksums, os.listdir("2529656"), self.seed_log.value(0, "WARC_Unzip_Errors")]
+        self.assertEqual(result, [None, ["test.warc.gz"], "TBD"], "Problem with test for stop unzip")
+
+
+if __name__ == '__main__':
+    unittest.main()
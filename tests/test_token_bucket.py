@@ -0,0 +1,47 @@
+"""
+Tests for the TokenBucket class.
+It limits the combined download rate of all workers, with optional limits by time of day.
+"""
+import datetime
+import time
+import unittest
+from web_functions import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_rate_no_limit(self):
+        """
+        Tests that there is no limit when neither a default limit nor a schedule is provided.
+        """
+        bucket = TokenBucket()
+        self.assertEqual(bucket.rate(datetime.datetime(2024, 2, 1, 12)), None, "Problem with test for no limit")
+
+    def test_rate_schedule(self):
+        """
+        Tests that the limit for the time of day is used, including a scheduled time that includes midnight,
+        and the default limit is used outside the schedule.
+        """
+        bucket = TokenBucket(10, [(8, 18, 2), (22, 6, None)])
+        day = bucket.rate(datetime.datetime(2024, 2, 1, 9))
+        self.assertEqual(day, 2000000, "Problem with test for schedule, business hours")
+        evening = bucket.rate(datetime.datetime(2024, 2, 1, 18))
+        self.assertEqual(evening, 10000000, "Problem with test for schedule, default")
+        night = bucket.rate(datetime.datetime(2024, 2, 1, 3))
+        self.assertEqual(night, None, "Problem with test for schedule, overnight")
+
+    def test_consume(self):
+        """
+        Tests that using more tokens than are in the bucket waits until the bucket refills at the limit.
+        """
+        bucket = TokenBucket(0.5)
+        start_time = time.monotonic()
+        for chunk in range(5):
+            bucket.consume(100000)
+        elapsed = time.monotonic() - start_time
+        self.assertGreaterEqual(elapsed, 0.9, "Problem with test for consume, too fast")
+        self.assertLess(elapsed, 1.5, "Problem with test for consume, too slow")
+
+
+if __name__ == '__main__':
+    unittest.main()
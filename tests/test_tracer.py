@@ -0,0 +1,138 @@
+"""
+Tests for Tracer, which records how long each step takes in a Chrome trace-event file,
+and for the spans download_warc() records for each WARC.
+"""
+import json
+import os
+import pandas as pd
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from observability import Tracer
+from web_functions import SeedLog, download_warc
+
+
+def read_trace(trace_path):
+    """
+    Reads a trace file, which is a JSON array without the closing bracket, and returns the list of events.
+    """
+    with open(trace_path) as trace_file:
+        return json.loads(trace_file.read().rstrip().rstrip(",") + "]")
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a temporary folder for the trace file.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.trace_path = os.path.join(self.temp_dir.name, "download_trace.json")
+
+    def tearDown(self):
+        """
+        Deletes the temporary folder.
+        """
+        self.temp_dir.cleanup()
+
+    def test_span(self):
+        """
+        Tests that a span has the name, category, arguments, and duration, and that each thread is named.
+        """
+        tracer = Tracer(self.trace_path)
+        with tracer.span("get_warc", "warc", warc="one.warc.gz"):
+            pass
+
+        def log_span():
+            with tracer.span("log", "log"):
+                pass
+        worker = threading.Thread(target=log_span, name="warcs_0")
+        worker.start()
+        worker.join()
+        tracer.close()
+
+        events = read_trace(self.trace_path)
+        spans = [(event["name"], event["cat"], event["args"]) for event in events if event["ph"] == "X"]
+        expected = [("get_warc", "warc", {"warc": "one.warc.gz"}), ("log", "log", {})]
+        self.assertEqual(spans, expected, "Problem with test for span, spans")
+        threads = [event["args"]["name"] for event in events if event["name"] == "thread_name"]
+        self.assertIn("warcs_0", threads, "Problem with test for span, thread names")
+        self.assertTrue(all(event["dur"] >= 0 for event in events if event["ph"] == "X"),
+                        "Problem with test for span, duration")
+
+    def test_error(self):
+        """
+        Tests that a span is recorded when the step raises an error.
+        """
+        tracer = Tracer(self.trace_path)
+        with self.assertRaises(ValueError):
+            with tracer.span("verify_warc_fixity", "warc"):
+                raise ValueError
+        tracer.close()
+        names = [event["name"] for event in read_trace(self.trace_path) if event["ph"] == "X"]
+        self.assertEqual(names, ["verify_warc_fixity"], "Problem with test for error")
+
+    def test_run_again(self):
+        """
+        Tests that the spans from a second run are added to the same file.
+        """
+        for name in ("first", "second"):
+            tracer = Tracer(self.trace_path)
+            with tracer.span(name, "stage"):
+                pass
+            tracer.close()
+        names = [event["name"] for event in read_trace(self.trace_path) if event["ph"] == "X"]
+        self.assertEqual(names, ["first", "second"], "Problem with test for run again")
+
+    def test_off(self):
+        """
+        Tests that no file is made when there is no path.
+        """
+        tracer = Tracer(None)
+        with tracer.span("get_warc", "warc"):
+            pass
+        tracer.close()
+        self.assertFalse(os.path.exists(self.trace_path), "Problem with test for off")
+
+    def test_download_warc(self):
+        """
+        Tests that download_warc() records a span for the WARC with a span inside it for each step.
+        The steps are replaced with mocks, which do not have a function name, so the spans use the warcs_log.csv column.
+        """
+        seed_log = SeedLog(pd.DataFrame([["aip-1", "1111111", "12345", "1", 0.01, 1, "one.warc.gz"]],
+                                        columns=["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs",
+                                                 "WARC_Filenames"]))
+        seed_log.start_warc_log()
+        tracer = Tracer(self.trace_path)
+        patches = [mock.patch.object(web_functions, "TRACE", tracer),
+                   mock.patch.object(web_functions, "API_REST", 0),
+                   mock.patch("web_functions.get_warc_info", return_value=("url", {"md5": "abc"}, 100)),
+                   mock.patch("web_functions.get_warc", return_value={"md5": "abc", "sha1": "def"}),
+                   mock.patch("web_functions.verify_warc_fixity"),
+                   mock.patch("web_functions.unzip_warc", return_value=None),
+                   mock.patch("web_functions.add_to_manifest")]
+        for patch in patches:
+            patch.start()
+        try:
+            download_warc(seed_log.records[0], 0, seed_log, "one.warc.gz")
+        finally:
+            for patch in patches:
+                patch.stop()
+            tracer.close()
+            os.remove(os.path.join(config.script_output, "warcs_log.csv"))
+
+        spans = {event["name"]: event for event in read_trace(self.trace_path) if event["ph"] == "X"}
+        expected = ["Info_Seconds", "disk_wait", "Download_Seconds", "Fixity_Seconds", "Unzip_Seconds",
+                    "download_warc", "api_rest"]
+        self.assertEqual(list(spans), expected, "Problem with test for download_warc, spans")
+        warc_span = spans["download_warc"]
+        inside = all(warc_span["ts"] <= spans[name]["ts"] and spans[name]["ts"] + spans[name]["dur"]
+                     <= warc_span["ts"] + warc_span["dur"] for name in expected[:5])
+        self.assertTrue(inside, "Problem with test for download_warc, steps inside the WARC span")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the TransferWatchdog class and for get_warc() resuming a WARC after its transfer stalls.
+
+The WARC is served by a local web server which stops sending data partway through the first transfer
+and sends the rest of the WARC when asked for a range, so the tests do not need the Archive-It API.
+"""
+import hashlib
+import http.server
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from test_get_warc import make_log
+from web_functions import TransferWatchdog, get_warc
+
+DATA = os.urandom(200000)
+
+
+class StallingHandler(http.server.BaseHTTPRequestHandler):
+    """Sends part of DATA and then stops sending without closing the connection, unless a range is requested."""
+
+    def do_GET(self):
+        if "Range" in self.headers:
+            start = int(self.headers["Range"][6:-1])
+            self.send_response(206)
+            self.send_header("Content-Length", str(len(DATA) - start))
+            self.end_headers()
+            self.wfile.write(DATA[start:])
+        else:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[:100000])
+            self.wfile.flush()
+            time.sleep(4)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransferWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Starts the local web server and makes the seed folder.
+        """
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/test.warc.gz"
+        os.mkdir("2529656")
+
+    def tearDown(self):
+        """
+        Stops the local web server and deletes the seed folder and seeds_log.csv, if made.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        for filename in os.listdir("2529656"):
+            os.remove(os.path.join("2529656", filename))
+        os.rmdir("2529656")
+        if os.path.exists(os.path.join(config.script_output, "seeds_log.csv")):
+            os.remove(os.path.join(config.script_output, "seeds_log.csv"))
+
+    def test_fast_transfer(self):
+        """
+        Tests that a transfer above the floor is not stopped.
+        """
+        response = mock.Mock()
+        with TransferWatchdog(response, 1000, 0.2, poll_seconds=0.05) as watchdog:
+            for _ in range(10):
+                watchdog.received(1000)
+                time.sleep(0.05)
+        self.assertEqual(watchdog.stalled, False, "Problem with test for fast transfer")
+
+    def test_throttled_transfer(self):
+        """
+        Tests that time waiting for the bandwidth limit does not count as a stalled transfer.
+        """
+        response = mock.Mock()
+        with TransferWatchdog(response, 1000, 0.2, poll_seconds=0.05) as watchdog:
+            with watchdog.throttled():
+                time.sleep(0.5)
+        self.assertEqual(watchdog.stalled, False, "Problem with test for throttled transfer")
+
+    def test_resume_stalled(self):
+        """
+        Tests that get_warc() stops the stalled transfer and resumes it from the bytes already received.
+        """
+        warc = "test.warc.gz"
+        seed_log = make_log(["magil-1", 2529656, 15678, "1594318", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        with mock.patch.object(web_functions, "STALL_BYTES_PER_SECOND", 1000), \
+                mock.patch.object(web_functions, "STALL_SECONDS", 1):
+            checksums = get_warc(seed_log, 0, self.url, warc, os.path.join("2529656", warc))
+
+        self.assertEqual(checksums["md5"], hashlib.md5(DATA).hexdigest(), "Problem with test for resume, MD5")
+        with open(os.path.join("2529656", warc), "rb") as warc_file:
+            self.assertEqual(warc_file.read(), DATA, "Problem with test for resume, file")
+        self.assertEqual(seed_log.value(0, "WARC_Download_Errors"), f"Successfully downloaded {warc}",
+                         "Problem with test for resume, log")
+
+
+if __name__ == '__main__':
+    unittest.main()
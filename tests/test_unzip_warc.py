@@ -2,29 +2,33 @@
 Tests for the unzip_error() function.
 It unzips the download WARC and either deletes the zip (if it worked) or the unzipped file (if there was an error).
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
-and seed_df only has the WARC being tested, not other WARCs for that seed.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
+and seed_log only has the WARC being tested, not other WARCs for that seed.
 """
+import gzip
+import hashlib
 import os
 import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import get_warc, unzip_warc
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, get_warc, unzip_warc
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestUnzipWarc(unittest.TestCase):
 
     def tearDown(self):
@@ -47,10 +51,10 @@ class TestUnzipWarc(unittest.TestCase):
         os.chdir(seed_dir)
         warc = "ARCHIVEIT-12912-WEEKLY-JOB1215043-SEED2173769-20200625025209518-00000-h3.warc.gz"
         warc_path = os.path.join(seed_dir, "2173769", warc)
-        seed_df = make_df(["harg-1", 2173769, 12912, "1215043", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        get_warc(seed_df, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
-        unzip_warc(seed_df, 0, warc_path, warc)
+        seed_log = make_log(["harg-1", 2173769, 12912, "1215043", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        get_warc(seed_log, 0, f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
+        unzip_checksums = unzip_warc(seed_log, 0, warc_path, warc)
 
         # Test the zipped WARC was deleted.
         warc_zip = os.path.exists(warc_path)
@@ -61,8 +65,14 @@ class TestUnzipWarc(unittest.TestCase):
         warc_unzip = os.path.exists(warc_path[:-3])
         self.assertEqual(warc_unzip, True, "Problem with test for correct, unzipped WARC")
 
+        # Test the checksums returned are for the unzipped WARC.
+        with open(warc_path[:-3], "rb") as unzipped:
+            content = unzipped.read()
+        expected_checksums = {"md5": hashlib.md5(content).hexdigest(), "sha256": hashlib.sha256(content).hexdigest()}
+        self.assertEqual(unzip_checksums, expected_checksums, "Problem with test for correct, checksums")
+
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Unzip_Errors']
+        actual = seed_log.value(0, 'WARC_Unzip_Errors')
         expected = f"Successfully unzipped {warc}"
         self.assertEqual(actual, expected, "Problem with test for correct, log")
 
@@ -77,15 +87,77 @@ class TestUnzipWarc(unittest.TestCase):
         os.chdir(seed_dir)
         warc = "ARCHIVEIT-ERROR.warc.gz"
         warc_path = os.path.join(seed_dir, "0000000", warc)
-        seed_df = make_df(["aip-0", 0000000, 00000, "0000000", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
-        unzip_warc(seed_df, 0, warc_path, warc)
+        seed_log = make_log(["aip-0", 0000000, 00000, "0000000", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        unzip_checksums = unzip_warc(seed_log, 0, warc_path, warc)
+
+        # Test no checksums are returned.
+        self.assertEqual(unzip_checksums, None, "Problem with test for error, checksums")
 
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Unzip_Errors']
-        expected = f"Error unzipping {warc}: gzip: {warc_path}: No such file or directory\n"
+        actual = seed_log.value(0, 'WARC_Unzip_Errors')
+        expected = f"Error unzipping {warc}: [Errno 2] No such file or directory: '{warc_path}'"
         self.assertEqual(actual, expected, "Problem with test for error, log")
 
+    def test_error_partial(self):
+        """
+        Tests that the function deletes the partly unzipped WARC, keeps the zipped WARC, and updates the log correctly
+        when the zipped WARC ends before the end of the gzip data.
+        """
+        # Makes the data needed for the function input and runs the function.
+        # The zipped WARC is cut off partway through the second gzip member.
+        seed_dir = os.path.join(config.script_output, "preservation_download")
+        os.makedirs(os.path.join(seed_dir, "0000000"))
+        os.chdir(seed_dir)
+        warc = "ARCHIVEIT-PARTIAL.warc.gz"
+        warc_path = os.path.join(seed_dir, "0000000", warc)
+        with open(warc_path, "wb") as warc_file:
+            warc_file.write(gzip.compress(b"WARC/1.0 record one"))
+            warc_file.write(gzip.compress(b"WARC/1.0 record two")[:-10])
+        seed_log = make_log(["aip-0", 0000000, 00000, "0000000", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        unzip_checksums = unzip_warc(seed_log, 0, warc_path, warc)
+
+        # Test no checksums are returned.
+        self.assertEqual(unzip_checksums, None, "Problem with test for error partial, checksums")
+
+        # Test the zipped WARC was kept and the partly unzipped WARC was deleted.
+        self.assertEqual(os.path.exists(warc_path), True, "Problem with test for error partial, zipped WARC")
+        self.assertEqual(os.path.exists(warc_path[:-3]), False, "Problem with test for error partial, unzipped WARC")
+
+        # Test the log is updated correctly.
+        actual = seed_log.value(0, 'WARC_Unzip_Errors')
+        expected = f"Error unzipping {warc}: Compressed file ended before the end-of-stream marker was reached"
+        self.assertEqual(actual, expected, "Problem with test for error partial, log")
+
+    def test_multiple_members(self):
+        """
+        Tests that the function unzips every gzip member and returns the checksums of the complete unzipped WARC,
+        which is how WARCs are zipped (one gzip member per WARC record).
+        """
+        # Makes the data needed for the function input and runs the function.
+        seed_dir = os.path.join(config.script_output, "preservation_download")
+        os.makedirs(os.path.join(seed_dir, "0000000"))
+        os.chdir(seed_dir)
+        warc = "ARCHIVEIT-MEMBERS.warc.gz"
+        warc_path = os.path.join(seed_dir, "0000000", warc)
+        with open(warc_path, "wb") as warc_file:
+            warc_file.write(gzip.compress(b"WARC/1.0 record one\r\n"))
+            warc_file.write(gzip.compress(b"WARC/1.0 record two\r\n"))
+        seed_log = make_log(["aip-0", 0000000, 00000, "0000000", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        unzip_checksums = unzip_warc(seed_log, 0, warc_path, warc)
+
+        # Test the unzipped WARC has both records.
+        with open(warc_path[:-3], "rb") as unzipped:
+            content = unzipped.read()
+        self.assertEqual(content, b"WARC/1.0 record one\r\nWARC/1.0 record two\r\n",
+                         "Problem with test for multiple members, unzipped WARC")
+
+        # Test the checksums returned are for the complete unzipped WARC.
+        expected_checksums = {"md5": hashlib.md5(content).hexdigest(), "sha256": hashlib.sha256(content).hexdigest()}
+        self.assertEqual(unzip_checksums, expected_checksums, "Problem with test for multiple members, checksums")
+
 
 if __name__ == '__main__':
     unittest.main()
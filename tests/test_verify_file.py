@@ -0,0 +1,54 @@
+"""
+Tests for the verify_file() function.
+It compares the checksums of a file on the disk to the checksums in the seed's manifests.
+"""
+import hashlib
+import os
+import unittest
+from web_functions import verify_file
+
+
+class TestVerifyFile(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the file to verify.
+        """
+        with open("audit_test.warc", "wb") as file:
+            file.write(b"WARC/1.0 audit content")
+        self.md5 = hashlib.md5(b"WARC/1.0 audit content").hexdigest()
+        self.sha256 = hashlib.sha256(b"WARC/1.0 audit content").hexdigest()
+
+    def tearDown(self):
+        """
+        Deletes the file made for the test.
+        """
+        os.remove("audit_test.warc")
+
+    def test_match(self):
+        """
+        Tests that the function returns Match when every checksum matches the manifest.
+        """
+        actual = verify_file("audit_test.warc", {"sha256": self.sha256, "md5": self.md5})
+        expected = [22, "md5|sha256", f"{self.md5}|{self.sha256}", f"{self.md5}|{self.sha256}", "Match"]
+        self.assertEqual(actual, expected, "Problem with test for match")
+
+    def test_mismatch(self):
+        """
+        Tests that the function returns Mismatch when a checksum does not match the manifest.
+        """
+        actual = verify_file("audit_test.warc", {"md5": "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"})
+        expected = [22, "md5", "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx", self.md5, "Mismatch"]
+        self.assertEqual(actual, expected, "Problem with test for mismatch")
+
+    def test_error(self):
+        """
+        Tests that the function returns an error when the file cannot be read.
+        """
+        actual = verify_file("missing.warc", {"md5": self.md5})
+        expected = [0, "md5", self.md5, "", "Error: [Errno 2] No such file or directory: 'missing.warc'"]
+        self.assertEqual(actual, expected, "Problem with test for error")
+
+
+if __name__ == '__main__':
+    unittest.main()
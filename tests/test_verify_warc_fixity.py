@@ -2,29 +2,31 @@
 Tests for the verify_warc_fixity() function.
 It compares the fixity of the downloaded WARC to Archive-It and deletes the file if it does not match.
 
-To save time, fake data is supplied in seed_df for fields that are not used in these tests
-and seed_df only has the WARC being tested, not other WARCs for that seed.
+To save time, fake data is supplied in seed_log for fields that are not used in these tests
+and seed_log only has the WARC being tested, not other WARCs for that seed.
 """
 import os
 import pandas as pd
 import shutil
 import unittest
 import configuration as config
-from web_functions import get_warc, verify_warc_fixity
+from archive_it_available import SKIP_REASON, archive_it_available
+from web_functions import SeedLog, get_warc, verify_warc_fixity
 
 
-def make_df(df_row):
+def make_log(df_row):
     """
-    Makes a dataframe with the provided row information. The column values are the same for all tests.
-    Returns the dataframe.
+    Makes a seed log with the provided row information. The column values are the same for all tests.
+    Returns the seed log.
     """
     column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames",
                    "Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction",
                    "WARC_Download_Errors", "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    df = pd.DataFrame([df_row], columns=column_list)
-    return df
+    seed_log = SeedLog(pd.DataFrame([df_row], columns=column_list))
+    return seed_log
 
 
+@unittest.skipUnless(archive_it_available(), SKIP_REASON)
 class TestVerifyWarcFixity(unittest.TestCase):
 
     def tearDown(self):
@@ -44,11 +46,12 @@ class TestVerifyWarcFixity(unittest.TestCase):
         # Makes the data needed for the function input and runs the function.
         warc = "ARCHIVEIT-12265-MONTHLY-JOB1718490-SEED2444051-20221203041251087-00001-h3.warc.gz"
         warc_path = os.path.join(os.getcwd(), "2444051", warc)
-        seed_df = make_df(["rbrl-1", 2444051, 12265, "1718490", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["rbrl-1", 2444051, 12265, "1718490", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
         os.mkdir("2444051")
-        get_warc(seed_df, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
-        verify_warc_fixity(seed_df, 0, warc_path, warc, "7f0c9f11a27b06271b4137d99946fc52")
+        download_checksums = get_warc(seed_log, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
+        verify_warc_fixity(seed_log, 0, warc_path, warc, {"md5": "7f0c9f11a27b06271b4137d99946fc52"},
+                           download_checksums)
 
         # Test the WARC was not deleted.
         warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2444051", warc))
@@ -56,7 +59,7 @@ class TestVerifyWarcFixity(unittest.TestCase):
 
         # Test the log is updated correctly.
         # Just tests for what it starts with, since the end of the log is the time stamp of the fixity check.
-        actual = seed_df.at[0, 'WARC_Fixity_Errors'].startswith(f"Successfully verified {warc} fixity on ")
+        actual = seed_log.value(0, 'WARC_Fixity_Errors').startswith(f"Successfully verified {warc} fixity on ")
         self.assertEqual(actual, True, "Problem with test for correct, log")
 
     def test_error_fixity(self):
@@ -67,47 +70,74 @@ class TestVerifyWarcFixity(unittest.TestCase):
         # Makes the data needed for the function input and runs the function.
         warc = "ARCHIVEIT-12912-TEST-JOB1115532-SEED2173769-20200326213812038-00000-h3.warc.gz"
         warc_path = os.path.join(os.getcwd(), "2173769", warc)
-        seed_df = make_df(["harg-1", 2173769, 12912, "1115532", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["harg-1", 2173769, 12912, "1115532", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
         os.mkdir("2173769")
-        get_warc(seed_df, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
+        download_checksums = get_warc(seed_log, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
         with self.assertRaises(ValueError):
-            verify_warc_fixity(seed_df, 0, warc_path, warc, "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+            verify_warc_fixity(seed_log, 0, warc_path, warc, {"md5": "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"},
+                               download_checksums)
 
         # Test the WARC was deleted.
         warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2173769", warc))
         self.assertEqual(warc_downloaded, False, "Problem with test for correct, WARC deletion")
 
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Fixity_Errors']
+        actual = seed_log.value(0, 'WARC_Fixity_Errors')
         expected = f"Error: fixity for {warc} changed and it was deleted: " \
                    f"xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx before, 422c2c674cac30a015120483c2fa25cd after"
         self.assertEqual(actual, expected, "Problem with test for correct, log")
 
-    def test_error_regex(self):
+    def test_error_no_checksum(self):
         """
         Tests that the function does not delete the WARC in the seed folder and updates the log correctly
-        when the WARC fixity cannot be extracted from the md5deep output.
+        when Archive-It does not provide a checksum that can be compared to the download.
         """
         # Makes the data needed for the function input and runs the function.
         warc = "ARCHIVEIT-12265-TEST-JOB1365541-SEED2454528-20210217005857702-00002-h3.warc.gz"
         warc_path = os.path.join(os.getcwd(), "2454528", warc)
-        seed_df = make_df(["rbrl-1", 2454528, 12265, "1365541", 0.01, 1, warc,
-                           "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        seed_log = make_log(["rbrl-1", 2454528, 12265, "1365541", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
         os.mkdir("2454528")
-        get_warc(seed_df, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
-        with self.assertRaises(AttributeError):
-            verify_warc_fixity(seed_df, 0, os.path.join(os.getcwd(), "error.warc.gz"), warc,
-                               "18080e6f3c82ad095d15be8c5ab6ca21")
+        download_checksums = get_warc(seed_log, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
+        with self.assertRaises(ValueError):
+            verify_warc_fixity(seed_log, 0, warc_path, warc, {}, download_checksums)
 
         # Test the WARC was not deleted.
         warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2454528", warc))
-        self.assertEqual(warc_downloaded, True, "Problem with test for correct, WARC deletion")
+        self.assertEqual(warc_downloaded, True, "Problem with test for no checksum, WARC deletion")
 
         # Test the log is updated correctly.
-        actual = seed_df.at[0, 'WARC_Fixity_Errors']
-        expected = f"Error: fixity for {warc} cannot be extracted from md5deep output: b''"
-        self.assertEqual(actual, expected, "Problem with test for correct, log")
+        actual = seed_log.value(0, 'WARC_Fixity_Errors')
+        expected = f"Error: fixity for {warc} cannot be verified because Archive-It did not provide a checksum"
+        self.assertEqual(actual, expected, "Problem with test for no checksum, log")
+
+    def test_error_sha1(self):
+        """
+        Tests that the function deletes the WARC in the seed folder and updates the log correctly
+        when the WARC MD5 matches Archive-It but the SHA1 does not.
+        """
+        # Makes the data needed for the function input and runs the function.
+        warc = "ARCHIVEIT-12265-MONTHLY-JOB1718490-SEED2444051-20221203041251087-00001-h3.warc.gz"
+        warc_path = os.path.join(os.getcwd(), "2444051", warc)
+        seed_log = make_log(["rbrl-1", 2444051, 12265, "1718490", 0.01, 1, warc,
+                             "TBD", "TBD", "TBD", "TBD", "TBD", "TBD", "TBD"])
+        os.mkdir("2444051")
+        download_checksums = get_warc(seed_log, 0,  f"https://warcs.archive-it.org/webdatafile/{warc}", warc, warc_path)
+        with self.assertRaises(ValueError):
+            verify_warc_fixity(seed_log, 0, warc_path, warc,
+                               {"md5": "7f0c9f11a27b06271b4137d99946fc52",
+                                "sha1": "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"}, download_checksums)
+
+        # Test the WARC was deleted.
+        warc_downloaded = os.path.exists(os.path.join(os.getcwd(), "2444051", warc))
+        self.assertEqual(warc_downloaded, False, "Problem with test for SHA1, WARC deletion")
+
+        # Test the log is updated correctly.
+        actual = seed_log.value(0, 'WARC_Fixity_Errors')
+        expected = f"Error: fixity for {warc} changed and it was deleted: " \
+                   f"xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx before, {download_checksums['sha1']} after"
+        self.assertEqual(actual, expected, "Problem with test for SHA1, log")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,138 @@
+"""
+Tests for the WARC log: download_warc() adding a row to warcs_log.csv for each WARC,
+the summary of the WARC steps in seeds_log.csv, and reading and removing rows when the script runs again.
+
+The WARC steps are replaced with functions that only log a message, so the tests do not need the Archive-It API.
+"""
+import csv
+import os
+import pandas as pd
+import unittest
+from unittest import mock
+import configuration as config
+import web_functions
+from web_functions import SeedLog, download_warc, log
+
+
+def make_log():
+    """
+    Makes a seed log with one seed with two WARCs. The column values are the same for all tests.
+    Returns the seed log.
+    """
+    column_list = ["AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames"]
+    return SeedLog(pd.DataFrame([["aip-1", "1111111", "12345", "1", 0.01, 2, "one.warc.gz|two.warc.gz"]],
+                                columns=column_list))
+
+
+def read_csv(csv_path):
+    """
+    Reads a CSV and returns a list of dictionaries, one per row.
+    """
+    with open(csv_path, newline="") as open_csv:
+        return list(csv.DictReader(open_csv))
+
+
+def fake_info(warc, seed_log, row_index):
+    return f"https://warcs.archive-it.org/webdatafile/{warc}", {"md5": "abc"}, 100
+
+
+def fake_get_warc(seed_log, row_index, warc_url, warc, warc_path, warc_size):
+    log(f"Successfully downloaded {warc}", seed_log, row_index, "WARC_Download_Errors")
+    return {"md5": "abc", "sha1": "def"}
+
+
+def fake_verify(seed_log, row_index, warc_path, warc, warc_checksums, download_checksums):
+    log(f"Successfully verified {warc} fixity on 2024-01-01 00:00:00.000000", seed_log, row_index,
+        "WARC_Fixity_Errors")
+
+
+def fake_unzip(seed_log, row_index, warc_path, warc):
+    if warc == "two.warc.gz":
+        log(f"Error unzipping {warc}: bad gzip", seed_log, row_index, "WARC_Unzip_Errors")
+        return None
+    log(f"Successfully unzipped {warc}", seed_log, row_index, "WARC_Unzip_Errors")
+    return {"md5": "ghi", "sha256": "jkl"}
+
+
+class TestWarcLog(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes the seed log and replaces the WARC steps.
+        """
+        self.seed_log = make_log()
+        self.seed_log.start_warc_log()
+        self.patches = [mock.patch("web_functions.get_warc_info", side_effect=fake_info),
+                        mock.patch("web_functions.get_warc", side_effect=fake_get_warc),
+                        mock.patch("web_functions.verify_warc_fixity", side_effect=fake_verify),
+                        mock.patch("web_functions.unzip_warc", side_effect=fake_unzip),
+                        mock.patch("web_functions.add_to_manifest"),
+                        mock.patch.object(web_functions, "API_REST", 0)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """
+        Restores the WARC steps and deletes the logs.
+        """
+        for patch in self.patches:
+            patch.stop()
+        for filename in ("seeds_log.csv", "warcs_log.csv"):
+            if os.path.exists(os.path.join(config.script_output, filename)):
+                os.remove(os.path.join(config.script_output, filename))
+
+    def test_warc_rows(self):
+        """
+        Tests that each WARC has a row in warcs_log.csv with its status, size, MD5, SHA1, and messages,
+        that only the unzipped WARC is added to the manifests, and that seeds_log.csv has a summary of the WARC steps.
+        """
+        download_warc(self.seed_log.records[0], 0, self.seed_log, "one.warc.gz")
+        download_warc(self.seed_log.records[0], 0, self.seed_log, "two.warc.gz")
+
+        rows = read_csv(os.path.join(config.script_output, "warcs_log.csv"))
+        actual = [[row["WARC"], row["Status"], row["Bytes"], row["MD5"], row["SHA1"], row["WARC_Unzip_Errors"]]
+                  for row in rows]
+        expected = [["one.warc.gz", "Successfully completed", "100", "abc", "def", "Successfully unzipped one.warc.gz"],
+                    ["two.warc.gz", "WARC_Unzip_Errors", "100", "abc", "def", "Error unzipping two.warc.gz: bad gzip"]]
+        self.assertEqual(actual, expected, "Problem with test for WARC rows, warcs_log.csv")
+        manifest_files = [call.args[2] for call in web_functions.add_to_manifest.call_args_list]
+        self.assertEqual(manifest_files, ["one.warc"], "Problem with test for WARC rows, manifests")
+        self.assertNotEqual(rows[0]["Download_Seconds"], "", "Problem with test for WARC rows, timing")
+
+        seeds = read_csv(os.path.join(config.script_output, "seeds_log.csv"))
+        actual_summary = [seeds[0][column] for column in ("WARC_Download_Errors", "WARC_Fixity_Errors",
+                                                          "WARC_Unzip_Errors")]
+        expected_summary = ["Successfully downloaded 2 of 2 WARCs", "Successfully verified 2 of 2 WARCs",
+                            "Successfully unzipped 1 of 2 WARCs; Error unzipping two.warc.gz: bad gzip"]
+        self.assertEqual(actual_summary, expected_summary, "Problem with test for WARC rows, seeds_log.csv")
+
+    def test_stopped(self):
+        """
+        Tests that a WARC that stops without an error because the script is stopping does not get a row.
+        """
+        with mock.patch("web_functions.get_warc", side_effect=ValueError):
+            download_warc(self.seed_log.records[0], 0, self.seed_log, "one.warc.gz")
+        rows = read_csv(os.path.join(config.script_output, "warcs_log.csv"))
+        self.assertEqual(rows, [], "Problem with test for stopped")
+
+    def test_run_again(self):
+        """
+        Tests that the messages for each WARC are read from warcs_log.csv when the script runs again,
+        and that removing a WARC that will be downloaded again removes its row.
+        """
+        download_warc(self.seed_log.records[0], 0, self.seed_log, "one.warc.gz")
+        download_warc(self.seed_log.records[0], 0, self.seed_log, "two.warc.gz")
+
+        seed_log = SeedLog(pd.read_csv(os.path.join(config.script_output, "seeds_log.csv"), dtype="object"))
+        seed_log.read_warc_log()
+        actual = seed_log.value(0, "WARC_Unzip_Errors")
+        expected = "Successfully unzipped one.warc.gz; Error unzipping two.warc.gz: bad gzip"
+        self.assertEqual(actual, expected, "Problem with test for run again, messages")
+
+        seed_log.remove_warcs("1111111", {"one.warc.gz"})
+        rows = read_csv(os.path.join(config.script_output, "warcs_log.csv"))
+        self.assertEqual([row["WARC"] for row in rows], ["one.warc.gz"], "Problem with test for run again, remove")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,50 +1,754 @@
 """Functions used by the ait_download.py script, to download web content from Archive-It."""
 
+import concurrent.futures
+import contextlib
 import csv
 import datetime
+import gzip
+import hashlib
+import heapq
+import io
+import ipaddress
+import itertools
 import os
 import pandas as pd
+import random
 import re
 import requests
 import shutil
-import subprocess
+import socket
 import sys
+import threading
 import time
+import urllib.parse
+import urllib3
 
 # Import constant variables and functions from another UGA preservation script.
 import configuration as config
 
+# Classes for the progress, trace, metrics, profiles, and run history of a download, and their configuration check.
+import observability
+from observability import Metrics, Profiler, Progress, RunHistory, Tracer
 
-def add_completeness(row_index, seed_df):
-    """Add error type(s), or that complete with no errors, to Complete column in the seed dataframe.
+# Number of bytes read or written at a time when streaming WARCs, so large WARCs are never held in memory.
+CHUNK_SIZE = 1024 * 1024
+
+# Number of bytes read at a time from a WARC transfer. This is smaller than CHUNK_SIZE because a partial chunk
+# is lost if the transfer is interrupted, and everything before it is kept when the transfer is resumed.
+TRANSFER_CHUNK_SIZE = 64 * 1024
+
+# Number of metadata reports for a seed that are downloaded at the same time.
+METADATA_CONNECTIONS = 8
+
+# Seconds to wait after each WARC to give the API a rest.
+API_REST = 15
+
+# Default retry policy for Archive-It API calls, which can be changed for each endpoint in the configuration file.
+# attempts is the total number of tries, and the wait before each retry doubles from base_seconds up to max_seconds.
+RETRY_POLICY = {"attempts": 5, "base_seconds": 2, "max_seconds": 120}
+
+# Status codes for errors that are usually temporary, so the API call is tried again.
+# Any other error (for example, 404 not found or 401 unauthorized) will not change if it is tried again.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Number of API calls, retries, and seconds spent waiting to retry for each endpoint, displayed at the end of the script.
+RETRY_STATS = {}
+
+# Size in bytes of each WARC from the WASAPI call made by seed_data(), by (date_start, date_end),
+# so get_warc_sizes() does not need to make the same call again to schedule the download.
+WARC_SIZES = {}
+
+# Seconds to wait for a connection to the API and for the next data from the API, so a connection that
+# stops responding raises an error (which is retried) instead of making the script wait forever.
+# Either can be changed in the configuration file with request_timeout = (connect seconds, read seconds),
+# which is used once setup() runs.
+REQUEST_TIMEOUT = (30, 300)
+
+# A WARC transfer that is slower than STALL_BYTES_PER_SECOND for STALL_SECONDS is stopped and resumed where it
+# stopped, up to TRANSFER_RESTARTS times. All three can be changed in the configuration file, used once setup() runs.
+# Only transfers that started and were interrupted count as restarts. The request for each transfer is retried by
+# api_get() with the get_warc retry policy, and a WARC is not restarted after api_get() gives up, so a WARC has at most
+# TRANSFER_RESTARTS + 1 transfers and each of those is tried up to that policy's attempts (5 by default) to connect.
+STALL_BYTES_PER_SECOND = 10000
+STALL_SECONDS = 300
+TRANSFER_RESTARTS = 5
+
+# Set when the script is asked to stop (Ctrl+C or SIGTERM), so no new WARCs are started
+# and WARCs being downloaded are saved to be resumed the next time the script runs.
+STOP = threading.Event()
+
+# Set when the script is asked to stop a second time, so WARCs being unzipped are stopped too
+# and are downloaded again the next time the script runs.
+STOP_NOW = threading.Event()
+
+# Seeds can be downloaded by more than one worker at a time, so changes to the seed log, seeds_log.csv,
+# and the manifests are made by one thread at a time.
+LOG_LOCK = threading.RLock()
+
+
+# Columns in seeds_log.csv with information about each seed, from seed_data() and metadata_csv().
+SEED_COLUMNS = ("AIP_ID", "Seed_ID", "AIT_Collection", "Job_ID", "Size_GB", "WARCs", "WARC_Filenames")
+
+# Columns in seeds_log.csv for logging each workflow step, which have "TBD" until there is a message.
+LOG_COLUMNS = ("Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction", "WARC_Download_Errors",
+               "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete")
+
+# Columns in seeds_log.csv for the WARC steps, which are summarized for each seed instead of having a message
+# for every WARC, and the word used for that step in the messages for a successful WARC.
+WARC_STEPS = {"WARC_Download_Errors": "downloaded", "WARC_Fixity_Errors": "verified", "WARC_Unzip_Errors": "unzipped"}
+
+# Columns in warcs_log.csv, which has one row for each WARC. Status is the step the WARC stopped at,
+# or "Successfully completed", and the columns for the WARC steps have the message for this WARC.
+# MD5 and SHA1 are for the zipped WARC as downloaded, which is deleted once it is unzipped,
+# so they are not in the seed's manifests.
+WARC_LOG_COLUMNS = ("AIP_ID", "Seed_ID", "WARC", "Status", "Bytes", "MD5", "SHA1", "Started", "Info_Seconds",
+                    "Download_Seconds", "Fixity_Seconds", "Unzip_Seconds") + tuple(WARC_STEPS)
+
+
+class SeedRecord:
+    """One seed's information and the log messages for each workflow step.
+
+    The seed information is read with attributes (seed.Seed_ID), like a row from DataFrame.itertuples(),
+    and the messages for each step are kept in a list, which is only joined with semicolons for seeds_log.csv.
+
+    Parameters:
+        index : the seed's row in seeds_log.csv, starting with 0
+        values : dictionary with the SEED_COLUMNS and, optionally, the LOG_COLUMNS for the seed
+    """
+    __slots__ = ("Index",) + SEED_COLUMNS + ("messages",)
+
+    def __init__(self, index, values):
+        self.Index = index
+        for column in SEED_COLUMNS:
+            setattr(self, column, values[column])
+        self.messages = {}
+        for column in LOG_COLUMNS:
+            value = values.get(column, "TBD")
+            self.messages[column] = [] if value == "TBD" or pd.isna(value) else str(value).split("; ")
+
+    def value(self, column):
+        """Return every message for one step joined with semicolons, or TBD if there are no messages."""
+        return "; ".join(self.messages[column]) or "TBD"
+
+    def summary(self, column):
+        """Return the log for one step as it is in seeds_log.csv.
+
+        For the WARC steps, the WARCs that were successful are counted instead of listed,
+        followed by any other messages. The message for every WARC is in warcs_log.csv.
+        """
+        if column not in WARC_STEPS:
+            return self.value(column)
+        messages = [message for message in self.messages[column] if not message.startswith("Successfully")]
+        successes = len(self.messages[column]) - len(messages)
+        if successes:
+            messages.insert(0, f"Successfully {WARC_STEPS[column]} {successes} of {self.WARCs} WARCs")
+        return "; ".join(messages) or "TBD"
+
+    def row(self):
+        """Return the values for every column of seeds_log.csv, in order."""
+        return [getattr(self, column) for column in SEED_COLUMNS] + [self.summary(column) for column in LOG_COLUMNS]
+
+
+class SeedLog:
+    """Every seed in the download and its log, which is saved as seeds_log.csv and warcs_log.csv.
+
+    pandas is only used to make the log from a dataframe (from seed_data() or a seeds_log.csv from an earlier run)
+    and to export it with to_df(). During the download, logging a message adds it to a list in the seed's record
+    and writes the CSV with the csv module.
+
+    seeds_log.csv has one row per seed, with a summary of the WARC steps, and warcs_log.csv has one row per WARC,
+    which is added as each WARC is done.
+
+    Parameters:
+        seed_df : dataframe with the SEED_COLUMNS and, optionally, the LOG_COLUMNS, with one row per seed
+        path : optional. Where to save seeds_log.csv. Default is the script output folder.
+    """
+
+    def __init__(self, seed_df, path=None):
+        self.records = [SeedRecord(index, values) for index, values in enumerate(seed_df.to_dict("records"))]
+        self.path = path or os.path.join(config.script_output, "seeds_log.csv")
+        self.warc_path = os.path.join(os.path.dirname(self.path), "warcs_log.csv")
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def value(self, row_index, column):
+        """Return the log for one seed and step as it is in seeds_log.csv."""
+        return self.records[row_index].value(column)
+
+    def add(self, row_index, column, message):
+        """Add a message to the log for one seed and step, without saving seeds_log.csv."""
+        with LOG_LOCK:
+            self.records[row_index].messages[column].append(message)
+
+    def find(self, seed_id):
+        """Return the record for a seed id, or None if the seed is not in the download."""
+        for record in self.records:
+            if str(record.Seed_ID) == str(seed_id):
+                return record
+        return None
+
+    def unfinished(self):
+        """Return the records for every seed that is not complete (Complete is TBD)."""
+        return [record for record in self.records if not record.messages["Complete"]]
+
+    def to_df(self):
+        """Return the log as a dataframe with the same columns as seeds_log.csv."""
+        with LOG_LOCK:
+            return pd.DataFrame([record.row() for record in self.records], columns=SEED_COLUMNS + LOG_COLUMNS)
+
+    def save(self):
+        """Save the log as seeds_log.csv, replacing the previous version.
+
+        The new version is saved to a temporary file first and then renamed,
+        so stopping the script while it is saved cannot leave a partial seeds_log.csv.
+        """
+        with LOG_LOCK:
+            with open(f"{self.path}.tmp", "w", newline="") as log_csv:
+                log_writer = csv.writer(log_csv, lineterminator="\n")
+                log_writer.writerow(SEED_COLUMNS + LOG_COLUMNS)
+                for record in self.records:
+                    log_writer.writerow(["" if value is None or pd.isna(value) else value for value in record.row()])
+            os.replace(f"{self.path}.tmp", self.path)
+
+    def start_warc_log(self):
+        """Start a new warcs_log.csv with only the header, replacing one from an earlier download."""
+        with LOG_LOCK:
+            with open(self.warc_path, "w", newline="") as warc_csv:
+                csv.writer(warc_csv, lineterminator="\n").writerow(WARC_LOG_COLUMNS)
+
+    def warc_messages(self, row_index, warc):
+        """Return a dictionary with the message about one WARC for each WARC step, or an empty string if none."""
+        messages = {}
+        with LOG_LOCK:
+            for column in WARC_STEPS:
+                warc_messages = [message for message in self.records[row_index].messages[column] if warc in message]
+                messages[column] = warc_messages[-1] if warc_messages else ""
+        return messages
+
+    def add_warc(self, row_index, warc, values):
+        """Add a row for one WARC to the end of warcs_log.csv, without rewriting the rest of the file.
+
+        Parameters:
+            row_index : the seed's row in the seed log
+            warc : the zipped WARC's filename
+            values : dictionary with the other WARC_LOG_COLUMNS that have information for this WARC
+        """
+        record = self.records[row_index]
+        with LOG_LOCK:
+            row = dict(values, AIP_ID=record.AIP_ID, Seed_ID=record.Seed_ID, WARC=warc,
+                       **self.warc_messages(row_index, warc))
+            new_log = not os.path.exists(self.warc_path)
+            with open(self.warc_path, "a", newline="") as warc_csv:
+                warc_writer = csv.DictWriter(warc_csv, WARC_LOG_COLUMNS, lineterminator="\n")
+                if new_log:
+                    warc_writer.writeheader()
+                warc_writer.writerow(row)
+
+    def read_warc_log(self):
+        """Replace the messages for the WARC steps with the messages in warcs_log.csv from an earlier run.
+
+        seeds_log.csv only has a summary of the WARC steps, so the message for each WARC is read from warcs_log.csv
+        when the script is run again. If there is no warcs_log.csv, the messages read from seeds_log.csv are kept.
+        """
+        if not os.path.exists(self.warc_path):
+            return
+        records = {str(record.Seed_ID): record for record in self.records}
+        with LOG_LOCK:
+            for record in self.records:
+                for column in WARC_STEPS:
+                    record.messages[column] = []
+            with open(self.warc_path, newline="") as warc_csv:
+                for row in csv.DictReader(warc_csv):
+                    if row["Seed_ID"] in records:
+                        for column in WARC_STEPS:
+                            if row[column]:
+                                records[row["Seed_ID"]].messages[column].append(row[column])
+
+    def remove_warcs(self, seed_id, keep):
+        """Remove the rows in warcs_log.csv for a seed's WARCs, except for the WARCs in keep."""
+        if not os.path.exists(self.warc_path):
+            return
+        with LOG_LOCK:
+            with open(self.warc_path, newline="") as warc_csv, \
+                    open(f"{self.warc_path}.tmp", "w", newline="") as new_csv:
+                warc_reader = csv.DictReader(warc_csv)
+                warc_writer = csv.DictWriter(new_csv, warc_reader.fieldnames, lineterminator="\n")
+                warc_writer.writeheader()
+                for row in warc_reader:
+                    if row["Seed_ID"] != str(seed_id) or row["WARC"] in keep:
+                        warc_writer.writerow(row)
+            os.replace(f"{self.warc_path}.tmp", self.warc_path)
+
+
+class DiskAdmission:
+    """Only start WARC downloads when there is enough free space to download and unzip them.
+
+    While a WARC is unzipped, both the zipped and unzipped WARC are on the disk. Each download reserves
+    the space it will need until it is unzipped, so the workers together never use more than is free.
+    If there is not enough space, the download waits and checks again periodically,
+    so it continues on its own once space is freed (for example, by moving finished seeds to other storage).
+
+    Parameters:
+        path : folder on the disk that the WARCs are saved to
+        threshold_bytes : free space to always leave on the disk
+        expansion : how many times larger a WARC is once unzipped
+        poll_seconds : how often to check the free space while waiting
+    """
+
+    def __init__(self, path, threshold_bytes, expansion, poll_seconds=60):
+        self.path = path
+        self.threshold_bytes = threshold_bytes
+        self.expansion = expansion
+        self.poll_seconds = poll_seconds
+        self.reserved_bytes = 0
+        self.condition = threading.Condition()
+
+    def needed(self, size):
+        """Return the bytes a WARC of this size (zipped) needs while it is downloaded and unzipped."""
+        return int(size * (1 + self.expansion))
+
+    def available(self):
+        """Return the bytes that can still be reserved, after the threshold and other downloads."""
+        return shutil.disk_usage(self.path).free - self.threshold_bytes - self.reserved_bytes
+
+    @contextlib.contextmanager
+    def admit(self, size, warc):
+        """Wait until there is space for the WARC, reserve it while the WARC is processed, and then release it."""
+        needed = self.needed(size)
+        with self.condition, TRACE.span("disk_wait", "warc", warc=warc):
+            waiting = False
+            while self.available() < needed and not STOP.is_set():
+                if not waiting:
+                    print(f"Waiting for {needed / 1000000000:.3f} GB of free disk space to download {warc}.")
+                    waiting = True
+                self.condition.wait(timeout=self.poll_seconds)
+            if waiting:
+                print(f"Enough disk space is free. Resuming with {warc}.")
+            self.reserved_bytes += needed
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.reserved_bytes -= needed
+                self.condition.notify_all()
+
+
+class TokenBucket:
+    """Limit the combined download rate of all workers, so a long download can share the network.
+
+    Each chunk of a WARC uses tokens (bytes) from the bucket, which refills at the current limit.
+    When the bucket is empty, the worker waits until enough tokens have been added.
+    The limit can change by time of day, for example to download slower during business hours.
+
+    Parameters:
+        default_mb : MB per second when no scheduled limit applies, or None for no limit
+        schedule : list of (start hour, end hour, MB per second), with hours from 0 to 24.
+                   The end hour is not included and can be earlier than the start hour to include midnight.
+        burst_seconds : how many seconds of unused bandwidth can be saved up and used at once
+    """
+
+    def __init__(self, default_mb=None, schedule=(), burst_seconds=1):
+        self.default_mb = default_mb
+        self.schedule = schedule
+        self.burst_seconds = burst_seconds
+        self.tokens = 0
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def rate(self, now=None):
+        """Return the limit in bytes per second for this time of day, or None if there is no limit."""
+        hour = (now or datetime.datetime.now()).hour
+        for start_hour, end_hour, mb in self.schedule:
+            in_range = start_hour <= hour < end_hour if start_hour < end_hour else hour >= start_hour or hour < end_hour
+            if in_range:
+                return int(mb * 1000000) if mb else None
+        return int(self.default_mb * 1000000) if self.default_mb else None
+
+    def consume(self, size):
+        """Take tokens for a chunk of this many bytes, waiting first if the download is over the limit."""
+        rate = self.rate()
+        if rate is None:
+            return
+        with self.lock:
+            current_time = time.monotonic()
+            self.tokens = min(self.tokens + (current_time - self.last_refill) * rate, rate * self.burst_seconds)
+            self.last_refill = current_time
+            self.tokens -= size
+            wait = -self.tokens / rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TransferWatchdog:
+    """Stop a WARC transfer that is too slow, so it can be resumed on a new connection.
+
+    A transfer can slow to a trickle without ever going long enough without data to reach the read timeout.
+    The watchdog checks the bytes received in each window of time in a separate thread, and if there were fewer
+    than the floor allows, it shuts down the connection. The download then gets an error or ends early,
+    and stalled is True. Time spent waiting for the shared bandwidth limit is not part of the window,
+    so a transfer that is slow because of the limit is not stopped.
+
+    Parameters:
+        response : the streaming requests response for the transfer
+        floor_bytes_per_second : the slowest rate allowed, or 0 to never stop the transfer
+        window_seconds : how long the transfer can be slower than the floor before it is stopped
+        poll_seconds : how often to check the rate
+    """
+
+    def __init__(self, response, floor_bytes_per_second, window_seconds, poll_seconds=1):
+        self.response = response
+        self.floor_bytes_per_second = floor_bytes_per_second
+        self.window_seconds = window_seconds
+        self.poll_seconds = poll_seconds
+        self.stalled = False
+        self.window_bytes = 0
+        self.throttle_seconds = 0
+        self.throttle_start = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.monitor, daemon=True)
+
+    def __enter__(self):
+        if self.floor_bytes_per_second:
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def received(self, size):
+        """Add the bytes in a chunk that was received to the current window."""
+        with self.lock:
+            self.window_bytes += size
+
+    @contextlib.contextmanager
+    def throttled(self):
+        """Leave the time inside this context, which is spent waiting for the bandwidth limit, out of the window."""
+        with self.lock:
+            self.throttle_start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.throttle_seconds += time.monotonic() - self.throttle_start
+                self.throttle_start = None
+
+    def monitor(self):
+        """Check the rate once per poll until the transfer is done, and stop the transfer if it is too slow."""
+        window_start = time.monotonic()
+        while not self.done.wait(self.poll_seconds):
+            with self.lock:
+                now = time.monotonic()
+                throttled = self.throttle_seconds + (now - self.throttle_start if self.throttle_start else 0)
+                if now - window_start - throttled < self.window_seconds:
+                    continue
+                if self.window_bytes < self.floor_bytes_per_second * self.window_seconds:
+                    self.stalled = True
+                    self.abort()
+                    return
+                window_start = now
+                self.window_bytes = 0
+                self.throttle_seconds = 0
+                if self.throttle_start:
+                    self.throttle_start = now
+
+    def abort(self):
+        """Shut down the transfer's connection, which ends a read that is waiting for data in another thread."""
+        connection = getattr(self.response.raw, "_connection", None)
+        sock = getattr(connection, "sock", None)
+        try:
+            if sock:
+                sock.shutdown(socket.SHUT_RDWR)
+            else:
+                self.response.close()
+        except OSError:
+            pass
+
+
+class CircuitBreaker:
+    """Pause every API call to a host while the host is down, so an outage does not make every seed fail.
+
+    After a number of failures in a row (status 500 or higher, timeouts, and dropped connections), the breaker opens
+    and API calls to that host wait. One waiting thread checks the API with a small call on a schedule,
+    and when it gets a response that is not an error, the breaker closes and the waiting calls continue.
 
     Parameters:
-        row_index : the seed's row in the dataframe, used to update the log
-        seed_df : dataframe with all seed data in the download, including log information
+        host : the host name, used in the messages
+        probe_url : the URL to check if the API is up, which should be fast and always work when the API is up
+        failures : the number of failures in a row which opens the breaker
+        probe_seconds : how often to check if the API is up while the breaker is open
     """
-    # Adds errors from Metadata_Report_Errors.
-    if "Error" in seed_df.at[row_index, 'Metadata_Report_Errors']:
-        log("Metadata_Report_Errors", seed_df, row_index, "Complete")
 
-    # Adds errors from WARC_Download_Errors.
-    if "Error" in seed_df.at[row_index, 'WARC_Download_Errors']:
-        log("WARC_Download_Errors", seed_df, row_index, "Complete")
+    def __init__(self, host, probe_url, failures=10, probe_seconds=60):
+        self.host = host
+        self.probe_url = probe_url
+        self.failures = failures
+        self.probe_seconds = probe_seconds
+        self.failure_count = 0
+        self.open = False
+        self.probing = False
+        self.opened_at = None
+        self.condition = threading.Condition()
+
+    def record(self, success):
+        """Update the number of failures in a row with the result of an API call, and open the breaker if needed."""
+        with self.condition:
+            if success:
+                self.failure_count = 0
+                return
+            self.failure_count += 1
+            if not self.open and self.failure_count >= self.failures:
+                self.open = True
+                self.opened_at = time.monotonic()
+                print(f"\n{self.host} failed {self.failure_count} times in a row and may be down. "
+                      f"Pausing API calls and checking every {self.probe_seconds} seconds.")
+
+    def check(self):
+        """Return True if the API responds without a server error."""
+        try:
+            response = requests.get(self.probe_url, auth=(config.username, config.password),
+                                    timeout=REQUEST_TIMEOUT, stream=True)
+            response.close()
+            return response.status_code < 500
+        except requests.exceptions.RequestException:
+            return False
+
+    def wait(self):
+        """Wait while the breaker is open. Return True if it was open, so the caller knows it waited."""
+        with self.condition:
+            if not self.open:
+                return False
+        while True:
+            with self.condition:
+                if not self.open:
+                    return True
+                if STOP.is_set():
+                    raise requests.exceptions.ConnectionError(f"{self.host} is down and the script is stopping")
+                if self.probing:
+                    self.condition.wait(timeout=1)
+                    continue
+                self.probing = True
+            time.sleep(self.probe_seconds)
+            healthy = self.check()
+            with self.condition:
+                self.probing = False
+                if healthy:
+                    self.open = False
+                    self.failure_count = 0
+                    print(f"\n{self.host} is responding again after {(time.monotonic() - self.opened_at) / 60:.1f} "
+                          f"minutes. Resuming API calls.")
+                self.condition.notify_all()
+
+
+# The objects shared by the steps of the download start with the default values, which do not use the configuration
+# file, so importing this module does not fail because of a value that check_config() would report.
+# setup() makes them again from the configuration file once check_config() has run.
+
+# Controls when WARC downloads can start, based on free space where the script output is saved.
+# The threshold and expansion can be changed in the configuration file.
+DISK = DiskAdmission(".", 10 * 1000000000, 3)
+
+# Limits how fast all the workers together download WARCs. The limits can be set in the configuration file.
+BANDWIDTH = TokenBucket()
+
+# One circuit breaker for each API host, made the first time the host is used by circuit_breaker().
+# The failures and probe_seconds can be set in the configuration file with circuit_breaker = {...}.
+BREAKERS = {}
 
-    # Adds errors from WARC_Fixity_Errors.
-    if "Error" in seed_df.at[row_index, 'WARC_Fixity_Errors']:
-        log("WARC_Fixity_Errors", seed_df, row_index, "Complete")
+# Counts what the download is doing for Prometheus, if metrics_port and/or metrics_textfile are in the configuration
+# file. The metrics file is updated every metrics_seconds (default 15).
+METRICS = Metrics()
 
-    # Adds errors from WARC_Unzip_Errors.
-    if "Error" in seed_df.at[row_index, 'WARC_Unzip_Errors']:
-        log("WARC_Unzip_Errors", seed_df, row_index, "Complete")
+# Reports the progress of download_seeds() every progress_seconds (which can be set in the configuration file)
+# and saves it to download_status.json in the script output folder.
+PROGRESS = Progress("download_status.json", metrics=METRICS, rest_seconds=API_REST)
 
-    # If none of the previous columns had errors, Complete column still has the initial default text of TBD.
-    # Adds default text for no errors.
-    if "TBD" in seed_df.at[row_index, 'Complete'] == 'TBD':
-        log("Successfully completed", seed_df, row_index, "Complete")
+# Records a span for each step in download_trace.json in the script output folder,
+# if trace = True is in the configuration file.
+TRACE = Tracer(None, METRICS)
+
+# Profiles each stage and saves the results in the script output folder, if ait_download.py is run with --profile.
+PROFILER = Profiler(".")
+
+# Saves a summary of each run to compare runs across quarters, in run_history.sqlite in the folder with the script
+# or the path for run_history in the configuration file.
+# The bytes and API calls for each stage are from run_counters(), once setup() runs.
+HISTORY = RunHistory(observability.RUN_HISTORY_PATH)
+
+
+def add_completeness(row_index, seed_log):
+    """Add error type(s), or that complete with no errors, to Complete column in the seed log.
+
+    Parameters:
+        row_index : the seed's row in the seed log, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+    """
+    # Other workers may be updating the log at the same time, so the whole record is read and updated together.
+    with LOG_LOCK:
+
+        # Adds each column with errors, in this order.
+        error_columns = [column for column in ("Metadata_Report_Errors", "WARC_Download_Errors", "WARC_Fixity_Errors",
+                                               "WARC_Unzip_Errors") if "Error" in seed_log.value(row_index, column)]
+        for column in error_columns:
+            seed_log.add(row_index, "Complete", column)
+
+        # If none of the previous columns had errors, Complete column still has the initial default text of TBD.
+        # Adds default text for no errors.
+        if not error_columns:
+            seed_log.add(row_index, "Complete", "Successfully completed")
+        seed_log.save()
+
+
+def add_to_manifest(seed_dir, aip_id, filename, checksums):
+    """Add the checksums for one file to the seed's manifests, one manifest per algorithm.
+
+    The manifests use the same format as md5sum, sha256sum, and BagIt (checksum, two spaces, filename),
+    so the checksums calculated during the download can be verified or reused later without recalculating them.
+    Only files that stay in the seed folder are added, so the manifests can be checked with those tools.
+
+    Parameters:
+        seed_dir : path to the seed's folder, where the manifests are saved
+        aip_id : UGA AIP identifier for the seed, used to name the manifests
+        filename : name of the file the checksums are for, without the path
+        checksums : dictionary with the algorithm name (md5, sha1, or sha256) for keys and the checksum for values
+    """
+    with LOG_LOCK:
+        for algorithm, checksum in checksums.items():
+            manifest_path = os.path.join(seed_dir, f"{aip_id}_manifest-{algorithm}.txt")
+            with open(manifest_path, "a") as manifest:
+                manifest.write(f"{checksum}  {filename}\n")
+
+
+def api_get(url, endpoint, **kwargs):
+    """Make a GET request to an Archive-It API, trying again with exponential backoff if the error is temporary.
+
+    Every Archive-It API call the script makes only reads data, so it is safe to repeat.
+    Temporary errors are the status codes in RETRY_STATUS_CODES, timeouts, and dropped connections.
+    The wait before each retry is random, up to a limit that doubles with each retry (full jitter),
+    so workers that fail at the same time do not all retry at the same time.
+
+    Parameters:
+        url : the API URL
+        endpoint : name for the type of API call, used to pick the retry policy and for the retry statistics
+        **kwargs : any other arguments for requests.get(), for example params or stream
+
+    Every call also goes through the circuit breaker for the API's host. While it is open (the API is down),
+    calls wait until the API is up again instead of using their attempts.
+
+    Returns:
+        The response from the last attempt. If the last attempt had a connection error, it is raised instead.
+    """
+    policy = dict(RETRY_POLICY)
+    policy.update(getattr(config, "retry_policies", {}).get(endpoint, {}))
+    kwargs.setdefault("auth", (config.username, config.password))
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+    with LOG_LOCK:
+        stats = RETRY_STATS.setdefault(endpoint, {"calls": 0, "errors": 0, "retries": 0, "retry_seconds": 0.0})
+        stats["calls"] += 1
+
+    # Waits for the API to be available again if it is down, and starts the attempts over after an outage,
+    # so calls during an outage are delayed instead of failing.
+    breaker = circuit_breaker(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker.wait():
+            attempt = 1
+        try:
+            start = time.perf_counter()
+            try:
+                with TRACE.span(f"api_get {endpoint}", "api", attempt=attempt):
+                    response = requests.get(url, **kwargs)
+            finally:
+                METRICS.observe("ait_api_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+            METRICS.inc("ait_api_requests_total", endpoint=endpoint, status=str(response.status_code))
+            breaker.record(response.status_code < 500)
+            if response.status_code not in RETRY_STATUS_CODES or (attempt >= policy["attempts"] and not breaker.open):
+                if response.status_code >= 400:
+                    with LOG_LOCK:
+                        stats["errors"] += 1
+                return response
+            problem = f"status code {response.status_code}"
+            retry_after = response.headers.get("Retry-After", "")
+            response.close()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+            METRICS.inc("ait_api_requests_total", endpoint=endpoint, status=type(error).__name__)
+            breaker.record(False)
+            if attempt >= policy["attempts"] and not breaker.open:
+                with LOG_LOCK:
+                    stats["errors"] += 1
+                raise
+            problem = type(error).__name__
+            retry_after = ""
+
+        # If the API is down, there is no need to wait for a retry, since the circuit breaker waits until it is up.
+        if breaker.open:
+            continue
+
+        # Uses the wait time from the API if it gave one (only for some 429 and 503 errors).
+        if retry_after.isdigit():
+            wait = min(int(retry_after), policy["max_seconds"])
+        else:
+            wait = random.uniform(0, min(policy["max_seconds"], policy["base_seconds"] * 2 ** attempt))
+        print(f"Retrying {endpoint} in {wait:.1f} seconds after {problem} (attempt {attempt} of {policy['attempts']}).")
+        with LOG_LOCK:
+            stats["retries"] += 1
+            stats["retry_seconds"] += wait
+        METRICS.inc("ait_api_retries_total", endpoint=endpoint)
+        METRICS.inc("ait_api_retry_wait_seconds_total", wait, endpoint=endpoint)
+        with TRACE.span("retry_wait", "api", endpoint=endpoint, problem=problem):
+            time.sleep(wait)
+
+
+def batch_seeds(seed_log, warc_sizes, budget, expansion=None, workers=1):
+    """Split the seeds that still need to be downloaded into batches that each fit within a budget.
+
+    The seeds are added largest first to the first batch they fit in (first fit decreasing),
+    so there are as few batches as possible and the batches are about the same size.
+    A seed that is larger than the budget on its own is a batch by itself.
+
+    Parameters:
+        seed_log : SeedLog with all seed data in the download, including log information
+        warc_sizes : dictionary with the WARC filename for keys and size in bytes for values, from get_warc_sizes()
+        budget : the most bytes for each batch
+        expansion : optional. How many times larger a WARC is once unzipped. If provided, the budget is for the
+                    disk space the batch needs, from disk_space_needed(), instead of the bytes downloaded.
+        workers : number of WARCs to download at the same time, used for the disk space needed
+
+    Returns:
+        A list of batches, where each batch is a list of the Seed IDs in it
+    """
+    def size(batch_tasks):
+        if expansion is None:
+            return sum(task_size for row_index, warc, task_size in batch_tasks)
+        return disk_space_needed(batch_tasks, expansion, workers)
+
+    # The schedule has the seeds largest first, with all the WARCs for a seed together.
+    tasks_by_seed = {}
+    for task in schedule_downloads(seed_log, warc_sizes, workers)[0]:
+        tasks_by_seed.setdefault(task[0], []).append(task)
+
+    batches = []
+    for row_index, seed_tasks in tasks_by_seed.items():
+        for batch in batches:
+            if size(batch["tasks"] + seed_tasks) <= budget:
+                break
+        else:
+            batch = {"seeds": [], "tasks": []}
+            batches.append(batch)
+        batch["seeds"].append(str(seed_log.records[row_index].Seed_ID))
+        batch["tasks"].extend(seed_tasks)
+    return [batch["seeds"] for batch in batches]
 
 
-def check_seeds(date_end, date_start, seed_df, seeds_directory):
+def check_seeds(date_end, date_start, seed_log, seeds_directory, seed_ids=None, csv_path=None):
     """Verify if the download is complete and save the results in completeness_check.csv.
 
     Verifies that all the expected seed folders for the download are present and complete (metadata and WARCs),
@@ -53,8 +757,10 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
     Parameters:
         date_end : first store date to not include, formatted YYYY-MM-DD
         date_start: first store date to include, formatted YYYY-MM-DD
-        seed_df : dataframe with all seed data in the download, including log information
+        seed_log : SeedLog with all seed data in the download, including log information
         seeds_directory : folder named "preservation_download" within the script_output directory
+        seed_ids : optional. Seed IDs to check, for checking one batch of the download. Default is every seed.
+        csv_path : optional. Where to save the results. Default is completeness_check.csv in the script output folder.
     """
 
     def seed_dictionary():
@@ -69,7 +775,7 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
         """
         # Downloads the entire WARC list.
         filters = {"page_size": 10000}
-        warcs = requests.get(config.wasapi, params=filters, auth=(config.username, config.password))
+        warcs = api_get(config.wasapi, "check_seeds", params=filters)
 
         # If there was an API error, ends the function.
         if warcs.status_code != 200:
@@ -124,8 +830,8 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
                 warcs_include += 1
             except (KeyError, IndexError):
                 try:
-                    seed_info[seed_identifier] = [seed_df.loc[seed_df['Seed_ID'] == seed_identifier]['AIP_ID'].item(), 1]
-                except (KeyError, ValueError, IndexError):
+                    seed_info[seed_identifier] = [seed_log.find(seed_identifier).AIP_ID, 1]
+                except AttributeError:
                     print(f"Seed {seed_identifier} is not in seeds_df")
                     warcs_exclude += 1
                     continue
@@ -189,7 +895,8 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
         # based on the end of the filename, it updates the value to False.
         result.append(True)
         expected_endings = ("_coll.csv", "_collscope.csv", "_crawldef.csv", "_crawljob.csv",
-                            "_seed.csv", "_seedscope.csv", ".warc")
+                            "_seed.csv", "_seedscope.csv", ".warc",
+                            "_manifest-md5.txt", "_manifest-sha1.txt", "_manifest-sha256.txt")
         for file in os.listdir(seed_folder):
             if not file.endswith(expected_endings):
                 result[-1] = False
@@ -208,9 +915,9 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
         # Iterates through the folder with the seeds.
         for seed_folder in os.listdir(seeds_directory):
 
-            # Creates a tuple of the expected seeds, which are the values in the Seed_ID row in the seed dataframe.
+            # Creates a tuple of the expected seeds, which are the Seed_ID of every seed in the seed log.
             # and adds metadata.csv to the list, which will also be in the folder.
-            expected_seed_ids = seed_df['Seed_ID'].values.tolist()
+            expected_seed_ids = [str(seed.Seed_ID) for seed in seed_log]
             expected_seed_ids.append("metadata.csv")
 
             # If there is a seed folder that is not named with one of the expected seed ids,
@@ -231,7 +938,7 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
         return
 
     # Starts a csv for the results of the quality review.
-    csv_path = os.path.join(config.script_output, "completeness_check.csv")
+    csv_path = csv_path or os.path.join(config.script_output, "completeness_check.csv")
     with open(csv_path, "w", newline="") as complete_csv:
         complete_write = csv.writer(complete_csv)
 
@@ -242,6 +949,8 @@ def check_seeds(date_end, date_start, seed_df, seeds_directory):
 
         # Tests each AIP for completeness and saves the results.
         for seed in seeds_metadata:
+            if seed_ids is not None and seed not in seed_ids:
+                continue
             aip_identifier, warc_count = seeds_metadata[seed]
             row = check_completeness(seed, aip_identifier, warc_count)
             complete_write.writerow(row)
@@ -266,24 +975,27 @@ def check_config():
         errors.append("Variable 'script_output' is missing from the configuration file.")
 
     # Checks that the API URLs, which are consistent values, are correct.
+    # A server on this machine is also allowed, which is the mock Archive-It used for testing and benchmarks.
     try:
-        if config.partner_api != 'https://partner.archive-it.org/api':
+        if config.partner_api != 'https://partner.archive-it.org/api' and not is_loopback(config.partner_api):
             errors.append("Partner API path is not correct.")
     except AttributeError:
         errors.append("Variable 'partner_api' is missing from the configuration file.")
     try:
-        if config.wasapi != 'https://warcs.archive-it.org/wasapi/v1/webdata':
+        if config.wasapi != 'https://warcs.archive-it.org/wasapi/v1/webdata' and not is_loopback(config.wasapi):
             errors.append("WASAPI path is not correct.")
     except AttributeError:
         errors.append("Variable 'wasapi' is missing from the configuration file.")
 
     # Checks that the institution page exists.
     try:
-        response = requests.get(config.inst_page)
+        response = requests.get(config.inst_page, timeout=REQUEST_TIMEOUT)
         if response.status_code != 200:
             errors.append("Institution Page URL is not correct.")
     except AttributeError:
         errors.append("Variable 'inst_page' is missing from the configuration file.")
+    except requests.exceptions.RequestException:
+        errors.append("Could not connect to the Institution Page URL.")
 
     # Checks that the username and password are present.
     try:
@@ -298,12 +1010,64 @@ def check_config():
     # Checks that the Archive-It username and password are correct by using them with an API call.
     # This only works if the partner_api variable is in the configuration file.
     try:
-        response = requests.get(f"{config.partner_api}/seed?limit=5", auth=(config.username, config.password))
+        response = requests.get(f"{config.partner_api}/seed?limit=5", auth=(config.username, config.password),
+                                timeout=REQUEST_TIMEOUT)
         if response.status_code != 200:
             errors.append("Could not access Partner API with provided credentials. "
                           "Check if the partner_api, username, and/or password variables have errors.")
     except AttributeError:
         errors.append("Variables 'partner_api', 'username', and/or 'password' are missing from the configuration file.")
+    except requests.exceptions.RequestException:
+        errors.append("Could not connect to the Partner API to check the credentials.")
+
+    # Checks that the optional variables, if present, are valid numbers.
+    for variable in ("disk_free_threshold_gb", "unzip_expansion"):
+        if not isinstance(getattr(config, variable, 1), (int, float)) or getattr(config, variable, 1) < 0:
+            errors.append(f"Variable '{variable}' must be a number that is 0 or greater.")
+    if not isinstance(getattr(config, "workers", 1), int) or getattr(config, "workers", 1) < 1:
+        errors.append("Variable 'workers' must be a whole number of at least 1.")
+    if not isinstance(getattr(config, "transfer_mb_per_second", 1), (int, float)) \
+            or getattr(config, "transfer_mb_per_second", 1) <= 0:
+        errors.append("Variable 'transfer_mb_per_second' must be a number greater than 0.")
+
+    bandwidth = getattr(config, "bandwidth_mb_per_second", None)
+    if bandwidth is not None and (not isinstance(bandwidth, (int, float)) or bandwidth <= 0):
+        errors.append("Variable 'bandwidth_mb_per_second' must be a number greater than 0.")
+    try:
+        for start_hour, end_hour, mb in getattr(config, "bandwidth_schedule", ()):
+            if not (0 <= start_hour <= 24 and 0 <= end_hour <= 24) or (mb is not None and mb <= 0):
+                errors.append(f"Variable 'bandwidth_schedule' has an incorrect limit: {(start_hour, end_hour, mb)}.")
+    except (TypeError, ValueError):
+        errors.append("Variable 'bandwidth_schedule' must be a list of (start hour, end hour, MB per second).")
+
+    if not isinstance(getattr(config, "batch_handoff", ""), str):
+        errors.append("Variable 'batch_handoff' must be a command, as a string.")
+
+    try:
+        for endpoint, policy in getattr(config, "retry_policies", {}).items():
+            if not set(policy).issubset(RETRY_POLICY) or policy.get("attempts", 1) < 1:
+                errors.append(f"Variable 'retry_policies' has an incorrect policy for {endpoint}: {policy}.")
+    except (AttributeError, TypeError):
+        errors.append("Variable 'retry_policies' must be a dictionary of endpoint names and policy dictionaries.")
+
+    timeout = getattr(config, "request_timeout", (1, 1))
+    timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    if len(timeout) != 2 or not all(isinstance(seconds, (int, float)) and seconds > 0 for seconds in timeout):
+        errors.append("Variable 'request_timeout' must be seconds greater than 0, or (connect seconds, read seconds).")
+    for variable in ("stall_bytes_per_second", "stall_seconds"):
+        if not isinstance(getattr(config, variable, 1), (int, float)) or getattr(config, variable, 1) < 0:
+            errors.append(f"Variable '{variable}' must be a number that is 0 or greater.")
+    if not isinstance(getattr(config, "transfer_restarts", 0), int) or getattr(config, "transfer_restarts", 0) < 0:
+        errors.append("Variable 'transfer_restarts' must be a whole number that is 0 or greater.")
+
+    breaker_settings = getattr(config, "circuit_breaker", {})
+    if not isinstance(breaker_settings, dict) or not set(breaker_settings).issubset({"failures", "probe_seconds"}) \
+            or not all(isinstance(value, (int, float)) and value > 0 for value in breaker_settings.values()):
+        errors.append("Variable 'circuit_breaker' must be a dictionary with failures and/or probe_seconds "
+                      "greater than 0.")
+
+    # Checks the variables for the progress, trace, metrics, and run history, which are checked with their classes.
+    errors.extend(observability.config_errors(config))
 
     # If there were errors, prints them and exits the script.
     if len(errors) > 0:
@@ -314,231 +1078,710 @@ def check_config():
         sys.exit()
 
 
-def download_crawl_definition(job_id, seed, seed_df, row_index):
-    """Download the crawl definition report, using the id from the crawl job report.
+def circuit_breaker(url):
+    """Get the circuit breaker for the host of an API URL, making it the first time the host is used.
+
+    The check for whether the API is up is a small call to WASAPI or the Partner API, whichever is on the host,
+    or else the URL of the first call to the host.
 
     Parameters:
-        job_id : Archive-It identifier for the crawl job
-        seed : tuple with one seed's data from the seed dataframe
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        url : the API URL
+
+    Returns:
+        The CircuitBreaker for the URL's host
+    """
+    host = urllib.parse.urlparse(url).netloc
+    with LOG_LOCK:
+        if host not in BREAKERS:
+            probe_url = url
+            if host == urllib.parse.urlparse(getattr(config, "wasapi", "")).netloc:
+                probe_url = f"{config.wasapi}?page_size=1"
+            elif host == urllib.parse.urlparse(getattr(config, "partner_api", "")).netloc:
+                probe_url = f"{config.partner_api}/seed?limit=1"
+            BREAKERS[host] = CircuitBreaker(host, probe_url, **getattr(config, "circuit_breaker", {}))
+        return BREAKERS[host]
+
+
+def combine_completeness(batch_paths, csv_path):
+    """Combine the completeness checks for each batch of a download into one completeness_check.csv.
+
+    Each batch's check has the seeds in that batch and any unexpected seed folders at the time of that check.
+    If a seed is in more than one check (an unexpected folder, or a batch checked again after a restart),
+    the last one is kept.
+
+    Parameters:
+        batch_paths : the completeness check csv for each batch, in the order the batches were downloaded
+        csv_path : where to save the combined completeness_check.csv
     """
+    batch_dfs = [pd.read_csv(path, dtype=str) for path in batch_paths if os.path.exists(path)]
+    if not batch_dfs:
+        return
+    completeness_df = pd.concat(batch_dfs).drop_duplicates(subset="Seed", keep="last")
+    completeness_df.to_csv(csv_path, index=False)
 
+
+def disk_space_needed(tasks, expansion, workers):
+    """Estimate the disk space the download needs, for checking if there is enough space before starting.
+
+    Once unzipped, every WARC needs its size times the expansion. While the largest WARCs are unzipped,
+    each worker also needs space for the zipped WARC.
+
+    Parameters:
+        tasks : list of (row_index, WARC filename, size in bytes) from schedule_downloads()
+        expansion : how many times larger a WARC is once unzipped
+        workers : number of WARCs to download at the same time
+
+    Returns:
+        The estimated bytes needed
+    """
+    sizes = sorted([size for row_index, warc, size in tasks], reverse=True)
+    return int(sum(sizes) * expansion + sum(sizes[:workers]))
+
+
+def crawl_definition_id(seed, job_id):
+    """Get the id of the crawl definition for a crawl job from the crawl job report.
+
+    Parameters:
+        seed : SeedRecord with one seed's data from the seed log
+        job_id : Archive-It identifier for the crawl job
+
+    Returns:
+        The crawl definition id, or None if the crawl job report was not downloaded
+    """
     try:
-        # If the crawl job report is present, reads it for the crawl definition id.
-        job_df = pd.read_csv(os.path.join(str(seed.Seed_ID), f"{seed.AIP_ID}_{job_id}_crawljob.csv"), dtype="object")
-        crawl_def = job_df.loc[0, "crawl_definition"]
+        with open(os.path.join(str(seed.Seed_ID), f"{seed.AIP_ID}_{job_id}_crawljob.csv"), newline="") as job_csv:
+            return next(csv.DictReader(job_csv))["crawl_definition"]
+    except FileNotFoundError:
+        return None
+
 
-        # If the crawl definition report hasn't been downloaded yet, downloads the report.
-        # Multiple jobs can have the same crawl definition, so it could already be downloaded.
-        report_name = f"{seed.AIP_ID}_{crawl_def}_crawldef.csv"
-        if not os.path.exists(os.path.join(str(seed.Seed_ID), report_name)):
-            get_report(seed, seed_df, row_index, "id", crawl_def, "crawl_definition", report_name)
+def download_crawl_definition(job_id, seed, seed_log, row_index):
+    """Download the crawl definition report, using the id from the crawl job report.
 
+    Parameters:
+        job_id : Archive-It identifier for the crawl job
+        seed : SeedRecord with one seed's data from the seed log
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
+    """
+
+    # If the crawl job report is present, reads it for the crawl definition id.
     # If the crawl job report wasn't downloaded due to an error, logs the error instead.
-    except FileNotFoundError:
+    crawl_def = crawl_definition_id(seed, job_id)
+    if crawl_def is None:
         log(f"Error: crawl job {job_id} was not downloaded so can't get crawl definition id",
-            seed_df, row_index, "Metadata_Report_Errors")
+            seed_log, row_index, "Metadata_Report_Errors")
+        return
+
+    # If the crawl definition report hasn't been downloaded yet, downloads the report.
+    # Multiple jobs can have the same crawl definition, so it could already be downloaded.
+    report_name = f"{seed.AIP_ID}_{crawl_def}_crawldef.csv"
+    if not os.path.exists(os.path.join(str(seed.Seed_ID), report_name)):
+        get_report(seed, seed_log, row_index, "id", crawl_def, "crawl_definition", report_name)
 
 
-def download_metadata(seed, row_index, seed_df):
+def download_metadata(seed, row_index, seed_log):
     """Download six metadata reports with the Partner API and redact the login information from the seed report.
 
     Parameters:
-        seed : tuple with one seed's data from the seed dataframe
-        row_index : the seed's row in the dataframe, used to update the log
-        seed_df : dataframe with all seed data in the download, including log information
+        seed : SeedRecord with one seed's data from the seed log
+        row_index : the seed's row in the seed log, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
     """
 
-    # Downloads four of the six metadata reports from Archive-It needed to understand the context of the WARC.
-    # These are reports where there is only one report per seed or collection.
-    get_report(seed, seed_df, row_index, "id", seed.Seed_ID, "seed", f"{seed.AIP_ID}_seed.csv")
-    get_report(seed, seed_df, row_index, "seed", seed.Seed_ID, "scope_rule", f"{seed.AIP_ID}_seedscope.csv")
-    get_report(seed, seed_df, row_index, "collection", seed.AIT_Collection, "scope_rule", f"{seed.AIP_ID}_collscope.csv")
-    get_report(seed, seed_df, row_index, "id", seed.AIT_Collection, "collection", f"{seed.AIP_ID}_coll.csv")
+    # The reports are downloaded at the same time, since each is a separate API call.
+    # Only the crawl definitions have to wait, since their ids are in the crawl job reports.
+    # The results are logged afterwards in the same order as the reports are listed here,
+    # so the log is the same no matter which API call finished first.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=METADATA_CONNECTIONS) as executor:
+
+        # Starts four of the six metadata reports from Archive-It needed to understand the context of the WARC,
+        # which are reports where there is only one report per seed or collection, and each of the crawl job reports.
+        job_list = seed.Job_ID.split("|")
+        reports = [("id", seed.Seed_ID, "seed", f"{seed.AIP_ID}_seed.csv"),
+                   ("seed", seed.Seed_ID, "scope_rule", f"{seed.AIP_ID}_seedscope.csv"),
+                   ("collection", seed.AIT_Collection, "scope_rule", f"{seed.AIP_ID}_collscope.csv"),
+                   ("id", seed.AIT_Collection, "collection", f"{seed.AIP_ID}_coll.csv")]
+        reports += [("id", job, "crawl_job", f"{seed.AIP_ID}_{job}_crawljob.csv") for job in job_list]
+        futures = [executor.submit(save_report, seed.Seed_ID, *report, redact=report[2] == "seed")
+                   for report in reports]
+        results = [future.result() for future in futures]
+
+        # Downloads the crawl definition report for each crawl job once, since multiple jobs can have the same one.
+        job_crawl_defs = {job: crawl_definition_id(seed, job) for job in job_list}
+        crawl_defs = list(dict.fromkeys(crawl_def for crawl_def in job_crawl_defs.values() if crawl_def is not None))
+        crawl_def_futures = {crawl_def: executor.submit(save_report, seed.Seed_ID, "id", crawl_def, "crawl_definition",
+                                                        f"{seed.AIP_ID}_{crawl_def}_crawldef.csv")
+                             for crawl_def in crawl_defs}
+
+        # Logs the results for the four seed and collection reports, including redacting the seed report.
+        for message, column in itertools.chain(*results[:4]):
+            log(message, seed_log, row_index, column)
+
+        # Logs the results for each crawl job report followed by its crawl definition report (if new).
+        logged_crawl_defs = set()
+        for job, result in zip(job_list, results[4:]):
+            for message, column in result:
+                log(message, seed_log, row_index, column)
+            crawl_def = job_crawl_defs[job]
+            if crawl_def is None:
+                log(f"Error: crawl job {job} was not downloaded so can't get crawl definition id",
+                    seed_log, row_index, "Metadata_Report_Errors")
+            elif crawl_def not in logged_crawl_defs:
+                logged_crawl_defs.add(crawl_def)
+                for message, column in crawl_def_futures[crawl_def].result():
+                    log(message, seed_log, row_index, column)
+
+    # Adds the checksums of every report that was saved to the seed's manifests, so they can be audited later.
+    seed_dir = str(seed.Seed_ID)
+    for report in sorted(os.listdir(seed_dir)):
+        if report.startswith(f"{seed.AIP_ID}_") and report.endswith(".csv"):
+            add_to_manifest(seed_dir, seed.AIP_ID, report,
+                            file_checksums(os.path.join(seed_dir, report), ["md5", "sha256"]))
+
+    with LOG_LOCK:
+
+        # If there were no download errors (the log still has "TBD" for that step), updates the log to show success.
+        if seed_log.value(row_index, "Metadata_Report_Errors") == "TBD":
+            log("Successfully downloaded all metadata reports", seed_log, row_index, "Metadata_Report_Errors")
+
+        # If there were no deleted empty reports (the log still has "TBD" for that step), updates the log.
+        if seed_log.value(row_index, "Metadata_Report_Empty") == "TBD":
+            log("No empty reports", seed_log, row_index, "Metadata_Report_Empty")
+
+
+def download_seeds(seed_log, tasks, workers, prefetch_seeds=None):
+    """Download the metadata and WARCs for every seed in the schedule, with one or more workers.
+
+    Each worker takes the next WARC in the schedule when it is done with the previous one.
+    The metadata is downloaded by a separate worker, which starts each seed (makes the seed folder and downloads
+    the metadata reports) ahead of the WARC workers, so the WARC workers usually do not wait for the metadata
+    API and the metadata API is used while WARCs download. The worker that finishes the last WARC from a seed
+    adds the completeness to the log. Because WARCs are scheduled by seed, only as many seeds as workers
+    are downloading WARCs at the same time, plus the seeds started ahead.
+    While the workers run, PROGRESS prints the progress and saves it to download_status.json.
 
-    # Redacts login information from the seed report.
-    redact_seed_report(seed.Seed_ID, seed.AIP_ID, seed_df, row_index)
+    Parameters:
+        seed_log : SeedLog with all seed data in the download, including log information
+        tasks : list of (row_index, WARC filename, size in bytes) in the order to download, from schedule_downloads()
+        workers : number of WARCs to download at the same time
+        prefetch_seeds : optional. How many seeds the metadata can be ahead of the seed a WARC worker is on.
+                         The default is the number of workers, plus one.
 
-    # Downloads each of the crawl job reports and its corresponding crawl definition report (if new).
-    job_list = seed.Job_ID.split("|")
-    for job in job_list:
-        get_report(seed, seed_df, row_index, "id", job, "crawl_job", f"{seed.AIP_ID}_{job}_crawljob.csv")
-        download_crawl_definition(job, seed, seed_df, row_index)
+    Returns:
+        A list with the number of bytes downloaded by each worker
+    """
+    if prefetch_seeds is None:
+        prefetch_seeds = getattr(config, "prefetch_seeds", workers + 1)
+
+    # Information shared by every worker about the progress of each seed, and the order the seeds start.
+    seeds = {}
+    seed_order = []
+    for row_index, warc, size in tasks:
+        if row_index not in seeds:
+            seeds[row_index] = {"position": len(seed_order), "started": None, "remaining": 0, "lock": threading.Lock()}
+            seed_order.append(row_index)
+        seeds[row_index]["remaining"] += 1
+    progress = {"current_seed": 0, "prefetched": 0, "worker_bytes": {}}
+    progress_lock = threading.Lock()
+
+    def start_seed(row_index):
+        """Make the seed folder and download the metadata, returning the WARCs finished in a previous run."""
+        # If the script is stopping, does not start the seed.
+        if STOP.is_set():
+            return None
+        seed = seed_log.records[row_index]
+        with progress_lock:
+            progress["current_seed"] += 1
+            print(f"\nStarting seed {progress['current_seed']} of {len(seeds)}.")
+
+        # If the seed already has a folder from a previous iteration of the script that was interrupted,
+        # deletes everything except the WARCs that were finished or partly downloaded,
+        # and the log information for everything deleted, so it can be remade.
+        done = set()
+        if os.path.exists(str(seed.Seed_ID)):
+            with TRACE.span("reset_seed", "seed", seed=str(seed.Seed_ID)):
+                done = reset_seed(seed.Seed_ID, seed_log)
+
+        # Makes a folder for the seed in the seeds directory and downloads the metadata to that seed folder.
+        os.makedirs(str(seed.Seed_ID), exist_ok=True)
+        with TRACE.span("download_metadata", "seed", seed=str(seed.Seed_ID)):
+            download_metadata(seed, row_index, seed_log)
+        return done
+
+    def prefetch(position):
+        """Start the metadata for every seed up to prefetch_seeds after the seed at this position in the order."""
+        with progress_lock:
+            while progress["prefetched"] < min(position + 1 + prefetch_seeds, len(seed_order)):
+                row_index = seed_order[progress["prefetched"]]
+                seed_id = seed_log.records[row_index].Seed_ID
+                seeds[row_index]["started"] = metadata_executor.submit(PROFILER.call, seed_id, start_seed, row_index)
+                progress["prefetched"] += 1
+
+    def download_task(row_index, warc, size):
+        """Download one WARC, first waiting for its seed to be started by the metadata worker."""
+        # If the script is stopping, does not start anything new. The seed is not marked complete,
+        # so the next time the script runs it continues the seed.
+        if STOP.is_set():
+            return
+        state = seeds[row_index]
+        prefetch(state["position"])
+        done = state["started"].result()
+        if done is None:
+            return
+        seed = seed_log.records[row_index]
+
+        # Skips WARCs that were finished the last time the script ran.
+        # If the script is stopping, the WARC is not done, so it stays in progress in the status file.
+        if warc not in done:
+            PROGRESS.start_warc(warc, seed.Seed_ID, size)
+            download_warc(seed, row_index, seed_log, warc)
+        if STOP.is_set():
+            return
+        PROGRESS.end_warc(warc, size)
+        with progress_lock:
+            worker = threading.current_thread().name
+            progress["worker_bytes"][worker] = progress["worker_bytes"].get(worker, 0) + size
+
+        # Updates the Complete column with the error type or that the seed processed successfully,
+        # once every WARC for the seed is done.
+        with state["lock"]:
+            state["remaining"] -= 1
+            seed_done = state["remaining"] == 0
+        if seed_done:
+            with TRACE.span("add_completeness", "seed", seed=str(seed.Seed_ID)):
+                add_completeness(row_index, seed_log)
+            PROGRESS.end_seed()
+
+    # Reports the bytes, WARCs, and seeds done, the rate, and the time left, until every WARC is done.
+    PROGRESS.start(tasks, len(seeds), workers)
+    PROGRESS.run()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata") as metadata_executor, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warcs") as executor:
+            futures = [executor.submit(PROFILER.call, seed_log.records[task[0]].Seed_ID, download_task, *task)
+                       for task in tasks]
+            for future in futures:
+                future.result()
+    finally:
+        PROGRESS.stop("stopped" if STOP.is_set() else "finished")
 
-    # If there were no download errors (the dataframe still has "TBD" in that cell), updates the log to show success.
-    if seed_df.at[row_index, "Metadata_Report_Errors"] == "TBD":
-        seed_df.loc[row_index, "Metadata_Report_Errors"] = "Successfully downloaded all metadata reports"
-        seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+    return list(progress["worker_bytes"].values())
 
-    # If there were no deleted empty reports (the dataframe still has "TBD" in that cell), updates the log.
-    if seed_df.at[row_index, "Metadata_Report_Empty"] == "TBD":
-        seed_df.loc[row_index, "Metadata_Report_Empty"] = "No empty reports"
-        seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
 
+def download_warc(seed, row_index, seed_log, warc):
+    """Download one WARC for a seed, verify the fixity is unchanged, and unzip the WARC.
 
-def download_warcs(seed, row_index, seed_df):
-    """Download every WARC for a seed, verify the fixity is unchanged, and unzip the WARC.
+    If an error is caught at any point, it is logged and the rest of the steps for this WARC are skipped.
+    The result, size, MD5 and SHA1 as downloaded, and the time for each step are added to warcs_log.csv
+    once the WARC is done.
 
     Parameters:
-        seed : tuple with one seed's data from the seed dataframe
-        row_index : the seed's row in the dataframe, used to update the log
-        seed_df : dataframe with all seed data in the download, including log information
+        seed : SeedRecord with one seed's data from the seed log
+        row_index : the seed's row in the seed log, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+        warc : the zipped WARC's filename
     """
 
-    # Makes a list of the filenames for all WARCs for this seed.
-    warc_names = seed.WARC_Filenames.split("|")
+    # The path for where the WARC will be saved on the local machine.
+    seed_dir = os.path.join(config.script_output, "preservation_download", str(seed.Seed_ID))
+    warc_path = os.path.join(seed_dir, warc)
 
-    # Downloads and validates every WARC.
-    # If an error is caught at any point, logs the error and starts the next WARC.
-    for warc in warc_names:
+    # If the script is stopping, does not start the WARC.
+    if STOP.is_set():
+        return
 
-        # The path for where the WARC will be saved on the local machine.
-        warc_path = os.path.join(config.script_output, "preservation_download", str(seed.Seed_ID), warc)
+    # Everything for the WARC is one span in the trace, with a span inside it for each step.
+    with TRACE.span("download_warc", "warc", seed=str(seed.Seed_ID), warc=warc):
 
-        # Gets URL for downloading the WARC and WARC MD5 from Archive-It using WASAPI.
-        # If there was an API error, stops processing this WARC and starts the next.
-        try:
-            warc_url, warc_md5 = get_warc_info(warc, seed_df, row_index)
-        except (ValueError, IndexError):
-            continue
+        # Information for the WARC's row in warcs_log.csv. Status is updated as each step starts,
+        # so it is the step with the error if the WARC stops early, and the time for each step is saved as it ends.
+        warc_log = {"Status": "WARC_Download_Errors", "Started": datetime.datetime.now().isoformat(" ", "seconds")}
 
-        # Downloads the WARC from Archive-It.
-        # If there is an API error, stops processing this WARC and starts the next.
-        try:
-            get_warc(seed_df, row_index, warc_url, warc, warc_path)
-        except ValueError:
-            continue
+        def timed(column, function, *args):
+            """Run one step for the WARC and save how long it took in warc_log."""
+            start = time.monotonic()
+            try:
+                with TRACE.span(getattr(function, "__name__", column), "warc", warc=warc):
+                    return function(*args)
+            finally:
+                warc_log[column] = round(time.monotonic() - start, 3)
 
-        # Verifies that the WARC fixity after download is correct, and deletes it if not.
         try:
-            verify_warc_fixity(seed_df, row_index, warc_path, warc, warc_md5)
-        except (AttributeError, ValueError):
-            continue
+            # Gets URL for downloading the WARC, the WARC checksums, and the WARC size from Archive-It using WASAPI.
+            # If there was an API error, stops processing this WARC.
+            try:
+                warc_url, warc_checksums, warc_size = timed("Info_Seconds", get_warc_info, warc, seed_log, row_index)
+            except (ValueError, IndexError):
+                return
+            warc_log["Bytes"] = warc_size
+
+            # Waits until there is enough disk space to download and unzip the WARC,
+            # and keeps that space reserved until the WARC is unzipped.
+            with DISK.admit(warc_size, warc):
+
+                # Downloads the WARC from Archive-It, calculating its checksums as it is saved.
+                # If there is an API error, or the script is stopping, stops processing this WARC.
+                try:
+                    download_checksums = timed("Download_Seconds", get_warc, seed_log, row_index, warc_url, warc,
+                                               warc_path, warc_size)
+                except ValueError:
+                    return
+                warc_log["MD5"] = download_checksums["md5"]
+                warc_log["SHA1"] = download_checksums["sha1"]
+
+                # Verifies that the WARC fixity after download is correct, and deletes it if not.
+                warc_log["Status"] = "WARC_Fixity_Errors"
+                try:
+                    timed("Fixity_Seconds", verify_warc_fixity, seed_log, row_index, warc_path, warc, warc_checksums,
+                          download_checksums)
+                except ValueError:
+                    return
+
+                # Unzips the WARC and handles any errors.
+                # The checksums of the unzipped WARC are calculated while it is unzipped, so it is never read again.
+                warc_log["Status"] = "WARC_Unzip_Errors"
+                unzip_checksums = timed("Unzip_Seconds", unzip_warc, seed_log, row_index, warc_path, warc)
+                if unzip_checksums:
+                    add_to_manifest(seed_dir, seed.AIP_ID, warc[:-3], unzip_checksums)
+                    warc_log["Status"] = "Successfully completed"
+
+        # Adds the WARC to warcs_log.csv, unless it stopped without a message for the step it was on,
+        # which is when the script is stopping and the WARC will be continued the next time the script runs.
+        finally:
+            status = warc_log["Status"]
+            if status == "Successfully completed" or seed_log.warc_messages(row_index, warc)[status]:
+                seed_log.add_warc(row_index, warc, warc_log)
+                METRICS.inc("ait_warcs_total", status=status)
+
+    # Waits to give the API a rest, unless the script is stopping.
+    with TRACE.span("api_rest", "warc", warc=warc):
+        STOP.wait(API_REST)
+
+
+def download_warcs(seed, row_index, seed_log):
+    """Download every WARC for a seed, verify the fixity is unchanged, and unzip the WARC.
+
+    Parameters:
+        seed : SeedRecord with one seed's data from the seed log
+        row_index : the seed's row in the seed log, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+    """
+
+    # Downloads and validates every WARC.
+    # If an error is caught at any point, logs the error and starts the next WARC.
+    for warc in seed.WARC_Filenames.split("|"):
+        download_warc(seed, row_index, seed_log, warc)
 
-        # Unzips the WARC and handles any errors.
-        unzip_warc(seed_df, row_index, warc_path, warc)
 
-        # Waits 15 second to give the API a rest.
-        time.sleep(15)
+def file_checksums(file_path, algorithms):
+    """Calculate one or more checksums for a file, reading the file only once.
 
+    Parameters:
+        file_path : the path, including the filename, of the file
+        algorithms : list of hashlib algorithm names, for example ["md5", "sha256"]
 
-def get_report(seed, seed_df, row_index, filter_type, filter_value, report_type, report_name):
+    Returns:
+        A dictionary with the algorithm names for keys and the checksums for values
+    """
+    hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    size = 0
+    with open(file_path, "rb") as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            for hash_object in hashes.values():
+                hash_object.update(chunk)
+            size += len(chunk)
+    METRICS.inc("ait_bytes_hashed_total", size, stage="file")
+    return {algorithm: hash_object.hexdigest() for algorithm, hash_object in hashes.items()}
+
+
+def get_report(seed, seed_log, row_index, filter_type, filter_value, report_type, report_name):
     """Download a single metadata report and save it as a csv in the seed's folder if it is not empty.
 
     Parameters:
-        seed : tuple with one seed's data from the seed dataframe, used to update the log
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        seed : SeedRecord with one seed's data from the seed log, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
         filter_type : part of API call to get the right report
         filter_value : part of the API call to get the right report
         report_type : the Archive-It name for the report
         report_name : the file name for the saved report
     """
+    for message, column in save_report(seed.Seed_ID, filter_type, filter_value, report_type, report_name):
+        log(message, seed_log, row_index, column)
 
-    # Builds the API call to get the report as a csv.
-    # Limit of -1 will return all matches. Default is only the first 100.
-    filters = {"limit": -1, filter_type: filter_value, "format": "csv"}
-    metadata_report = requests.get(f"{config.partner_api}/{report_type}",
-                                   params=filters, auth=(config.username, config.password))
-
-    # Saves the metadata report if there were no API errors and there was data of this type (content isn't empty).
-    # For scope rules, it is common for one or both to not have data since these aren't required.
-    if metadata_report.status_code == 200:
-        if metadata_report.content == b"":
-            log(report_name, seed_df, row_index, "Metadata_Report_Empty")
-            return
-        else:
-            with open(os.path.join(str(seed.Seed_ID), report_name), "wb") as report_csv:
-                report_csv.write(metadata_report.content)
-    else:
-        log(f"{report_name} API Error {metadata_report.status_code}", seed_df, row_index, "Metadata_Report_Errors")
-        return
 
+def get_warc(seed_log, row_index, warc_url, warc, warc_path, warc_size=None):
+    """Download the WARC and saves it to the seed folder, calculating the WARC checksums while it downloads.
 
-def get_warc(seed_df, row_index, warc_url, warc, warc_path):
-    """Download the WARC and saves it to the seed folder.
+    The WARC is streamed to the file in chunks, which are added to the checksums as they arrive,
+    so the WARC does not need to be read again from the disk to verify its fixity.
+    If the transfer is interrupted or has the wrong number of bytes, it is resumed from the last correct byte.
 
     Parameters:
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
         warc_url : the URL in Archive-It, used to download the WARC
         warc : the zipped WARC's filename
         warc_path : the path, including the filename, for saving the downloaded WARC to the seed folder
+        warc_size : optional. The size in bytes from WASAPI. If provided, a transfer that is shorter or longer
+                    is stopped as soon as that is known and resumed, instead of failing the fixity check later.
+                    If the API reports the same different size again after a restart, the WASAPI size may be
+                    out of date, so the API size is used instead and the fixity check decides if the WARC is correct.
+
+    Returns:
+        A dictionary with the MD5 and SHA1 of the zipped WARC, as downloaded
     """
 
-    # Downloads the WARC, which will be zipped.
-    warc_download = requests.get(f"{warc_url}", auth=(config.username, config.password))
+    # Saves the zipped WARC in the seed folder, keeping the original filename,
+    # and calculates the checksums from the same chunks that are saved.
+    # The download rate is limited by waiting for tokens from the shared bandwidth limit for every chunk.
+    md5 = hashlib.md5()
+    sha1 = hashlib.sha1()
+    size = 0
+    restarts = 0
+    reported_size = None
+    start_time = time.monotonic()
+
+    # If part of the WARC was saved when the script was stopped, continues from the end of that part.
+    # The part is read once to restart the checksums, which is faster than downloading it again.
+    partial_path = f"{warc_path}.part"
+    if os.path.exists(partial_path):
+        os.replace(partial_path, warc_path)
+        with open(warc_path, "rb") as warc_file:
+            while True:
+                chunk = warc_file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                md5.update(chunk)
+                sha1.update(chunk)
+                size += len(chunk)
+        METRICS.inc("ait_bytes_hashed_total", size, stage="download")
+        print(f"Resuming {warc} at {size / 1000000:.1f} MB, saved when the script was stopped.")
+
+    with open(warc_path, "r+b" if size else "wb") as warc_file:
+        warc_file.seek(size)
+        while True:
+
+            # If the script is stopping, saves what was downloaded so far to continue the next time it runs,
+            # and raises an error to skip the rest of the steps for this WARC. This is not logged as an error,
+            # since the seed is not finished and will be continued.
+            if STOP.is_set():
+                warc_file.close()
+                if size:
+                    os.replace(warc_path, partial_path)
+                    print(f"Saved {size / 1000000:.1f} MB of {warc} to continue the next time the script runs.")
+                else:
+                    os.remove(warc_path)
+                raise ValueError
 
-    # Updates the log with the success or error from the download.
-    # If there was an error, raises an error to skip the rest of the steps for this WARC.
-    if warc_download.status_code == 200:
-        log(f"Successfully downloaded {warc}", seed_df, row_index, "WARC_Download_Errors")
-    else:
-        log(f"API Error {warc_download.status_code}: can't download {warc}",
-            seed_df, row_index, "WARC_Download_Errors")
-        raise ValueError
+            # Downloads the WARC, which will be zipped, or the rest of the WARC if the transfer was restarted.
+            # api_get() already retried a connection error or temporary status code with backoff,
+            # so it is not retried again here and does not count as a restart.
+            headers = {"Range": f"bytes={size}-"} if size else {}
+            try:
+                warc_download = api_get(warc_url, "get_warc", stream=True, headers=headers)
+                error_text = None if warc_download.status_code in (200, 206) else warc_download.status_code
+            except requests.exceptions.RequestException as error:
+                error_text = type(error).__name__
+
+            # If there was an error, updates the log and raises an error to skip the rest of the steps for this WARC.
+            if error_text is not None:
+                log(f"API Error {error_text}: can't download {warc}", seed_log, row_index, "WARC_Download_Errors")
+                warc_file.close()
+                os.remove(warc_path)
+                raise ValueError
+
+            # If the API sent the whole WARC instead of the rest of it, starts the file and checksums over.
+            if size and warc_download.status_code == 200:
+                warc_file.seek(0)
+                warc_file.truncate()
+                md5 = hashlib.md5()
+                sha1 = hashlib.sha1()
+                size = 0
+
+            # Checks that the API is sending the number of bytes still needed, based on the size from WASAPI,
+            # before saving anything, since a transfer of the wrong length cannot have the right fixity.
+            # If the API reports the same different size after a restart, the size from WASAPI may be out of date,
+            # so the API size is used and the difference is logged, and the fixity check decides if the WARC is correct.
+            content_length = warc_download.headers.get("Content-Length", "")
+            wrong_length = (warc_size is not None and content_length.isdigit()
+                            and int(content_length) != warc_size - size)
+            if wrong_length and restarts and size + int(content_length) == reported_size:
+                log(f"Archive-It sent {reported_size} bytes for {warc} instead of the {warc_size} bytes in WASAPI",
+                    seed_log, row_index, "WARC_Download_Errors")
+                warc_size = reported_size
+                wrong_length = False
+            if wrong_length:
+                reported_size = size + int(content_length)
+                problem = f"Content-Length of {content_length} bytes instead of {warc_size - size}"
+                warc_download.close()
+            else:
+                watchdog = TransferWatchdog(warc_download, STALL_BYTES_PER_SECOND, STALL_SECONDS)
+                overlong = False
+                stopped = False
+                try:
+                    with watchdog:
+                        for chunk in warc_download.iter_content(chunk_size=TRANSFER_CHUNK_SIZE):
+                            if STOP.is_set():
+                                stopped = True
+                                break
+                            if warc_size is not None and size + len(chunk) > warc_size:
+                                overlong = True
+                                break
+                            with watchdog.throttled():
+                                BANDWIDTH.consume(len(chunk))
+                            warc_file.write(chunk)
+                            md5.update(chunk)
+                            sha1.update(chunk)
+                            size += len(chunk)
+                            watchdog.received(len(chunk))
+                            PROGRESS.received(warc, len(chunk), size)
+                            METRICS.inc("ait_bytes_downloaded_total", len(chunk))
+                            METRICS.inc("ait_bytes_hashed_total", len(chunk), stage="download")
+                except requests.exceptions.RequestException as error:
+                    problem = type(error).__name__
+                else:
+                    if stopped:
+                        continue
+                    if overlong:
+                        problem = f"more than the {warc_size} bytes in WASAPI"
+                    elif warc_size is not None and size < warc_size:
+                        problem = f"the transfer ending at {size} of {warc_size} bytes"
+                    elif not watchdog.stalled:
+                        break
+                finally:
+                    warc_download.close()
+
+                if watchdog.stalled:
+                    problem = f"less than {STALL_BYTES_PER_SECOND} bytes per second for {STALL_SECONDS} seconds"
+
+                # If the transfer had more bytes than the WARC, it is not known which are wrong, so it starts over.
+                if overlong:
+                    warc_file.seek(0)
+                    warc_file.truncate()
+                    md5 = hashlib.md5()
+                    sha1 = hashlib.sha1()
+                    size = 0
+
+            # The transfer was interrupted, so it is resumed from the last byte received, up to TRANSFER_RESTARTS times.
+            restarts += 1
+            if restarts > TRANSFER_RESTARTS:
+                log(f"Error: download of {warc} was interrupted {restarts} times, last by {problem}",
+                    seed_log, row_index, "WARC_Download_Errors")
+                warc_file.close()
+                os.remove(warc_path)
+                raise ValueError
+            print(f"Resuming {warc} at {size / 1000000:.1f} MB after {problem} "
+                  f"(restart {restarts} of {TRANSFER_RESTARTS}).")
+
+    # Displays the download rate, and the limit if there is one, so it is clear if the limit is slowing the download.
+    rate = size / max(time.monotonic() - start_time, 0.001) / 1000000
+    limit = BANDWIDTH.rate()
+    limit_text = f", limited to {limit / 1000000:.1f} MB/s for all workers" if limit else ""
+    print(f"Downloaded {warc} ({size / 1000000:.1f} MB at {rate:.1f} MB/s{limit_text}).")
 
-    # Saves the zipped WARC in the seed folder, keeping the original filename.
-    with open(warc_path, "wb") as warc_file:
-        warc_file.write(warc_download.content)
+    log(f"Successfully downloaded {warc}", seed_log, row_index, "WARC_Download_Errors")
+    return {"md5": md5.hexdigest(), "sha1": sha1.hexdigest()}
 
 
-def get_warc_info(warc, seed_df, row_index):
-    """Get the URL for and MD5 for the WARC using WASAPI.
+def get_warc_info(warc, seed_log, row_index):
+    """Get the URL for and checksums for the WARC using WASAPI.
 
     Parameters:
         warc : the zipped WARC's filename
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
 
     Returns:
         URL for downloading the WARC from Archive-It
-        MD5 of the zipped WARC
+        Dictionary of the checksums (MD5 and SHA1) of the zipped WARC
+        Size of the zipped WARC in bytes
     """
 
     # WASAPI call to get all data related to this WARC.
-    warc_data = requests.get(f"{config.wasapi}?filename={warc}", auth=(config.username, config.password))
+    try:
+        warc_data = api_get(f"{config.wasapi}?filename={warc}", "get_warc_info")
+    except requests.exceptions.RequestException as error:
+        log(f"API Error {type(error).__name__}: can't get info about {warc}",
+            seed_log, row_index, "WARC_Download_Errors")
+        raise ValueError
 
     # If there is an API error, updates the log and raises an error to skip the rest of the steps for this WARC.
     if not warc_data.status_code == 200:
         log(f"API Error {warc_data.status_code}: can't get info about {warc}",
-            seed_df, row_index, "WARC_Download_Errors")
+            seed_log, row_index, "WARC_Download_Errors")
         raise ValueError
 
-    # Gets and returns the two data points needed from the WASAPI results, unless there is an error.
+    # Gets and returns the data points needed from the WASAPI results, unless there is an error.
+    # WASAPI includes both MD5 and SHA1, and both are verified.
     py_warc = warc_data.json()
     try:
         warc_url = py_warc['files'][0]['locations'][0]
-        warc_md5 = py_warc['files'][0]['checksums']['md5']
-        return warc_url, warc_md5
+        warc_checksums = {algorithm: checksum for algorithm, checksum in py_warc['files'][0]['checksums'].items()
+                          if algorithm in ("md5", "sha1")}
+        warc_size = py_warc['files'][0]['size']
+        return warc_url, warc_checksums, warc_size
     except IndexError:
         log(f"Index Error: cannot get the WARC URL or MD5 for {warc}",
-            seed_df, row_index, "WARC_Download_Errors")
+            seed_log, row_index, "WARC_Download_Errors")
         raise IndexError
 
 
-def log(message, seed_df, row_index, column):
-    """Add log information to the seeds dataframe and save an updated version of seeds_log.csv.
+def get_warc_sizes(date_start, date_end):
+    """Get the size of every WARC in the download using WASAPI, to use for scheduling the downloads.
+
+    If seed_data() already got the WARCs for these dates, the sizes from that WASAPI call are used.
+    Otherwise, such as when a stopped download is continued from seeds_log.csv, WASAPI is called again.
+
+    Parameters:
+        date_start: first store date to include, formatted YYYY-MM-DD
+        date_end : first store date to not include, formatted YYYY-MM-DD
+
+    Returns:
+        A dictionary with the WARC filename for keys and size in bytes for values,
+        which is empty if there was an API error so the schedule uses the seed sizes instead
+    """
+    if (date_start, date_end) in WARC_SIZES:
+        return WARC_SIZES[(date_start, date_end)]
+    filters = {"store-time-after": date_start, "store-time-before": date_end, "page_size": 10000}
+    warcs = api_get(config.wasapi, "get_warc_sizes", params=filters)
+    if not warcs.status_code == 200:
+        print(f"\nAPI error {warcs.status_code} when getting WARC sizes. The schedule will use seed sizes.")
+        return {}
+    return {file['filename']: file['size'] for file in warcs.json()['files']}
+
+
+def is_loopback(url):
+    """Return True if the URL is for a server on this machine, like the mock Archive-It in mock_archive_it.py."""
+    host = urllib.parse.urlsplit(url).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def log(message, seed_log, row_index, column):
+    """Add log information to the seed log and save an updated version of seeds_log.csv.
 
     Parameters:
         message : Information to include in the log
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log
         column : the name of the column to add the log message to
     """
 
-    # Updates the dataframe.
-    # If the cell has the default log value of TBD, it replaces it with the message.
-    # Otherwise, it separates the existing message(s) and new message with a semicolon.
-    if seed_df.loc[row_index, column] == "TBD":
-        seed_df.loc[row_index, column] = message
-    else:
-        seed_df.loc[row_index, column] += "; " + message
-
-    # Saves a new version of seeds_log.csv with the updated information.
-    # The previous version of the file is overwritten.
-    seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+    # Adds the message to the seed's list of messages for that step.
+    # Saves a new version of seeds_log.csv with the updated information, where the messages for each step
+    # are separated with a semicolon. The previous version of the file is overwritten.
+    with LOG_LOCK, TRACE.span("log", "log", column=column):
+        seed_log.add(row_index, column, message)
+        seed_log.save()
 
 
 def metadata_csv(seeds_list, date_end):
@@ -553,6 +1796,382 @@ def metadata_csv(seeds_list, date_end):
     Returns:
         A dataframe with the Seed ID (Folder) and AIP ID
     """
+    df = seed_metadata(seeds_list, date_end)
+    df.to_csv(os.path.join(config.script_output, "preservation_download", "metadata.csv"), index=False)
+
+    # Returns a dataframe with the Seed ID (Folder) and AIP ID so the AIP ID can be added to the seed data.
+    aip_df = df[['Folder', 'AIP_ID']].copy()
+    aip_df.rename(columns={"Folder": "Seed_ID"}, inplace=True)
+    return aip_df
+
+
+def plan_download(date_start, date_end, workers):
+    """Get the size of a download and how it would be scheduled, without saving or downloading anything.
+
+    This uses the same API calls as the start of ait_download.py (WASAPI and the Partner API seed reports),
+    but does not save seeds_log.csv or metadata.csv or make any folders, so it can be run before a download
+    or while a stopped download still needs to be continued.
+
+    Parameters:
+        date_start: first store date to include, formatted YYYY-MM-DD
+        date_end : first store date to not include, formatted YYYY-MM-DD
+        workers : number of WARCs to download at the same time, used for the schedule
+
+    Returns:
+        A dataframe with the Department, Collection, Seeds, WARCs, and Bytes (zipped and unzipped) of each collection
+        A list of (row_index, WARC filename, size in bytes) in the order to download, from schedule_downloads()
+        A list with the predicted bytes and WARCs for each worker, as (bytes, WARCs), from schedule_downloads()
+    """
+    seed_df = seed_data(date_start, date_end, save=False)
+    metadata_df = seed_metadata(seed_df['Seed_ID'].values.tolist(), date_end)
+    metadata_df = metadata_df[["Folder", "AIP_ID", "Department", "Collection"]].rename(columns={"Folder": "Seed_ID"})
+    seed_df = pd.merge(seed_df, metadata_df, how="left")
+    seed_df.insert(0, "AIP_ID", seed_df.pop('AIP_ID'))
+    seed_log = SeedLog(seed_df)
+    tasks, worker_loads = schedule_downloads(seed_log, get_warc_sizes(date_start, date_end), workers)
+
+    # Adds the size of each WARC in the schedule to its seed, and totals the seeds by department and collection.
+    task_df = pd.DataFrame(tasks, columns=["Row", "WARC", "Bytes"])
+    seed_df["Bytes"] = task_df.groupby("Row")["Bytes"].sum().reindex(seed_df.index, fill_value=0)
+    seed_df["WARCs"] = task_df.groupby("Row")["WARC"].count().reindex(seed_df.index, fill_value=0)
+    plan_df = seed_df.groupby(["Department", "Collection"], dropna=False).agg(
+        Seeds=("Seed_ID", "count"), WARCs=("WARCs", "sum"), Bytes=("Bytes", "sum")).reset_index()
+    plan_df["Unzipped_Bytes"] = (plan_df["Bytes"] * DISK.expansion).astype(int)
+    return plan_df, tasks, worker_loads
+
+
+def read_manifests(seed_dir):
+    """Read every manifest in a seed folder.
+
+    Each line is a checksum, two spaces (or a space and an asterisk, which md5sum uses for binary mode),
+    and a filename. A manifest may be edited by hand or made by another tool, so blank lines are skipped
+    and any other line that is not in this format is printed and skipped, instead of stopping the seed.
+
+    Parameters:
+        seed_dir : path to the seed's folder
+
+    Returns:
+        A dictionary with the filenames for keys and a dictionary of algorithm and checksum for values
+    """
+    manifests = {}
+    for manifest_name in os.listdir(seed_dir):
+        regex_manifest = re.match(r".*_manifest-(\w+)\.txt$", manifest_name)
+        if not regex_manifest:
+            continue
+        algorithm = regex_manifest.group(1)
+        with open(os.path.join(seed_dir, manifest_name)) as manifest:
+            for line_number, line in enumerate(manifest, 1):
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                regex_line = re.match(r"(\S+) [ *](.+)$", line)
+                if not regex_line:
+                    print(f"Skipping line {line_number} of {os.path.join(seed_dir, manifest_name)}, "
+                          f"which is not a checksum and filename: {line!r}")
+                    continue
+                checksum, filename = regex_line.groups()
+                manifests.setdefault(filename, {})[algorithm] = checksum
+    return manifests
+
+
+def redact_csv(source, destination):
+    """Copy a seed report from one text stream to another, one row at a time, redacting the login information.
+
+    If the login_password column is present, the login_username and login_password columns are filled with REDACTED,
+    even if they are blank, and login_username is added if it is not present.
+    Since not all login information is meaningful (some is from staff web browsers autofill information
+    while viewing the metadata), knowing if there was login information or not is misleading.
+    The Archive-It API is not consistent about if the login columns are present or not.
+    save_report() uses this to redact the seed report while it is downloaded.
+
+    Parameters:
+        source : text stream to read the seed report from, for example an open file or API response
+        destination : text stream to write the redacted seed report to
+
+    Returns:
+        True if the login columns were redacted, or False if there were no login columns
+    """
+    reader = csv.reader(source)
+    writer = csv.writer(destination, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        return False
+    redact = "login_password" in header
+    if redact and "login_username" not in header:
+        header.append("login_username")
+    login_columns = [index for index, column in enumerate(header) if column in ("login_username", "login_password")]
+    writer.writerow(header)
+    for row in reader:
+        if redact:
+            row += [""] * (len(header) - len(row))
+            for index in login_columns:
+                row[index] = "REDACTED"
+        writer.writerow(row)
+    return redact
+
+
+def reset_seed(seed_id, seed_log):
+    """Delete the directories and log information for a seed so that it can be remade,
+    except for the WARCs that were finished or partly downloaded.
+
+    This is used when the script is interrupted before completing all seeds,
+    so that it can try again with the seed that was in progress at the time of the interruption.
+    A WARC is finished if the unzipped WARC is in the seed folder and its checksums are in the manifests,
+    since that is the last step for a WARC. Finished WARCs, their checksums, and their log information are kept,
+    and WARCs that were saved partly downloaded when the script was stopped (.part) are kept to be continued.
+
+    Parameters:
+        seed_id : Archive-It identifier for the seed
+        seed_log : SeedLog with all seed data in the download, including log information
+
+    Returns:
+        A set with the filenames (zipped) of the finished WARCs, which do not need to be downloaded again
+    """
+    with LOG_LOCK:
+        record = seed_log.find(seed_id)
+
+        # Finds the finished WARCs, which are unzipped WARCs in the folder and the manifests.
+        # The zipped WARCs are deleted after unzipping, so the filenames in the log are the unzipped name plus .gz.
+        manifests = read_manifests(seed_id)
+        keep = {filename for filename in manifests
+                if filename.endswith(".warc") and os.path.exists(os.path.join(seed_id, filename))}
+        done = {f"{filename}.gz" for filename in keep}
+        partial = [filename for filename in os.listdir(seed_id) if filename.endswith(".part")]
+
+        # Deletes the seed folder and all its contents if there is nothing to keep.
+        # Otherwise, deletes everything else and remakes the manifests with only the checksums for the finished WARCs.
+        if not done and not partial:
+            shutil.rmtree(seed_id)
+        else:
+            for filename in os.listdir(seed_id):
+                if filename not in keep and filename not in partial:
+                    os.remove(os.path.join(seed_id, filename))
+            for filename in sorted(keep):
+                add_to_manifest(seed_id, record.AIP_ID, filename, manifests[filename])
+
+        # Returns log columns back to the initial default of TBD, removing the record of the failed attempt,
+        # except for messages about the finished WARCs.
+        for column in LOG_COLUMNS[:-1]:
+            record.messages[column] = [message for message in record.messages[column]
+                                       if any(warc in message for warc in done)]
+
+        # Saves a new version of seeds_log.csv with the updated information,
+        # and removes the WARCs that will be downloaded again from warcs_log.csv.
+        seed_log.save()
+        seed_log.remove_warcs(seed_id, done)
+
+    return done
+
+
+def run_counters():
+    """Return the totals for the run history that are compared before and after each stage.
+
+    Returns:
+        A dictionary with the bytes downloaded and the API calls, errors, retries, and seconds waiting to retry
+    """
+    with LOG_LOCK:
+        return {"bytes_downloaded": PROGRESS.received_bytes,
+                "api_calls": sum(stats["calls"] for stats in RETRY_STATS.values()),
+                "api_errors": sum(stats["errors"] for stats in RETRY_STATS.values()),
+                "retries": sum(stats["retries"] for stats in RETRY_STATS.values()),
+                "retry_seconds": sum(stats["retry_seconds"] for stats in RETRY_STATS.values())}
+
+
+def save_report(seed_id, filter_type, filter_value, report_type, report_name, redact=False):
+    """Download a single metadata report and save it as a csv in the seed's folder if it is not empty.
+
+    The report is streamed to the file, so it is never held in memory. For the seed report, the login information
+    is redacted while it is streamed, so the unredacted report is never saved.
+    This does not update the log, so it can be used by more than one thread at a time
+    and the caller can log the results in a consistent order.
+    A connection that still fails after the API retries is returned as an API error like an error status code.
+
+    Parameters:
+        seed_id : Archive-It identifier for the seed, which is the name of the seed's folder
+        filter_type : part of API call to get the right report
+        filter_value : part of the API call to get the right report
+        report_type : the Archive-It name for the report
+        report_name : the file name for the saved report
+        redact : optional. If True, redacts the login columns (only in the seed report)
+
+    Returns:
+        A list of tuples with the log message and log column, which is empty if the report was saved without redaction
+    """
+
+    # Builds the API call to get the report as a csv.
+    # Limit of -1 will return all matches. Default is only the first 100.
+    filters = {"limit": -1, filter_type: filter_value, "format": "csv"}
+    results = []
+    report_path = os.path.join(str(seed_id), report_name)
+    with TRACE.span("save_report", "seed", seed=str(seed_id), report=report_name):
+        try:
+            metadata_report = api_get(f"{config.partner_api}/{report_type}", "get_report", params=filters,
+                                      stream=True)
+
+            # Saves the metadata report if there were no API errors and there was data of this type (content isn't
+            # empty). For scope rules, it is common for one or both to not have data since these aren't required.
+            with metadata_report:
+                if metadata_report.status_code != 200:
+                    results.append((f"{report_name} API Error {metadata_report.status_code}",
+                                    "Metadata_Report_Errors"))
+                elif redact:
+                    # Without auto_close, the response does not report it is closed once the last data is read,
+                    # which would make the text wrapper stop with an error before it reads the buffered rows.
+                    metadata_report.raw.decode_content = True
+                    metadata_report.raw.auto_close = False
+                    report_text = io.TextIOWrapper(metadata_report.raw, encoding="utf-8", newline="")
+                    with open(report_path, "w", newline="", encoding="utf-8") as report_csv:
+                        redacted = redact_csv(report_text, report_csv)
+                else:
+                    with open(report_path, "wb") as report_csv:
+                        for chunk in metadata_report.iter_content(chunk_size=CHUNK_SIZE):
+                            report_csv.write(chunk)
+
+        # If the connection still failed after the retries, or failed while the report was saved,
+        # deletes any part of the report that was saved so the seed is logged as incomplete and the download continues.
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as error:
+            if os.path.exists(report_path):
+                os.remove(report_path)
+            results.append((f"{report_name} API Error {type(error).__name__}", "Metadata_Report_Errors"))
+            if redact:
+                results.append(("No seeds.csv to redact", "Seed_Report_Redaction"))
+            return results
+
+    if metadata_report.status_code == 200 and os.path.getsize(report_path) == 0:
+        os.remove(report_path)
+        results.append((report_name, "Metadata_Report_Empty"))
+
+    # Adds the result of the redaction to the log.
+    if redact and os.path.exists(report_path):
+        results.append(("Successfully redacted" if redacted else "No login columns to redact", "Seed_Report_Redaction"))
+    elif redact:
+        results.append(("No seeds.csv to redact", "Seed_Report_Redaction"))
+    return results
+
+
+def schedule_downloads(seed_log, warc_sizes, workers):
+    """Put the WARCs for every seed that still needs to be downloaded in the order that finishes soonest.
+
+    Seeds are ordered largest first (longest processing time first), and the WARCs within each seed largest first,
+    so a large seed never starts last and leaves the other workers idle while it downloads.
+    The time each worker will be busy is predicted by assigning each WARC to the worker that will be free first,
+    which is how download_seeds() works.
+
+    Parameters:
+        seed_log : SeedLog with all seed data in the download, including log information
+        warc_sizes : dictionary with the WARC filename for keys and size in bytes for values, from get_warc_sizes()
+        workers : number of WARCs to download at the same time
+
+    Returns:
+        A list of (row_index, WARC filename, size in bytes) in the order to download
+        A list with the predicted bytes and WARCs for each worker, as (bytes, WARCs)
+    """
+    # Filtered for "TBD" in the Complete column to skip seeds done earlier if this is a restart.
+    # Sizes are not in WASAPI for WARCs that were deleted from Archive-It, so the seed's average is used instead.
+    seeds = []
+    for seed in seed_log.unfinished():
+        warc_names = seed.WARC_Filenames.split("|")
+        average_size = int(float(seed.Size_GB) * 1000000000 / len(warc_names))
+        warcs = sorted([(warc_sizes.get(warc, average_size), warc) for warc in warc_names], reverse=True)
+        seeds.append((sum(size for size, warc in warcs), seed.Index, warcs))
+    seeds.sort(key=lambda seed_info: seed_info[0], reverse=True)
+
+    tasks = []
+    for seed_size, row_index, warcs in seeds:
+        for size, warc in warcs:
+            tasks.append((row_index, warc, size))
+
+    # Predicts the work each worker will do. Each WARC goes to the worker with the least work so far.
+    loads = [(0, worker, 0) for worker in range(workers)]
+    for row_index, warc, size in tasks:
+        load_bytes, worker, load_warcs = heapq.heappop(loads)
+        heapq.heappush(loads, (load_bytes + size, worker, load_warcs + 1))
+    worker_loads = [(load_bytes, load_warcs) for load_bytes, worker, load_warcs in sorted(loads, key=lambda x: x[1])]
+
+    return tasks, worker_loads
+
+
+def seed_data(date_start, date_end, save=True):
+    """Get information about each WARC and seed in the download using WASAPI and save to seeds_log.csv.
+
+    Parameters:
+        date_start: first store date to include, formatted YYYY-MM-DD
+        date_end : first store date to not include, formatted YYYY-MM-DD
+        save : optional. If False, seeds_log.csv is not saved, so planning a download does not replace the log
+               of a download that was stopped.
+
+    Returns:
+         Dataframe with the information about every seed in this download.
+    """
+
+    # Uses WASAPI to get information about all WARCs in this download, based on the date limits.
+    # WASAPI is the only API that allows limiting by date.
+    filters = {"store-time-after": date_start, "store-time-before": date_end, "page_size": 10000}
+    warcs = api_get(config.wasapi, "seed_data", params=filters)
+
+    # If there was an error with the API call, quits the script.
+    if not warcs.status_code == 200:
+        print(f"\nAPI error {warcs.status_code} when getting WARC data.")
+        print(f"Ending script (this information is required). Try script again later.")
+        exit()
+
+    # Saves WARC data from WASAPI (which downloads as a dictionary) to a dataframe and reorganizes it by seed.
+    # For each seed: Archive-It collection, seed id, job, size in GB, number of WARCs, and all the WARC filenames.
+    # The size of each WARC is also kept for scheduling the download.
+    rows = []
+    for file in warcs.json()['files']:
+        rows.append([file['collection'], file['crawl'], file['size'], file['filename']])
+    WARC_SIZES[(date_start, date_end)] = {file['filename']: file['size'] for file in warcs.json()['files']}
+    warc_df = pd.DataFrame(rows, columns=["AIT_Collection", "Job_ID", "Size", "WARC_Filename"])
+    warc_df['Seed_ID'] = warc_df['WARC_Filename'].str.extract(r"^.*-SEED(\d+)-")
+
+    coll_df = warc_df[['Seed_ID', 'AIT_Collection']].copy()
+    coll_df = coll_df.drop_duplicates()
+    coll_df['AIT_Collection'] = coll_df['AIT_Collection'].astype(str)
+    coll_by_seed = coll_df.groupby(['Seed_ID'])['AIT_Collection'].apply("|".join)
+
+    job_df = warc_df[['Seed_ID', 'Job_ID']].copy()
+    job_df = job_df.drop_duplicates()
+    job_df['Job_ID'] = job_df['Job_ID'].astype(str)
+    jobs_by_seed = job_df.groupby(['Seed_ID'])['Job_ID'].apply("|".join)
+
+    warc_df['Size_GB'] = warc_df['Size']/1000000000
+    gb_by_seed = warc_df.groupby(['Seed_ID'])['Size_GB'].sum().round(3)
+
+    count_by_seed = warc_df.groupby('Seed_ID')['Seed_ID'].count()
+
+    warc_names = warc_df.groupby(['Seed_ID'])['WARC_Filename'].apply("|".join)
+
+    seed_df = pd.concat([coll_by_seed, jobs_by_seed, gb_by_seed, count_by_seed, warc_names], axis=1)
+    seed_df.columns = ["AIT_Collection", "Job_ID", "Size_GB", 'WARCs', "WARC_Filenames"]
+    seed_df = seed_df.reset_index()
+
+    # Adds columns for logging the workflow steps with default text of "TBD".
+    # It needs to have text instead of being blank to avoid a dtype error when the result (string) is added to the log.
+    log_columns = ["Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction", "WARC_Download_Errors",
+                   "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
+    for log_column in log_columns:
+        seed_df[log_column] = 'TBD'
+
+    # Saves the dataframe as a CSV in the script output folder for splitting or restarting a batch.
+    # Returns the dataframe for when the entire group will be downloaded as one batch.
+    if save:
+        seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+    return seed_df
+
+
+def seed_metadata(seeds_list, date_end):
+    """Get the department, collection, AIP ID, and title for each seed using the Partner API to get the seed reports.
+
+    This is the information in metadata.csv, which is saved by metadata_csv(). It is also used to plan a download.
+
+    Parameters:
+        seeds_list : a list of all Archive-It identifiers for the seeds in this download
+        date_end : first store date to not include, formatted YYYY-MM-DD
+
+    Returns:
+        A dataframe with the Department, Collection, Folder (Seed ID), AIP_ID, Title, and Version of each seed
+    """
 
     # Makes a dataframe for storing all the seed data.
     df = pd.DataFrame(columns=["Department", "Collection", "Folder", "AIP_ID", "Title", "Version"])
@@ -565,7 +2184,7 @@ def metadata_csv(seeds_list, date_end):
 
         # Uses the Partner API to get the seed report.
         # If the connection fails, logs an error and adds a row to the df, so it is clear more work is needed.
-        api_result = requests.get(f"{config.partner_api}/seed?id={seed_id}", auth=(config.username, config.password))
+        api_result = api_get(f"{config.partner_api}/seed?id={seed_id}", "metadata_csv")
         if not api_result.status_code == 200:
             row_list = [f"TBD: API error {api_result.status_code}", "TBD", seed_id, "TBD", "TBD", 1]
             df.loc[len(df)] = row_list
@@ -646,192 +2265,198 @@ def metadata_csv(seeds_list, date_end):
     df_tbd = df[df['Department'].str.startswith("TBD")].copy()
     df_tbd['AIP_ID'] = "TBD"
 
-    # Combines the department dataframes, removes the temporary column Sequential,
-    # and saves the completed dataframe to a CSV.
+    # Combines the department dataframes and removes the temporary column Sequential.
     df = pd.concat([df_magil, df_harg_rbrl, df_tbd])
-    df = df.drop(['Sequential'], axis=1)
-    df.to_csv(os.path.join(config.script_output, "preservation_download", "metadata.csv"), index=False)
-
-    # Returns a dataframe with the Seed ID (Folder) and AIP ID so the AIP ID can be added to seed_df.
-    aip_df = df[['Folder', 'AIP_ID']].copy()
-    aip_df.rename(columns={"Folder": "Seed_ID"}, inplace=True)
-    return aip_df
+    return df.drop(['Sequential'], axis=1)
 
 
-def redact_seed_report(seed_id, aip_id, seed_df, row_index):
-    """Redact login information in the seed report, if the columns are present.
+def setup():
+    """Make the settings and the objects shared by the steps of the download from the configuration file.
 
-    If the two login columns are present, fills the column with REDACTED, even if they are blank.
-    Since not all login information is meaningful (some is from staff web browsers autofill information
-    while viewing the metadata), knowing if there was login information or not is misleading.
-    The Archive-It API is not consistent about if the login columns are present or not.
+    This runs after check_config(), so the values are known to be correct.
+    Until it runs, the settings and objects have the default values.
+    """
+    global REQUEST_TIMEOUT, STALL_BYTES_PER_SECOND, STALL_SECONDS, TRANSFER_RESTARTS
+    global DISK, BANDWIDTH, METRICS, PROGRESS, TRACE, PROFILER, HISTORY
+
+    REQUEST_TIMEOUT = getattr(config, "request_timeout", REQUEST_TIMEOUT)
+    STALL_BYTES_PER_SECOND = getattr(config, "stall_bytes_per_second", STALL_BYTES_PER_SECOND)
+    STALL_SECONDS = getattr(config, "stall_seconds", STALL_SECONDS)
+    TRANSFER_RESTARTS = getattr(config, "transfer_restarts", TRANSFER_RESTARTS)
+
+    DISK = DiskAdmission(config.script_output, int(getattr(config, "disk_free_threshold_gb", 10) * 1000000000),
+                         getattr(config, "unzip_expansion", 3))
+    BANDWIDTH = TokenBucket(getattr(config, "bandwidth_mb_per_second", None), getattr(config, "bandwidth_schedule", ()))
+    METRICS = Metrics(getattr(config, "metrics_port", None), getattr(config, "metrics_textfile", None),
+                      getattr(config, "metrics_seconds", 15))
+    PROGRESS = Progress(os.path.join(config.script_output, "download_status.json"),
+                        getattr(config, "progress_seconds", 60), metrics=METRICS, rest_seconds=API_REST)
+    TRACE = Tracer(os.path.join(config.script_output, "download_trace.json") if getattr(config, "trace", False)
+                   else None, METRICS)
+    PROFILER = Profiler(config.script_output)
+    HISTORY = RunHistory(getattr(config, "run_history", observability.RUN_HISTORY_PATH), run_counters)
+
+
+@contextlib.contextmanager
+def stage(name, **args):
+    """Run one stage of ait_download.py, recording it in the trace, the profile, and the run history.
 
     Parameters:
-        seed_id : Archive-It identifier for the seed
-        aip_id : UGA AIP identifier for the seed in this download timeframe
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        name : the name of the stage, usually the main function it runs
+        **args : information about the stage to include in the trace
     """
+    with TRACE.span(name, "stage", **args), PROFILER.stage(name), HISTORY.stage(name):
+        yield
 
-    # Reads the seeds.csv into a dataframe for editing.
-    # If it is not present, logs the error and ends this function.
-    try:
-        report_df = pd.read_csv(os.path.join(str(seed_id), f"{aip_id}_seed.csv"))
-    except FileNotFoundError:
-        log("No seeds.csv to redact", seed_df, row_index, "Seed_Report_Redaction")
-        return
-
-    # If the login columns exist, replaces the values with REDACTED and updates the log.
-    # If they do not exist, just updates the log.
-    if "login_password" in report_df.columns:
-        report_df['login_username'] = "REDACTED"
-        report_df['login_password'] = "REDACTED"
-        report_df.to_csv(os.path.join(str(seed_id), f"{aip_id}_seed.csv"), index=False)
-        log("Successfully redacted", seed_df, row_index, "Seed_Report_Redaction")
-    else:
-        log("No login columns to redact", seed_df, row_index, "Seed_Report_Redaction")
 
+def stop_downloads(signal_number, frame):
+    """Stop the download gracefully when the script gets Ctrl+C (SIGINT) or SIGTERM.
 
-def reset_seed(seed_id, seed_df):
-    """Delete the directories and log information for a seed so that it can be remade.
-
-    This is used when the script is interrupted before completing all seeds,
-    so that it can try again with the seed that was in progress at the time of the interruption.
+    No new WARCs are started, WARCs being downloaded are saved to continue the next time the script runs,
+    and WARCs being verified or unzipped are finished. A second signal also stops the WARCs being unzipped,
+    which are downloaded again the next time the script runs. Neither signal raises KeyboardInterrupt,
+    which could reach ait_download.py anywhere (even while it saves the logs), so the script always stops
+    once the workers have stopped and saves the logs and run history the same way after one or two signals.
 
     Parameters:
-        seed_id : Archive-It identifier for the seed
-        seed_df : dataframe with all seed data in the download, including log information
+        signal_number : the signal received, from the signal module
+        frame : the current stack frame, from the signal module (not used)
     """
-
-    # Deletes the seed folder and all its contents.
-    shutil.rmtree(seed_id)
-
-    # Returns log columns back to the initial default of TBD, removing the record of the failed attempt.
-    row_index = seed_df.index[seed_df['Seed_ID'] == seed_id].tolist()[0]
-    seed_df.loc[row_index, 'Metadata_Report_Errors'] = "TBD"
-    seed_df.loc[row_index, 'Metadata_Report_Empty'] = "TBD"
-    seed_df.loc[row_index, 'Seed_Report_Redaction'] = "TBD"
-    seed_df.loc[row_index, 'WARC_Download_Errors'] = "TBD"
-    seed_df.loc[row_index, 'WARC_Fixity_Errors'] = "TBD"
-    seed_df.loc[row_index, 'WARC_Unzip_Errors'] = "TBD"
-
-    # Saves a new version of seeds_log.csv with the updated information.
-    # The previous version of the file is overwritten.
-    seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
+    if STOP.is_set():
+        STOP_NOW.set()
+        print(f"\nReceived signal {signal_number} again. Stopping the WARCs being unzipped.")
+    else:
+        STOP.set()
+        print(f"\nReceived signal {signal_number}. Stopping once the WARCs in progress are saved or unzipped. "
+              f"Send the signal again to also stop the WARCs being unzipped.")
 
 
-def seed_data(date_start, date_end):
-    """Get information about each WARC and seed in the download using WASAPI and save to seeds_log.csv.
+def transfer_rate():
+    """Return the estimated download rate for one worker, for predicting how long a download will take.
 
-    Parameters:
-        date_start: first store date to include, formatted YYYY-MM-DD
-        date_end : first store date to not include, formatted YYYY-MM-DD
+    The rate is transfer_mb_per_second from the configuration file if it is there,
+    and otherwise the median rate of the last finished runs in the run history.
 
     Returns:
-         Dataframe with the information about every seed in this download.
+        The rate in bytes per second, or None if there is no estimate
+        Where the rate is from, to display with the prediction
     """
+    if hasattr(config, "transfer_mb_per_second"):
+        return config.transfer_mb_per_second * 1000000, "transfer_mb_per_second"
+    return HISTORY.estimate_rate(), "previous runs"
 
-    # Uses WASAPI to get information about all WARCs in this download, based on the date limits.
-    # WASAPI is the only API that allows limiting by date.
-    filters = {"store-time-after": date_start, "store-time-before": date_end, "page_size": 10000}
-    warcs = requests.get(config.wasapi, params=filters, auth=(config.username, config.password))
 
-    # If there was an error with the API call, quits the script.
-    if not warcs.status_code == 200:
-        print(f"\nAPI error {warcs.status_code} when getting WARC data.")
-        print(f"Ending script (this information is required). Try script again later.")
-        exit()
-
-    # Saves WARC data from WASAPI (which downloads as a dictionary) to a dataframe and reorganizes it by seed.
-    # For each seed: Archive-It collection, seed id, job, size in GB, number of WARCs, and all the WARC filenames.
-    rows = []
-    for file in warcs.json()['files']:
-        rows.append([file['collection'], file['crawl'], file['size'], file['filename']])
-    warc_df = pd.DataFrame(rows, columns=["AIT_Collection", "Job_ID", "Size", "WARC_Filename"])
-    warc_df['Seed_ID'] = warc_df['WARC_Filename'].str.extract(r"^.*-SEED(\d+)-")
-
-    coll_df = warc_df[['Seed_ID', 'AIT_Collection']].copy()
-    coll_df = coll_df.drop_duplicates()
-    coll_df['AIT_Collection'] = coll_df['AIT_Collection'].astype(str)
-    coll_by_seed = coll_df.groupby(['Seed_ID'])['AIT_Collection'].apply("|".join)
-
-    job_df = warc_df[['Seed_ID', 'Job_ID']].copy()
-    job_df = job_df.drop_duplicates()
-    job_df['Job_ID'] = job_df['Job_ID'].astype(str)
-    jobs_by_seed = job_df.groupby(['Seed_ID'])['Job_ID'].apply("|".join)
-
-    warc_df['Size_GB'] = warc_df['Size']/1000000000
-    gb_by_seed = warc_df.groupby(['Seed_ID'])['Size_GB'].sum().round(3)
-
-    count_by_seed = warc_df.groupby('Seed_ID')['Seed_ID'].count()
-
-    warc_names = warc_df.groupby(['Seed_ID'])['WARC_Filename'].apply("|".join)
-
-    seed_df = pd.concat([coll_by_seed, jobs_by_seed, gb_by_seed, count_by_seed, warc_names], axis=1)
-    seed_df.columns = ["AIT_Collection", "Job_ID", "Size_GB", 'WARCs', "WARC_Filenames"]
-    seed_df = seed_df.reset_index()
+def unzip_warc(seed_log, row_index, warc_path, warc):
+    """Unzip the WARC, which is downloaded as a gzip file, calculating the checksums of the unzipped WARC.
 
-    # Adds columns for logging the workflow steps with default text of "TBD".
-    # It needs to have text instead of being blank to avoid a dtype error when the result (string) is added to the log.
-    log_columns = ["Metadata_Report_Errors", "Metadata_Report_Empty", "Seed_Report_Redaction", "WARC_Download_Errors",
-                   "WARC_Fixity_Errors", "WARC_Unzip_Errors", "Complete"]
-    for log_column in log_columns:
-        seed_df[log_column] = 'TBD'
+    WARCs are usually made of many gzip members, one per record, which gzip reads as one continuous file.
+    The zipped WARC is deleted if it unzips correctly, and the partly unzipped WARC is deleted if not.
+    If the script is stopped a second time (STOP_NOW), the partly unzipped WARC is deleted without logging an error,
+    so the WARC is downloaded again the next time the script runs.
 
-    # Saves the dataframe as a CSV in the script output folder for splitting or restarting a batch.
-    # Returns the dataframe for when the entire group will be downloaded as one batch.
-    seed_df.to_csv(os.path.join(config.script_output, "seeds_log.csv"), index=False)
-    return seed_df
+    Parameters:
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
+        warc_path : the path, including the filename, for the downloaded WARC to the seed folder
+        warc : the zipped WARC's filename
 
+    Returns:
+        A dictionary with the MD5 and SHA256 of the unzipped WARC, or None if it could not be unzipped or was stopped
+    """
+    # The unzipped WARC is the same path and filename as warc_path, without the last 3 characters (.gz).
+    unzipped_path = warc_path[:-3]
 
-def unzip_warc(seed_df, row_index, warc_path, warc):
-    """Unzip the WARC, which is downloaded as a gzip file.
+    # Extracts the WARC from the gzip file one chunk at a time, adding each chunk to the checksums as it is saved.
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    try:
+        with gzip.open(warc_path, "rb") as zipped, open(unzipped_path, "wb") as unzipped:
+            while True:
+                # Stops without finishing the WARC if the script is stopped a second time.
+                if STOP_NOW.is_set():
+                    break
+                chunk = zipped.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                unzipped.write(chunk)
+                md5.update(chunk)
+                sha256.update(chunk)
+                METRICS.inc("ait_bytes_decompressed_total", len(chunk))
+                METRICS.inc("ait_bytes_hashed_total", len(chunk), stage="unzip")
+    except (OSError, EOFError) as error:
+        if os.path.exists(unzipped_path):
+            os.remove(unzipped_path)
+        log(f"Error unzipping {warc}: {error}", seed_log, row_index, "WARC_Unzip_Errors")
+        return None
+
+    # If the script was stopped a second time, deletes the partly unzipped WARC. No error is logged,
+    # so the WARC is not in warcs_log.csv and it is downloaded again the next time the script runs.
+    if STOP_NOW.is_set():
+        os.remove(unzipped_path)
+        return None
+
+    # Deletes the zipped WARC and logs the result of unzipping.
+    os.remove(warc_path)
+    log(f"Successfully unzipped {warc}", seed_log, row_index, "WARC_Unzip_Errors")
+    return {"md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
+
+
+def verify_file(file_path, manifest_checksums):
+    """Compare the checksums of a file on the disk to the checksums in the seed's manifests.
+
+    This is used to audit a preservation download and may run in another thread or process,
+    so it does not update the log and returns the result instead.
 
     Parameters:
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
-        warc_path : the path, including the filename, for the downloaded WARC to the seed folder
-        warc : the zipped WARC's filename
+        file_path : the path, including the filename, of the file to verify
+        manifest_checksums : dictionary of algorithm and checksum from the manifests for this file
+
+    Returns:
+        A list with the file size, algorithms (separated by |), manifest checksums, audit checksums, and result
     """
-    # Extracts the WARC from the gzip file, which deletes the zipped WARC.
-    unzip_output = subprocess.run(f"gunzip -f {warc_path}", stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
-                                  shell=True)
+    algorithms = sorted(manifest_checksums)
+    manifest_values = "|".join(manifest_checksums[algorithm] for algorithm in algorithms)
+    try:
+        size = os.path.getsize(file_path)
+        audit_checksums = file_checksums(file_path, algorithms)
+    except OSError as error:
+        return [0, "|".join(algorithms), manifest_values, "", f"Error: {error}"]
 
-    # Logs the result of unzipping, based on the output of gunzip.
-    if unzip_output.stderr == b'':
-        log(f"Successfully unzipped {warc}", seed_df, row_index, "WARC_Unzip_Errors")
-    else:
-        log(f"Error unzipping {warc}: {unzip_output.stderr.decode('utf-8')}", seed_df, row_index, "WARC_Unzip_Errors")
+    audit_values = "|".join(audit_checksums[algorithm] for algorithm in algorithms)
+    result = "Match" if audit_values == manifest_values else "Mismatch"
+    return [size, "|".join(algorithms), manifest_values, audit_values, result]
 
 
-def verify_warc_fixity(seed_df, row_index, warc_path, warc, warc_md5):
+def verify_warc_fixity(seed_log, row_index, warc_path, warc, warc_checksums, download_checksums):
     """Compare the fixity of the downloaded WARC to the fixity in Archive-It and delete the file if it does not match.
 
     Parameters:
-        seed_df : dataframe with all seed data in the download, including log information
-        row_index : the seed's row in the dataframe, used to update the log
+        seed_log : SeedLog with all seed data in the download, including log information
+        row_index : the seed's row in the seed log, used to update the log
         warc_path : the path, including the filename, for the downloaded WARC in the seed folder
         warc : the zipped WARC's filename
-        warc_md5 : the MD5 of the zipped WARC from the Archive-It API
+        warc_checksums : dictionary with the MD5 and SHA1 of the zipped WARC from the Archive-It API
+        download_checksums : dictionary with the MD5 and SHA1 of the zipped WARC calculated during the download
     """
 
-    # Calculates the md5 for the downloaded zipped WARC with md5deep.
-    md5deep_output = subprocess.run(f'md5deep "{warc_path}"', stdout=subprocess.PIPE, shell=True)
-    try:
-        regex_md5 = re.match("b['|\"]([a-z0-9]*) ", str(md5deep_output.stdout))
-        downloaded_warc_md5 = regex_md5.group(1)
-    except AttributeError:
-        log(f"Error: fixity for {warc} cannot be extracted from md5deep output: {md5deep_output.stdout}",
-            seed_df, row_index, "WARC_Fixity_Errors")
-        raise AttributeError
-
-    # Compares the md5 of the downloaded zipped WARC to Archive-It metadata.
-    # If the md5 has changed, deletes the WARC.
-    if warc_md5 == downloaded_warc_md5:
-        log(f"Successfully verified {warc} fixity on {datetime.datetime.now()}",
-            seed_df, row_index, "WARC_Fixity_Errors")
-    else:
-        os.remove(warc_path)
-        log(f"Error: fixity for {warc} changed and it was deleted: {warc_md5} before, {downloaded_warc_md5} after",
-            seed_df, row_index, "WARC_Fixity_Errors")
+    # Every algorithm that has a checksum from both Archive-It and the download is compared.
+    # If there is none in common, the WARC cannot be verified but is not deleted, since it may be correct.
+    algorithms = [algorithm for algorithm in ("md5", "sha1") if algorithm in warc_checksums
+                  and algorithm in download_checksums]
+    if len(algorithms) == 0:
+        log(f"Error: fixity for {warc} cannot be verified because Archive-It did not provide a checksum",
+            seed_log, row_index, "WARC_Fixity_Errors")
         raise ValueError
+
+    # Compares the checksums of the downloaded zipped WARC to Archive-It metadata.
+    # If any checksum has changed, deletes the WARC.
+    for algorithm in algorithms:
+        if warc_checksums[algorithm] != download_checksums[algorithm]:
+            os.remove(warc_path)
+            log(f"Error: fixity for {warc} changed and it was deleted: "
+                f"{warc_checksums[algorithm]} before, {download_checksums[algorithm]} after",
+                seed_log, row_index, "WARC_Fixity_Errors")
+            raise ValueError
+
+    log(f"Successfully verified {warc} fixity on {datetime.datetime.now()}",
+        seed_log, row_index, "WARC_Fixity_Errors")